@@ -1,14 +1,31 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, g, send_from_directory
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-import sqlite3
 import os
-import json
+import mimetypes
 
 from datetime import datetime
 from functools import wraps
 import traceback
 from config import Config
+import database
+from database import get_db, connect, write_transaction
+from repository import (UserRepository, VideoRepository, CommentRepository,
+                        VoteRepository, PaymentRepository, TournamentRepository,
+                        SQL_REFRESH_VIEW_COUNT, SQL_VIEW_EXISTS, SQL_COUNT_VIDEO_VIEWS,
+                        SQL_PROFILE_RECENT_COMMENTS, SQL_ADMIN_RECENT_ACTIVITY, SQL_ADMIN_REPORTS,
+                        SQL_ADMIN_REPORTS_BY_STATUS, SQL_ADMIN_REPORT_COUNTS, SQL_CAPPED_COUNT,
+                        admin_users_sql, admin_videos_sql, encode_cursor, decode_cursor)
+from migrations import migrate
+import write_buffer
+from translations import TranslationCatalogs
+from cache import TTLCache, SharedCache, backend_from_url
+from tournament_state import TournamentState
+from search import VideoSearch, match_query, matching_ids, search_terms
+from media import MediaURLResolver
+from compression import compress_response, compress_variants, pick_variant, precompressed_variant
+from assets import AssetBundles
+from http_cache import StaticFingerprints, cache_policy, apply_policy
 import urllib.parse
 import requests
 
@@ -58,17 +75,50 @@ except Exception as e:
 
 app = Flask(__name__)
 app.config.from_object(Config)
-
-# Cache busting configuration
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+database.init_app(app)
+
+# Static URLs carry a content hash (?v=...), so a changed file gets a new URL
+static_fingerprints = StaticFingerprints(app.static_folder,
+                                         max_bytes=Config.STATIC_FINGERPRINT_MAX_BYTES,
+                                         check_interval=Config.STATIC_FINGERPRINT_CHECK_SECONDS)
+
+# Page CSS/JS bundles (static/css, static/js -> static/dist/<name>.<hash>.<ext>), linked with asset_url()
+asset_bundles = AssetBundles(lambda path: url_for('static', filename=path), directory=app.static_folder,
+                             check_interval=Config.STATIC_FINGERPRINT_CHECK_SECONDS)
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Add the file's content hash to url_for('static', ...)"""
+    if endpoint == 'static' and 'v' not in values:
+        fingerprint = static_fingerprints.get(values.get('filename', ''))
+        if fingerprint:
+            values['v'] = fingerprint
+
+def response_cache_policy():
+    """Caching policy of the current request (see http_cache.POLICIES)"""
+    if request.endpoint == 'static':
+        # Only a URL whose hash matches the file on disk may be kept for good;
+        # plain /static/... links still get ETag/Last-Modified from send_file
+        fingerprint = request.args.get('v')
+        if fingerprint and fingerprint == static_fingerprints.get(request.view_args.get('filename', '')):
+            return 'immutable'
+        return 'revalidate'
+    view = app.view_functions.get(request.endpoint)
+    return getattr(view, 'cache_policy', 'no-store')
 
 @app.after_request
 def after_request(response):
-    """Add cache-busting headers for development"""
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate, public, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    """Compress text responses, then set Cache-Control per route: immutable assets,
+    revalidated public pages, no-store otherwise"""
+    # Compressed first, so ETags and 304s are computed on the bytes actually sent
+    compress_response(response, request, min_size=Config.COMPRESSION_MIN_BYTES,
+                      gzip_level=Config.COMPRESSION_GZIP_LEVEL,
+                      brotli_quality=Config.COMPRESSION_BROTLI_QUALITY)
+    if request.endpoint == 'static':
+        return apply_policy(response, request, response_cache_policy(), vary=(),
+                            immutable_max_age=Config.STATIC_IMMUTABLE_MAX_AGE_SECONDS)
+    # Pages rendered for a session (logged in, flashes, language choice) stay out of shared caches
+    return apply_policy(response, request, response_cache_policy(), private=bool(session))
 
 # Language/Translation support
 SUPPORTED_LANGUAGES = ['en', 'fr']
@@ -82,45 +132,141 @@ def get_locale():
     # Check if language is in browser preferences
     return request.accept_languages.best_match(SUPPORTED_LANGUAGES) or DEFAULT_LANGUAGE
 
+# Compiled once per process (English fallback merged in), reloaded when the JSON changes
+translation_catalogs = TranslationCatalogs(check_interval=Config.TRANSLATIONS_RELOAD_CHECK_SECONDS)
+
 def load_translations(language):
-    """Load translations for the specified language"""
-    try:
-        translation_file = os.path.join('static', 'translations', f'{language}.json')
-        with open(translation_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        # Fallback to English if translation file not found
-        try:
-            translation_file = os.path.join('static', 'translations', 'en.json')
-            with open(translation_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
+    """Get the compiled, read-only translations for the specified language"""
+    return translation_catalogs.get(language)
 
 @app.before_request
 def before_request():
     """Set language and translations before each request"""
+    if request.endpoint == 'static':
+        # static files never render a template; serve a prebuilt .br/.gz when accepted
+        # (python compression.py writes them)
+        filename = request.view_args.get('filename', '')
+        variant = precompressed_variant(request, app.static_folder, filename)
+        if variant:
+            response = send_from_directory(app.static_folder, variant[0],
+                                           mimetype=mimetypes.guess_type(filename)[0])
+            response.headers['Content-Encoding'] = variant[1]
+            response.vary.add('Accept-Encoding')
+            return response
+        return
     g.language = get_locale()
     g.translations = load_translations(g.language)
 
+# The logged-in user's row, shared by the decorators and context processors.
+# Cached per process for a few seconds; write paths call invalidate_current_user().
+current_user_cache = TTLCache(ttl=Config.CURRENT_USER_CACHE_TTL_SECONDS)
+
+def get_current_user():
+    """Get the logged-in user's CurrentUser row (one lookup per request at most), or None"""
+    user_id = session.get('user_id')
+    if user_id is None:
+        return None
+    if 'current_user' not in g:
+        g.current_user = current_user_cache.get_or_load(
+            user_id, lambda: UserRepository(get_db()).current(user_id))
+    return g.current_user
+
+def invalidate_current_user(user_id=None):
+    """Drop a user's cached row after changing it (all users when user_id is None)"""
+    if user_id is None:
+        current_user_cache.clear()
+    else:
+        current_user_cache.delete(user_id)
+    g.pop('current_user', None)
+
+# Homepage, /videos and leaderboard results, plus the fully rendered page for
+# anonymous visitors (keyed by sort mode and language) together with its
+# br/gzip bodies, so a cache hit is never recompressed. Kept in the CACHE_URL
+# backend so workers share them; an expired entry is rebuilt by one worker
+# while the others serve the stale copy. Cleared by invalidate_listings()
+# when moderation, approvals or deletions change which videos are listed;
+# vote counts and ratings are left to refresh with LISTING_CACHE_TTL_SECONDS,
+# so a voting rush keeps being served from the cache.
+cache_backend = backend_from_url(Config.CACHE_URL)
+listing_cache = SharedCache(cache_backend, 'listings', ttl=Config.LISTING_CACHE_TTL_SECONDS,
+                            stale_ttl=Config.CACHE_STALE_SECONDS, lock_ttl=Config.CACHE_LOCK_SECONDS,
+                            version=Config.CACHE_KEY_VERSION)
+anonymous_page_cache = SharedCache(cache_backend, 'pages', ttl=Config.LISTING_CACHE_TTL_SECONDS,
+                                   stale_ttl=Config.CACHE_STALE_SECONDS, lock_ttl=Config.CACHE_LOCK_SECONDS,
+                                   version=Config.CACHE_KEY_VERSION)
+
+# Row counts shown by the admin user/video consoles, per filter and search:
+# counted up to ADMIN_COUNT_CAP and reused for ADMIN_COUNT_CACHE_SECONDS
+admin_count_cache = SharedCache(cache_backend, 'admin_counts', ttl=Config.ADMIN_COUNT_CACHE_SECONDS,
+                                stale_ttl=Config.CACHE_STALE_SECONDS, lock_ttl=Config.CACHE_LOCK_SECONDS,
+                                version=Config.CACHE_KEY_VERSION)
+
+# First page of /search results and the search box suggestions, per query words;
+# cleared along with the listings, since moderation changes them too
+search_cache = SharedCache(cache_backend, 'search', ttl=Config.SEARCH_CACHE_TTL_SECONDS,
+                           stale_ttl=Config.CACHE_STALE_SECONDS, lock_ttl=Config.CACHE_LOCK_SECONDS,
+                           version=Config.CACHE_KEY_VERSION)
+
+# Whether the tournament is open, checked by the upgrade and payment paths without
+# loading the row; admin_toggle_tournament() bumps its generation, which every
+# worker notices within TOURNAMENT_STATE_CHECK_SECONDS
+tournament_state = TournamentState(load=lambda: TournamentRepository(get_db()).settings(),
+                                   load_generation=lambda: TournamentRepository(get_db()).generation(),
+                                   check_interval=Config.TOURNAMENT_STATE_CHECK_SECONDS,
+                                   max_age=Config.TOURNAMENT_STATE_MAX_AGE_SECONDS)
+
+def invalidate_listings():
+    """Drop cached listings after approvals, blocks, deletions or uploader changes (not votes)"""
+    listing_cache.clear()
+    anonymous_page_cache.clear()
+    search_cache.clear()
+
+def render_listing_page(key, render):
+    """
+    Render a public listing page, serving anonymous visitors from the shared cache
+
+    Args:
+        key: Cache key identifying the page and its query (sort mode, ...)
+        render: Callable returning the rendered HTML
+
+    Returns:
+        str or Response: Rendered page (compressed for the client when cached)
+    """
+    # Logged-in pages carry the user's nav/avatar, and flashes are one-off
+    if 'user_id' in session or session.get('_flashes'):
+        return render()
+
+    def render_with_variants():
+        html = render().encode('utf-8')
+        return html, compress_variants(html, min_size=Config.COMPRESSION_MIN_BYTES,
+                                       gzip_level=Config.COMPRESSION_GZIP_LEVEL,
+                                       brotli_quality=Config.COMPRESSION_BROTLI_QUALITY)
+
+    html, variants = anonymous_page_cache.get_or_load(key + (g.language,), render_with_variants)
+    response = app.response_class(html, mimetype='text/html')
+    variant = pick_variant(variants, request)
+    if variant:
+        # compress_response() leaves bodies that already carry an encoding alone
+        response.headers['Content-Encoding'] = variant[0]
+        response.set_data(variant[1])
+    return response
+
 # Template context processor to make payment status available in all templates
 @app.context_processor
 def inject_user_status():
     context = {
         'current_user_is_paid': False,
         'get_video_url': get_video_url,
+        'asset_url': asset_bundles.url,
         'current_language': g.get('language', DEFAULT_LANGUAGE),
         'translations': g.get('translations', {}),
+        'translations_json': translation_catalogs.get_json(g.get('language', DEFAULT_LANGUAGE)),
         'supported_languages': SUPPORTED_LANGUAGES
     }
     
-    if 'user_id' in session:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
-        result = c.fetchone()
-        conn.close()
-        context['current_user_is_paid'] = result[0] if result else False
+    user = get_current_user()
+    if user is not None:
+        context['current_user_is_paid'] = bool(user.is_paid)
     
     return context
 
@@ -131,296 +277,11 @@ os.makedirs('static/avatars', exist_ok=True)
 
 # Database setup
 def init_db():
-    conn = sqlite3.connect('tournament.db')
+    conn = connect()
     c = conn.cursor()
     
-    # Users table
-    c.execute('''CREATE TABLE IF NOT EXISTS users (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT UNIQUE NOT NULL,
-        email TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        is_paid BOOLEAN DEFAULT FALSE,
-        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        first_name TEXT,
-        last_name TEXT,
-        bio TEXT,
-        location TEXT,
-        website TEXT,
-        avatar_filename TEXT,
-        joined_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        subscriber_count INTEGER DEFAULT 0,
-        total_views INTEGER DEFAULT 0,
-        is_admin BOOLEAN DEFAULT FALSE,
-        admin_level TEXT DEFAULT NULL,
-        is_blocked BOOLEAN DEFAULT FALSE,
-        block_reason TEXT,
-        blocked_until TIMESTAMP DEFAULT NULL,
-        last_login TIMESTAMP,
-        login_count INTEGER DEFAULT 0
-    )''')
-    
-    # Add new columns to existing users table if they don't exist
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN first_name TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN last_name TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN bio TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN location TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN website TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN avatar_filename TEXT')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN joined_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN subscriber_count INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN total_views INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN joined_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN subscriber_count INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass
-    try:
-        c.execute('ALTER TABLE users ADD COLUMN total_views INTEGER DEFAULT 0')
-    except sqlite3.OperationalError:
-        pass
-    
-    # Videos table
-    c.execute('''CREATE TABLE IF NOT EXISTS videos (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        title TEXT NOT NULL,
-        description TEXT,
-        filename TEXT NOT NULL,
-        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        total_votes INTEGER DEFAULT 0,
-        average_rating REAL DEFAULT 0.0,
-        is_approved BOOLEAN DEFAULT FALSE,
-        approval_date TIMESTAMP DEFAULT NULL,
-        approved_by INTEGER DEFAULT NULL,
-        is_blocked BOOLEAN DEFAULT FALSE,
-        block_reason TEXT,
-        blocked_by INTEGER DEFAULT NULL,
-        view_count INTEGER DEFAULT 0,
-        category TEXT,
-        tags TEXT,
-        duration INTEGER DEFAULT 0,
-        file_size INTEGER DEFAULT 0,
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (approved_by) REFERENCES users (id),
-        FOREIGN KEY (blocked_by) REFERENCES users (id)
-    )''')
-    
-    # Votes table
-    c.execute('''CREATE TABLE IF NOT EXISTS votes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        video_id INTEGER,
-        rating INTEGER CHECK(rating >= 1 AND rating <= 5),
-        vote_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        UNIQUE(user_id, video_id),
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (video_id) REFERENCES videos (id)
-    )''')
-    
-    # Comments table (updated to support replies)
-    c.execute('''CREATE TABLE IF NOT EXISTS comments (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        video_id INTEGER,
-        comment TEXT NOT NULL,
-        comment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        parent_id INTEGER DEFAULT NULL,
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (video_id) REFERENCES videos (id),
-        FOREIGN KEY (parent_id) REFERENCES comments (id)
-    )''')
-    
-    # Comment likes table
-    c.execute('''CREATE TABLE IF NOT EXISTS comment_likes (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        comment_id INTEGER,
-        user_id INTEGER,
-        like_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (comment_id) REFERENCES comments (id),
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        UNIQUE(comment_id, user_id)
-    )''')
-    
-    # Add parent_id column to existing comments table if it doesn't exist
-    try:
-        c.execute('''ALTER TABLE comments ADD COLUMN parent_id INTEGER DEFAULT NULL''')
-    except:
-        pass  # Column already exists
-    
-    # Add admin-related columns to existing users table
-    admin_columns = [
-        ('is_admin', 'BOOLEAN DEFAULT FALSE'),
-        ('admin_level', 'TEXT DEFAULT NULL'),
-        ('is_blocked', 'BOOLEAN DEFAULT FALSE'),
-        ('block_reason', 'TEXT'),
-        ('blocked_until', 'TIMESTAMP DEFAULT NULL'),
-        ('last_login', 'TIMESTAMP'),
-        ('login_count', 'INTEGER DEFAULT 0'),
-        ('can_vote', 'BOOLEAN DEFAULT FALSE')
-    ]
-    
-    for column_name, column_def in admin_columns:
-        try:
-            c.execute(f'ALTER TABLE users ADD COLUMN {column_name} {column_def}')
-        except sqlite3.OperationalError:
-            pass
-    
-    # Add video_id column to existing voting_fees table for per-video payments
-    try:
-        c.execute('ALTER TABLE voting_fees ADD COLUMN video_id INTEGER')
-    except sqlite3.OperationalError:
-        pass  # Column already exists
-    
-    # Add admin-related columns to existing videos table
-    video_columns = [
-        ('is_approved', 'BOOLEAN DEFAULT FALSE'),
-        ('approval_date', 'TIMESTAMP DEFAULT NULL'),
-        ('approved_by', 'INTEGER DEFAULT NULL'),
-        ('is_blocked', 'BOOLEAN DEFAULT FALSE'),
-        ('block_reason', 'TEXT'),
-        ('blocked_by', 'INTEGER DEFAULT NULL'),
-        ('view_count', 'INTEGER DEFAULT 0'),
-        ('category', 'TEXT'),
-        ('tags', 'TEXT'),
-        ('duration', 'INTEGER DEFAULT 0'),
-        ('file_size', 'INTEGER DEFAULT 0')
-    ]
-    
-    for column_name, column_def in video_columns:
-        try:
-            c.execute(f'ALTER TABLE videos ADD COLUMN {column_name} {column_def}')
-        except sqlite3.OperationalError:
-            pass
-    
-    # Admin logs table
-    c.execute('''CREATE TABLE IF NOT EXISTS admin_logs (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        admin_id INTEGER,
-        action TEXT NOT NULL,
-        target_type TEXT NOT NULL,
-        target_id INTEGER,
-        details TEXT,
-        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        ip_address TEXT,
-        FOREIGN KEY (admin_id) REFERENCES users (id)
-    )''')
-    
-    # Admin messages table
-    c.execute('''CREATE TABLE IF NOT EXISTS admin_messages (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        admin_id INTEGER,
-        recipient_id INTEGER,
-        subject TEXT NOT NULL,
-        message TEXT NOT NULL,
-        sent_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        is_read BOOLEAN DEFAULT FALSE,
-        email_sent BOOLEAN DEFAULT FALSE,
-        FOREIGN KEY (admin_id) REFERENCES users (id),
-        FOREIGN KEY (recipient_id) REFERENCES users (id)
-    )''')
-    
-    # Reports table
-    c.execute('''CREATE TABLE IF NOT EXISTS reports (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        reporter_id INTEGER,
-        reported_type TEXT NOT NULL,
-        reported_id INTEGER,
-        reason TEXT NOT NULL,
-        description TEXT,
-        status TEXT DEFAULT 'pending',
-        handled_by INTEGER DEFAULT NULL,
-        handled_date TIMESTAMP DEFAULT NULL,
-        report_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (reporter_id) REFERENCES users (id),
-        FOREIGN KEY (handled_by) REFERENCES users (id)
-    )''')
-    
-    # Categories table
-    c.execute('''CREATE TABLE IF NOT EXISTS categories (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        name TEXT UNIQUE NOT NULL,
-        description TEXT,
-        created_by INTEGER,
-        created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        is_active BOOLEAN DEFAULT TRUE,
-        FOREIGN KEY (created_by) REFERENCES users (id)
-    )''')
-    
-    # Video views table - Track unique views per user per video
-    c.execute('''CREATE TABLE IF NOT EXISTS video_views (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER,
-        video_id INTEGER,
-        view_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        ip_address TEXT,
-        user_agent TEXT,
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (video_id) REFERENCES videos (id),
-        UNIQUE(user_id, video_id)
-    )''')
-    
-    # Payment transactions table - Track mobile money payments
-    c.execute('''CREATE TABLE IF NOT EXISTS payment_transactions (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        transaction_id TEXT UNIQUE NOT NULL,
-        provider TEXT NOT NULL,
-        phone_number TEXT NOT NULL,
-        amount REAL NOT NULL,
-        currency TEXT NOT NULL,
-        status TEXT DEFAULT 'pending',
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (id)
-    )''')
-    
-    # Voting fees table - Track $2 voting fee payments per video
-    c.execute('''CREATE TABLE IF NOT EXISTS voting_fees (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_id INTEGER NOT NULL,
-        video_id INTEGER NOT NULL,
-        transaction_id TEXT UNIQUE NOT NULL,
-        provider TEXT NOT NULL,
-        phone_number TEXT NOT NULL,
-        amount REAL NOT NULL,
-        currency TEXT NOT NULL,
-        status TEXT DEFAULT 'pending',
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        FOREIGN KEY (user_id) REFERENCES users (id),
-        FOREIGN KEY (video_id) REFERENCES videos (id)
-    )''')
+    # Bring the schema up to date (migrations are the only place the schema changes)
+    migrate(conn)
     
     # Create default admin user if not exists
     c.execute('SELECT COUNT(*) FROM users WHERE is_admin = 1')
@@ -444,21 +305,26 @@ def init_db():
         ('Art', 'Creative content, Drawing, Photography')
     ]
     
-    for cat_name, cat_desc in default_categories:
-        try:
-            c.execute('INSERT INTO categories (name, description, created_by) VALUES (?, ?, ?)',
-                     (cat_name, cat_desc, 1))  # Created by admin
-        except sqlite3.IntegrityError:
-            pass  # Category already exists
+    # Categories that already exist are skipped
+    c.executemany('INSERT OR IGNORE INTO categories (name, description, created_by) VALUES (?, ?, ?)',
+                  [(cat_name, cat_desc, 1) for cat_name, cat_desc in default_categories])  # Created by admin
     
     conn.commit()
     conn.close()
 
 # Initialize database on startup for production
 def ensure_db_initialized():
-    """Ensure database is initialized when app starts"""
-    if not os.path.exists('tournament.db'):
+    """Ensure database is initialized and its schema is current when app starts"""
+    if not database.database_exists():
         init_db()
+        return
+    
+    # Existing database: costs one schema_version read when nothing is pending
+    conn = connect()
+    try:
+        migrate(conn)
+    finally:
+        conn.close()
 
 # Initialize database when module is imported (for production deployment)
 ensure_db_initialized()
@@ -561,18 +427,20 @@ def should_use_cloud_storage():
     # (even if Cloudinary is configured)
     return False
 
+# Resolved media URLs are memoized per filename (presigned S3 URLs until shortly before expiry)
+media_urls = MediaURLResolver(lambda path: url_for('static', filename=path),
+                              cloud_storage=should_use_cloud_storage,
+                              cloudinary_cloud_name=Config.CLOUDINARY_CLOUD_NAME,
+                              s3=s3_storage if S3_AVAILABLE else None,
+                              static_cdn_url=Config.STATIC_CDN_URL,
+                              s3_cdn_url=Config.MEDIA_CDN_URL,
+                              presign_seconds=Config.S3_PRESIGNED_URL_SECONDS,
+                              presign_margin=Config.S3_PRESIGNED_URL_MARGIN_SECONDS,
+                              ttl=Config.MEDIA_URL_CACHE_SECONDS)
+
 def get_video_url(filename):
     """Get video URL - either local or cloud based on configuration"""
-    if should_use_cloud_storage():
-        # Check if it's a cloud URL already
-        if filename.startswith('http'):
-            return filename
-        # Generate Cloudinary URL
-        if app.config.get('CLOUDINARY_CLOUD_NAME'):
-            return f"https://res.cloudinary.com/{app.config['CLOUDINARY_CLOUD_NAME']}/video/upload/{filename}"
-    
-    # Fallback to local URL
-    return url_for('static', filename=f'uploads/{filename}')
+    return media_urls.video_url(filename)
 
 # Helper functions
 def login_required(f):
@@ -597,13 +465,9 @@ def paid_required(f):
             return f(*args, **kwargs)
         
         # Fallback: Check database for payment status
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
-        user = c.fetchone()
-        conn.close()
+        user = get_current_user()
         
-        if user and user[0]:
+        if user and user.is_paid:
             # Update session to match database for future requests
             session['is_paid'] = True
             session['payment_confirmed'] = True
@@ -618,18 +482,10 @@ def paid_required(f):
 @app.context_processor
 def inject_user_avatar():
     """Inject current user's avatar and image URL helper into all templates"""
-    avatar_filename = None
-    
-    if 'user_id' in session:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        c.execute('SELECT avatar_filename FROM users WHERE id = ?', (session['user_id'],))
-        result = c.fetchone()
-        conn.close()
-        avatar_filename = result[0] if result and result[0] else None
+    user = get_current_user()
     
     return {
-        'current_user_avatar': avatar_filename,
+        'current_user_avatar': user.avatar_filename if user is not None else None,
         'get_image_url': get_image_url
     }
 
@@ -643,18 +499,14 @@ def admin_required(level='basic'):
                 flash('Please log in to access this page.')
                 return redirect(url_for('login'))
             
-            conn = sqlite3.connect('tournament.db')
-            c = conn.cursor()
-            c.execute('SELECT is_admin, admin_level, is_blocked FROM users WHERE id = ?', (session['user_id'],))
-            user = c.fetchone()
-            conn.close()
+            user = get_current_user()
             
-            if not user or not user[0] or user[2]:  # Not admin or blocked
+            if not user or not user.is_admin or user.is_blocked:  # Not admin or blocked
                 flash('Access denied. Admin privileges required.')
                 return redirect(url_for('index'))
             
             # Check admin level
-            user_level = user[1] or 'basic'
+            user_level = user.admin_level or 'basic'
             if level == 'super' and user_level != 'super':
                 flash('Super admin privileges required.')
                 return redirect(url_for('admin_dashboard'))
@@ -666,13 +518,12 @@ def admin_required(level='basic'):
 def log_admin_action(admin_id, action, target_type, target_id, details=None):
     """Log admin actions for audit trail"""
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        c.execute('''INSERT INTO admin_logs (admin_id, action, target_type, target_id, details, ip_address) 
-                     VALUES (?, ?, ?, ?, ?, ?)''',
-                  (admin_id, action, target_type, target_id, details, request.remote_addr))
-        conn.commit()
-        conn.close()
+        # Audit rows are written behind, batched with other low-value writes
+        write_buffer.enqueue('''INSERT INTO admin_logs (admin_id, action, target_type, target_id, details,
+                                                       ip_address, timestamp)
+                                VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                             (admin_id, action, target_type, target_id, details, request.remote_addr,
+                              write_buffer.utc_timestamp()))
     except Exception as e:
         print(f"Error logging admin action: {e}")
 
@@ -806,56 +657,27 @@ def get_image_url(filename, folder='avatars'):
     Returns:
         str: URL of the image
     """
-    if not filename:
-        return None
-    
-    # Check if it's an S3 key (contains '/')
-    if '/' in filename and S3_AVAILABLE:
-        return s3_storage.get_file_url(filename)
-    
-    # Check if it's a full URL already
-    if filename.startswith('http'):
-        return filename
-    
-    # Local storage URL
-    return url_for('static', filename=f'{folder}/{filename}')
+    return media_urls.image_url(filename, folder)
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
 # Routes
 @app.route('/')
+@cache_policy('revalidate')
 def index():
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
+    def load():
+        conn = get_db()
+        video_repo = VideoRepository(conn)
+        # Get top videos ranked by votes (NEW TOURNAMENT RANKING SYSTEM)
+        return video_repo.top(5), UserRepository(conn).count(), video_repo.count()
     
-    # Get top videos ranked by votes (NEW TOURNAMENT RANKING SYSTEM)
-    c.execute('''SELECT v.id, v.title, v.filename, v.total_votes, v.average_rating, u.username 
-                 FROM videos v JOIN users u ON v.user_id = u.id 
-                 WHERE v.is_approved = 1 AND v.is_blocked = 0
-                 ORDER BY v.total_votes DESC, v.upload_date DESC LIMIT 5''')
-    top_videos_raw = c.fetchall()
-    
-    # Convert to proper data types
-    top_videos = []
-    for video in top_videos_raw:
-        video_list = list(video)
-        video_list[3] = int(video_list[3]) if video_list[3] is not None else 0  # total_votes
-        video_list[4] = float(video_list[4]) if video_list[4] is not None else 0.0  # average_rating
-        top_videos.append(tuple(video_list))
-    
-    # Get total participants
-    c.execute('SELECT COUNT(*) FROM users')
-    total_participants = c.fetchone()[0]
+    def render():
+        top_videos, total_participants, total_videos = listing_cache.get_or_load(('index',), load)
+        return render_template('index.html', 
+                             top_videos=top_videos,
+                             total_participants=total_participants,
+                             total_videos=total_videos)
     
-    # Get total videos
-    c.execute('SELECT COUNT(*) FROM videos')
-    total_videos = c.fetchone()[0]
-    
-    conn.close()
-    
-    return render_template('index.html', 
-                         top_videos=top_videos,
-                         total_participants=total_participants,
-                         total_videos=total_videos)
+    return render_listing_page(('index',), render)
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -863,7 +685,7 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute('''SELECT id, username, email, password_hash, is_blocked, blocked_until, 
                             block_reason, is_admin, admin_level FROM users WHERE username = ?''', (username,))
@@ -878,20 +700,20 @@ def login():
                     blocked_until_dt = datetime.fromisoformat(blocked_until.replace('Z', '+00:00'))
                     if datetime.now() < blocked_until_dt:
                         flash(f'Your account is temporarily blocked until {blocked_until}. Reason: {user[6]}')
-                        conn.close()
                         return render_template('login.html')
                     else:
                         # Unblock user if block period expired
-                        c.execute('UPDATE users SET is_blocked = FALSE, blocked_until = NULL, block_reason = NULL WHERE id = ?', (user[0],))
+                        with write_transaction() as write_conn:
+                            write_conn.execute('UPDATE users SET is_blocked = FALSE, blocked_until = NULL, block_reason = NULL WHERE id = ?', (user[0],))
+                        invalidate_current_user(user[0])
                 else:
                     flash(f'Your account is permanently blocked. Reason: {user[6]}')
-                    conn.close()
                     return render_template('login.html')
             
-            # Update login statistics
-            c.execute('''UPDATE users SET last_login = CURRENT_TIMESTAMP, 
-                        login_count = COALESCE(login_count, 0) + 1 WHERE id = ?''', (user[0],))
-            conn.commit()
+            # Update login statistics (written behind)
+            write_buffer.enqueue('''UPDATE users SET last_login = ?,
+                                    login_count = COALESCE(login_count, 0) + 1 WHERE id = ?''',
+                                 (write_buffer.utc_timestamp(), user[0]))
             
             session['user_id'] = user[0]
             session['username'] = user[1]
@@ -908,8 +730,6 @@ def login():
         else:
             flash('Invalid username or password')
         
-        conn.close()
-    
     return render_template('login.html')
 
 @app.route('/register', methods=['GET', 'POST'])
@@ -922,18 +742,14 @@ def register():
         # Hash password
         password_hash = generate_password_hash(password)
         
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
         try:
-            c.execute('INSERT INTO users (username, email, password_hash, is_paid) VALUES (?, ?, ?, ?)',
-                     (username, email, password_hash, False))
-            conn.commit()
+            with write_transaction() as conn:
+                conn.execute('INSERT INTO users (username, email, password_hash, is_paid) VALUES (?, ?, ?, ?)',
+                             (username, email, password_hash, False))
             flash('Registration successful! Please pay the $35 tournament entry fee to start uploading videos.')
             return redirect(url_for('login'))
-        except sqlite3.IntegrityError:
+        except database.IntegrityError:
             flash('Username or email already exists')
-        finally:
-            conn.close()
     
     return render_template('register.html')
 
@@ -959,7 +775,7 @@ def set_language(language):
 @login_required
 def debug_user_status():
     """Debug endpoint to check user payment status"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute('SELECT id, username, is_paid FROM users WHERE id = ?', (session['user_id'],))
     user = c.fetchone()
@@ -970,7 +786,6 @@ def debug_user_status():
                 WHERE user_id = ? 
                 ORDER BY created_at DESC LIMIT 5''', (session['user_id'],))
     transactions = c.fetchall()
-    conn.close()
     
     debug_info = {
         'user_id': session.get('user_id'),
@@ -987,11 +802,10 @@ def debug_user_status():
 def debug_video_files():
     """Debug endpoint to check video file status on Render"""
     try:
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute('SELECT id, title, filename, upload_date, file_size FROM videos ORDER BY upload_date DESC LIMIT 10')
         videos = c.fetchall()
-        conn.close()
         
         file_status = []
         upload_folder = app.config['UPLOAD_FOLDER']
@@ -1034,18 +848,16 @@ def debug_video_files():
 @login_required
 def debug_force_upgrade():
     """Force upgrade user to paid status for testing"""
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
-    
     print(f"🔧 FORCE UPGRADE: Updating user {session['user_id']} to paid status")
-    c.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
-    
-    # Verify the update
-    c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
-    updated_status = c.fetchone()
+    with write_transaction() as conn:
+        c = conn.cursor()
+        c.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
+        
+        # Verify the update
+        c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
+        updated_status = c.fetchone()
     
-    conn.commit()
-    conn.close()
+    invalidate_current_user(session['user_id'])
     
     # Enhanced session persistence for Render
     session.permanent = True
@@ -1066,71 +878,137 @@ def debug_force_upgrade():
 @app.route('/dashboard')
 @login_required
 def dashboard():
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
+    conn = get_db()
     
     # Get user's videos
-    c.execute('''SELECT id, title, filename, total_votes, average_rating, upload_date 
-                 FROM videos WHERE user_id = ? ORDER BY upload_date DESC''', 
-              (session['user_id'],))
-    user_videos_raw = c.fetchall()
-    
-    # Convert to proper data types
-    user_videos = []
-    for video in user_videos_raw:
-        video_list = list(video)
-        video_list[3] = int(video_list[3]) if video_list[3] is not None else 0  # total_votes
-        video_list[4] = float(video_list[4]) if video_list[4] is not None else 0.0  # average_rating
-        user_videos.append(tuple(video_list))
+    user_videos = VideoRepository(conn).for_user(session['user_id'])
     
     # Get user's payment status
-    c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
-    payment_result = c.fetchone()
-    user_payment_status = payment_result[0] if payment_result else False
+    user_payment_status = UserRepository(conn).is_paid(session['user_id'])
     
-    conn.close()
     return render_template('dashboard.html', user_videos=user_videos, is_paid=user_payment_status)
 
+def listing_sort():
+    """Sort mode of a /videos request: 'recent' or the default 'most_voted'"""
+    # VIDEOS NOW RANKED BY VOTES ('recent' sorts newest first)
+    return 'recent' if request.args.get('sort') == 'recent' else 'most_voted'
+
+def video_listing_page(sort_by, after=None):
+    """
+    One keyset page of /videos (the first page of each sort comes from the listing cache)
+    
+    Returns:
+        tuple: (VideoCard list, cursor of the next page or None)
+    
+    Raises:
+        ValueError: If after is not a valid cursor
+    """
+    if after is None:
+        return listing_cache.get_or_load(
+            ('videos', sort_by),
+            lambda: VideoRepository(get_db()).page(sort_by, limit=Config.VIDEOS_PER_PAGE))
+    return VideoRepository(get_db()).page(sort_by, after, limit=Config.VIDEOS_PER_PAGE)
+
 @app.route('/videos')
+@cache_policy('revalidate')
 def videos():
-    # Get sort parameter from URL (default: most_voted - NEW RANKING SYSTEM)
-    sort_by = request.args.get('sort', 'most_voted')
-    print(f"=== VIDEOS DEBUG: Sort parameter = '{sort_by}' ===")
+    sort_by = listing_sort()
+    after = request.args.get('after') or None
     
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
+    def render():
+        page_videos, next_cursor = video_listing_page(sort_by, after)
+        return render_template('videos.html', videos=page_videos, current_sort=sort_by,
+                               next_cursor=next_cursor)
     
-    # Determine sorting based on parameter - VIDEOS NOW RANKED BY VOTES
-    if sort_by == 'most_voted':
-        print("Using MOST VOTED sorting (DEFAULT - TOURNAMENT RANKING)")
-        # Sort by total votes - THIS IS THE NEW TOURNAMENT RANKING
-        c.execute('''SELECT v.id, v.title, v.filename, v.total_votes, v.average_rating, u.username, v.upload_date
-                     FROM videos v JOIN users u ON v.user_id = u.id 
-                     WHERE v.is_approved = 1 AND v.is_blocked = 0
-                     ORDER BY v.total_votes DESC, v.upload_date DESC''')
-    elif sort_by == 'recent':
-        print("Using RECENT sorting")
-        # Sort by upload date (newest first), only show approved and unblocked videos
-        c.execute('''SELECT v.id, v.title, v.filename, v.total_votes, v.average_rating, u.username, v.upload_date
-                     FROM videos v JOIN users u ON v.user_id = u.id 
-                     WHERE v.is_approved = 1 AND v.is_blocked = 0
-                     ORDER BY v.upload_date DESC''')
-    
-    all_videos_raw = c.fetchall()
-    print(f"Found {len(all_videos_raw)} videos")
-    
-    # Convert to proper data types
-    all_videos = []
-    for video in all_videos_raw:
-        video_list = list(video)
-        video_list[3] = int(video_list[3]) if video_list[3] is not None else 0  # total_votes
-        video_list[4] = float(video_list[4]) if video_list[4] is not None else 0.0  # average_rating
-        all_videos.append(tuple(video_list))
-        print(f"  Video: {video_list[1]}, Votes: {video_list[3]}, Rating: {video_list[4]}")
+    if after is not None:
+        # Later pages (the no-JavaScript "Load more" link) are rendered per request
+        try:
+            return render()
+        except ValueError:
+            return redirect(url_for('videos', sort=sort_by))
+    return render_listing_page(('videos', sort_by), render)
+
+@app.route('/api/videos')
+@cache_policy('revalidate')
+def api_videos():
+    """Next /videos page for infinite scroll (?sort=, ?after=<next_cursor>), as data and card HTML"""
+    sort_by = listing_sort()
+    try:
+        page_videos, next_cursor = video_listing_page(sort_by, request.args.get('after') or None)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
     
-    conn.close()
-    print(f"=== END VIDEOS DEBUG ===")
-    return render_template('videos.html', videos=all_videos, current_sort=sort_by)
+    return jsonify({
+        'success': True,
+        'sort': sort_by,
+        'next_cursor': next_cursor,
+        'videos': [video.as_dict() for video in page_videos],
+        'html': render_template('video_cards.html', videos=page_videos, current_sort=sort_by)
+    })
+
+def search_results_page(text, after=None):
+    """
+    One keyset page of /search results (first pages come from the search cache)
+    
+    Returns:
+        tuple: (SearchHit list, cursor of the next page or None)
+    
+    Raises:
+        ValueError: If after is not a valid cursor
+    """
+    if after is None:
+        return search_cache.get_or_load(
+            ('results', ' '.join(search_terms(text))),
+            lambda: VideoSearch(get_db()).page(text, limit=Config.VIDEOS_PER_PAGE))
+    return VideoSearch(get_db()).page(text, after, limit=Config.VIDEOS_PER_PAGE)
+
+@app.route('/search')
+@cache_policy('revalidate')
+def search_videos():
+    """Approved videos matching ?q=, best match first (ranked by relevance and votes)"""
+    query = request.args.get('q', '').strip()
+    try:
+        results, next_cursor = search_results_page(query, request.args.get('after') or None)
+    except ValueError:
+        return redirect(url_for('search_videos', q=query))
+    return render_template('search.html', query=query, videos=results, next_cursor=next_cursor)
+
+@app.route('/api/search')
+@cache_policy('revalidate')
+def api_search():
+    """Next /search page for infinite scroll (?q=, ?after=<next_cursor>), as data and card HTML"""
+    query = request.args.get('q', '').strip()
+    try:
+        results, next_cursor = search_results_page(query, request.args.get('after') or None)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+    
+    return jsonify({
+        'success': True,
+        'next_cursor': next_cursor,
+        'videos': [video.as_dict() for video in results],
+        'html': render_template('video_cards.html', videos=results)
+    })
+
+@app.route('/api/search/suggest')
+@cache_policy('revalidate')
+def api_search_suggest():
+    """Search box typeahead (?q=<what has been typed>): a few matching video titles"""
+    text = request.args.get('q', '')
+    terms = search_terms(text)
+    suggestions = []
+    if terms:
+        suggestions = search_cache.get_or_load(
+            ('suggest', ' '.join(terms)),
+            lambda: VideoSearch(get_db()).suggest(text, limit=Config.SEARCH_SUGGESTIONS,
+                                                  candidates=Config.SEARCH_SUGGEST_CANDIDATES,
+                                                  min_length=Config.SEARCH_SUGGEST_MIN_LENGTH))
+    
+    return jsonify({
+        'success': True,
+        'suggestions': [dict(suggestion.as_dict(), url=url_for('video_detail', video_id=suggestion.id))
+                        for suggestion in suggestions]
+    })
 
 @app.route('/upload_video', methods=['GET', 'POST'])
 @login_required
@@ -1276,18 +1154,15 @@ def upload_video():
             file_size_bytes = saved_size
             
             # Save to database (videos need admin approval before appearing on platform)
-            conn = sqlite3.connect('tournament.db')
-            c = conn.cursor()
-            c.execute('''INSERT INTO videos (user_id, title, description, filename, file_size, is_approved) 
-                        VALUES (?, ?, ?, ?, ?, ?)''',
-                     (session['user_id'], title, description, final_filename, file_size_bytes, False))
-            
-            video_id = c.lastrowid
+            with write_transaction() as conn:
+                c = conn.cursor()
+                c.execute('''INSERT INTO videos (user_id, title, description, filename, file_size, is_approved) 
+                            VALUES (?, ?, ?, ?, ?, ?)''',
+                         (session['user_id'], title, description, final_filename, file_size_bytes, False))
+                
+                video_id = c.lastrowid
             print(f"Video saved to database with ID: {video_id}")
             
-            conn.commit()
-            conn.close()
-            
             print("=== UPLOAD DEBUG SUCCESS ===")
             flash('Video uploaded successfully! It will appear on the platform after admin approval.', 'info')
             return redirect(url_for('dashboard'))
@@ -1307,34 +1182,32 @@ def upload_video():
     return render_template('upload_video.html')
 
 @app.route('/video/<int:video_id>', methods=['GET', 'POST'])
+@cache_policy('revalidate')
 def video_detail(video_id):
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Handle comment submission
     if request.method == 'POST' and 'user_id' in session:
         comment = request.form['comment']
-        c.execute('''INSERT INTO comments (user_id, video_id, comment) 
-                    VALUES (?, ?, ?)''', (session['user_id'], video_id, comment))
-        conn.commit()
+        with write_transaction() as write_conn:
+            write_conn.execute('''INSERT INTO comments (user_id, video_id, comment) 
+                                  VALUES (?, ?, ?)''', (session['user_id'], video_id, comment))
         flash('Comment added successfully!')
         return redirect(url_for('video_detail', video_id=video_id))
     
     # Get video details including uploader avatar
-    c.execute('''SELECT v.*, u.username, u.avatar_filename FROM videos v 
-                 JOIN users u ON v.user_id = u.id WHERE v.id = ?''', (video_id,))
-    video_raw = c.fetchone()
+    video = VideoRepository(conn).get(video_id)
     
-    if not video_raw:
+    if not video:
         flash('Video not found')
-        conn.close()
         return redirect(url_for('videos'))
     
     # Track video view (YouTube-style: one view per user account)
     if 'user_id' in session:
         user_id = session['user_id']
         # Check if user has already viewed this video
-        c.execute('SELECT id FROM video_views WHERE user_id = ? AND video_id = ?', (user_id, video_id))
+        c.execute(SQL_VIEW_EXISTS, (user_id, video_id))
         existing_view = c.fetchone()
         
         if not existing_view:
@@ -1342,19 +1215,13 @@ def video_detail(video_id):
             user_agent = request.headers.get('User-Agent', '')
             ip_address = request.environ.get('HTTP_X_FORWARDED_FOR', request.environ.get('REMOTE_ADDR', ''))
             
-            try:
-                c.execute('''INSERT INTO video_views (user_id, video_id, ip_address, user_agent) 
-                           VALUES (?, ?, ?, ?)''', (user_id, video_id, ip_address, user_agent))
-                
-                # Update video view count based on unique views
-                c.execute('SELECT COUNT(*) FROM video_views WHERE video_id = ?', (video_id,))
-                unique_view_count = c.fetchone()[0]
-                
-                c.execute('UPDATE videos SET view_count = ? WHERE id = ?', (unique_view_count, video_id))
-                conn.commit()
-            except sqlite3.IntegrityError:
-                # Handle race condition - view already recorded
-                pass
+            # Written behind: repeat views queued before the flush are ignored by
+            # the UNIQUE(user_id, video_id) constraint, and view_count is
+            # recounted from the unique views once per video per flush
+            write_buffer.enqueue('''INSERT OR IGNORE INTO video_views (user_id, video_id, ip_address, user_agent, view_date)
+                                    VALUES (?, ?, ?, ?, ?)''',
+                                 (user_id, video_id, ip_address, user_agent, write_buffer.utc_timestamp()),
+                                 after=(SQL_REFRESH_VIEW_COUNT, (video_id, video_id)))
     else:
         # For anonymous users, track by session to prevent multiple views in same session
         # This is a compromise - we can't perfectly track anonymous users like YouTube does
@@ -1365,87 +1232,54 @@ def video_detail(video_id):
             # Only logged-in users contribute to the official view count
             # This encourages user registration while preventing spam
     
-    # Convert video tuple to list and ensure numeric fields are properly typed
-    video = list(video_raw)
-    # video[6] = total_votes, video[7] = average_rating
-    video[6] = int(video[6]) if video[6] is not None else 0  # total_votes
-    video[7] = float(video[7]) if video[7] is not None else 0.0  # average_rating
-    
-    # Get comments with reply counts, like counts, and user like status (only parent comments, not replies)
-    c.execute('''SELECT c.comment, c.comment_date, u.username, c.id,
-                        (SELECT COUNT(*) FROM comments replies 
-                         WHERE replies.parent_id = c.id) as reply_count,
-                        u.avatar_filename,
-                        (SELECT COUNT(*) FROM comment_likes 
-                         WHERE comment_id = c.id) as like_count
-                 FROM comments c JOIN users u ON c.user_id = u.id 
-                 WHERE c.video_id = ? AND c.parent_id IS NULL
-                 ORDER BY c.comment_date DESC''', (video_id,))
-    comments_raw = c.fetchall()
-    
-    # Add user like and dislike status to each comment
-    comments = []
-    for comment in comments_raw:
-        comment_dict = {
-            'text': comment[0],
-            'date': comment[1], 
-            'username': comment[2],
-            'id': comment[3],
-            'reply_count': comment[4],
-            'avatar': comment[5],
-            'like_count': comment[6],
-            'user_liked': False,
-            'user_disliked': False
-        }
-        
-        # Check if current user liked or disliked this comment
-        if 'user_id' in session:
-            c.execute('SELECT id FROM comment_likes WHERE comment_id = ? AND user_id = ?', 
-                     (comment[3], session['user_id']))
-            comment_dict['user_liked'] = c.fetchone() is not None
-            
-            # Create comment_dislikes table if it doesn't exist
-            c.execute('''CREATE TABLE IF NOT EXISTS comment_dislikes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                comment_id INTEGER,
-                user_id INTEGER,
-                dislike_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (comment_id) REFERENCES comments (id),
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                UNIQUE(comment_id, user_id)
-            )''')
-            
-            c.execute('SELECT id FROM comment_dislikes WHERE comment_id = ? AND user_id = ?', 
-                     (comment[3], session['user_id']))
-            comment_dict['user_disliked'] = c.fetchone() is not None
-            
-        comments.append(comment_dict)
+    # First page of parent comments (not replies) with reply/like counts, the viewer's
+    # like/dislike state and the first replies of each thread; later pages come from
+    # api_video_comments (?comments_after= without JavaScript)
+    comments_repo = CommentRepository(conn)
+    comments_after = request.args.get('comments_after') or None
+    try:
+        comments, next_comments_cursor = comments_repo.page(video_id, session.get('user_id'), comments_after,
+                                                            limit=Config.COMMENTS_PER_PAGE,
+                                                            reply_previews=Config.REPLY_PREVIEWS_PER_COMMENT)
+    except ValueError:
+        comments, next_comments_cursor = comments_repo.page(video_id, session.get('user_id'),
+                                                            limit=Config.COMMENTS_PER_PAGE,
+                                                            reply_previews=Config.REPLY_PREVIEWS_PER_COMMENT)
     
     # Get top-rated videos for sidebar (only approved and unblocked videos)
-    c.execute('''SELECT v.id, v.title, v.filename, v.total_votes, v.average_rating, u.username, u.avatar_filename 
-                 FROM videos v JOIN users u ON v.user_id = u.id 
-                 WHERE v.total_votes >= 0 AND v.is_approved = 1 AND v.is_blocked = 0
-                 ORDER BY v.average_rating DESC, v.total_votes DESC LIMIT 10''')
-    top_videos_raw = c.fetchall()
-    
-    # Convert top videos to proper data types
-    top_videos = []
-    for top_video in top_videos_raw:
-        video_list = list(top_video)
-        video_list[3] = int(video_list[3]) if video_list[3] is not None else 0  # total_votes
-        video_list[4] = float(video_list[4]) if video_list[4] is not None else 0.0  # average_rating
-        # avatar_filename (index 6) stays as is
-        top_videos.append(tuple(video_list))
+    top_videos = VideoRepository(conn).top_rated(10)
     
     # Get current user avatar for comment form
     current_user_avatar = None
     if 'user_id' in session:
-        c.execute('SELECT avatar_filename FROM users WHERE id = ?', (session['user_id'],))
-        avatar_result = c.fetchone()
-        current_user_avatar = avatar_result[0] if avatar_result else None
+        current_user_avatar = UserRepository(conn).avatar(session['user_id'])
     
-    conn.close()
-    return render_template('video_detail.html', video=video, comments=comments, top_videos=top_videos, current_user_avatar=current_user_avatar)
+    return render_template('video_detail.html', video=video, comments=comments, next_comments_cursor=next_comments_cursor,
+                           top_videos=top_videos, current_user_avatar=current_user_avatar)
+
+@app.route('/api/videos/<int:video_id>/comments')
+@cache_policy('revalidate')
+def api_video_comments(video_id):
+    """Next page of a video's comments (?after=<next_cursor>), as data and comment HTML"""
+    conn = get_db()
+    video = VideoRepository(conn).get(video_id)
+    if not video:
+        return jsonify({'success': False, 'error': 'Video not found'}), 404
+    
+    try:
+        comments, next_cursor = CommentRepository(conn).page(video_id, session.get('user_id'),
+                                                             request.args.get('after') or None,
+                                                             limit=Config.COMMENTS_PER_PAGE,
+                                                             reply_previews=Config.REPLY_PREVIEWS_PER_COMMENT)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+    
+    return jsonify({
+        'success': True,
+        'next_cursor': next_cursor,
+        'comments': [comment.as_dict() for comment in comments],
+        'html': render_template('comment_threads.html', video=video, comments=comments)
+    })
 
 @app.route('/admin/recalculate_views')
 def recalculate_views():
@@ -1454,7 +1288,7 @@ def recalculate_views():
         flash('Access denied')
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Check if user is admin
@@ -1462,75 +1296,75 @@ def recalculate_views():
     result = c.fetchone()
     if not result or not result[0]:
         flash('Admin access required')
-        conn.close()
         return redirect(url_for('index'))
     
-    # Get all videos
-    c.execute('SELECT id FROM videos')
-    videos = c.fetchall()
-    
-    updated_count = 0
-    for video in videos:
-        video_id = video[0]
+    with write_transaction() as write_conn:
+        wc = write_conn.cursor()
         
-        # Count unique views for this video
-        c.execute('SELECT COUNT(*) FROM video_views WHERE video_id = ?', (video_id,))
-        unique_views = c.fetchone()[0]
+        # Get all videos
+        wc.execute('SELECT id FROM videos')
+        videos = wc.fetchall()
         
-        # Update video view count
-        c.execute('UPDATE videos SET view_count = ? WHERE id = ?', (unique_views, video_id))
-        updated_count += 1
-    
-    conn.commit()
-    conn.close()
+        updated_count = 0
+        for video in videos:
+            video_id = video[0]
+            
+            # Count unique views for this video
+            wc.execute(SQL_COUNT_VIDEO_VIEWS, (video_id,))
+            unique_views = wc.fetchone()[0]
+            
+            # Update video view count
+            wc.execute('UPDATE videos SET view_count = ? WHERE id = ?', (unique_views, video_id))
+            updated_count += 1
     
     flash(f'Successfully recalculated view counts for {updated_count} videos')
     return redirect(url_for('admin_dashboard'))
 
+def leaderboard_page(per_page):
+    """Read the requested page of the materialized leaderboard (page from ?page=)"""
+    total = listing_cache.get_or_load(('leaderboard_size',), lambda: UserRepository(get_db()).leaderboard_size())
+    total_pages = max((total + per_page - 1) // per_page, 1)
+    page = min(max(request.args.get('page', 1, type=int), 1), total_pages)
+    entries = listing_cache.get_or_load(('leaderboard', page, per_page),
+                                        lambda: UserRepository(get_db()).leaderboard(page, per_page))
+    return entries, page, total_pages, total
+
 @app.route('/leaderboard')
+@cache_policy('revalidate')
 def leaderboard():
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
-    
     # Get user rankings based on total votes (NEW TOURNAMENT RANKING)
-    c.execute('''SELECT u.username, COUNT(v.id) as video_count, 
-                        AVG(v.average_rating) as avg_rating,
-                        SUM(v.total_votes) as total_votes
-                 FROM users u 
-                 LEFT JOIN videos v ON u.id = v.user_id 
-                 GROUP BY u.id, u.username 
-                 ORDER BY total_votes DESC, video_count DESC''')
-    leaderboard_data_raw = c.fetchall()
-    
-    # Convert to proper data types
-    leaderboard_data = []
-    for row in leaderboard_data_raw:
-        row_list = list(row)
-        row_list[1] = int(row_list[1]) if row_list[1] is not None else 0  # video_count
-        row_list[2] = float(row_list[2]) if row_list[2] is not None else 0.0  # avg_rating
-        row_list[3] = int(row_list[3]) if row_list[3] is not None else 0  # total_votes
-        leaderboard_data.append(tuple(row_list))
+    leaderboard_data, page, total_pages, _ = leaderboard_page(Config.LEADERBOARD_PER_PAGE)
     
-    conn.close()
-    return render_template('leaderboard.html', leaderboard=leaderboard_data)
-
+    return render_template('leaderboard.html', leaderboard=leaderboard_data,
+                           page=page, total_pages=total_pages)
 
+@app.route('/api/leaderboard')
+@cache_policy('revalidate')
+def api_leaderboard():
+    """Leaderboard page as JSON (?page=, ?per_page= up to LEADERBOARD_API_MAX_PER_PAGE)"""
+    per_page = request.args.get('per_page', Config.LEADERBOARD_PER_PAGE, type=int)
+    per_page = min(max(per_page, 1), Config.LEADERBOARD_API_MAX_PER_PAGE)
+    entries, page, total_pages, total = leaderboard_page(per_page)
+    
+    return jsonify({
+        'success': True,
+        'page': page,
+        'per_page': per_page,
+        'total_pages': total_pages,
+        'total_participants': total,
+        'leaderboard': [entry.as_dict() for entry in entries]
+    })
 
 @app.route('/vote', methods=['POST'])
 @login_required
 def vote():
     video_id = request.form['video_id']
     
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
+    conn = get_db()
     
     try:
         # Check if user already voted on this video
-        c.execute('SELECT id FROM votes WHERE user_id = ? AND video_id = ?', (session['user_id'], video_id))
-        existing_vote = c.fetchone()
-        
-        if existing_vote:
-            conn.close()
+        if VoteRepository(conn).has_voted(session['user_id'], video_id):
             return jsonify({
                 'success': False, 
                 'message': 'You have already voted on this video.',
@@ -1538,13 +1372,7 @@ def vote():
             })
         
         # Check if user has paid the $2 voting fee for this specific video
-        c.execute('''SELECT id FROM voting_fees 
-                    WHERE user_id = ? AND video_id = ? AND status = 'successful' ''', 
-                 (session['user_id'], video_id))
-        payment = c.fetchone()
-        
-        if not payment:
-            conn.close()
+        if not PaymentRepository(conn).has_paid_voting_fee(session['user_id'], video_id):
             return jsonify({
                 'success': False, 
                 'message': 'You need to pay $2 to vote on this video.',
@@ -1553,30 +1381,32 @@ def vote():
                 'video_id': video_id
             })
         
-        # Insert vote (simple vote, no rating - just counts as 1 vote)
-        c.execute('''INSERT INTO votes (user_id, video_id, rating) 
-                    VALUES (?, ?, ?)''', (session['user_id'], video_id, 5))  # Default rating for counting
-        
-        # Update video statistics - RANKED BY TOTAL VOTES
-        c.execute('''UPDATE videos SET 
-                    total_votes = (SELECT COUNT(*) FROM votes WHERE video_id = ?)
-                    WHERE id = ?''', (video_id, video_id))
-        
-        # Get updated stats for response
-        c.execute('''SELECT total_votes FROM videos WHERE id = ?''', (video_id,))
-        stats = c.fetchone()
-        
-        conn.commit()
+        with write_transaction() as write_conn:
+            # Insert vote (simple vote, no rating - just counts as 1 vote).
+            # The votes trigger adds it to rating_sum/rating_count in the same
+            # statement; a parallel duplicate click inserts nothing.
+            inserted = write_conn.execute('''INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)
+                                            ON CONFLICT (user_id, video_id) DO NOTHING RETURNING id''',
+                                          (session['user_id'], video_id, 5)).fetchone()  # Default rating for counting
+            if inserted is None:
+                return jsonify({
+                    'success': False, 
+                    'message': 'You have already voted on this video.',
+                    'already_voted': True
+                })
+            
+            # Update video statistics - RANKED BY TOTAL VOTES
+            # Every vote row carries a rating, so rating_count is the vote count
+            stats = write_conn.execute('UPDATE videos SET total_votes = rating_count WHERE id = ? RETURNING total_votes',
+                                       (video_id,)).fetchone()
         
         return jsonify({
             'success': True, 
             'message': 'Vote submitted successfully!',
-            'total_votes': int(stats[0]) if stats[0] else 0
+            'total_votes': int(stats[0]) if stats and stats[0] else 0
         })
     except Exception as e:
         return jsonify({'success': False, 'message': 'Error submitting vote'})
-    finally:
-        conn.close()
 
 @app.route('/submit_rating', methods=['POST'])
 @login_required
@@ -1589,104 +1419,74 @@ def submit_rating():
     if not video_id or not rating or rating not in range(1, 6):
         return jsonify({'success': False, 'message': 'Invalid rating data'})
     
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
-    
     try:
-        # First, check if video exists and is accessible
-        c.execute('SELECT id FROM videos WHERE id = ? AND is_blocked = 0', (video_id,))
-        if not c.fetchone():
-            return jsonify({'success': False, 'message': 'Video not found or unavailable'})
-
-        # Then check if user already voted/rated this video
-        c.execute('SELECT id, rating FROM votes WHERE user_id = ? AND video_id = ?', 
-                 (session['user_id'], video_id))
-        existing_vote = c.fetchone()
-        
-        # Always allow rating updates or new ratings
-        if existing_vote:
-            vote_id = existing_vote[0]
-            old_rating = existing_vote[1]
-            # Update existing rating
-            c.execute('UPDATE votes SET rating = ? WHERE id = ?',
-                     (rating, vote_id))
-            print(f"Updated rating for vote {vote_id} from {old_rating} to {rating}")
+        with write_transaction() as write_conn:
+            # Video check, the user's previous rating and the video's aggregates in one read
+            state = VoteRepository(write_conn).rating_state(session['user_id'], video_id)
+            if state is None:
+                return jsonify({'success': False, 'message': 'Video not found or unavailable'})
+            
+            # Insert or re-rate in one statement; the votes trigger updates
+            # rating_sum, rating_count and average_rating alongside it
+            write_conn.execute('''INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)
+                                  ON CONFLICT (user_id, video_id) DO UPDATE SET rating = excluded.rating''',
+                               (session['user_id'], video_id, rating))
+        
+        old_rating = state.user_rating
+        is_update = old_rating is not None
+        if is_update:
+            print(f"Updated rating for video {video_id} from {old_rating} to {rating}")
         else:
-            # Insert new rating
-            c.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)', 
-                     (session['user_id'], video_id, rating))
             print(f"Inserted new rating {rating} for video {video_id}")
         
-        conn.commit()  # Commit the vote change first
-        
-        # Update video statistics - only update average rating, not vote count
-        c.execute('''UPDATE videos SET 
-                    average_rating = (SELECT AVG(CAST(rating AS FLOAT)) FROM votes WHERE video_id = ?)
-                    WHERE id = ?''', (video_id, video_id))
-        conn.commit()  # Commit the stats update
+        # The same arithmetic the trigger just applied (only rating_count changes the vote count)
+        rating_count = state.rating_count + (0 if is_update else 1)
+        new_average = (state.rating_sum - (old_rating or 0) + rating) / rating_count
+        print(f"Updated stats - votes: {state.total_votes}, avg rating: {new_average}")
         
-        # Get updated stats for response
-        c.execute('SELECT total_votes, average_rating FROM videos WHERE id = ?', (video_id,))
-        stats = c.fetchone()
-        print(f"Updated stats - votes: {stats[0]}, avg rating: {stats[1]}")
-        
-        message = 'Rating updated successfully!' if existing_vote else 'Rating submitted successfully!'
-        if existing_vote:
+        message = 'Rating submitted successfully!'
+        if is_update:
             message = f'Rating updated from {old_rating} to {rating} stars!'
             print(message)
             
         return jsonify({
             'success': True, 
             'message': message,
-            'new_average': float(stats[1]) if stats[1] else 0.0,  # stats[1] is average_rating
-            'total_votes': int(stats[0]) if stats[0] else 0,      # stats[0] is total_votes
+            'new_average': new_average,
+            'total_votes': int(state.total_votes),
             'user_rating': rating,
-            'old_rating': old_rating if existing_vote else None,
-            'is_update': existing_vote is not None
+            'old_rating': old_rating,
+            'is_update': is_update
         })
     except Exception as e:
         print(f"Rating submission error: {e}")
-        conn.rollback()  # Rollback any changes if there was an error
         return jsonify({
             'success': False, 
             'message': 'Error submitting rating. Please try again.',
             'error': str(e)
         })
-    finally:
-        conn.close()
 
 @app.route('/get_user_rating/<int:video_id>')
 @login_required
 def get_user_rating(video_id):
     """Get the current user's rating for a video"""
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
+    conn = get_db()
     
     try:
         # Get user's current rating only
-        c.execute('''
-            SELECT rating FROM votes
-            WHERE user_id = ? AND video_id = ?
-        ''', (session['user_id'], video_id))
-        result = c.fetchone()
+        rating = VoteRepository(conn).user_rating(session['user_id'], video_id)
         
         # Check payment status separately for voting feature
-        c.execute('''
-            SELECT 1 FROM voting_fees 
-            WHERE user_id = ? AND video_id = ? AND status = 'successful'
-        ''', (session['user_id'], video_id))
-        has_paid = c.fetchone() is not None
+        has_paid = PaymentRepository(conn).has_paid_voting_fee(session['user_id'], video_id)
         
         return jsonify({
             'success': True,
-            'rating': result[0] if result else None,
+            'rating': rating,
             'has_paid': has_paid  # Still include payment status for voting feature
         })
     except Exception as e:
         print(f"Get rating error: {e}")
         return jsonify({'success': False, 'message': 'Error retrieving rating'})
-    finally:
-        conn.close()
 
 @app.route('/add_comment', methods=['POST'])
 def add_comment():
@@ -1701,43 +1501,40 @@ def add_comment():
         return jsonify({'success': False, 'message': 'Missing required fields'})
     
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Insert comment
-        if parent_id:
-            # This is a reply
-            c.execute('''INSERT INTO comments (video_id, user_id, comment, parent_id) 
-                         VALUES (?, ?, ?, ?)''', 
-                      (video_id, session['user_id'], comment_text, parent_id))
-        else:
-            # This is a main comment
-            c.execute('''INSERT INTO comments (video_id, user_id, comment) 
-                         VALUES (?, ?, ?)''', 
-                      (video_id, session['user_id'], comment_text))
+        with write_transaction() as conn:
+            c = conn.cursor()
         
-        comment_id = c.lastrowid
-        conn.commit()
+            # Insert comment
+            if parent_id:
+                # This is a reply
+                c.execute('''INSERT INTO comments (video_id, user_id, comment, parent_id) 
+                             VALUES (?, ?, ?, ?)''', 
+                          (video_id, session['user_id'], comment_text, parent_id))
+            else:
+                # This is a main comment
+                c.execute('''INSERT INTO comments (video_id, user_id, comment) 
+                             VALUES (?, ?, ?)''', 
+                          (video_id, session['user_id'], comment_text))
         
-        # Get the comment with user info including avatar
-        c.execute('''SELECT c.comment, c.comment_date, u.username, c.id, u.avatar_filename 
-                     FROM comments c JOIN users u ON c.user_id = u.id 
-                     WHERE c.id = ?''', (comment_id,))
-        comment_data = c.fetchone()
+            comment_id = c.lastrowid
         
-        conn.close()
+            # Get the comment with user info including avatar
+            c.execute('''SELECT c.comment, c.comment_date, u.username, c.id, u.avatar_filename 
+                         FROM comments c JOIN users u ON c.user_id = u.id 
+                         WHERE c.id = ?''', (comment_id,))
+            comment_data = c.fetchone()
         
-        return jsonify({
-            'success': True,
-            'comment': {
-                'id': comment_data[3],
-                'text': comment_data[0],
-                'date': comment_data[1],
-                'username': comment_data[2],
-                'avatar': comment_data[4],
-                'is_reply': bool(parent_id)
-            }
-        })
+            return jsonify({
+                'success': True,
+                'comment': {
+                    'id': comment_data[3],
+                    'text': comment_data[0],
+                    'date': comment_data[1],
+                    'username': comment_data[2],
+                    'avatar': comment_data[4],
+                    'is_reply': bool(parent_id)
+                }
+            })
         
     except Exception as e:
         return jsonify({'success': False, 'message': 'Error adding comment'})
@@ -1754,48 +1551,25 @@ def like_comment():
         return jsonify({'success': False, 'message': 'Missing required fields'})
     
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Check if user already liked this comment
-        c.execute('''SELECT id FROM comment_likes 
-                     WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        existing_like = c.fetchone()
-        
-        if action == 'like' and not existing_like:
-            # Add like and remove any existing dislike
-            c.execute('''INSERT INTO comment_likes (comment_id, user_id) VALUES (?, ?)''', 
-                      (comment_id, session['user_id']))
-            # Remove dislike if it exists (mutual exclusivity)
-            c.execute('''DELETE FROM comment_dislikes WHERE comment_id = ? AND user_id = ?''', 
-                      (comment_id, session['user_id']))
-        elif action == 'unlike' and existing_like:
-            # Remove like
-            c.execute('''DELETE FROM comment_likes WHERE comment_id = ? AND user_id = ?''', 
-                      (comment_id, session['user_id']))
-        
-        # Get updated like count
-        c.execute('''SELECT COUNT(*) FROM comment_likes WHERE comment_id = ?''', (comment_id,))
-        like_count = c.fetchone()[0]
-        
-        # Check if user still has like/dislike after the operation
-        c.execute('''SELECT id FROM comment_likes WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        user_liked = c.fetchone() is not None
-        
-        c.execute('''SELECT id FROM comment_dislikes WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        user_disliked = c.fetchone() is not None
-        
-        conn.commit()
-        conn.close();
+        with write_transaction() as conn:
+            # One write per click, safe under parallel clicks. Triggers remove the
+            # user's dislike (mutual exclusivity) and keep like_count current.
+            if action == 'like':
+                conn.execute('''INSERT INTO comment_likes (comment_id, user_id) VALUES (?, ?)
+                                ON CONFLICT (comment_id, user_id) DO NOTHING''',
+                             (comment_id, session['user_id']))
+            elif action == 'unlike':
+                conn.execute('DELETE FROM comment_likes WHERE comment_id = ? AND user_id = ?',
+                             (comment_id, session['user_id']))
+        
+            # Updated like count and the user's like/dislike state
+            state = CommentRepository(conn).reactions(comment_id, session['user_id'])
         
         return jsonify({
             'success': True,
-            'like_count': like_count,
-            'user_liked': user_liked,
-            'user_disliked': user_disliked
+            'like_count': state.like_count if state else 0,
+            'user_liked': bool(state and state.user_liked),
+            'user_disliked': bool(state and state.user_disliked)
         })
         
     except Exception as e:
@@ -1813,98 +1587,47 @@ def dislike_comment():
         return jsonify({'success': False, 'message': 'Missing required fields'})
     
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Create comment_dislikes table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS comment_dislikes (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            comment_id INTEGER,
-            user_id INTEGER,
-            dislike_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (comment_id) REFERENCES comments (id),
-            FOREIGN KEY (user_id) REFERENCES users (id),
-            UNIQUE(comment_id, user_id)
-        )''')
-        
-        # Check if user already disliked this comment
-        c.execute('''SELECT id FROM comment_dislikes 
-                     WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        existing_dislike = c.fetchone()
-        
-        if action == 'dislike' and not existing_dislike:
-            # Add dislike and remove any existing like
-            c.execute('''INSERT INTO comment_dislikes (comment_id, user_id) VALUES (?, ?)''', 
-                      (comment_id, session['user_id']))
-            # Remove like if it exists (mutual exclusivity)
-            c.execute('''DELETE FROM comment_likes WHERE comment_id = ? AND user_id = ?''', 
-                      (comment_id, session['user_id']))
-        elif action == 'undislike' and existing_dislike:
-            # Remove dislike
-            c.execute('''DELETE FROM comment_dislikes WHERE comment_id = ? AND user_id = ?''', 
-                      (comment_id, session['user_id']))
-        
-        # Get updated like count (in case we removed a like)
-        c.execute('''SELECT COUNT(*) FROM comment_likes WHERE comment_id = ?''', (comment_id,))
-        like_count = c.fetchone()[0]
-        
-        # Check if user still has like/dislike after the operation
-        c.execute('''SELECT id FROM comment_likes WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        user_liked = c.fetchone() is not None
-        
-        c.execute('''SELECT id FROM comment_dislikes WHERE comment_id = ? AND user_id = ?''', 
-                  (comment_id, session['user_id']))
-        user_disliked = c.fetchone() is not None
-        
-        conn.commit()
-        conn.close()
+        with write_transaction() as conn:
+            # Adding a dislike removes the user's like in the same statement (trigger)
+            if action == 'dislike':
+                conn.execute('''INSERT INTO comment_dislikes (comment_id, user_id) VALUES (?, ?)
+                                ON CONFLICT (comment_id, user_id) DO NOTHING''',
+                             (comment_id, session['user_id']))
+            elif action == 'undislike':
+                conn.execute('DELETE FROM comment_dislikes WHERE comment_id = ? AND user_id = ?',
+                             (comment_id, session['user_id']))
+        
+            # Updated like count (in case we removed a like) and the user's state
+            state = CommentRepository(conn).reactions(comment_id, session['user_id'])
         
         return jsonify({
             'success': True,
-            'user_disliked': user_disliked,
-            'user_liked': user_liked,
-            'like_count': like_count
+            'user_disliked': bool(state and state.user_disliked),
+            'user_liked': bool(state and state.user_liked),
+            'like_count': state.like_count if state else 0
         })
         
     except Exception as e:
         return jsonify({'success': False, 'message': 'Error updating dislike'})
 
+@app.route('/api/comments/<int:comment_id>/replies')
 @app.route('/get_replies/<int:comment_id>')
+@cache_policy('revalidate')
 def get_replies(comment_id):
-    """Fetch replies for a specific comment"""
+    """Next page of a comment's replies (?after=<next_cursor>), as data and reply HTML"""
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Get replies for the comment
-        c.execute('''SELECT c.comment, c.comment_date, u.username, c.id, u.avatar_filename
-                     FROM comments c JOIN users u ON c.user_id = u.id 
-                     WHERE c.parent_id = ? 
-                     ORDER BY c.comment_date ASC''', (comment_id,))
-        replies = c.fetchall()
-        
-        conn.close()
-        
-        # Format replies for JSON response
-        formatted_replies = []
-        for reply in replies:
-            formatted_replies.append({
-                'id': reply[3],
-                'text': reply[0],
-                'date': reply[1],
-                'username': reply[2],
-                'avatar': reply[4]
-            })
-        
-        return jsonify({
-            'success': True,
-            'replies': formatted_replies
-        })
-        
-    except Exception as e:
-        return jsonify({'success': False, 'message': 'Error fetching replies'})
+        replies, next_cursor = CommentRepository(get_db()).replies(comment_id, session.get('user_id'),
+                                                                   request.args.get('after') or None,
+                                                                   limit=Config.REPLIES_PER_PAGE)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'Invalid cursor'}), 400
+    
+    return jsonify({
+        'success': True,
+        'next_cursor': next_cursor,
+        'replies': [reply.as_dict() for reply in replies],
+        'html': render_template('comment_replies.html', replies=replies)
+    })
 
 @app.route('/profile')
 @app.route('/profile/<username>')
@@ -1916,12 +1639,13 @@ def profile(username=None):
         flash('Please log in to view profiles')
         return redirect(url_for('login'))
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get user information
     c.execute('''SELECT id, username, email, first_name, last_name, bio, location, 
-                        website, avatar_filename, registration_date, subscriber_count, total_views
+                        website, avatar_filename, registration_date, subscriber_count, total_views,
+                        video_count
                  FROM users WHERE username = ?''', (target_username,))
     user = c.fetchone()
     
@@ -1934,17 +1658,14 @@ def profile(username=None):
     
     # Get user's videos with stats
     c.execute('''SELECT v.id, v.title, v.description, v.filename, v.upload_date, 
-                v.total_votes, v.average_rating, COUNT(c.id) as comment_count
+                v.total_votes, v.average_rating, v.comment_count
                 FROM videos v 
-                LEFT JOIN comments c ON v.id = c.video_id 
                 WHERE v.user_id = ? 
-                GROUP BY v.id 
                 ORDER BY v.upload_date DESC''', (user_id,))
     user_videos = c.fetchall()
     
     # Get total statistics
-    c.execute('''SELECT COUNT(*) FROM videos WHERE user_id = ?''', (user_id,))
-    total_videos = c.fetchone()[0]
+    total_videos = user[12]
     
     c.execute('''SELECT SUM(total_votes), AVG(average_rating) FROM videos WHERE user_id = ? AND total_votes > 0''', (user_id,))
     stats = c.fetchone()
@@ -1952,16 +1673,9 @@ def profile(username=None):
     avg_rating = stats[1] if stats[1] else 0.0
     
     # Get recent activity (comments)
-    c.execute('''SELECT c.comment, c.comment_date, v.title, v.id
-                 FROM comments c 
-                 JOIN videos v ON c.video_id = v.id 
-                 WHERE c.user_id = ? 
-                 ORDER BY c.comment_date DESC 
-                 LIMIT 5''', (user_id,))
+    c.execute(SQL_PROFILE_RECENT_COMMENTS, (user_id,))
     recent_comments = c.fetchall()
     
-    conn.close()
-    
     return render_template('profile.html', 
                          profile_user=user,
                          user_videos=user_videos,
@@ -2006,20 +1720,19 @@ def edit_profile():
                     return redirect(url_for('edit_profile'))
         
         try:
-            conn = sqlite3.connect('tournament.db')
-            c = conn.cursor()
+            with write_transaction() as conn:
+                if avatar_filename:
+                    conn.execute('''UPDATE users SET first_name=?, last_name=?, bio=?, location=?, 
+                                    website=?, avatar_filename=? WHERE id=?''',
+                                 (first_name, last_name, bio, location, website, avatar_filename, session['user_id']))
+                else:
+                    conn.execute('''UPDATE users SET first_name=?, last_name=?, bio=?, location=?, 
+                                    website=? WHERE id=?''',
+                                 (first_name, last_name, bio, location, website, session['user_id']))
             
+            invalidate_current_user(session['user_id'])
             if avatar_filename:
-                c.execute('''UPDATE users SET first_name=?, last_name=?, bio=?, location=?, 
-                            website=?, avatar_filename=? WHERE id=?''',
-                         (first_name, last_name, bio, location, website, avatar_filename, session['user_id']))
-            else:
-                c.execute('''UPDATE users SET first_name=?, last_name=?, bio=?, location=?, 
-                            website=? WHERE id=?''',
-                         (first_name, last_name, bio, location, website, session['user_id']))
-            
-            conn.commit()
-            conn.close()
+                invalidate_listings()  # listing cards show the uploader's avatar
             
             flash('Profile updated successfully!', 'success')
             return redirect(url_for('profile'))
@@ -2030,13 +1743,12 @@ def edit_profile():
             return redirect(url_for('edit_profile'))
     
     # GET request - show edit form
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('''SELECT username, email, first_name, last_name, bio, location, 
                         website, avatar_filename FROM users WHERE id = ?''', (session['user_id'],))
     user = c.fetchone()
-    conn.close()
     
     return render_template('edit_profile.html', user=user)
 
@@ -2061,21 +1773,19 @@ def account_settings():
                 return redirect(url_for('account_settings'))
             
             try:
-                conn = sqlite3.connect('tournament.db')
-                c = conn.cursor()
+                c = get_db().cursor()
                 c.execute('SELECT password_hash FROM users WHERE id = ?', (session['user_id'],))
                 user = c.fetchone()
                 
                 if user and check_password_hash(user[0], current_password):
                     new_hash = generate_password_hash(new_password)
-                    c.execute('UPDATE users SET password_hash = ? WHERE id = ?', 
-                             (new_hash, session['user_id']))
-                    conn.commit()
+                    with write_transaction() as conn:
+                        conn.execute('UPDATE users SET password_hash = ? WHERE id = ?', 
+                                     (new_hash, session['user_id']))
                     flash('Password changed successfully!', 'success')
                 else:
                     flash('Current password is incorrect', 'error')
                 
-                conn.close()
             except Exception as e:
                 flash('Error changing password. Please try again.', 'error')
             
@@ -2084,12 +1794,10 @@ def account_settings():
         elif action == 'deactivate_account':
             # Handle account deactivation
             try:
-                conn = sqlite3.connect('tournament.db')
-                c = conn.cursor()
-                c.execute('UPDATE users SET is_blocked = 1, block_reason = ? WHERE id = ?', 
-                         ('Account deactivated by user', session['user_id']))
-                conn.commit()
-                conn.close();
+                with write_transaction() as conn:
+                    conn.execute('UPDATE users SET is_blocked = 1, block_reason = ? WHERE id = ?', 
+                                 ('Account deactivated by user', session['user_id']))
+                invalidate_current_user(session['user_id'])
                 flash('Account has been deactivated', 'info')
                 return redirect(url_for('logout'))
             except Exception as e:
@@ -2097,13 +1805,12 @@ def account_settings():
                 return redirect(url_for('account_settings'))
     
     # GET request - show settings page
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     c.execute('''SELECT username, email, first_name, last_name, bio, location, 
                         website, avatar_filename, registration_date FROM users WHERE id = ?''', 
              (session['user_id'],))
     user = c.fetchone()
-    conn.close();
     
     return render_template('account_settings.html', user=user)
 
@@ -2112,15 +1819,7 @@ def account_settings():
 def upgrade():
     """Upgrade/subscription page with mobile money payment"""
     # Check if tournament is open
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
-    c.execute('SELECT is_open FROM tournament_settings WHERE id = 1')
-    tournament_data = c.fetchone()
-    conn.close()
-    
-    tournament_open = tournament_data[0] if tournament_data else True
-    
-    if not tournament_open:
+    if not tournament_state.is_open():
         flash('⚠️ Tournament is currently CLOSED. You cannot upgrade to participant status at this time. Please check back later when the competition reopens.', 'warning')
         return redirect(url_for('dashboard'))
     
@@ -2132,7 +1831,7 @@ def upgrade():
 @login_required
 def pay_voting_fee(video_id):
     """Page to pay $2 voting fee for a specific video"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get video details
@@ -2144,16 +1843,10 @@ def pay_voting_fee(video_id):
         return redirect(url_for('videos'))
     
     # Check if user already paid for this video
-    c.execute('''SELECT id FROM voting_fees 
-                WHERE user_id = ? AND video_id = ? AND status = 'successful' ''', 
-             (session['user_id'], video_id))
-    payment = c.fetchone()
-    
-    if payment:
+    if PaymentRepository(conn).has_paid_voting_fee(session['user_id'], video_id):
         flash('You have already paid to vote on this video!', 'info')
         return redirect(url_for('video_detail', video_id=video_id))
     
-    conn.close()
     return render_template('pay_voting_fee.html', video=video)
 
 @app.route('/initiate_voting_fee_payment', methods=['POST'])
@@ -2179,23 +1872,16 @@ def initiate_voting_fee_payment():
             return jsonify({'success': False, 'error': 'Invalid phone number format'}), 400
         
         # Check if video exists
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute('SELECT id, title FROM videos WHERE id = ?', (video_id,))
         video = c.fetchone()
         
         if not video:
-            conn.close()
             return jsonify({'success': False, 'error': 'Video not found'}), 404
         
         # Check if user already paid for this video
-        c.execute('''SELECT id FROM voting_fees 
-                    WHERE user_id = ? AND video_id = ? AND status = 'successful' ''', 
-                 (session['user_id'], video_id))
-        existing_payment = c.fetchone()
-        
-        if existing_payment:
-            conn.close()
+        if PaymentRepository(conn).has_paid_voting_fee(session['user_id'], video_id):
             return jsonify({'success': False, 'error': 'You have already paid to vote on this video'}), 400
         
         # Initialize mobile money service
@@ -2229,14 +1915,12 @@ def initiate_voting_fee_payment():
         
         if result['success']:
             # Store payment record in database with video_id
-            c.execute('''INSERT INTO voting_fees 
-                        (user_id, video_id, transaction_id, provider, phone_number, amount, currency, status, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (session['user_id'], video_id, result['transaction_id'], provider, phone_number,
-                      amount, currency, result['status'], datetime.now()))
-            
-            conn.commit()
-            conn.close()
+            with write_transaction() as write_conn:
+                write_conn.execute('''INSERT INTO voting_fees 
+                                      (user_id, video_id, transaction_id, provider, phone_number, amount, currency, status, created_at)
+                                      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+                                   (session['user_id'], video_id, result['transaction_id'], provider, phone_number,
+                                    amount, currency, result['status'], datetime.now()))
             
             return jsonify({
                 'success': True,
@@ -2247,7 +1931,6 @@ def initiate_voting_fee_payment():
                 'redirect_url': f'/video/{video_id}'
             })
         else:
-            conn.close()
             return jsonify({'success': False, 'error': result['error']}), 400
             
     except Exception as e:
@@ -2263,15 +1946,7 @@ def initiate_mobile_payment():
         from mobile_money_config import get_mobile_money_config
         
         # Check if tournament is open before processing payment
-        conn_check = sqlite3.connect('tournament.db')
-        c_check = conn_check.cursor()
-        c_check.execute('SELECT is_open FROM tournament_settings WHERE id = 1')
-        tournament_data = c_check.fetchone()
-        conn_check.close()
-        
-        tournament_open = tournament_data[0] if tournament_data else True
-        
-        if not tournament_open:
+        if not tournament_state.is_open():
             return jsonify({
                 'success': False,
                 'error': 'Tournament is currently CLOSED. You cannot upgrade to participant status at this time. Please try again when the competition reopens.'
@@ -2333,36 +2008,35 @@ def initiate_mobile_payment():
         
         if result['success']:
             # Store payment record in database
-            conn = sqlite3.connect('tournament.db')
-            c = conn.cursor()
-            c.execute('''INSERT INTO payment_transactions 
-                        (user_id, transaction_id, provider, phone_number, amount, currency, status, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (session['user_id'], result['transaction_id'], provider, phone_number,
-                      amount, currency, result['status'], datetime.now()))
-            
-            # For demo/sandbox mode, immediately mark as successful and update user status
-            if result['status'] == 'successful' or True:  # Always successful in demo mode
-                print(f"🔄 Updating user {session['user_id']} payment status to TRUE")
-                c.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
+            with write_transaction() as conn:
+                c = conn.cursor()
+                c.execute('''INSERT INTO payment_transactions 
+                            (user_id, transaction_id, provider, phone_number, amount, currency, status, created_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+                         (session['user_id'], result['transaction_id'], provider, phone_number,
+                          amount, currency, result['status'], datetime.now()))
                 
-                # Verify the update worked
-                c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
-                updated_status = c.fetchone()
-                print(f"✅ User {session['user_id']} is_paid status after update: {updated_status[0] if updated_status else 'NOT FOUND'}")
+                # For demo/sandbox mode, immediately mark as successful and update user status
+                if result['status'] == 'successful' or True:  # Always successful in demo mode
+                    print(f"🔄 Updating user {session['user_id']} payment status to TRUE")
+                    c.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
                 
-                # RENDER FIX: Enhanced session persistence
-                session.permanent = True  # Make session last longer
-                session['is_paid'] = True
-                session['payment_confirmed'] = True
-                session['payment_timestamp'] = datetime.now().isoformat()
-                session['payment_provider'] = provider
-                session['payment_amount'] = amount
-                print(f"🎯 Enhanced session updated for user {session['user_id']} - is_paid: {session.get('is_paid')}")
-                print(f"💾 Session data: payment_confirmed={session.get('payment_confirmed')}, timestamp={session.get('payment_timestamp')}")
+                    # Verify the update worked
+                    c.execute('SELECT is_paid FROM users WHERE id = ?', (session['user_id'],))
+                    updated_status = c.fetchone()
+                    print(f"✅ User {session['user_id']} is_paid status after update: {updated_status[0] if updated_status else 'NOT FOUND'}")
                 
-            conn.commit()
-            conn.close()
+                    # RENDER FIX: Enhanced session persistence
+                    session.permanent = True  # Make session last longer
+                    session['is_paid'] = True
+                    session['payment_confirmed'] = True
+                    session['payment_timestamp'] = datetime.now().isoformat()
+                    session['payment_provider'] = provider
+                    session['payment_amount'] = amount
+                    print(f"🎯 Enhanced session updated for user {session['user_id']} - is_paid: {session.get('is_paid')}")
+                    print(f"💾 Session data: payment_confirmed={session.get('payment_confirmed')}, timestamp={session.get('payment_timestamp')}")
+                
+            invalidate_current_user(session['user_id'])
             
             return jsonify({
                 'success': True,
@@ -2391,7 +2065,7 @@ def check_payment_status(transaction_id):
         from mobile_money_config import get_mobile_money_config
         
         # Get transaction from database
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute('''SELECT provider, phone_number, amount, currency, status 
                     FROM payment_transactions 
@@ -2436,19 +2110,18 @@ def check_payment_status(transaction_id):
             result = {'success': True, 'status': 'pending'}
         
         if result['success']:
-            # Update transaction status in database
-            c.execute('''UPDATE payment_transactions 
-                        SET status = ?, updated_at = ? 
-                        WHERE transaction_id = ?''',
-                     (result['status'], datetime.now(), transaction_id))
-            
-            # If payment is successful, update user status
-            if result['status'] == 'successful':
-                c.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
-                print(f"User {session['user_id']} payment confirmed via {provider}")
-            
-            conn.commit()
-            conn.close()
+            with write_transaction() as write_conn:
+                # Update transaction status in database
+                write_conn.execute('''UPDATE payment_transactions 
+                                      SET status = ?, updated_at = ? 
+                                      WHERE transaction_id = ?''',
+                                   (result['status'], datetime.now(), transaction_id))
+                
+                # If payment is successful, update user status
+                if result['status'] == 'successful':
+                    write_conn.execute('UPDATE users SET is_paid = TRUE WHERE id = ?', (session['user_id'],))
+                    print(f"User {session['user_id']} payment confirmed via {provider}")
+            invalidate_current_user(session['user_id'])
             
             return jsonify({
                 'success': True,
@@ -2457,7 +2130,6 @@ def check_payment_status(transaction_id):
                 'message': 'Payment successful! You can now upload videos.' if result['status'] == 'successful' else 'Payment is still being processed.'
             })
         else:
-            conn.close()
             return jsonify({
                 'success': False,
                 'error': result['error'],
@@ -2485,7 +2157,7 @@ def confirm_payment():
 def delete_video(video_id):
     """Delete a video (only by the owner)"""
     try:
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         
         # Check if video belongs to current user
@@ -2507,12 +2179,12 @@ def delete_video(video_id):
             os.remove(video_path)
         
         # Delete from database (cascade will delete votes and comments)
-        c.execute('DELETE FROM votes WHERE video_id = ?', (video_id,))
-        c.execute('DELETE FROM comments WHERE video_id = ?', (video_id,))
-        c.execute('DELETE FROM videos WHERE id = ?', (video_id,))
+        with write_transaction() as write_conn:
+            write_conn.execute('DELETE FROM votes WHERE video_id = ?', (video_id,))
+            write_conn.execute('DELETE FROM comments WHERE video_id = ?', (video_id,))
+            write_conn.execute('DELETE FROM videos WHERE id = ?', (video_id,))
         
-        conn.commit()
-        conn.close();
+        invalidate_listings()
         
         flash('Video deleted successfully!', 'success')
         return redirect(url_for('dashboard'))
@@ -2526,19 +2198,10 @@ def delete_video(video_id):
 def deactivate_account():
     """Temporarily deactivate user account"""
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Add deactivated column if it doesn't exist
-        try:
-            c.execute('ALTER TABLE users ADD COLUMN is_deactivated BOOLEAN DEFAULT FALSE')
-        except sqlite3.OperationalError:
-            pass
-        
         # Deactivate account
-        c.execute('UPDATE users SET is_deactivated = TRUE WHERE id = ?', (session['user_id'],))
-        conn.commit()
-        conn.close();
+        with write_transaction() as conn:
+            conn.execute('UPDATE users SET is_deactivated = TRUE WHERE id = ?', (session['user_id'],))
+        invalidate_current_user(session['user_id'])
         
         # Clear session
         session.clear()
@@ -2555,7 +2218,7 @@ def delete_account():
     """Permanently delete user account"""
     try:
         user_id = session['user_id']
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         
         # Get all user's videos to delete files
@@ -2577,14 +2240,15 @@ def delete_account():
                 os.remove(avatar_path)
         
         # Delete all user data (cascade)
-        c.execute('DELETE FROM comment_likes WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM votes WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM comments WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM videos WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM users WHERE id = ?', (user_id,))
+        with write_transaction() as write_conn:
+            write_conn.execute('DELETE FROM comment_likes WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM votes WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM comments WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM videos WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
         
-        conn.commit()
-        conn.close();
+        invalidate_current_user(user_id)
+        invalidate_listings()
         
         # Clear session
         session.clear()
@@ -2605,23 +2269,23 @@ def channel(username):
 @admin_required('basic')
 def admin_dashboard():
     """Admin dashboard with platform statistics and quick actions"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get platform statistics
     stats = {}
     
     # Tournament status
-    c.execute('SELECT is_open, last_updated, updated_by FROM tournament_settings WHERE id = 1')
-    tournament_data = c.fetchone()
-    if tournament_data:
-        stats['tournament_open'] = tournament_data[0]
-        stats['tournament_last_updated'] = tournament_data[1]
-        stats['tournament_updated_by'] = tournament_data[2]
+    tournament_settings = tournament_state.get()
+    if tournament_settings:
+        stats['tournament_open'] = tournament_settings.is_open
+        stats['tournament_last_updated'] = tournament_settings.last_updated
+        stats['tournament_updated_by'] = tournament_settings.updated_by
     else:
         # Create default if doesn't exist
-        c.execute('INSERT INTO tournament_settings (id, is_open) VALUES (1, TRUE)')
-        conn.commit()
+        with write_transaction() as write_conn:
+            write_conn.execute('INSERT OR IGNORE INTO tournament_settings (id, is_open) VALUES (1, TRUE)')
+        tournament_state.invalidate()
         stats['tournament_open'] = True
         stats['tournament_last_updated'] = None
         stats['tournament_updated_by'] = None
@@ -2639,7 +2303,7 @@ def admin_dashboard():
     c.execute('SELECT COUNT(*) FROM users WHERE is_paid = 1')
     stats['paid_users'] = c.fetchone()[0]
     
-    c.execute('SELECT COUNT(*) FROM users WHERE DATE(last_login) = DATE("now")')
+    c.execute("SELECT COUNT(*) FROM users WHERE DATE(last_login) = DATE('now')")
     stats['active_today'] = c.fetchone()[0]
     
     # Video statistics
@@ -2652,24 +2316,22 @@ def admin_dashboard():
     c.execute('SELECT COUNT(*) FROM videos WHERE is_blocked = 1')
     stats['blocked_videos'] = c.fetchone()[0]
     
-    c.execute('SELECT COUNT(*) FROM videos WHERE DATE(upload_date) = DATE("now")')
+    c.execute("SELECT COUNT(*) FROM videos WHERE DATE(upload_date) = DATE('now')")
     stats['videos_today'] = c.fetchone()[0]
     
     # Comment and vote statistics
-    c.execute('SELECT COUNT(*) FROM comments WHERE DATE(comment_date) = DATE("now")')
+    c.execute("SELECT COUNT(*) FROM comments WHERE DATE(comment_date) = DATE('now')")
     stats['comments_today'] = c.fetchone()[0]
     
-    c.execute('SELECT COUNT(*) FROM votes WHERE DATE(vote_date) = DATE("now")')
+    c.execute("SELECT COUNT(*) FROM votes WHERE DATE(vote_date) = DATE('now')")
     stats['votes_today'] = c.fetchone()[0]
     
     # Reports statistics
-    c.execute('SELECT COUNT(*) FROM reports WHERE status = "pending"')
+    c.execute("SELECT COUNT(*) FROM reports WHERE status = 'pending'")
     stats['pending_reports'] = c.fetchone()[0]
     
     # Recent activity
-    c.execute('''SELECT action, target_type, target_id, details, timestamp, u.username
-                 FROM admin_logs al JOIN users u ON al.admin_id = u.id
-                 ORDER BY timestamp DESC LIMIT 10''')
+    c.execute(SQL_ADMIN_RECENT_ACTIVITY)
     recent_activity = c.fetchall()
     
     # Pending approvals
@@ -2679,59 +2341,62 @@ def admin_dashboard():
                  ORDER BY v.upload_date ASC LIMIT 10''')
     pending_videos = c.fetchall()
     
-    conn.close();
-    
     return render_template('admin/dashboard.html', 
                          stats=stats, 
                          recent_activity=recent_activity,
                          pending_videos=pending_videos)
 
+def admin_count(key, query, params):
+    """
+    Rows an admin console query matches, for its header: counted only up to
+    ADMIN_COUNT_CAP + 1 (shown as "cap+") and cached for ADMIN_COUNT_CACHE_SECONDS
+    
+    Args:
+        key: Cache key (console, filter, search)
+        query: SELECT over the matching rows
+        params: Its parameters
+    """
+    return admin_count_cache.get_or_load(
+        key, lambda: get_db().execute(SQL_CAPPED_COUNT.format(query=query),
+                                      params + [Config.ADMIN_COUNT_CAP + 1]).fetchone()[0])
+
 @app.route('/admin/users')
 @admin_required('basic')
 def admin_users():
-    """User management page"""
+    """User management page (?search=, ?filter=, keyset pages via ?after=)"""
     search = request.args.get('search', '')
     filter_type = request.args.get('filter', 'all')
-    page = int(request.args.get('page', 1))
+    after = request.args.get('after') or None
+    page = max(request.args.get('page', 1, type=int), 1)  # only numbers the page in the header
     per_page = 25
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
-    # Build query based on filters
-    where_clause = "WHERE 1=1"
-    params = []
-    
-    if search:
-        where_clause += " AND (username LIKE ? OR email LIKE ? OR first_name LIKE ? OR last_name LIKE ?)"
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param, search_param, search_param])
-    
-    if filter_type == 'blocked':
-        where_clause += " AND is_blocked = 1"
-    elif filter_type == 'admin':
-        where_clause += " AND is_admin = 1"
-    elif filter_type == 'participants':
-        where_clause += " AND is_paid = 1"
-    elif filter_type == 'regular':
-        where_clause += " AND is_paid = 0"
-    
-    # Get total count
-    c.execute(f"SELECT COUNT(*) FROM users {where_clause}", params)
-    total_users = c.fetchone()[0]
-    
-    # Get users for current page
-    offset = (page - 1) * per_page
-    c.execute(f'''SELECT id, username, email, first_name, last_name, is_admin, 
-                         is_blocked, registration_date, last_login, login_count, admin_level, is_paid
-                  FROM users {where_clause} 
-                  ORDER BY registration_date DESC 
-                  LIMIT ? OFFSET ?''', params + [per_page, offset])
+    # Prefix match of every word over username, email and name (users_fts)
+    search_query = match_query(conn, search)
+    params = [search_query] if search_query else []
+    keyset_params = []
+    if after:
+        try:
+            keyset_params = list(decode_cursor(after, 2))
+        except ValueError:
+            return redirect(url_for('admin_users', search=search, filter=filter_type))
+    page_sql, count_sql = admin_users_sql(filter_type, matching_ids(conn, 'users_fts') if search_query else None,
+                                          after=bool(after))
+    
+    total_users = admin_count(('users', filter_type, search_query), count_sql, params)
+    
+    # Get users for current page: newest first, continuing after the previous page's last row
+    c.execute(page_sql, params + keyset_params + [per_page + 1])
     users = c.fetchall()
     
-    conn.close();
+    next_cursor = None
+    if len(users) > per_page:
+        users = users[:per_page]
+        next_cursor = encode_cursor((users[-1][7], users[-1][0]))
     
-    total_pages = (total_users + per_page - 1) // per_page
+    total_pages = max((min(total_users, Config.ADMIN_COUNT_CAP) + per_page - 1) // per_page, page)
     
     return render_template('admin/users.html', 
                          users=users,
@@ -2739,52 +2404,48 @@ def admin_users():
                          filter_type=filter_type,
                          page=page,
                          total_pages=total_pages,
-                         total_users=total_users)
+                         total_users=total_users,
+                         count_cap=Config.ADMIN_COUNT_CAP,
+                         after=after,
+                         next_cursor=next_cursor)
 
 @app.route('/admin/videos')
 @admin_required('basic')
 def admin_videos():
-    """Video management page"""
+    """Video management page (?search=, ?filter=, keyset pages via ?after=)"""
     search = request.args.get('search', '')
     filter_type = request.args.get('filter', 'all')
-    page = int(request.args.get('page', 1))
+    after = request.args.get('after') or None
+    page = max(request.args.get('page', 1, type=int), 1)  # only numbers the page in the header
     per_page = 25
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
-    # Build query based on filters
-    where_clause = "WHERE 1=1"
-    params = []
-    
-    if search:
-        where_clause += " AND (v.title LIKE ? OR v.description LIKE ? OR u.username LIKE ?)"
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param, search_param])
-    
-    if filter_type == 'pending':
-        where_clause += " AND v.is_approved = 0 AND v.is_blocked = 0"
-    elif filter_type == 'approved':
-        where_clause += " AND v.is_approved = 1 AND v.is_blocked = 0"
-    elif filter_type == 'blocked':
-        where_clause += " AND v.is_blocked = 1"
-    
-    # Get total count
-    c.execute(f"SELECT COUNT(*) FROM videos v JOIN users u ON v.user_id = u.id {where_clause}", params)
-    total_videos = c.fetchone()[0]
-    
-    # Get videos for current page
-    offset = (page - 1) * per_page
-    c.execute(f'''SELECT v.id, v.title, v.filename, v.upload_date, v.is_approved, v.is_blocked,
-                         v.total_votes, v.average_rating, v.file_size, u.username, v.view_count
-                  FROM videos v JOIN users u ON v.user_id = u.id {where_clause}
-                  ORDER BY v.upload_date DESC 
-                  LIMIT ? OFFSET ?''', params + [per_page, offset])
+    # Prefix match of every word over title, tags, uploader and description (videos_fts)
+    search_query = match_query(conn, search)
+    params = [search_query] if search_query else []
+    keyset_params = []
+    if after:
+        try:
+            keyset_params = list(decode_cursor(after, 2))
+        except ValueError:
+            return redirect(url_for('admin_videos', search=search, filter=filter_type))
+    page_sql, count_sql = admin_videos_sql(filter_type, matching_ids(conn, 'videos_fts') if search_query else None,
+                                           after=bool(after))
+    
+    total_videos = admin_count(('videos', filter_type, search_query), count_sql, params)
+    
+    # Get videos for current page: newest first, continuing after the previous page's last row
+    c.execute(page_sql, params + keyset_params + [per_page + 1])
     videos = c.fetchall()
     
-    conn.close();
+    next_cursor = None
+    if len(videos) > per_page:
+        videos = videos[:per_page]
+        next_cursor = encode_cursor((videos[-1][3], videos[-1][0]))
     
-    total_pages = (total_videos + per_page - 1) // per_page
+    total_pages = max((min(total_videos, Config.ADMIN_COUNT_CAP) + per_page - 1) // per_page, page)
     
     return render_template('admin/videos.html', 
                          videos=videos,
@@ -2792,7 +2453,10 @@ def admin_videos():
                          filter_type=filter_type,
                          page=page,
                          total_pages=total_pages,
-                         total_videos=total_videos)
+                         total_videos=total_videos,
+                         count_cap=Config.ADMIN_COUNT_CAP,
+                         after=after,
+                         next_cursor=next_cursor)
 
 
 
@@ -2813,7 +2477,7 @@ def admin_block_user(user_id):
         flash(message, 'error')
         return redirect(url_for('admin_users'))
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT username, is_blocked FROM users WHERE id = ?', (user_id,))
@@ -2841,8 +2505,9 @@ def admin_block_user(user_id):
                 elif duration == '1_month':
                     blocked_until = (datetime.now() + timedelta(days=30)).isoformat()
             
-            c.execute('''UPDATE users SET is_blocked = 1, block_reason = ?, blocked_until = ? 
-                        WHERE id = ?''', (reason, blocked_until, user_id))
+            with write_transaction() as write_conn:
+                write_conn.execute('''UPDATE users SET is_blocked = 1, block_reason = ?, blocked_until = ? 
+                                      WHERE id = ?''', (reason, blocked_until, user_id))
             
             log_admin_action(session['user_id'], 'block_user', 'user', user_id, 
                            f"Blocked user {username}. Reason: {reason}. Duration: {duration}")
@@ -2850,8 +2515,9 @@ def admin_block_user(user_id):
             new_blocked_status = True
             
         elif action_type == 'unblock':
-            c.execute('''UPDATE users SET is_blocked = 0, block_reason = NULL, blocked_until = NULL 
-                        WHERE id = ?''', (user_id,))
+            with write_transaction() as write_conn:
+                write_conn.execute('''UPDATE users SET is_blocked = 0, block_reason = NULL, blocked_until = NULL 
+                                      WHERE id = ?''', (user_id,))
             
             log_admin_action(session['user_id'], 'unblock_user', 'user', user_id, f"Unblocked user {username}")
             message = f'User {username} has been unblocked'
@@ -2864,7 +2530,7 @@ def admin_block_user(user_id):
             flash(message, 'error')
             return redirect(url_for('admin_users'))
         
-        conn.commit()
+        invalidate_current_user(user_id)
         
         if is_ajax:
             return jsonify({
@@ -2881,7 +2547,6 @@ def admin_block_user(user_id):
             return redirect(url_for('admin_users'))
             
     except Exception as e:
-        conn.rollback()
         error_message = f'Error updating user status: {str(e)}'
         app.logger.error(f"Block user error: {error_message}")
         
@@ -2890,8 +2555,6 @@ def admin_block_user(user_id):
         flash(error_message, 'error')
         return redirect(url_for('admin_users'))
     
-    finally:
-        conn.close()
 
 @app.route('/admin/user/<int:user_id>/admin', methods=['POST'])
 @admin_required('super')
@@ -2900,7 +2563,7 @@ def admin_toggle_admin(user_id):
     action = request.form.get('action')  # 'grant' or 'revoke'
     level = request.form.get('level', 'basic')  # 'basic' or 'super'
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT username FROM users WHERE id = ?', (user_id,))
@@ -2910,30 +2573,30 @@ def admin_toggle_admin(user_id):
         username = user[0]
         
         if action == 'grant':
-            c.execute('UPDATE users SET is_admin = 1, admin_level = ? WHERE id = ?', (level, user_id))
+            with write_transaction() as write_conn:
+                write_conn.execute('UPDATE users SET is_admin = 1, admin_level = ? WHERE id = ?', (level, user_id))
             log_admin_action(session['user_id'], 'grant_admin', 'user', user_id, 
                            f"Granted {level} admin privileges to {username}")
             flash(f'Granted {level} admin privileges to {username}', 'success')
         
         elif action == 'revoke':
-            c.execute('UPDATE users SET is_admin = 0, admin_level = NULL WHERE id = ?', (user_id,))
+            with write_transaction() as write_conn:
+                write_conn.execute('UPDATE users SET is_admin = 0, admin_level = NULL WHERE id = ?', (user_id,))
             log_admin_action(session['user_id'], 'revoke_admin', 'user', user_id, 
                            f"Revoked admin privileges from {username}")
             flash(f'Revoked admin privileges from {username}', 'success')
     
-    conn.commit()
-    conn.close();
+    invalidate_current_user(user_id)
     
     # Handle AJAX requests
     if request.form.get('ajax'):
         # Get updated user data
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         c.execute('''SELECT id, username, email, first_name, last_name, is_admin, 
                            is_blocked, registration_date, last_login, login_count, admin_level, is_paid
                      FROM users WHERE id = ?''', (user_id,))
         updated_user = c.fetchone()
-        conn.close()
         
         return jsonify({
             'success': True,
@@ -2949,7 +2612,7 @@ def admin_toggle_participant(user_id):
     """Toggle user participant status (paid/unpaid)"""
     action = request.form.get('action')  # 'upgrade', 'downgrade'
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get user info
@@ -2962,19 +2625,21 @@ def admin_toggle_participant(user_id):
         
         if action == 'upgrade':
             # Upgrade to participant (set is_paid = 1)
-            c.execute('UPDATE users SET is_paid = 1 WHERE id = ?', (user_id,))
+            with write_transaction() as write_conn:
+                write_conn.execute('UPDATE users SET is_paid = 1 WHERE id = ?', (user_id,))
             log_admin_action(session['user_id'], 'upgrade_participant', 'user', user_id, 
                            f"Upgraded {username} to participant status")
             message = f'Upgraded {username} to participant status'
         
         elif action == 'downgrade':
             # Downgrade to regular user (set is_paid = 0)
-            c.execute('UPDATE users SET is_paid = 0 WHERE id = ?', (user_id,))
+            with write_transaction() as write_conn:
+                write_conn.execute('UPDATE users SET is_paid = 0 WHERE id = ?', (user_id,))
             log_admin_action(session['user_id'], 'downgrade_participant', 'user', user_id, 
                            f"Downgraded {username} to regular user")
             message = f'Downgraded {username} to regular user'
         
-        conn.commit()
+        invalidate_current_user(user_id)
         
         # Handle AJAX requests
         if request.form.get('ajax'):
@@ -2983,7 +2648,6 @@ def admin_toggle_participant(user_id):
                                is_blocked, registration_date, last_login, login_count, admin_level, is_paid
                          FROM users WHERE id = ?''', (user_id,))
             updated_user = c.fetchone()
-            conn.close()
             
             return jsonify({
                 'success': True,
@@ -3000,23 +2664,23 @@ def admin_toggle_participant(user_id):
             })
         flash('User not found', 'error')
     
-    conn.close()
     return redirect(url_for('admin_users'))
 
 @app.route('/admin/video/<int:video_id>/approve', methods=['POST'])
 @admin_required('basic')
 def admin_approve_video(video_id):
     """Approve video for public viewing"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT title, user_id FROM videos WHERE id = ?', (video_id,))
     video = c.fetchone()
     
     if video:
-        c.execute('''UPDATE videos SET is_approved = 1, approval_date = CURRENT_TIMESTAMP, 
-                    approved_by = ? WHERE id = ?''', (session['user_id'], video_id))
-        conn.commit()
+        with write_transaction() as write_conn:
+            write_conn.execute('''UPDATE videos SET is_approved = 1, approval_date = CURRENT_TIMESTAMP, 
+                                  approved_by = ? WHERE id = ?''', (session['user_id'], video_id))
+        invalidate_listings()
         
         # Get user email for notification
         c.execute('SELECT email, username FROM users WHERE id = ?', (video[1],))
@@ -3031,7 +2695,6 @@ def admin_approve_video(video_id):
                         f"Approved video: {video[0]}")
         flash(f'Video "{video[0]}" has been approved', 'success')
     
-    conn.close()
     return redirect(request.referrer or url_for('admin_videos'))
 
 @app.route('/admin/video/<int:video_id>/block', methods=['POST'])
@@ -3041,7 +2704,7 @@ def admin_block_video(video_id):
     action = request.form.get('action')  # 'block' or 'unblock'
     reason = request.form.get('reason', '')
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     c.execute('SELECT title, user_id FROM videos WHERE id = ?', (video_id,))
@@ -3051,8 +2714,9 @@ def admin_block_video(video_id):
         title = video[0]
         
         if action == 'block':
-            c.execute('''UPDATE videos SET is_blocked = 1, block_reason = ?, blocked_by = ? 
-                        WHERE id = ?''', (reason, session['user_id'], video_id))
+            with write_transaction() as write_conn:
+                write_conn.execute('''UPDATE videos SET is_blocked = 1, block_reason = ?, blocked_by = ? 
+                                      WHERE id = ?''', (reason, session['user_id'], video_id))
             
             log_admin_action(session['user_id'], 'block_video', 'video', video_id, 
                            f"Blocked video: {title}. Reason: {reason}")
@@ -3065,15 +2729,15 @@ def admin_block_video(video_id):
                            f'Your video "{title}" has been blocked. Reason: {reason}')
         
         elif action == 'unblock':
-            c.execute('''UPDATE videos SET is_blocked = 0, block_reason = NULL, blocked_by = NULL 
-                        WHERE id = ?''', (video_id,))
+            with write_transaction() as write_conn:
+                write_conn.execute('''UPDATE videos SET is_blocked = 0, block_reason = NULL, blocked_by = NULL 
+                                      WHERE id = ?''', (video_id,))
             
             log_admin_action(session['user_id'], 'unblock_video', 'video', video_id, 
                            f"Unblocked video: {title}")
             flash(f'Video "{title}" has been unblocked', 'success')
     
-    conn.commit()
-    conn.close();
+    invalidate_listings()
     return redirect(request.referrer or url_for('admin_videos'))
 
 @app.route('/admin/messages', methods=['GET', 'POST'])
@@ -3087,7 +2751,7 @@ def admin_messages():
         message = request.form.get('message')
         send_email = 'send_email' in request.form
         
-        conn = sqlite3.connect('tournament.db')
+        conn = get_db()
         c = conn.cursor()
         
         recipients = []
@@ -3106,23 +2770,21 @@ def admin_messages():
             c.execute('SELECT id, email FROM users WHERE is_admin = 0 AND is_blocked = 0')
             recipients = c.fetchall()
         
-        # Send messages
+        # Save every message in one transaction
+        with write_transaction() as write_conn:
+            write_conn.executemany('''INSERT INTO admin_messages (admin_id, recipient_id, subject, message, email_sent)
+                                      VALUES (?, ?, ?, ?, ?)''', 
+                                   [(session['user_id'], recipient[0], subject, message, send_email)
+                                    for recipient in recipients])
+        
+        # Send emails if requested (after the commit, outside the writer lock)
         message_count = 0
         for recipient in recipients:
-            # Save to database
-            c.execute('''INSERT INTO admin_messages (admin_id, recipient_id, subject, message, email_sent)
-                        VALUES (?, ?, ?, ?, ?)''', 
-                     (session['user_id'], recipient[0], subject, message, send_email))
-            
-            # Send email if requested
             if send_email:
                 send_admin_email(recipient[1], subject, message)
             
             message_count += 1
         
-        conn.commit()
-        conn.close();
-        
         log_admin_action(session['user_id'], 'send_message', 'message', None, 
                         f"Sent message '{subject}' to {message_count} users")
         flash(f'Message sent to {message_count} users', 'success')
@@ -3130,7 +2792,7 @@ def admin_messages():
         return redirect(url_for('admin_messages'))
     
     # GET request - show message form and recent messages
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get recent messages
@@ -3145,8 +2807,6 @@ def admin_messages():
     c.execute('SELECT id, username, email FROM users ORDER BY username')
     users = c.fetchall()
     
-    conn.close();
-    
     return render_template('admin/messages.html', recent_messages=recent_messages, users=users)
 
 @app.route('/admin/reports')
@@ -3155,41 +2815,29 @@ def admin_reports():
     """View and handle user reports - optimized version"""
     status_filter = request.args.get('status', 'pending')
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     try:
         # Get reports with limit for performance
-        c.execute('''SELECT r.id, r.reported_type, r.reported_id, r.reason, r.description, 
-                            r.report_date, r.status, u1.username as reporter, u2.username as handler
-                     FROM reports r 
-                     JOIN users u1 ON r.reporter_id = u1.id
-                     LEFT JOIN users u2 ON r.handled_by = u2.id
-                     WHERE r.status = ? OR ? = 'all'
-                     ORDER BY r.report_date DESC
-                     LIMIT 50''', (status_filter, status_filter))
+        if status_filter == 'all':
+            c.execute(SQL_ADMIN_REPORTS)
+        else:
+            c.execute(SQL_ADMIN_REPORTS_BY_STATUS, (status_filter,))
         reports = c.fetchall()
         
-        # Pre-calculate counts for performance
-        c.execute('SELECT COUNT(*) FROM reports WHERE status = "pending"')
-        pending_count = c.fetchone()[0]
-        
-        c.execute('SELECT COUNT(*) FROM reports WHERE status = "resolved"')
-        resolved_count = c.fetchone()[0]
+        c.execute(SQL_ADMIN_REPORT_COUNTS)
+        status_counts = dict(c.fetchall())
         
-        c.execute('SELECT COUNT(*) FROM reports WHERE status = "dismissed"')
-        dismissed_count = c.fetchone()[0]
-        
-        c.execute('SELECT COUNT(*) FROM reports')
-        total_count = c.fetchone()[0]
+        pending_count = status_counts.get('pending', 0)
+        resolved_count = status_counts.get('resolved', 0)
+        dismissed_count = status_counts.get('dismissed', 0)
+        total_count = sum(status_counts.values())
         
     except Exception as e:
         reports = []
         pending_count = resolved_count = dismissed_count = total_count = 0
     
-    finally:
-        conn.close();
-    
     return render_template('admin/reports.html', 
                          reports=reports, 
                          status_filter=status_filter,
@@ -3202,7 +2850,7 @@ def admin_reports():
 @admin_required('basic')
 def admin_analytics():
     """Platform analytics and statistics - ultra fast version"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     try:
@@ -3243,9 +2891,6 @@ def admin_analytics():
         top_videos = []
         active_users = []
     
-    finally:
-        conn.close();
-    
     return render_template('admin/analytics.html', 
                          user_growth=user_growth,
                          video_growth=video_growth,
@@ -3265,19 +2910,16 @@ def admin_handle_report(report_id):
     if status not in ['resolved', 'dismissed']:
         return jsonify({'success': False, 'message': 'Invalid status'}), 400
     
-    conn = sqlite3.connect('tournament.db')
-    c = conn.cursor()
-    
-    # Update report status
-    c.execute('''UPDATE reports SET status = ?, handled_by = ?, handled_date = CURRENT_TIMESTAMP 
-                 WHERE id = ?''', (status, session['user_id'], report_id))
-    
-    # Get report details for logging
-    c.execute('SELECT reason, reported_type, reported_id FROM reports WHERE id = ?', (report_id,))
-    report = c.fetchone()
-    
-    conn.commit()
-    conn.close();
+    with write_transaction() as conn:
+        c = conn.cursor()
+        
+        # Update report status
+        c.execute('''UPDATE reports SET status = ?, handled_by = ?, handled_date = CURRENT_TIMESTAMP 
+                     WHERE id = ?''', (status, session['user_id'], report_id))
+        
+        # Get report details for logging
+        c.execute('SELECT reason, reported_type, reported_id FROM reports WHERE id = ?', (report_id,))
+        report = c.fetchone()
     
     if report:
         log_admin_action(session['user_id'], f'{status}_report', 'report', report_id, 
@@ -3302,7 +2944,7 @@ def admin_delete_user(user_id):
         flash('You cannot delete your own account.', 'error')
         return redirect(url_for('admin_users'))
     
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get user info for logging
@@ -3311,7 +2953,6 @@ def admin_delete_user(user_id):
     
     if not user:
         flash('User not found.', 'error')
-        conn.close()
         return redirect(url_for('admin_users'))
     
     username = user[0]
@@ -3336,27 +2977,26 @@ def admin_delete_user(user_id):
                 os.remove(avatar_path)
         
         # Delete all user data (in correct order to avoid foreign key constraints)
-        c.execute('DELETE FROM comment_likes WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM votes WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM comments WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM admin_messages WHERE recipient_id = ? OR admin_id = ?', (user_id, user_id))
-        c.execute('DELETE FROM admin_logs WHERE admin_id = ?', (user_id,))
-        c.execute('DELETE FROM reports WHERE reporter_id = ? OR handled_by = ?', (user_id, user_id))
-        c.execute('DELETE FROM videos WHERE user_id = ?', (user_id,))
-        c.execute('DELETE FROM users WHERE id = ?', (user_id,))
-        
-        conn.commit()
+        with write_transaction() as write_conn:
+            write_conn.execute('DELETE FROM comment_likes WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM votes WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM comments WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM admin_messages WHERE recipient_id = ? OR admin_id = ?', (user_id, user_id))
+            write_conn.execute('DELETE FROM admin_logs WHERE admin_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM reports WHERE reporter_id = ? OR handled_by = ?', (user_id, user_id))
+            write_conn.execute('DELETE FROM videos WHERE user_id = ?', (user_id,))
+            write_conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
+        
+        invalidate_current_user(user_id)
+        invalidate_listings()
         
         log_admin_action(session['user_id'], 'delete_user', 'user', user_id, 
                         f"Permanently deleted user account: {username}")
         flash(f'User account "{username}" has been permanently deleted.', 'success')
         
     except Exception as e:
-        conn.rollback()
         print(f"Error deleting user {user_id}: {str(e)}")  # Add logging
         flash(f'Error deleting user account: {str(e)}', 'error')
-    finally:
-        conn.close()
     
     return redirect(url_for('admin_users'))
 
@@ -3364,7 +3004,7 @@ def admin_delete_user(user_id):
 @admin_required('basic')
 def admin_delete_video(video_id):
     """Permanently delete a video and all associated data"""
-    conn = sqlite3.connect('tournament.db')
+    conn = get_db()
     c = conn.cursor()
     
     # Get video info for logging
@@ -3373,7 +3013,6 @@ def admin_delete_video(video_id):
     
     if not video:
         flash('Video not found.', 'error')
-        conn.close();
         return redirect(url_for('admin_videos'))
     
     title, filename, user_id = video
@@ -3385,23 +3024,21 @@ def admin_delete_video(video_id):
             os.remove(video_path)
         
         # Delete all video data (in correct order to avoid foreign key constraints)
-        c.execute('DELETE FROM comment_likes WHERE comment_id IN (SELECT id FROM comments WHERE video_id = ?)', (video_id,))
-        c.execute('DELETE FROM comments WHERE video_id = ?', (video_id,))
-        c.execute('DELETE FROM votes WHERE video_id = ?', (video_id,))
-        c.execute('DELETE FROM reports WHERE reported_type = "video" AND reported_id = ?', (video_id,))
-        c.execute('DELETE FROM videos WHERE id = ?', (video_id,))
+        with write_transaction() as write_conn:
+            write_conn.execute('DELETE FROM comment_likes WHERE comment_id IN (SELECT id FROM comments WHERE video_id = ?)', (video_id,))
+            write_conn.execute('DELETE FROM comments WHERE video_id = ?', (video_id,))
+            write_conn.execute('DELETE FROM votes WHERE video_id = ?', (video_id,))
+            write_conn.execute("DELETE FROM reports WHERE reported_type = 'video' AND reported_id = ?", (video_id,))
+            write_conn.execute('DELETE FROM videos WHERE id = ?', (video_id,))
         
-        conn.commit();
+        invalidate_listings()
         
         log_admin_action(session['user_id'], 'delete_video', 'video', video_id, 
                         f"Permanently deleted video: {title}")
         flash(f'Video "{title}" has been permanently deleted.', 'success')
         
     except Exception as e:
-        conn.rollback();
         flash(f'Error deleting video: {str(e)}', 'error')
-    finally:
-        conn.close();
     
     return redirect(url_for('admin_videos'))
 
@@ -3420,63 +3057,60 @@ def admin_settings():
 @admin_required('super')
 def admin_toggle_tournament():
     """Toggle tournament open/close status - affects all participants"""
-    conn = None
     try:
-        conn = sqlite3.connect('tournament.db')
-        c = conn.cursor()
-        
-        # Get current tournament status
-        c.execute('SELECT is_open FROM tournament_settings WHERE id = 1')
-        result = c.fetchone()
-        current_status = result[0] if result else True
-        new_status = not current_status
-        
-        # Initialize participant_count
-        participant_count = 0
-        
-        # Update tournament status
-        c.execute('''UPDATE tournament_settings 
-                    SET is_open = ?, last_updated = CURRENT_TIMESTAMP, updated_by = ?
-                    WHERE id = 1''', (new_status, session['user_id']))
-        
-        if new_status:
-            # Tournament OPENED
-            message = '🟢 Tournament OPENED! Users can now upgrade to participant status.'
-            action_desc = 'Opened tournament - users can now pay $35 to become participants'
-            
-        else:
-            # Tournament CLOSED - downgrade all current participants to regular users
-            c.execute('SELECT COUNT(*) FROM users WHERE is_paid = 1')
-            participant_count = c.fetchone()[0]
+        with write_transaction() as conn:
+            c = conn.cursor()
             
-            if participant_count > 0:
-                # Mark them as was_participant (keep payment history)
-                c.execute('UPDATE users SET was_participant = TRUE WHERE is_paid = 1')
+            # Get current tournament status
+            c.execute('SELECT is_open FROM tournament_settings WHERE id = 1')
+            result = c.fetchone()
+            current_status = result[0] if result else True
+            new_status = not current_status
+            
+            # Initialize participant_count
+            participant_count = 0
+            
+            # Update tournament status
+            c.execute('''UPDATE tournament_settings 
+                        SET is_open = ?, last_updated = CURRENT_TIMESTAMP, updated_by = ?,
+                            generation = generation + 1
+                        WHERE id = 1''', (new_status, session['user_id']))
+            
+            if new_status:
+                # Tournament OPENED
+                message = '🟢 Tournament OPENED! Users can now upgrade to participant status.'
+                action_desc = 'Opened tournament - users can now pay $35 to become participants'
                 
-                # Downgrade to regular users
-                c.execute('UPDATE users SET is_paid = FALSE WHERE is_paid = 1')
-                
-                message = f'🔴 Tournament CLOSED! {participant_count} participants downgraded to regular users. They must pay again when tournament reopens.'
-                action_desc = f'Closed tournament - downgraded {participant_count} participants to regular users'
             else:
-                message = '🔴 Tournament CLOSED! No participants to downgrade.'
-                action_desc = 'Closed tournament - no active participants'
-        
-        # Log admin action
-        c.execute('''INSERT INTO admin_logs (admin_id, action, target_type, target_id, details, timestamp)
-                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''',
-                 (session['user_id'], 'toggle_tournament', 'tournament', 1, action_desc))
-        
-        # Insert into tournament history
-        try:
+                # Tournament CLOSED - downgrade all current participants to regular users
+                c.execute('SELECT COUNT(*) FROM users WHERE is_paid = 1')
+                participant_count = c.fetchone()[0]
+                
+                if participant_count > 0:
+                    # Mark them as was_participant (keep payment history)
+                    c.execute('UPDATE users SET was_participant = TRUE WHERE is_paid = 1')
+                    
+                    # Downgrade to regular users
+                    c.execute('UPDATE users SET is_paid = FALSE WHERE is_paid = 1')
+                    
+                    message = f'🔴 Tournament CLOSED! {participant_count} participants downgraded to regular users. They must pay again when tournament reopens.'
+                    action_desc = f'Closed tournament - downgraded {participant_count} participants to regular users'
+                else:
+                    message = '🔴 Tournament CLOSED! No participants to downgrade.'
+                    action_desc = 'Closed tournament - no active participants'
+            
+            # Log admin action
+            c.execute('''INSERT INTO admin_logs (admin_id, action, target_type, target_id, details, timestamp)
+                        VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)''',
+                     (session['user_id'], 'toggle_tournament', 'tournament', 1, action_desc))
+            
+            # Insert into tournament history
             c.execute('''INSERT INTO tournament_history (status, changed_by, changed_at, participants_affected)
                         VALUES (?, ?, CURRENT_TIMESTAMP, ?)''',
                      ('open' if new_status else 'closed', session['user_id'], participant_count))
-        except sqlite3.OperationalError:
-            # tournament_history table might not have all columns, that's okay
-            pass
         
-        conn.commit()
+        tournament_state.invalidate()
+        invalidate_current_user()  # closing the tournament downgrades every participant
         
         # Return JSON for AJAX request
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -3498,9 +3132,6 @@ def admin_toggle_tournament():
             }), 500
         flash(f'Error toggling tournament: {str(e)}', 'danger')
         return redirect(url_for('admin_dashboard'))
-    finally:
-        if conn:
-            conn.close()
 
 @app.route('/debug/payment_config')
 @login_required
@@ -0,0 +1,181 @@
+"""
+Static Asset Bundles
+The CSS and JS that used to be inlined in the page templates lives under
+static/css and static/js. Each bundle below concatenates some of those
+sources, minifies them and writes static/dist/<bundle>.<content hash>.<ext>,
+so a bundle's URL changes exactly when its content does and browsers keep
+it for good in between (see http_cache).
+
+Templates link bundles with asset_url():
+
+    <link href="{{ asset_url('base.css') }}" rel="stylesheet">
+    <script src="{{ asset_url('video_detail.js') }}"></script>
+
+Bundles are built on first use and rebuilt when a source changes on disk;
+run "python assets.py" during a deploy to build them ahead of time.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = 'dist'
+
+# bundle name -> source files under static/, concatenated in order
+BUNDLES = {
+    'base.css': ['css/base.css'],
+    'base.js': ['js/base.js', 'js/search_box.js'],
+    'index.js': ['js/index.js'],
+    'videos.js': ['js/load_more.js', 'js/videos.js'],
+    'search.js': ['js/load_more.js', 'js/search.js'],
+    'video_detail.css': ['css/video_detail.css'],
+    'video_detail.js': ['js/load_more.js', 'js/video_detail.js'],
+    'upgrade_mobile.css': ['css/upgrade_mobile.css'],
+    'upgrade_mobile.js': ['js/upgrade_mobile.js'],
+    'pay_voting_fee.css': ['css/pay_voting_fee.css'],
+    'pay_voting_fee.js': ['js/pay_voting_fee.js'],
+}
+
+# Strings are matched first so comment markers inside them are left alone
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(source):
+    """Drop comments and redundant whitespace from a stylesheet"""
+    pieces = []
+    last = 0
+    for match in _CSS_TOKENS.finditer(source):
+        pieces.append(_squeeze_css(source[last:match.start()]))
+        pieces.append(match.group(1) or '')
+        last = match.end()
+    pieces.append(_squeeze_css(source[last:]))
+    return ''.join(pieces).strip()
+
+
+def _squeeze_css(text):
+    return _CSS_PUNCTUATION.sub(r'\1', _CSS_SPACE.sub(' ', text)).replace(';}', '}')
+
+
+def _ends_inside_template(line, inside):
+    """Whether a script line leaves a `template literal` open (given whether it starts in one)"""
+    quote = '`' if inside else None
+    i = 0
+    while i < len(line):
+        char = line[i]
+        if char == '\\':
+            i += 2
+            continue
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"`':
+            quote = char
+        elif line.startswith('//', i):
+            break
+        i += 1
+    return quote == '`'
+
+
+def minify_js(source):
+    """
+    Conservative script minification: strips indentation, blank lines and
+    whole-line // comments, but never joins lines, so automatic semicolon
+    insertion behaves exactly as before. Lines inside a multi-line template
+    literal are its content and are kept untouched.
+    """
+    lines = []
+    inside = False
+    for line in source.splitlines():
+        if inside:
+            lines.append(line)
+        elif _ends_inside_template(line, inside):
+            lines.append(line.lstrip())  # trailing spaces already belong to the literal
+        else:
+            stripped = line.strip()
+            if stripped and not stripped.startswith('//'):
+                lines.append(stripped)
+        inside = _ends_inside_template(line, inside)
+    return '\n'.join(lines)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+class AssetBundles:
+    """
+    Per-process builder and URL lookup for BUNDLES
+
+    Args:
+        static_url: Callable building the URL of a file under static/
+        directory: The app's static folder
+        bundles: {bundle name: [source paths]}
+        check_interval: Seconds between mtime checks of a bundle's sources
+    """
+
+    def __init__(self, static_url, directory=STATIC_DIR, bundles=None, check_interval=2.0):
+        self.static_url = static_url
+        self.directory = directory
+        self.bundles = BUNDLES if bundles is None else bundles
+        self.check_interval = check_interval
+        self._built = {}  # name -> (source mtimes, checked_at, dist filename)
+        self._lock = threading.Lock()
+
+    def _mtimes(self, sources):
+        return tuple(os.stat(os.path.join(self.directory, source)).st_mtime_ns for source in sources)
+
+    def build(self, name):
+        """
+        Minify a bundle and write it under static/dist/ (unless an identical build exists)
+
+        Returns:
+            str: The bundle's path relative to static/
+        """
+        sources = self.bundles[name]
+        stem, ext = os.path.splitext(name)
+        parts = []
+        for source in sources:
+            with open(os.path.join(self.directory, source), 'r', encoding='utf-8') as f:
+                parts.append(f.read())
+        content = MINIFIERS[ext]('\n'.join(parts)).encode('utf-8')
+
+        filename = f'{DIST_DIR}/{stem}.{hashlib.sha1(content).hexdigest()[:12]}{ext}'
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written under a temporary name and renamed, so no request sees half a file
+            temporary = f'{path}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(content)
+            os.replace(temporary, path)
+        return filename
+
+    def filename(self, name):
+        """Current built filename of a bundle (rebuilt if its sources changed)"""
+        entry = self._built.get(name)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] < self.check_interval:
+            return entry[2]
+
+        with self._lock:
+            mtimes = self._mtimes(self.bundles[name])
+            entry = self._built.get(name)
+            filename = entry[2] if entry is not None and entry[0] == mtimes else self.build(name)
+            self._built[name] = (mtimes, now, filename)
+            return filename
+
+    def url(self, name):
+        """URL of a bundle for templates (asset_url)"""
+        return self.static_url(self.filename(name))
+
+    def build_all(self):
+        return [self.build(name) for name in self.bundles]
+
+
+if __name__ == '__main__':
+    for filename in AssetBundles(static_url=lambda path: path).build_all():
+        size = os.path.getsize(os.path.join(STATIC_DIR, filename))
+        print(f"✅ Built static/{filename} ({size:,} bytes)")
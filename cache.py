@@ -0,0 +1,463 @@
+"""
+In-Process Caching
+Small thread-safe TTL cache for values that are read on almost every request
+but change rarely (the logged-in user's row, listing pages, ...).
+
+TTLCache entries live in the worker process that created them, so they get a
+short TTL: another worker's writes become visible once it expires, and the
+writing worker invalidates its own copy immediately. SharedCache (below)
+keeps its entries where every worker can see them.
+"""
+import pickle
+import socket
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Dict-like cache whose entries expire ttl seconds after they were stored
+
+    Args:
+        ttl: Seconds an entry stays valid
+        max_entries: Least recently stored entries are evicted beyond this
+    """
+
+    def __init__(self, ttl, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                # Only drop it if nobody stored a fresh value meanwhile
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            return default
+        return value
+
+    def set(self, key, value, ttl=None):
+        """Store a value for ttl seconds (the cache's ttl by default)"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        """Return the cached value, or call loader() and cache what it returns (None is not cached)"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# --- Shared caches ---------------------------------------------------------
+# A TTLCache is private to its worker. SharedCache keeps its entries in a
+# backend that several workers can reach, so a result computed by one
+# gunicorn/Passenger worker serves all of them:
+#
+#     memory://                   this process only (the default)
+#     sqlite:///path/cache.db     shared by every worker on the host
+#     redis://host:6379/0         shared by every host
+#
+# Backends store pickled bytes with an expiry, and offer bulk get/set, an
+# atomic add() (used as a rebuild lock) and an atomic incr() for the
+# never-expiring generation counters that invalidate a whole cache.
+
+class MemoryBackend:
+    """Backend holding entries in this process"""
+
+    def __init__(self):
+        self._entries = {}  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get_many(self, keys):
+        now = time.time()
+        found = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, items, ttl):
+        expires_at = time.time() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+
+    def add(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._entries[key] = (now + ttl, value)
+            # Adds are rare (one per rebuild), so expired entries are swept here
+            for stale in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[stale]
+            return True
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            value = int(entry[1]) + 1 if entry is not None else 1
+            self._entries[key] = (float('inf'), str(value).encode())
+            return value
+
+
+class SQLiteBackend:
+    """
+    Backend storing entries in a SQLite file shared by the workers of one host
+
+    Args:
+        path: Cache database file (created on first use)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('''CREATE TABLE IF NOT EXISTS cache_entries
+                            (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)''')
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        rows = self._conn().execute(
+            f"SELECT key, value FROM cache_entries WHERE key IN ({', '.join('?' * len(keys))}) AND expires_at > ?",
+            keys + [time.time()])
+        return {key: bytes(value) for key, value in rows}
+
+    def set_many(self, items, ttl):
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                             [(key, value, now + ttl) for key, value in items.items()])
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def add(self, key, value, ttl):
+        now = time.time()
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Adds are rare (one per rebuild), so expired entries are swept here
+            conn.execute('DELETE FROM cache_entries WHERE expires_at <= ?', (now,))
+            cursor = conn.execute('INSERT OR IGNORE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                                  (key, value, now + ttl))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return cursor.rowcount == 1
+
+    def delete_many(self, keys):
+        self._conn().executemany('DELETE FROM cache_entries WHERE key = ?', [(key,) for key in keys])
+
+    def incr(self, key):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT value FROM cache_entries WHERE key = ?', (key,)).fetchone()
+            value = int(bytes(row[0])) + 1 if row else 1
+            conn.execute('INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                         (key, str(value).encode(), float('inf')))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+
+class RedisBackend:
+    """
+    Backend speaking the Redis protocol (RESP) directly over a socket, so no
+    client library is needed; one connection per thread
+
+    Args:
+        host, port: Server address
+        db: Database number (SELECT)
+        password: Sent with AUTH when set
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(self, host='localhost', port=6379, db=0, password=None, timeout=2.0):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection(self.address, timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.password:
+                self._call(('AUTH', self.password))
+            if self.db:
+                self._call(('SELECT', self.db))
+        return conn
+
+    def _pipeline(self, commands):
+        """Send several commands in one write and read their replies in order"""
+        sock, reader = self._connection()
+        payload = bytearray()
+        for command in commands:
+            payload += b'*%d\r\n' % len(command)
+            for arg in command:
+                if not isinstance(arg, bytes):
+                    arg = str(arg).encode()
+                payload += b'$%d\r\n%s\r\n' % (len(arg), arg)
+        try:
+            sock.sendall(payload)
+            return [self._reply(reader) for _ in commands]
+        except (OSError, ConnectionError):
+            self._close()
+            raise
+
+    def _call(self, command):
+        return self._pipeline([command])[0]
+
+    def _reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError('Redis connection closed')
+        kind, rest = line[:1], line[1:-2]
+        if kind == b'+':
+            return rest.decode()
+        if kind == b'-':
+            raise RuntimeError(f'Redis error: {rest.decode()}')
+        if kind == b':':
+            return int(rest)
+        if kind == b'$':
+            length = int(rest)
+            return None if length < 0 else reader.read(length + 2)[:-2]
+        if kind == b'*':
+            length = int(rest)
+            return None if length < 0 else [self._reply(reader) for _ in range(length)]
+        raise ConnectionError(f'Unexpected Redis reply: {line!r}')
+
+    def _close(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self._call(['MGET'] + keys)
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    def set_many(self, items, ttl):
+        milliseconds = max(int(ttl * 1000), 1)
+        self._pipeline([('SET', key, value, 'PX', milliseconds) for key, value in items.items()])
+
+    def add(self, key, value, ttl):
+        return self._call(('SET', key, value, 'PX', max(int(ttl * 1000), 1), 'NX')) == 'OK'
+
+    def delete_many(self, keys):
+        keys = list(keys)
+        if keys:
+            self._call(['DEL'] + keys)
+
+    def incr(self, key):
+        return self._call(('INCR', key))
+
+
+def backend_from_url(url):
+    """
+    Build a cache backend from a URL (memory://, sqlite:///path, redis://[:password@]host:port/db)
+
+    Returns:
+        Backend instance
+    """
+    parsed = urllib.parse.urlparse(url or 'memory://')
+    if parsed.scheme == 'memory':
+        return MemoryBackend()
+    if parsed.scheme == 'sqlite':
+        return SQLiteBackend(parsed.path[1:] if parsed.path.startswith('/') else parsed.path or 'cache.db')
+    if parsed.scheme == 'redis':
+        return RedisBackend(parsed.hostname or 'localhost', parsed.port or 6379,
+                            db=int(parsed.path.strip('/') or 0), password=parsed.password)
+    raise ValueError(f'Unsupported cache URL: {url}')
+
+
+class SharedCache:
+    """
+    Cache on a (possibly shared) backend, with versioned keys and
+    single-flight reloads
+
+    Entries stay fresh for ttl seconds, then are kept stale_ttl seconds more.
+    When an entry goes stale, the first worker to take its rebuild lock
+    reloads it while the others keep serving the stale value; when it is
+    missing, the others wait (up to lock_ttl) for that worker's result.
+
+    clear() bumps a generation counter that is part of every key instead of
+    deleting entries: old entries simply stop being looked up and expire on
+    their own, and a rebuild that was already running when clear() was
+    called stores its result under the old generation, where nobody reads it.
+
+    Args:
+        backend: MemoryBackend, SQLiteBackend or RedisBackend
+        namespace: Prefix separating this cache's keys from other caches
+        ttl: Seconds an entry is fresh
+        stale_ttl: Seconds a stale entry may still be served during a rebuild
+        lock_ttl: Seconds a rebuild lock is held at most
+        version: Part of every key; bump it when the cached values change shape
+    """
+
+    POLL_SECONDS = 0.05
+
+    def __init__(self, backend, namespace, ttl, stale_ttl=60, lock_ttl=10, version='1'):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_ttl = lock_ttl
+        self.prefix = f'{namespace}:v{version}:'
+        self._generation_key = f'generation:{self.prefix}'
+
+    def _generation(self):
+        raw = self.backend.get_many([self._generation_key]).get(self._generation_key)
+        return 0 if raw is None else int(raw)
+
+    def _key(self, key, generation):
+        if isinstance(key, tuple):
+            key = ':'.join(str(part) for part in key)
+        return f'{self.prefix}g{generation}:{key}'
+
+    def _decode(self, raw):
+        return pickle.loads(raw)  # (fresh_until, value)
+
+    def _encode(self, value):
+        return pickle.dumps((time.time() + self.ttl, value), pickle.HIGHEST_PROTOCOL)
+
+    def get(self, key, default=None):
+        """Cached value, fresh or stale, or default"""
+        name = self._key(key, self._generation())
+        raw = self.backend.get_many([name]).get(name)
+        return default if raw is None else self._decode(raw)[1]
+
+    def get_many(self, keys):
+        """
+        Bulk get in one backend round trip
+
+        Returns:
+            dict: {key: value} for the keys that are cached (fresh or stale)
+        """
+        generation = self._generation()
+        names = {self._key(key, generation): key for key in keys}
+        return {names[name]: self._decode(raw)[1]
+                for name, raw in self.backend.get_many(list(names)).items()}
+
+    def set(self, key, value):
+        self.set_many({key: value})
+
+    def set_many(self, items):
+        """Bulk set in one backend round trip"""
+        generation = self._generation()
+        self._store({self._key(key, generation): value for key, value in items.items()})
+
+    def _store(self, named_values):
+        self.backend.set_many({name: self._encode(value) for name, value in named_values.items()},
+                              self.ttl + self.stale_ttl)
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached value, or reload it with loader() - in one worker
+        at a time (None is not cached)
+        """
+        # The key is fixed before loading, so a clear() during the load
+        # leaves the result under a generation nobody reads any more
+        name = self._key(key, self._generation())
+        raw = self.backend.get_many([name]).get(name)
+        if raw is not None:
+            fresh_until, value = self._decode(raw)
+            if fresh_until > time.time() or not self._lock(name):
+                return value
+            return self._reload(name, loader)
+
+        deadline = time.monotonic() + self.lock_ttl
+        while not self._lock(name):
+            if time.monotonic() >= deadline:
+                return loader()  # the rebuilding worker is stuck; don't wait on it any longer
+            time.sleep(self.POLL_SECONDS)
+            raw = self.backend.get_many([name]).get(name)
+            if raw is not None:
+                return self._decode(raw)[1]
+        return self._reload(name, loader)
+
+    def _lock(self, name):
+        return self.backend.add(f'lock:{name}', b'1', self.lock_ttl)
+
+    def _reload(self, name, loader):
+        try:
+            # Another worker may have finished its rebuild (and released the
+            # lock) between our lookup and taking the lock
+            raw = self.backend.get_many([name]).get(name)
+            if raw is not None:
+                fresh_until, value = self._decode(raw)
+                if fresh_until > time.time():
+                    return value
+            value = loader()
+            if value is not None:
+                self._store({name: value})
+            return value
+        finally:
+            self.backend.delete_many([f'lock:{name}'])
+
+    def delete(self, key):
+        self.backend.delete_many([self._key(key, self._generation())])
+
+    def clear(self):
+        """Invalidate every entry of this cache (for the current key version) in O(1)"""
+        self.backend.incr(self._generation_key)
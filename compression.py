@@ -0,0 +1,179 @@
+"""
+Response Compression
+Compresses HTML/JSON/text responses above a size threshold with brotli (when
+the brotli package is installed) or gzip, whichever the client accepts, and
+serves precompressed .br/.gz variants of static files.
+
+Build the static variants after deploying new assets:
+
+    python compression.py            (compress files under static/)
+    python compression.py --clean    (remove the variants again)
+
+A variant is only served while it is at least as new as its source file, so
+a stale build falls back to the uncompressed file instead of old content.
+"""
+import gzip
+import os
+import sys
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+COMPRESSIBLE_MIMETYPES = {
+    'text/html', 'text/plain', 'text/css', 'text/javascript', 'application/javascript',
+    'application/json', 'image/svg+xml',
+}
+# Static files worth precompressing; uploads and images are already compressed
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.json', '.svg', '.html', '.txt')
+
+# (encoding, file suffix), preferred first
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')] if BROTLI_AVAILABLE else [('gzip', '.gz')]
+
+
+def compress(data, encoding, gzip_level=6, brotli_quality=5):
+    """Compress bytes with 'br' or 'gzip' (gzip output carries no timestamp, so equal input -> equal bytes)"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    return gzip.compress(data, compresslevel=gzip_level, mtime=0)
+
+
+def accepted_encodings(request):
+    """Encodings from ENCODINGS the client accepts, preferred first"""
+    return [(encoding, suffix) for encoding, suffix in ENCODINGS
+            if request.accept_encodings[encoding] > 0]
+
+
+def compress_response(response, request, min_size=1024, gzip_level=6, brotli_quality=5):
+    """
+    Compress a response body in place when it is worth it
+
+    Args:
+        response: Outgoing response
+        request: Incoming request (for Accept-Encoding)
+        min_size: Smaller bodies are sent as they are
+        gzip_level: zlib level 1-9
+        brotli_quality: brotli quality 0-11
+
+    Returns:
+        Response: The same response
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    # The body depends on Accept-Encoding whether or not this client gets it compressed
+    response.vary.add('Accept-Encoding')
+
+    if ('Content-Encoding' in response.headers or response.direct_passthrough or response.is_streamed
+            or response.status_code < 200 or response.status_code in (204, 206, 304)):
+        return response
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+    encodings = accepted_encodings(request)
+    if not encodings:
+        return response
+
+    encoding = encodings[0][0]
+    response.set_data(compress(data, encoding, gzip_level, brotli_quality))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def compress_variants(data, min_size=1024, gzip_level=6, brotli_quality=5):
+    """
+    Compress a body once per encoding, for bodies that are cached and sent
+    many times (see pick_variant)
+
+    Returns:
+        dict: {encoding: compressed bytes}, without encodings that don't shrink it
+    """
+    if len(data) < min_size:
+        return {}
+    variants = {}
+    for encoding, _ in ENCODINGS:
+        compressed = compress(data, encoding, gzip_level, brotli_quality)
+        if len(compressed) < len(data):
+            variants[encoding] = compressed
+    return variants
+
+
+def pick_variant(variants, request):
+    """
+    Choose the variant from compress_variants() the client accepts
+
+    Returns:
+        tuple: (encoding, compressed bytes), or None to send the body as it is
+    """
+    for encoding, _ in accepted_encodings(request):
+        if encoding in variants:
+            return encoding, variants[encoding]
+    return None
+
+
+def precompressed_variant(request, directory, filename):
+    """
+    Find a fresh .br/.gz variant of a static file the client accepts
+
+    Returns:
+        tuple: (variant filename, encoding), or None
+    """
+    path = safe_join(directory, filename)
+    if path is None:
+        return None
+    try:
+        source_mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    for encoding, suffix in accepted_encodings(request):
+        try:
+            if os.stat(path + suffix).st_mtime_ns >= source_mtime:
+                return filename + suffix, encoding
+        except OSError:
+            continue
+    return None
+
+
+def build_static_variants(directory=STATIC_DIR, min_size=1024, clean=False):
+    """
+    Write (or with clean=True, remove) .gz and .br variants next to static files
+
+    Returns:
+        int: Number of variant files written or removed
+    """
+    suffixes = ('.gz', '.br')
+    count = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if name.endswith(suffixes):
+                if clean:
+                    os.remove(path)
+                    count += 1
+                continue
+            if clean or not name.endswith(PRECOMPRESS_EXTENSIONS) or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            for encoding, suffix in ENCODINGS:
+                # Strongest settings: this runs once per deploy, not per request
+                compressed = compress(data, encoding, gzip_level=9, brotli_quality=11)
+                if len(compressed) >= len(data):
+                    continue
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+                count += 1
+    return count
+
+
+if __name__ == '__main__':
+    clean = '--clean' in sys.argv[1:]
+    count = build_static_variants(clean=clean)
+    print(f"✅ {'Removed' if clean else 'Wrote'} {count} precompressed static files")
+    if not BROTLI_AVAILABLE and not clean:
+        print("ℹ️  brotli not installed - only .gz variants were written (pip install brotli)")
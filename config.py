@@ -77,9 +77,88 @@ class Config:
     # Database
     DATABASE_URL = os.environ.get('DATABASE_URL') or 'sqlite:///tournament.db'
     
+    # SQLite connection tuning (applied once per pooled connection)
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 16384))  # 16MB page cache
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))  # 128MB
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_STATEMENT_CACHE_SIZE = 256
+    
+    # Read/write split: GET requests read through read-only connections and
+    # writes are serialized through database.write_transaction(). A write lock
+    # held by another process is retried with exponential backoff (about 5s in all).
+    DB_READ_ONLY_REQUESTS = os.environ.get('DB_READ_ONLY_REQUESTS', 'true').lower() == 'true'
+    SQLITE_WRITE_RETRIES = int(os.environ.get('SQLITE_WRITE_RETRIES', 8))
+    SQLITE_WRITE_RETRY_DELAY_MS = int(os.environ.get('SQLITE_WRITE_RETRY_DELAY_MS', 20))
+    
+    # Write-behind buffer for video views, login statistics and admin logs
+    # (see write_buffer.py). Crash policy: drop, spool or sync. With spool each
+    # process writes WRITE_BUFFER_SPOOL_PATH.<pid>.<token>
+    WRITE_BUFFER_FLUSH_INTERVAL_MS = int(os.environ.get('WRITE_BUFFER_FLUSH_INTERVAL_MS', 500))
+    WRITE_BUFFER_MAX_RECORDS = int(os.environ.get('WRITE_BUFFER_MAX_RECORDS', 200))
+    WRITE_BUFFER_CRASH_POLICY = os.environ.get('WRITE_BUFFER_CRASH_POLICY', 'drop').lower()
+    WRITE_BUFFER_SPOOL_PATH = os.environ.get('WRITE_BUFFER_SPOOL_PATH', 'write_buffer.spool')
+    
+    # PostgreSQL connection pool (used when DATABASE_URL is postgres://...)
+    DB_POOL_MIN_CONNECTIONS = int(os.environ.get('DB_POOL_MIN_CONNECTIONS', 1))
+    DB_POOL_MAX_CONNECTIONS = int(os.environ.get('DB_POOL_MAX_CONNECTIONS', 10))
+    DB_POOL_TIMEOUT_SECONDS = float(os.environ.get('DB_POOL_TIMEOUT_SECONDS', 10))
+    
     # File Upload Settings
     ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'wmv', 'flv', 'webm', 'jpg', 'jpeg', 'png', 'gif'}
     
     # App Settings
     VIDEOS_PER_PAGE = 12
+    COMMENTS_PER_PAGE = 20
+    REPLY_PREVIEWS_PER_COMMENT = 3
+    REPLIES_PER_PAGE = 10
+    LEADERBOARD_PER_PAGE = 50
+    LEADERBOARD_API_MAX_PER_PAGE = 100
+    # Admin user/video consoles count matching rows up to this many ("10,000+" beyond)
+    # and reuse a count for this many seconds
+    ADMIN_COUNT_CAP = int(os.environ.get('ADMIN_COUNT_CAP', 10000))
+    ADMIN_COUNT_CACHE_SECONDS = float(os.environ.get('ADMIN_COUNT_CACHE_SECONDS', 60))
+    # Search box typeahead: suggestions shown, how many of the most relevant matching
+    # videos are re-ranked by votes to pick them, and the shortest word matched as a
+    # prefix (bounds on the work per keystroke)
+    SEARCH_SUGGESTIONS = 8
+    SEARCH_SUGGEST_CANDIDATES = int(os.environ.get('SEARCH_SUGGEST_CANDIDATES', 500))
+    SEARCH_SUGGEST_MIN_LENGTH = int(os.environ.get('SEARCH_SUGGEST_MIN_LENGTH', 3))
+    # Seconds a worker may reuse the first page of results / suggestions for a query
+    SEARCH_CACHE_TTL_SECONDS = float(os.environ.get('SEARCH_CACHE_TTL_SECONDS', 30))
+    # Seconds a worker may serve the logged-in user's row from its cache
+    CURRENT_USER_CACHE_TTL_SECONDS = float(os.environ.get('CURRENT_USER_CACHE_TTL_SECONDS', 10))
+    # Where listing/page caches live: memory:// (each worker), sqlite:///cache.db
+    # (shared by the workers on one host) or redis://[:password@]host:6379/0
+    CACHE_URL = os.environ.get('CACHE_URL', 'memory://')
+    # Part of every shared cache key; bump it when cached values change shape
+    CACHE_KEY_VERSION = os.environ.get('CACHE_KEY_VERSION', '3')
+    # Seconds an expired entry is still served while one worker rebuilds it
+    CACHE_STALE_SECONDS = float(os.environ.get('CACHE_STALE_SECONDS', 60))
+    # Seconds a worker may hold an entry's rebuild lock
+    CACHE_LOCK_SECONDS = float(os.environ.get('CACHE_LOCK_SECONDS', 10))
+    # Seconds a worker may serve homepage/listing data (and anonymous pages) from memory;
+    # votes and moderation actions invalidate it earlier
+    LISTING_CACHE_TTL_SECONDS = float(os.environ.get('LISTING_CACHE_TTL_SECONDS', 30))
+    # Fingerprinted static files (?v=<content hash>) are cached by browsers for this long;
+    # files above the size limit (uploaded videos) are not hashed and only get validators
+    STATIC_IMMUTABLE_MAX_AGE_SECONDS = int(os.environ.get('STATIC_IMMUTABLE_MAX_AGE_SECONDS', 31536000))
+    STATIC_FINGERPRINT_MAX_BYTES = int(os.environ.get('STATIC_FINGERPRINT_MAX_BYTES', 5 * 1024 * 1024))
+    STATIC_FINGERPRINT_CHECK_SECONDS = float(os.environ.get('STATIC_FINGERPRINT_CHECK_SECONDS', 2))
+    # Seconds between checks of the tournament settings row's generation, and the
+    # longest a worker keeps the row without reloading it
+    TOURNAMENT_STATE_CHECK_SECONDS = float(os.environ.get('TOURNAMENT_STATE_CHECK_SECONDS', 1))
+    TOURNAMENT_STATE_MAX_AGE_SECONDS = float(os.environ.get('TOURNAMENT_STATE_MAX_AGE_SECONDS', 60))
+    # Media delivery: CDN origins for local /static files and for public S3 objects (empty = serve
+    # directly), presigned S3 URL lifetime (0 = public URLs) and how long resolved URLs are memoized
+    STATIC_CDN_URL = os.environ.get('STATIC_CDN_URL', '')
+    MEDIA_CDN_URL = os.environ.get('MEDIA_CDN_URL', '')
+    S3_PRESIGNED_URL_SECONDS = int(os.environ.get('S3_PRESIGNED_URL_SECONDS', 0))
+    S3_PRESIGNED_URL_MARGIN_SECONDS = int(os.environ.get('S3_PRESIGNED_URL_MARGIN_SECONDS', 60))
+    MEDIA_URL_CACHE_SECONDS = float(os.environ.get('MEDIA_URL_CACHE_SECONDS', 300))
+    # Response compression (brotli when installed, else gzip) for text bodies of at least this size
+    COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    # Seconds between checks of the translation JSON files for edits
+    TRANSLATIONS_RELOAD_CHECK_SECONDS = float(os.environ.get('TRANSLATIONS_RELOAD_CHECK_SECONDS', 2))
     PARTICIPANT_FEE = 3500  # $35 in cents
\ No newline at end of file
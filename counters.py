@@ -0,0 +1,119 @@
+"""
+Denormalized Counter Reconciliation
+Checks the stored counters and rating aggregates (kept up to date by the
+triggers from migrations 5, 6 and 8) against the rows they summarize, and
+rebuilds any that drifted - e.g. after rows were edited by hand or restored
+from an older backup.
+
+Run with: python counters.py            (report drift and fix it)
+          python counters.py --check    (report only)
+"""
+import sys
+import database
+from migrations import LEADERBOARD_ORDER, leaderboard_total
+
+# (table, counter column, query counting the rows it should hold for table.id)
+COUNTERS = [
+    ('comments', 'reply_count', 'SELECT COUNT(*) FROM comments replies WHERE replies.parent_id = comments.id'),
+    ('comments', 'like_count', 'SELECT COUNT(*) FROM comment_likes WHERE comment_likes.comment_id = comments.id'),
+    ('comments', 'dislike_count',
+     'SELECT COUNT(*) FROM comment_dislikes WHERE comment_dislikes.comment_id = comments.id'),
+    ('videos', 'comment_count', 'SELECT COUNT(*) FROM comments WHERE comments.video_id = videos.id'),
+    ('users', 'video_count', 'SELECT COUNT(*) FROM videos WHERE videos.user_id = users.id'),
+    ('videos', 'rating_sum', 'SELECT COALESCE(SUM(rating), 0) FROM votes WHERE votes.video_id = videos.id'),
+    ('videos', 'rating_count', 'SELECT COUNT(rating) FROM votes WHERE votes.video_id = videos.id'),
+    ('leaderboard', 'video_count', leaderboard_total('video_count')),
+    ('leaderboard', 'total_votes', leaderboard_total('total_votes')),
+]
+
+# (table, column, expression it is derived from) - checked after COUNTERS are
+# rebuilt, and compared with a tolerance because REAL columns round
+DERIVED = [
+    ('videos', 'average_rating',
+     'CASE WHEN rating_count > 0 THEN rating_sum * 1.0 / rating_count ELSE 0.0 END'),
+    ('leaderboard', 'avg_rating', f"({leaderboard_total('avg_rating')})"),
+]
+DERIVED_TOLERANCE = 0.0001
+
+# (table, rank column, key column, ORDER BY the ranks follow) - checked and
+# renumbered last, once the values they are ordered by are right
+RANKS = [
+    ('leaderboard', 'rank', 'user_id', LEADERBOARD_ORDER),
+]
+
+
+def find_drift(conn):
+    """
+    Count the rows whose stored counters disagree with the rows they count
+
+    Returns:
+        dict: {'table.column': number_of_wrong_rows} for every counter
+    """
+    drift = {}
+    for table, column, actual in COUNTERS:
+        drift[f'{table}.{column}'] = conn.execute(
+            f'SELECT COUNT(*) FROM {table} WHERE {column} <> ({actual})').fetchone()[0]
+    for table, column, expression in DERIVED:
+        drift[f'{table}.{column}'] = conn.execute(
+            f'SELECT COUNT(*) FROM {table} WHERE {_derived_mismatch(column, expression)}').fetchone()[0]
+    for table, column, key, order in RANKS:
+        drift[f'{table}.{column}'] = conn.execute(
+            f'SELECT COUNT(*) FROM {_expected_ranks(table, column, key, order)} '
+            f'WHERE stored <> expected').fetchone()[0]
+    return drift
+
+
+def _derived_mismatch(column, expression):
+    return f'ABS(COALESCE({column}, 0) - ({expression})) > {DERIVED_TOLERANCE}'
+
+
+def _expected_ranks(table, column, key, order):
+    return (f'(SELECT {key}, {column} AS stored, ROW_NUMBER() OVER (ORDER BY {order}) AS expected '
+            f'FROM {table}) ranks')
+
+
+def reconcile(conn):
+    """
+    Rebuild every counter that drifted, in one transaction
+
+    Returns:
+        dict: {'table.column': number_of_rows_fixed}
+    """
+    fixed = {}
+    try:
+        for table, column, actual in COUNTERS:
+            cursor = conn.execute(
+                f'UPDATE {table} SET {column} = ({actual}) WHERE {column} <> ({actual})')
+            fixed[f'{table}.{column}'] = cursor.rowcount
+        for table, column, expression in DERIVED:
+            cursor = conn.execute(
+                f'UPDATE {table} SET {column} = {expression} WHERE {_derived_mismatch(column, expression)}')
+            fixed[f'{table}.{column}'] = cursor.rowcount
+        for table, column, key, order in RANKS:
+            cursor = conn.execute(
+                f'UPDATE {table} SET {column} = ranks.expected FROM {_expected_ranks(table, column, key, order)} '
+                f'WHERE ranks.{key} = {table}.{key} AND ranks.stored <> ranks.expected')
+            fixed[f'{table}.{column}'] = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return fixed
+
+
+def main(argv):
+    check_only = '--check' in argv
+    conn = database.connect()
+    try:
+        results = find_drift(conn) if check_only else reconcile(conn)
+    finally:
+        conn.close()
+
+    verb = 'out of step' if check_only else 'fixed'
+    for name, rows in results.items():
+        print(f"{'✅' if rows == 0 else '⚠️ '} {name}: {rows} rows {verb}")
+    return 1 if check_only and any(results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+"""
+HTTP Caching Policies
+Decides the Cache-Control headers of every response:
+
+    immutable   -> fingerprinted static files (url_for('static') adds ?v=<content hash>);
+                   browsers keep them for a year without asking again
+    revalidate  -> public pages: stored, but checked with an ETag on every use;
+                   an unchanged page costs a 304 with no body
+    no-store    -> everything else (accounts, payments, admin): never stored
+
+Views opt in with the @cache_policy('revalidate') decorator; anything
+without one keeps no-store.
+"""
+import hashlib
+import os
+import threading
+import time
+from functools import wraps
+
+POLICIES = ('immutable', 'revalidate', 'no-store')
+NO_STORE = 'no-cache, no-store, must-revalidate, max-age=0'
+
+
+def cache_policy(name):
+    """Set the caching policy of a view (see POLICIES)"""
+    if name not in POLICIES:
+        raise ValueError(f'Unknown cache policy: {name}')
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, **kwargs)
+        decorated_function.cache_policy = name
+        return decorated_function
+    return decorator
+
+
+class StaticFingerprints:
+    """
+    Per-process cache of static file content hashes
+
+    Args:
+        directory: The app's static folder
+        max_bytes: Larger files (uploaded videos) are not hashed; they are
+            served with validators only
+        check_interval: Seconds between mtime checks of a file
+    """
+
+    def __init__(self, directory, max_bytes=5 * 1024 * 1024, check_interval=2.0):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.check_interval = check_interval
+        self._hashes = {}  # filename -> (mtime_ns, size, checked_at, digest)
+        self._lock = threading.Lock()
+
+    def _hash(self, path):
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(65536), b''):
+                digest.update(block)
+        return digest.hexdigest()[:12]
+
+    def get(self, filename):
+        """
+        Short content hash of a static file
+
+        Returns:
+            str: Hash, or None for missing or too-large files
+        """
+        entry = self._hashes.get(filename)
+        now = time.monotonic()
+        if entry is not None and now - entry[2] < self.check_interval:
+            return entry[3]
+
+        path = os.path.join(self.directory, filename)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size > self.max_bytes:
+            return None
+
+        with self._lock:
+            if entry is None or entry[:2] != (stat.st_mtime_ns, stat.st_size):
+                try:
+                    digest = self._hash(path)
+                except OSError:
+                    return None
+            else:
+                digest = entry[3]
+            self._hashes[filename] = (stat.st_mtime_ns, stat.st_size, now, digest)
+            return digest
+
+
+PAGE_VARY = ('Cookie', 'Accept-Language')
+
+
+def apply_policy(response, request, policy, private=False, vary=PAGE_VARY, immutable_max_age=31536000):
+    """
+    Set caching headers on a response (and turn it into a 304 when the
+    client's validators match)
+
+    Args:
+        response: Outgoing response
+        request: Incoming request
+        policy: One of POLICIES
+        private: Page differs per user, so shared caches must not store it
+        vary: Request headers a revalidated response depends on
+        immutable_max_age: Seconds fingerprinted files are kept
+    """
+    if policy == 'immutable':
+        response.headers['Cache-Control'] = f'public, max-age={immutable_max_age}, immutable'
+    elif policy == 'revalidate':
+        response.headers['Cache-Control'] = f"{'private' if private else 'public'}, no-cache"
+        response.vary.update(vary)
+        if (request.method in ('GET', 'HEAD') and response.status_code == 200
+                and not response.is_streamed and not response.direct_passthrough):
+            response.add_etag()
+            response.make_conditional(request)
+    else:
+        response.headers['Cache-Control'] = NO_STORE
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+    return response
@@ -0,0 +1,117 @@
+"""
+Media URL Resolver
+Turns stored media filenames (local uploads, S3 keys, Cloudinary public IDs,
+full URLs) into the URLs templates render. Each filename is resolved once
+and memoized, so listing pages do a dict lookup per card instead of
+re-running the storage branching.
+
+    STATIC_CDN_URL                serve local static files (/static/...) from a
+                                  CDN that pulls from this app
+    MEDIA_CDN_URL                 serve public S3 objects from a CDN host (e.g.
+                                  CloudFront) in front of the bucket
+    S3_PRESIGNED_URL_SECONDS      > 0: hand out time-limited presigned S3 URLs,
+                                  cached until shortly before they expire
+
+Usage:
+    resolver = MediaURLResolver(lambda path: url_for('static', filename=path), s3=s3_storage)
+    resolver.video_url(video.filename)
+    resolver.image_url(user.avatar_filename, 'avatars')
+"""
+from cache import TTLCache
+
+
+class MediaURLResolver:
+    """
+    Memoizing resolver for video and image URLs
+
+    Args:
+        static_url: Callable building the URL of a file under static/
+        cloud_storage: Callable telling whether videos are served from Cloudinary
+        cloudinary_cloud_name: Cloudinary account used for video URLs
+        s3: S3StorageService for S3 keys, or None when S3 is unavailable
+        static_cdn_url: CDN origin (https://static.example.com) for files under static/
+        s3_cdn_url: CDN origin (https://media.example.com) for public S3 objects
+        presign_seconds: Lifetime of presigned S3 URLs; 0 uses public URLs
+        presign_margin: Seconds before expiry at which a presigned URL is replaced
+        ttl: Seconds other resolved URLs are memoized
+        max_entries: Memoized URLs kept per process
+    """
+
+    def __init__(self, static_url, cloud_storage=lambda: False, cloudinary_cloud_name=None, s3=None,
+                 static_cdn_url='', s3_cdn_url='', presign_seconds=0, presign_margin=60, ttl=300, max_entries=4096):
+        self.static_url = static_url
+        self.cloud_storage = cloud_storage
+        self.cloudinary_cloud_name = cloudinary_cloud_name
+        self.s3 = s3
+        self.static_cdn_url = (static_cdn_url or '').rstrip('/')
+        self.s3_cdn_url = (s3_cdn_url or '').rstrip('/')
+        self.presign_seconds = presign_seconds
+        self.presign_margin = presign_margin
+        self.ttl = ttl
+        self._urls = TTLCache(ttl=ttl, max_entries=max_entries)
+
+    def _resolve(self, key, build):
+        url = self._urls.get(key)
+        if url is None:
+            url, ttl = build()
+            self._urls.set(key, url, ttl)
+        return url
+
+    def _local(self, path):
+        url = self.static_url(path)
+        return (self.static_cdn_url + url if self.static_cdn_url else url), self.ttl
+
+    def _s3(self, key):
+        if self.presign_seconds > 0:
+            # Signed for the bucket host, so it can't be moved onto the CDN
+            return (self.s3.get_presigned_url(key, self.presign_seconds),
+                    max(self.presign_seconds - self.presign_margin, 0))
+        if self.s3_cdn_url:
+            return f'{self.s3_cdn_url}/{key}', self.ttl
+        return self.s3.get_file_url(key), self.ttl
+
+    def video_url(self, filename):
+        """
+        URL of an uploaded video
+
+        Args:
+            filename: Stored filename, Cloudinary public ID or full URL
+
+        Returns:
+            str: Video URL, or None without a filename
+        """
+        if not filename:
+            return None
+        return self._resolve(('video', filename), lambda: self._video(filename))
+
+    def _video(self, filename):
+        if self.cloud_storage():
+            # Check if it's a cloud URL already
+            if filename.startswith('http'):
+                return filename, self.ttl
+            if self.cloudinary_cloud_name:
+                return (f'https://res.cloudinary.com/{self.cloudinary_cloud_name}/video/upload/{filename}',
+                        self.ttl)
+        return self._local(f'uploads/{filename}')
+
+    def image_url(self, filename, folder='avatars'):
+        """
+        URL of an image (avatar, thumbnail)
+
+        Args:
+            filename: Local filename, S3 key (contains '/') or full URL
+            folder: Folder under static/ for local files
+
+        Returns:
+            str: Image URL, or None without a filename
+        """
+        if not filename:
+            return None
+        return self._resolve(('image', folder, filename), lambda: self._image(filename, folder))
+
+    def _image(self, filename, folder):
+        if '/' in filename and self.s3 is not None and not filename.startswith('http'):
+            return self._s3(filename)
+        if filename.startswith('http'):
+            return filename, self.ttl
+        return self._local(f'{folder}/{filename}')
@@ -0,0 +1,811 @@
+"""
+Schema Migrations
+Numbered, run-once schema changes tracked in the schema_version table.
+
+This module is the only code path allowed to change the database schema.
+To change the schema, append a new (version, description, steps) entry to
+MIGRATIONS - never edit one that has already shipped.
+"""
+import sqlite3
+
+SCHEMA_VERSION_TABLE = '''CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)'''
+
+
+# Key for the PostgreSQL advisory lock that serializes migration runs
+MIGRATION_LOCK_KEY = 7400001
+
+
+def is_postgres(conn):
+    return getattr(conn, 'dialect', 'sqlite') == 'postgresql'
+
+
+def table_columns(conn, table):
+    """Return the set of column names a table currently has"""
+    if is_postgres(conn):
+        rows = conn.execute('''SELECT column_name FROM information_schema.columns
+                               WHERE table_schema = current_schema() AND table_name = ?''', (table,))
+        return {row[0] for row in rows}
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def add_missing_columns(table, columns):
+    """
+    Build a migration step that adds any of the given columns a table lacks
+
+    Databases created before migrations existed went through years of
+    ad-hoc ALTER TABLE statements, so their column sets differ.
+
+    Args:
+        table: Table name
+        columns: List of (column_name, column_definition) tuples
+    """
+    def step(conn):
+        existing = table_columns(conn, table)
+        for column_name, column_def in columns:
+            if column_name not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column_name} {column_def}')
+    return step
+
+
+# Version 1: the schema init_db() used to build, including every column it bolted on later
+BASELINE = [
+    '''CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        is_paid BOOLEAN DEFAULT FALSE,
+        registration_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        first_name TEXT,
+        last_name TEXT,
+        bio TEXT,
+        location TEXT,
+        website TEXT,
+        avatar_filename TEXT,
+        joined_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        subscriber_count INTEGER DEFAULT 0,
+        total_views INTEGER DEFAULT 0,
+        is_admin BOOLEAN DEFAULT FALSE,
+        admin_level TEXT DEFAULT NULL,
+        is_blocked BOOLEAN DEFAULT FALSE,
+        block_reason TEXT,
+        blocked_until TIMESTAMP DEFAULT NULL,
+        last_login TIMESTAMP,
+        login_count INTEGER DEFAULT 0,
+        can_vote BOOLEAN DEFAULT FALSE
+    )''',
+    # SQLite cannot ADD COLUMN with a non-constant default, so joined_date
+    # arrives without CURRENT_TIMESTAMP on upgraded databases
+    add_missing_columns('users', [
+        ('first_name', 'TEXT'),
+        ('last_name', 'TEXT'),
+        ('bio', 'TEXT'),
+        ('location', 'TEXT'),
+        ('website', 'TEXT'),
+        ('avatar_filename', 'TEXT'),
+        ('joined_date', 'TIMESTAMP'),
+        ('subscriber_count', 'INTEGER DEFAULT 0'),
+        ('total_views', 'INTEGER DEFAULT 0'),
+        ('is_admin', 'BOOLEAN DEFAULT FALSE'),
+        ('admin_level', 'TEXT DEFAULT NULL'),
+        ('is_blocked', 'BOOLEAN DEFAULT FALSE'),
+        ('block_reason', 'TEXT'),
+        ('blocked_until', 'TIMESTAMP DEFAULT NULL'),
+        ('last_login', 'TIMESTAMP'),
+        ('login_count', 'INTEGER DEFAULT 0'),
+        ('can_vote', 'BOOLEAN DEFAULT FALSE')
+    ]),
+    '''CREATE TABLE IF NOT EXISTS videos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        title TEXT NOT NULL,
+        description TEXT,
+        filename TEXT NOT NULL,
+        upload_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        total_votes INTEGER DEFAULT 0,
+        average_rating REAL DEFAULT 0.0,
+        is_approved BOOLEAN DEFAULT FALSE,
+        approval_date TIMESTAMP DEFAULT NULL,
+        approved_by INTEGER DEFAULT NULL,
+        is_blocked BOOLEAN DEFAULT FALSE,
+        block_reason TEXT,
+        blocked_by INTEGER DEFAULT NULL,
+        view_count INTEGER DEFAULT 0,
+        category TEXT,
+        tags TEXT,
+        duration INTEGER DEFAULT 0,
+        file_size INTEGER DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (approved_by) REFERENCES users (id),
+        FOREIGN KEY (blocked_by) REFERENCES users (id)
+    )''',
+    add_missing_columns('videos', [
+        ('is_approved', 'BOOLEAN DEFAULT FALSE'),
+        ('approval_date', 'TIMESTAMP DEFAULT NULL'),
+        ('approved_by', 'INTEGER DEFAULT NULL'),
+        ('is_blocked', 'BOOLEAN DEFAULT FALSE'),
+        ('block_reason', 'TEXT'),
+        ('blocked_by', 'INTEGER DEFAULT NULL'),
+        ('view_count', 'INTEGER DEFAULT 0'),
+        ('category', 'TEXT'),
+        ('tags', 'TEXT'),
+        ('duration', 'INTEGER DEFAULT 0'),
+        ('file_size', 'INTEGER DEFAULT 0')
+    ]),
+    '''CREATE TABLE IF NOT EXISTS votes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        video_id INTEGER,
+        rating INTEGER CHECK(rating >= 1 AND rating <= 5),
+        vote_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(user_id, video_id),
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (video_id) REFERENCES videos (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS comments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        video_id INTEGER,
+        comment TEXT NOT NULL,
+        comment_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        parent_id INTEGER DEFAULT NULL,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (video_id) REFERENCES videos (id),
+        FOREIGN KEY (parent_id) REFERENCES comments (id)
+    )''',
+    add_missing_columns('comments', [
+        ('parent_id', 'INTEGER DEFAULT NULL')
+    ]),
+    '''CREATE TABLE IF NOT EXISTS comment_likes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        comment_id INTEGER,
+        user_id INTEGER,
+        like_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (comment_id) REFERENCES comments (id),
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(comment_id, user_id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS admin_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        admin_id INTEGER,
+        action TEXT NOT NULL,
+        target_type TEXT NOT NULL,
+        target_id INTEGER,
+        details TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ip_address TEXT,
+        FOREIGN KEY (admin_id) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS admin_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        admin_id INTEGER,
+        recipient_id INTEGER,
+        subject TEXT NOT NULL,
+        message TEXT NOT NULL,
+        sent_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_read BOOLEAN DEFAULT FALSE,
+        email_sent BOOLEAN DEFAULT FALSE,
+        FOREIGN KEY (admin_id) REFERENCES users (id),
+        FOREIGN KEY (recipient_id) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        reporter_id INTEGER,
+        reported_type TEXT NOT NULL,
+        reported_id INTEGER,
+        reason TEXT NOT NULL,
+        description TEXT,
+        status TEXT DEFAULT 'pending',
+        handled_by INTEGER DEFAULT NULL,
+        handled_date TIMESTAMP DEFAULT NULL,
+        report_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (reporter_id) REFERENCES users (id),
+        FOREIGN KEY (handled_by) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS categories (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT UNIQUE NOT NULL,
+        description TEXT,
+        created_by INTEGER,
+        created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_active BOOLEAN DEFAULT TRUE,
+        FOREIGN KEY (created_by) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS video_views (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER,
+        video_id INTEGER,
+        view_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        ip_address TEXT,
+        user_agent TEXT,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (video_id) REFERENCES videos (id),
+        UNIQUE(user_id, video_id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS payment_transactions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        transaction_id TEXT UNIQUE NOT NULL,
+        provider TEXT NOT NULL,
+        phone_number TEXT NOT NULL,
+        amount REAL NOT NULL,
+        currency TEXT NOT NULL,
+        status TEXT DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS voting_fees (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        video_id INTEGER NOT NULL,
+        transaction_id TEXT UNIQUE NOT NULL,
+        provider TEXT NOT NULL,
+        phone_number TEXT NOT NULL,
+        amount REAL NOT NULL,
+        currency TEXT NOT NULL,
+        status TEXT DEFAULT 'pending',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (video_id) REFERENCES videos (id)
+    )''',
+    add_missing_columns('voting_fees', [
+        ('video_id', 'INTEGER')
+    ])
+]
+
+# Version 2: tables and columns that used to be created at request time
+REQUEST_TIME_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS comment_dislikes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        comment_id INTEGER,
+        user_id INTEGER,
+        dislike_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (comment_id) REFERENCES comments (id),
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(comment_id, user_id)
+    )''',
+    add_missing_columns('users', [
+        ('is_deactivated', 'BOOLEAN DEFAULT FALSE'),
+        ('was_participant', 'BOOLEAN DEFAULT FALSE')
+    ])
+]
+
+# Version 3: tournament open/close state, previously created by hand on each server
+TOURNAMENT_SETTINGS = [
+    '''CREATE TABLE IF NOT EXISTS tournament_settings (
+        id INTEGER PRIMARY KEY,
+        is_open BOOLEAN DEFAULT TRUE,
+        last_updated TIMESTAMP DEFAULT NULL,
+        updated_by INTEGER DEFAULT NULL,
+        FOREIGN KEY (updated_by) REFERENCES users (id)
+    )''',
+    '''CREATE TABLE IF NOT EXISTS tournament_history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        status TEXT NOT NULL,
+        changed_by INTEGER,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        participants_affected INTEGER DEFAULT 0,
+        FOREIGN KEY (changed_by) REFERENCES users (id)
+    )''',
+    add_missing_columns('tournament_history', [
+        ('participants_affected', 'INTEGER DEFAULT 0')
+    ]),
+    'INSERT OR IGNORE INTO tournament_settings (id, is_open) VALUES (1, TRUE)'
+]
+
+# Version 4: indexes for the listing pages and per-row lookups.
+# comment_likes/comment_dislikes lookups by comment_id already use the
+# UNIQUE(comment_id, user_id) autoindex, and votes by (user_id, video_id)
+# use UNIQUE(user_id, video_id).
+HOT_PATH_INDEXES = [
+    # Homepage and /videos?sort=most_voted
+    '''CREATE INDEX IF NOT EXISTS idx_videos_public_votes
+       ON videos (is_approved, is_blocked, total_votes DESC, upload_date DESC)''',
+    # /videos?sort=recent
+    '''CREATE INDEX IF NOT EXISTS idx_videos_public_recent
+       ON videos (is_approved, is_blocked, upload_date DESC)''',
+    # Top-rated sidebar on video_detail
+    '''CREATE INDEX IF NOT EXISTS idx_videos_public_rating
+       ON videos (is_approved, is_blocked, average_rating DESC, total_votes DESC)''',
+    # Dashboard and profile video lists
+    '''CREATE INDEX IF NOT EXISTS idx_videos_user
+       ON videos (user_id, upload_date DESC)''',
+    # Top-level comments for a video, newest first
+    '''CREATE INDEX IF NOT EXISTS idx_comments_video
+       ON comments (video_id, parent_id, comment_date DESC)''',
+    # Reply counts and reply threads
+    '''CREATE INDEX IF NOT EXISTS idx_comments_parent
+       ON comments (parent_id, comment_date)''',
+    # Recent activity on profiles
+    '''CREATE INDEX IF NOT EXISTS idx_comments_user
+       ON comments (user_id, comment_date DESC)''',
+    # Covering index for vote counts and rating averages per video
+    '''CREATE INDEX IF NOT EXISTS idx_votes_video
+       ON votes (video_id, rating)''',
+    # "Has this user paid to vote on this video?"
+    '''CREATE INDEX IF NOT EXISTS idx_voting_fees_lookup
+       ON voting_fees (user_id, video_id, status)''',
+    # Unique view counts per video
+    '''CREATE INDEX IF NOT EXISTS idx_video_views_video
+       ON video_views (video_id)''',
+    # Admin report queue and per-status counts
+    '''CREATE INDEX IF NOT EXISTS idx_reports_status
+       ON reports (status, report_date DESC)''',
+    '''CREATE INDEX IF NOT EXISTS idx_reports_date
+       ON reports (report_date DESC)''',
+    # Admin dashboard recent activity
+    '''CREATE INDEX IF NOT EXISTS idx_admin_logs_timestamp
+       ON admin_logs (timestamp DESC)''',
+    # Payment history for the debug/status endpoints
+    '''CREATE INDEX IF NOT EXISTS idx_payment_transactions_user
+       ON payment_transactions (user_id, created_at DESC)''',
+]
+
+
+def counter_triggers(table, counters):
+    """
+    Build a migration step that keeps counters on other tables in step with
+    inserts into and deletes from table
+
+    Args:
+        table: Table whose rows are being counted
+        counters: List of (target_table, counter_column, foreign_key_column)
+            tuples - target_table.counter_column counts the rows of table
+            whose foreign_key_column points at target_table.id
+    """
+    def updates(row, delta):
+        return ''.join(f'    UPDATE {target} SET {column} = {column} {delta} 1 WHERE id = {row}.{key};\n'
+                       for target, column, key in counters)
+
+    def step(conn):
+        if is_postgres(conn):
+            function = f'{table}_counters'
+            conn.execute(f'CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$\n'
+                         f"BEGIN\nIF TG_OP = 'INSERT' THEN\n{updates('NEW', '+')}"
+                         f"ELSE\n{updates('OLD', '-')}END IF;\nRETURN NULL;\nEND $$ LANGUAGE plpgsql")
+            conn.execute(f'DROP TRIGGER IF EXISTS trg_{table}_counters ON {table}')
+            conn.execute(f'''CREATE TRIGGER trg_{table}_counters AFTER INSERT OR DELETE ON {table}
+                            FOR EACH ROW EXECUTE PROCEDURE {function}()''')
+            return
+
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_counters_insert AFTER INSERT ON {table}\n'
+                     f'BEGIN\n{updates("NEW", "+")}END')
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_counters_delete AFTER DELETE ON {table}\n'
+                     f'BEGIN\n{updates("OLD", "-")}END')
+    return step
+
+
+# Version 5: stored counters so comment threads and profiles don't COUNT(*)
+# per row. Triggers keep them exact on every write path (including admin
+# deletes and the write-behind buffer); counters.py reconciles them.
+DENORMALIZED_COUNTERS = [
+    add_missing_columns('comments', [
+        ('reply_count', 'INTEGER NOT NULL DEFAULT 0'),
+        ('like_count', 'INTEGER NOT NULL DEFAULT 0'),
+        ('dislike_count', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+    add_missing_columns('videos', [('comment_count', 'INTEGER NOT NULL DEFAULT 0')]),
+    add_missing_columns('users', [('video_count', 'INTEGER NOT NULL DEFAULT 0')]),
+    '''UPDATE comments SET
+           reply_count = (SELECT COUNT(*) FROM comments replies WHERE replies.parent_id = comments.id),
+           like_count = (SELECT COUNT(*) FROM comment_likes WHERE comment_likes.comment_id = comments.id),
+           dislike_count = (SELECT COUNT(*) FROM comment_dislikes WHERE comment_dislikes.comment_id = comments.id)''',
+    '''UPDATE videos SET comment_count = (SELECT COUNT(*) FROM comments WHERE comments.video_id = videos.id)''',
+    '''UPDATE users SET video_count = (SELECT COUNT(*) FROM videos WHERE videos.user_id = users.id)''',
+    counter_triggers('comments', [('comments', 'reply_count', 'parent_id'),
+                                  ('videos', 'comment_count', 'video_id')]),
+    counter_triggers('comment_likes', [('comments', 'like_count', 'comment_id')]),
+    counter_triggers('comment_dislikes', [('comments', 'dislike_count', 'comment_id')]),
+    counter_triggers('videos', [('users', 'video_count', 'user_id')]),
+]
+
+def rating_aggregate_triggers(conn):
+    """
+    Keep videos.rating_sum, rating_count and average_rating in step with
+    votes, inside the statement that inserts, re-rates or deletes the vote
+    """
+    def update(new_row, old_row):
+        # Change in (sum, count) of non-NULL ratings; average_rating is derived
+        delta_sum = ' + '.join(filter(None, [new_row and f'COALESCE({new_row}.rating, 0)',
+                                             old_row and f'-COALESCE({old_row}.rating, 0)']))
+        delta_count = ' + '.join(filter(None, [
+            new_row and f'CASE WHEN {new_row}.rating IS NULL THEN 0 ELSE 1 END',
+            old_row and f'-CASE WHEN {old_row}.rating IS NULL THEN 0 ELSE 1 END']))
+        return (f'    UPDATE videos SET rating_sum = rating_sum + ({delta_sum}),\n'
+                f'        rating_count = rating_count + ({delta_count}),\n'
+                f'        average_rating = CASE WHEN rating_count + ({delta_count}) > 0\n'
+                f'            THEN (rating_sum + ({delta_sum})) * 1.0 / (rating_count + ({delta_count}))\n'
+                f'            ELSE 0.0 END\n'
+                f'    WHERE id = {new_row or old_row}.video_id;\n')
+
+    if is_postgres(conn):
+        conn.execute('CREATE OR REPLACE FUNCTION votes_rating_aggregates() RETURNS trigger AS $$\n'
+                     f"BEGIN\nIF TG_OP = 'INSERT' THEN\n{update('NEW', None)}"
+                     f"ELSIF TG_OP = 'UPDATE' THEN\n{update('NEW', 'OLD')}"
+                     f"ELSE\n{update(None, 'OLD')}END IF;\nRETURN NULL;\nEND $$ LANGUAGE plpgsql")
+        conn.execute('DROP TRIGGER IF EXISTS trg_votes_rating_aggregates ON votes')
+        conn.execute('''CREATE TRIGGER trg_votes_rating_aggregates AFTER INSERT OR DELETE OR UPDATE OF rating ON votes
+                        FOR EACH ROW EXECUTE PROCEDURE votes_rating_aggregates()''')
+        return
+
+    for name, event, new_row, old_row in [('insert', 'INSERT', 'NEW', None),
+                                          ('update', 'UPDATE OF rating', 'NEW', 'OLD'),
+                                          ('delete', 'DELETE', None, 'OLD')]:
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS trg_votes_rating_aggregates_{name} AFTER {event} ON votes\n'
+                     f'BEGIN\n{update(new_row, old_row)}END')
+
+
+# Version 6: running rating sums so a vote or re-rating costs O(1) instead of
+# re-averaging every vote the video has. Drift is checked by counters.py.
+RATING_AGGREGATES = [
+    add_missing_columns('videos', [
+        ('rating_sum', 'INTEGER NOT NULL DEFAULT 0'),
+        ('rating_count', 'INTEGER NOT NULL DEFAULT 0'),
+    ]),
+    '''UPDATE videos SET
+           rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM votes WHERE votes.video_id = videos.id),
+           rating_count = (SELECT COUNT(rating) FROM votes WHERE votes.video_id = videos.id)''',
+    '''UPDATE videos SET average_rating = CASE WHEN rating_count > 0 THEN rating_sum * 1.0 / rating_count
+                                              ELSE 0.0 END''',
+    rating_aggregate_triggers,
+]
+
+def exclusive_reaction_triggers(conn):
+    """
+    Make a like and a dislike from the same user on the same comment mutually
+    exclusive: adding one removes the other in the same statement, so the
+    like/dislike endpoints need a single write
+    """
+    pairs = [('comment_likes', 'comment_dislikes'), ('comment_dislikes', 'comment_likes')]
+    for table, opposite in pairs:
+        delete = f'    DELETE FROM {opposite} WHERE comment_id = NEW.comment_id AND user_id = NEW.user_id;\n'
+        if is_postgres(conn):
+            conn.execute(f'CREATE OR REPLACE FUNCTION {table}_exclusive() RETURNS trigger AS $$\n'
+                         f'BEGIN\n{delete}RETURN NULL;\nEND $$ LANGUAGE plpgsql')
+            conn.execute(f'DROP TRIGGER IF EXISTS trg_{table}_exclusive ON {table}')
+            conn.execute(f'''CREATE TRIGGER trg_{table}_exclusive AFTER INSERT ON {table}
+                            FOR EACH ROW EXECUTE PROCEDURE {table}_exclusive()''')
+        else:
+            conn.execute(f'CREATE TRIGGER IF NOT EXISTS trg_{table}_exclusive AFTER INSERT ON {table}\n'
+                         f'BEGIN\n{delete}END')
+
+
+# Version 7: like/dislike exclusivity moves into the database (see above)
+EXCLUSIVE_REACTIONS = [
+    # Rows written before this migration may hold both
+    '''DELETE FROM comment_dislikes WHERE EXISTS (
+           SELECT 1 FROM comment_likes
+           WHERE comment_likes.comment_id = comment_dislikes.comment_id
+             AND comment_likes.user_id = comment_dislikes.user_id)''',
+    exclusive_reaction_triggers,
+]
+
+def create_row_trigger(conn, name, event, table, body, when=None):
+    """
+    Create an AFTER ... FOR EACH ROW trigger on either backend
+
+    Args:
+        name: Trigger name (also names the PostgreSQL trigger function)
+        event: e.g. 'INSERT' or 'UPDATE OF total_votes, video_count'
+        table: Table the trigger is attached to
+        body: Semicolon-terminated statements using NEW/OLD
+        when: Optional condition on NEW/OLD for firing at all
+    """
+    if is_postgres(conn):
+        conn.execute(f'CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$\n'
+                     f'BEGIN\n{body}RETURN NULL;\nEND $$ LANGUAGE plpgsql')
+        conn.execute(f'DROP TRIGGER IF EXISTS {name} ON {table}')
+        conn.execute(f'CREATE TRIGGER {name} AFTER {event} ON {table} FOR EACH ROW '
+                     f'{f"WHEN ({when}) " if when else ""}EXECUTE PROCEDURE {name}()')
+    else:
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON {table} FOR EACH ROW '
+                     f'{f"WHEN {when} " if when else ""}\nBEGIN\n{body}END')
+
+
+# A participant's standing counts approved, unblocked videos only - the same
+# videos the public listings show
+LEADERBOARD_TOTALS = {
+    'video_count': 'COUNT(*)',
+    'total_votes': 'COALESCE(SUM(videos.total_votes), 0)',
+    'avg_rating': 'COALESCE(AVG(videos.average_rating), 0.0)',
+}
+
+
+def leaderboard_total(column):
+    """Correlated query computing leaderboard.column from the user's videos"""
+    return (f'SELECT {LEADERBOARD_TOTALS[column]} FROM videos WHERE videos.user_id = leaderboard.user_id '
+            f'AND videos.is_approved = 1 AND videos.is_blocked = 0')
+
+
+# Ranking is by total_votes, then video_count (both descending), then user_id,
+# so every participant has a distinct position
+LEADERBOARD_ORDER = 'total_votes DESC, video_count DESC, user_id'
+
+
+def leaderboard_ahead(row, key):
+    """SQL condition: row ranks above the participant whose values are key.*"""
+    return (f'({row}.total_votes > {key}.total_votes OR ({row}.total_votes = {key}.total_votes AND '
+            f'({row}.video_count > {key}.video_count OR ({row}.video_count = {key}.video_count AND '
+            f'{row}.user_id < {key}.user_id))))')
+
+
+def leaderboard_triggers(conn):
+    """
+    Keep the leaderboard table in step with users and videos. A participant
+    whose totals change walks the rank index from their old position to the
+    new one, and only the participants passed on the way are renumbered.
+    """
+    refresh = ('    UPDATE leaderboard SET '
+               + ', '.join(f'{column} = ({leaderboard_total(column)})' for column in LEADERBOARD_TOTALS)
+               + ' WHERE leaderboard.user_id IN ({users});\n')
+    own_rank = '(SELECT rank FROM leaderboard WHERE user_id = NEW.user_id)'
+
+    create_row_trigger(conn, 'trg_users_leaderboard_insert', 'INSERT', 'users',
+                       '    INSERT INTO leaderboard (user_id) VALUES (NEW.id);\n')
+    create_row_trigger(conn, 'trg_users_leaderboard_delete', 'DELETE', 'users',
+                       '    DELETE FROM leaderboard WHERE user_id = OLD.id;\n')
+    create_row_trigger(conn, 'trg_videos_leaderboard_insert', 'INSERT', 'videos',
+                       refresh.format(users='NEW.user_id'))
+    create_row_trigger(conn, 'trg_videos_leaderboard_delete', 'DELETE', 'videos',
+                       refresh.format(users='OLD.user_id'))
+    create_row_trigger(conn, 'trg_videos_leaderboard_update',
+                       'UPDATE OF user_id, is_approved, is_blocked, total_votes, average_rating', 'videos',
+                       refresh.format(users='OLD.user_id, NEW.user_id'))
+
+    # New participants (rank 0 until placed) start from the bottom, where
+    # they almost always stay
+    create_row_trigger(conn, 'trg_leaderboard_rank_insert', 'INSERT', 'leaderboard',
+                       f'    UPDATE leaderboard SET rank = 1 + COALESCE((SELECT other.rank FROM leaderboard other\n'
+                       f'        WHERE other.rank > 0 AND {leaderboard_ahead("other", "NEW")}\n'
+                       f'        ORDER BY other.rank DESC LIMIT 1), 0) WHERE user_id = NEW.user_id;\n'
+                       f'    UPDATE leaderboard SET rank = rank + 1\n'
+                       f'        WHERE rank >= {own_rank} AND user_id <> NEW.user_id;\n')
+    create_row_trigger(conn, 'trg_leaderboard_rank_delete', 'DELETE', 'leaderboard',
+                       '    UPDATE leaderboard SET rank = rank - 1 WHERE rank > OLD.rank;\n')
+    create_row_trigger(conn, 'trg_leaderboard_rank_up', 'UPDATE OF total_votes, video_count', 'leaderboard',
+                       f'    UPDATE leaderboard SET rank = 1 + COALESCE((SELECT other.rank FROM leaderboard other\n'
+                       f'        WHERE other.rank < OLD.rank AND {leaderboard_ahead("other", "NEW")}\n'
+                       f'        ORDER BY other.rank DESC LIMIT 1), 0) WHERE user_id = NEW.user_id;\n'
+                       f'    UPDATE leaderboard SET rank = rank + 1\n'
+                       f'        WHERE rank >= {own_rank} AND rank < OLD.rank AND user_id <> NEW.user_id;\n',
+                       when=leaderboard_ahead('NEW', 'OLD'))
+    create_row_trigger(conn, 'trg_leaderboard_rank_down', 'UPDATE OF total_votes, video_count', 'leaderboard',
+                       f'    UPDATE leaderboard SET rank = COALESCE((SELECT other.rank FROM leaderboard other\n'
+                       f'        WHERE other.rank > OLD.rank AND NOT {leaderboard_ahead("other", "NEW")}\n'
+                       f'        ORDER BY other.rank LIMIT 1) - 1, (SELECT MAX(rank) FROM leaderboard))\n'
+                       f'        WHERE user_id = NEW.user_id;\n'
+                       f'    UPDATE leaderboard SET rank = rank - 1\n'
+                       f'        WHERE rank > OLD.rank AND rank <= {own_rank} AND user_id <> NEW.user_id;\n',
+                       when=leaderboard_ahead('OLD', 'NEW'))
+
+
+# Version 8: materialized leaderboard. Pages read a rank range instead of
+# aggregating every user's videos; triggers keep totals and ranks current.
+MATERIALIZED_LEADERBOARD = [
+    '''CREATE TABLE IF NOT EXISTS leaderboard (
+        user_id INTEGER PRIMARY KEY,
+        video_count INTEGER NOT NULL DEFAULT 0,
+        total_votes INTEGER NOT NULL DEFAULT 0,
+        avg_rating REAL NOT NULL DEFAULT 0.0,
+        rank INTEGER NOT NULL DEFAULT 0
+    )''',
+    f'''INSERT INTO leaderboard (user_id, video_count, total_votes, avg_rating, rank)
+       SELECT user_id, video_count, total_votes, avg_rating, ROW_NUMBER() OVER (ORDER BY {LEADERBOARD_ORDER})
+       FROM (SELECT u.id AS user_id, COUNT(v.id) AS video_count,
+                    COALESCE(SUM(v.total_votes), 0) AS total_votes,
+                    COALESCE(AVG(v.average_rating), 0.0) AS avg_rating
+             FROM users u
+             LEFT JOIN videos v ON v.user_id = u.id AND v.is_approved = 1 AND v.is_blocked = 0
+             GROUP BY u.id) totals''',
+    'CREATE INDEX IF NOT EXISTS idx_leaderboard_rank ON leaderboard (rank)',
+    # Covers the per-user totals the triggers recompute
+    '''CREATE INDEX IF NOT EXISTS idx_videos_user_standing
+       ON videos (user_id, is_approved, is_blocked, total_votes, average_rating)''',
+    leaderboard_triggers,
+]
+
+# Version 9: keyset pagination for /videos. Pages continue from the last
+# card's sort key, so the indexes end in id (the tiebreaker) and the key
+# columns must not be NULL (a NULL never compares, so its row would be skipped)
+KEYSET_LISTINGS = [
+    'UPDATE videos SET total_votes = 0 WHERE total_votes IS NULL',
+    "UPDATE videos SET upload_date = '1970-01-01 00:00:00' WHERE upload_date IS NULL",
+    'DROP INDEX IF EXISTS idx_videos_public_votes',
+    'DROP INDEX IF EXISTS idx_videos_public_recent',
+    '''CREATE INDEX IF NOT EXISTS idx_videos_public_votes
+       ON videos (is_approved, is_blocked, total_votes DESC, upload_date DESC, id DESC)''',
+    '''CREATE INDEX IF NOT EXISTS idx_videos_public_recent
+       ON videos (is_approved, is_blocked, upload_date DESC, id DESC)''',
+]
+
+# Version 10: keyset pagination for a video's comments, on the same terms
+KEYSET_COMMENTS = [
+    "UPDATE comments SET comment_date = '1970-01-01 00:00:00' WHERE comment_date IS NULL",
+    'DROP INDEX IF EXISTS idx_comments_video',
+    '''CREATE INDEX IF NOT EXISTS idx_comments_video
+       ON comments (video_id, parent_id, comment_date DESC, id DESC)''',
+]
+
+# Version 11: full-text search (see search.py). Each search table holds one
+# row per user/video, keyed by its id (rowid), with the columns below in
+# ranking-weight order. SQLite gets FTS5 tables; PostgreSQL gets a weighted
+# tsvector per row with a GIN index. Triggers keep both in step with their
+# sources, including a video's copy of its uploader's username.
+SEARCH_COLUMNS = {
+    'users_fts': ['username', 'email', 'first_name', 'last_name'],
+    'videos_fts': ['title', 'tags', 'username', 'description'],
+}
+# unicode61 splits on every non-alphanumeric character (so e-mail addresses
+# become words); the prefix indexes make 2-3 character prefix queries fast
+FTS5_OPTIONS = "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'"
+
+
+def search_row(conn, table, values):
+    """
+    Column list and value expressions to insert one row into a search table
+
+    Args:
+        table: 'users_fts' or 'videos_fts'
+        values: SQL expressions for SEARCH_COLUMNS[table], in order
+
+    Returns:
+        tuple: ('(rowid, ...)', 'expression, ...')
+    """
+    if is_postgres(conn):
+        # Weights A-D follow the column order; words are split like unicode61 does
+        document = ' || '.join(
+            f"setweight(to_tsvector('simple', regexp_replace(COALESCE({value}, ''), '[^[:alnum:]]+', ' ', 'g')), "
+            f"'{weight}')" for value, weight in zip(values, 'ABCD'))
+        return '(rowid, document)', document
+    return f"(rowid, {', '.join(SEARCH_COLUMNS[table])})", ', '.join(values)
+
+
+def search_tables(conn):
+    """Create the search tables, fill them and attach their triggers"""
+    users = search_row(conn, 'users_fts', [f'{{row}}.{column}' for column in SEARCH_COLUMNS['users_fts']])
+    uploader = '(SELECT username FROM users WHERE users.id = {row}.user_id)'
+    videos = search_row(conn, 'videos_fts', ['{row}.title', '{row}.tags', uploader, '{row}.description'])
+
+    for table in SEARCH_COLUMNS:
+        if is_postgres(conn):
+            conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (rowid INTEGER PRIMARY KEY, document TSVECTOR NOT NULL)')
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_document ON {table} USING GIN (document)')
+        else:
+            conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                         f"{', '.join(SEARCH_COLUMNS[table])}, {FTS5_OPTIONS})")
+
+    conn.execute(f"INSERT INTO users_fts {users[0]} SELECT users.id, {users[1].format(row='users')} FROM users")
+    conn.execute(f"INSERT INTO videos_fts {videos[0]} SELECT videos.id, {videos[1].format(row='videos')} FROM videos")
+
+    def reindex(table, columns, row):
+        return (f'    DELETE FROM {table} WHERE rowid = {row}.id;\n'
+                f'    INSERT INTO {table} {columns[0]} VALUES ({row}.id, {columns[1].format(row=row)});\n')
+
+    create_row_trigger(conn, 'trg_users_search_insert', 'INSERT', 'users', reindex('users_fts', users, 'NEW'))
+    create_row_trigger(conn, 'trg_users_search_update', 'UPDATE OF username, email, first_name, last_name',
+                       'users', reindex('users_fts', users, 'NEW'))
+    create_row_trigger(conn, 'trg_users_search_delete', 'DELETE', 'users',
+                       '    DELETE FROM users_fts WHERE rowid = OLD.id;\n')
+    # A renamed uploader is searchable under the new name in all their videos
+    create_row_trigger(conn, 'trg_users_search_videos', 'UPDATE OF username', 'users',
+                       '    DELETE FROM videos_fts WHERE rowid IN (SELECT id FROM videos WHERE user_id = NEW.id);\n'
+                       f'    INSERT INTO videos_fts {videos[0]} SELECT videos.id, {videos[1].format(row="videos")}\n'
+                       '        FROM videos WHERE videos.user_id = NEW.id;\n',
+                       when='OLD.username <> NEW.username')
+
+    create_row_trigger(conn, 'trg_videos_search_insert', 'INSERT', 'videos', reindex('videos_fts', videos, 'NEW'))
+    create_row_trigger(conn, 'trg_videos_search_update', 'UPDATE OF title, description, tags, user_id',
+                       'videos', reindex('videos_fts', videos, 'NEW'))
+    create_row_trigger(conn, 'trg_videos_search_delete', 'DELETE', 'videos',
+                       '    DELETE FROM videos_fts WHERE rowid = OLD.id;\n')
+
+
+SEARCH = [
+    search_tables,
+    # Admin consoles page through users/videos newest first by keyset (see KEYSET_LISTINGS);
+    # databases older than the baseline never had registration_date
+    add_missing_columns('users', [('registration_date', 'TIMESTAMP')]),
+    "UPDATE users SET registration_date = '1970-01-01 00:00:00' WHERE registration_date IS NULL",
+    'CREATE INDEX IF NOT EXISTS idx_users_registered ON users (registration_date DESC, id DESC)',
+    'CREATE INDEX IF NOT EXISTS idx_videos_uploaded ON videos (upload_date DESC, id DESC)',
+]
+
+# Version 12: bumped with every change to the tournament row, so each worker's
+# cached copy (tournament_state.py) notices it with one primary-key lookup
+TOURNAMENT_GENERATION = [
+    add_missing_columns('tournament_settings', [('generation', 'INTEGER NOT NULL DEFAULT 0')]),
+]
+
+MIGRATIONS = [
+    (1, 'Baseline schema', BASELINE),
+    (2, 'Request-time tables and columns', REQUEST_TIME_SCHEMA),
+    (3, 'Tournament settings and history', TOURNAMENT_SETTINGS),
+    (4, 'Hot-path indexes', HOT_PATH_INDEXES),
+    (5, 'Denormalized comment, like and video counters', DENORMALIZED_COUNTERS),
+    (6, 'Running rating sums and counts', RATING_AGGREGATES),
+    (7, 'Mutually exclusive comment likes and dislikes', EXCLUSIVE_REACTIONS),
+    (8, 'Materialized leaderboard', MATERIALIZED_LEADERBOARD),
+    (9, 'Keyset pagination indexes for video listings', KEYSET_LISTINGS),
+    (10, 'Keyset pagination index for comments', KEYSET_COMMENTS),
+    (11, 'Full-text search tables', SEARCH),
+    (12, 'Tournament settings generation', TOURNAMENT_GENERATION),
+]
+
+
+def get_schema_version(conn):
+    """Return the highest applied migration version (0 for a new database)"""
+    if is_postgres(conn):
+        # A failed query would abort the surrounding transaction, so look first
+        if conn.execute("SELECT to_regclass('schema_version')").fetchone()[0] is None:
+            return 0
+        return conn.execute('SELECT MAX(version) FROM schema_version').fetchone()[0] or 0
+
+    try:
+        row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return row[0] or 0
+
+
+def _begin_exclusive(conn):
+    """Open a transaction that keeps other migrating processes out until it ends"""
+    if is_postgres(conn):
+        conn.execute('SELECT pg_advisory_xact_lock(?)', (MIGRATION_LOCK_KEY,))
+    else:
+        conn.execute('BEGIN IMMEDIATE')
+
+
+def migrate(conn):
+    """
+    Apply every pending migration, each exactly once and in its own transaction
+
+    An up-to-date database costs a single version read. Several workers may
+    start at the same time, so the version is re-checked once the write lock
+    is held and migrations another process already applied are skipped.
+
+    Returns:
+        int: The schema version after migrating
+    """
+    current = get_schema_version(conn)
+    latest = MIGRATIONS[-1][0]
+    if current >= latest:
+        return current
+
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute(SCHEMA_VERSION_TABLE)
+    conn.commit()
+
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+
+        _begin_exclusive(conn)
+        try:
+            if get_schema_version(conn) >= version:
+                conn.rollback()
+                continue
+
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+
+            conn.execute('INSERT INTO schema_version (version, description) VALUES (?, ?)',
+                         (version, description))
+            conn.commit()
+            print(f"🗄️  Applied migration {version}: {description}")
+        except Exception:
+            conn.rollback()
+            raise
+
+        current = version
+
+    return current
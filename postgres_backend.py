@@ -0,0 +1,299 @@
+"""
+PostgreSQL Backend
+sqlite3-compatible connection wrapper over a pooled psycopg2 connection.
+
+The application (and repository.py) is written against the sqlite3 API and
+SQLite's SQL dialect. This module keeps that code unchanged on PostgreSQL by
+translating each statement once (results are cached) and by exposing the
+parts of the sqlite3 API the app relies on: conn.execute(), cursor.lastrowid,
+chained cursor.execute(...).fetchone(), cursor.row_factory and
+conn.in_transaction.
+"""
+import re
+import threading
+from functools import lru_cache
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+    import psycopg2.pool
+    PSYCOPG2_AVAILABLE = True
+except ImportError:
+    psycopg2 = None
+    PSYCOPG2_AVAILABLE = False
+
+# Columns declared BOOLEAN in migrations.py. SQLite stores them as 0/1 and
+# the app compares them that way; PostgreSQL needs TRUE/FALSE.
+BOOLEAN_COLUMNS = frozenset({
+    'is_paid', 'is_admin', 'is_blocked', 'can_vote', 'is_approved', 'is_read',
+    'email_sent', 'is_active', 'is_deactivated', 'was_participant', 'is_open'
+})
+
+# Sessions run in UTC so CURRENT_TIMESTAMP matches SQLite's (always UTC)
+CONNECT_OPTIONS = '-c timezone=UTC'
+
+# Tables whose primary key is not an "id" column (no RETURNING id for lastrowid)
+TABLES_WITHOUT_ID = frozenset({'schema_version', 'leaderboard', 'users_fts', 'videos_fts'})
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_DATE_NOW = re.compile(r'''\bDATE\s*\(\s*["']now["']\s*\)''', re.IGNORECASE)
+_DATETIME_NOW = re.compile(r'''\bDATETIME\s*\(\s*["']now["']\s*\)''', re.IGNORECASE)
+_AUTOINCREMENT = re.compile(r'\bINTEGER\s+PRIMARY\s+KEY\s+AUTOINCREMENT\b', re.IGNORECASE)
+# SQLite never enforced these (PRAGMA foreign_keys is off), and the delete
+# paths in app.py rely on that, so PostgreSQL gets the same relaxed schema
+_FOREIGN_KEY = re.compile(r',\s*FOREIGN\s+KEY\s*\([^)]*\)\s*REFERENCES\s+\w+\s*\([^)]*\)', re.IGNORECASE)
+_INSERT_OR_IGNORE = re.compile(r'^\s*INSERT\s+OR\s+IGNORE\s+INTO\b', re.IGNORECASE)
+_INSERT_INTO = re.compile(r'^\s*INSERT\s+INTO\s+(\w+)', re.IGNORECASE)
+_DDL = re.compile(r'^\s*(?:CREATE|ALTER)\s+TABLE\b', re.IGNORECASE)
+# The type after a column name (admin_logs has a column called "timestamp")
+_TIMESTAMP_TYPE = re.compile(r'(\b\w+\s+)TIMESTAMP\b(?!\s*\()', re.IGNORECASE)
+_LIKE = re.compile(r'\bLIKE\b', re.IGNORECASE)
+_BOOLEAN_COMPARE = re.compile(
+    r'\b((?:\w+\.)?(?:' + '|'.join(sorted(BOOLEAN_COLUMNS)) + r'))(\s*(?:=|!=|<>)\s*)([01])\b',
+    re.IGNORECASE)
+
+
+def _translate_code(code, has_params, ddl):
+    """Translate a fragment of SQL that contains no string literals"""
+    if ddl:
+        code = _AUTOINCREMENT.sub('SERIAL PRIMARY KEY', code)
+        code = _FOREIGN_KEY.sub('', code)
+        # Whole seconds, like SQLite's CURRENT_TIMESTAMP text
+        code = _TIMESTAMP_TYPE.sub(r'\1TIMESTAMP(0)', code)
+    code = _LIKE.sub('ILIKE', code)
+    code = _BOOLEAN_COMPARE.sub(
+        lambda m: f"{m.group(1)}{m.group(2)}{'TRUE' if m.group(3) == '1' else 'FALSE'}", code)
+    if has_params:
+        code = code.replace('%', '%%').replace('?', '%s')
+    return code
+
+
+@lru_cache(maxsize=512)
+def translate(sql, has_params=True):
+    """
+    Translate one SQLite statement to PostgreSQL
+
+    Args:
+        sql: Statement written for SQLite
+        has_params: Whether it will be executed with parameters. psycopg2
+            only interprets %-placeholders (and needs % escaped) when it is.
+
+    Returns:
+        tuple: (postgres_sql, returns_id) - returns_id is True when the
+            statement was given a RETURNING id clause to emulate lastrowid
+    """
+    sql = _DATE_NOW.sub('CURRENT_DATE', sql)
+    sql = _DATETIME_NOW.sub('CURRENT_TIMESTAMP', sql)
+
+    on_conflict_ignore = bool(_INSERT_OR_IGNORE.match(sql))
+    if on_conflict_ignore:
+        sql = _INSERT_OR_IGNORE.sub('INSERT INTO', sql, count=1)
+
+    # Rewrite everything outside string literals; escape % inside them too
+    ddl = bool(_DDL.match(sql))
+    parts = []
+    position = 0
+    for literal in _STRING_LITERAL.finditer(sql):
+        parts.append(_translate_code(sql[position:literal.start()], has_params, ddl))
+        text = literal.group(0)
+        parts.append(text.replace('%', '%%') if has_params else text)
+        position = literal.end()
+    parts.append(_translate_code(sql[position:], has_params, ddl))
+    sql = ''.join(parts).rstrip().rstrip(';')
+
+    if on_conflict_ignore:
+        sql += ' ON CONFLICT DO NOTHING'
+
+    returns_id = False
+    insert = _INSERT_INTO.match(sql)
+    if insert and insert.group(1).lower() not in TABLES_WITHOUT_ID and 'RETURNING' not in sql.upper():
+        sql += ' RETURNING id'
+        returns_id = True
+
+    return sql, returns_id
+
+
+def _as_text(value, cursor):
+    return value
+
+
+def _as_float(value, cursor):
+    return float(value) if value is not None else None
+
+
+if PSYCOPG2_AVAILABLE:
+    # Match sqlite3's return types: timestamps come back as the same
+    # 'YYYY-MM-DD HH:MM:SS' strings the templates slice, and NUMERIC
+    # aggregates (AVG over integers) as floats rather than Decimals
+    psycopg2.extensions.register_type(psycopg2.extensions.new_type(
+        (1082, 1083, 1114, 1184), 'SQLITE_TEXT_TIMESTAMP', _as_text))
+    psycopg2.extensions.register_type(psycopg2.extensions.new_type(
+        (1700,), 'SQLITE_FLOAT_NUMERIC', _as_float))
+
+    IntegrityError = psycopg2.IntegrityError
+    OperationalError = psycopg2.OperationalError
+    Error = psycopg2.Error
+else:
+    class Error(Exception):
+        """Placeholder so except clauses work without psycopg2 installed"""
+
+    class IntegrityError(Error):
+        pass
+
+    class OperationalError(Error):
+        pass
+
+
+class PostgresCursor:
+    """sqlite3.Cursor look-alike over a psycopg2 cursor"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self._cursor = connection.raw.cursor()
+        self.row_factory = connection.row_factory
+        self.lastrowid = None
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def _row(self, row):
+        if row is None or self.row_factory is None:
+            return row
+        return self.row_factory(self, row)
+
+    def execute(self, sql, params=()):
+        statement, returns_id = translate(sql, bool(params))
+        self._cursor.execute(statement, tuple(params) if params else None)
+        self.lastrowid = None
+        if returns_id:
+            row = self._cursor.fetchone()
+            self.lastrowid = row[0] if row else None
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        statement, returns_id = translate(sql, True)
+        if returns_id:
+            statement = statement[:-len(' RETURNING id')]
+        self._cursor.executemany(statement, [tuple(params) for params in seq_of_params])
+        return self
+
+    def fetchone(self):
+        if self._cursor.description is None:
+            return None
+        return self._row(self._cursor.fetchone())
+
+    def fetchall(self):
+        if self._cursor.description is None:
+            return []
+        rows = self._cursor.fetchall()
+        if self.row_factory is None:
+            return rows
+        return [self.row_factory(self, row) for row in rows]
+
+    def fetchmany(self, size=None):
+        if self._cursor.description is None:
+            return []
+        rows = self._cursor.fetchmany(size) if size else self._cursor.fetchmany()
+        return [self._row(row) for row in rows]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        self._cursor.close()
+
+
+class PostgresConnection:
+    """sqlite3.Connection look-alike over a (possibly pooled) psycopg2 connection"""
+
+    dialect = 'postgresql'
+
+    def __init__(self, raw, pool=None):
+        self.raw = raw
+        self.pool = pool
+        self.row_factory = None
+
+    def cursor(self):
+        return PostgresCursor(self)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    @property
+    def in_transaction(self):
+        return self.raw.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        """Return the connection to its pool, or close it if it is unpooled"""
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            self.raw.close()
+
+
+class PostgresPool:
+    """
+    Thread-safe pool of server-side connections
+
+    Wraps psycopg2's ThreadedConnectionPool, which raises as soon as it is
+    exhausted, with a semaphore so callers wait for a free connection instead.
+    """
+
+    def __init__(self, dsn, min_connections, max_connections, timeout):
+        if not PSYCOPG2_AVAILABLE:
+            raise RuntimeError('DATABASE_URL points at PostgreSQL but psycopg2 is not installed')
+        self.timeout = timeout
+        self._available = threading.BoundedSemaphore(max_connections)
+        self._pool = psycopg2.pool.ThreadedConnectionPool(
+            min_connections, max_connections, dsn, options=CONNECT_OPTIONS)
+
+    def acquire(self, readonly=False):
+        """Check out a connection; readonly ones run every transaction READ ONLY"""
+        if not self._available.acquire(timeout=self.timeout):
+            raise OperationalError('Timed out waiting for a database connection')
+        try:
+            raw = self._pool.getconn()
+            if raw.readonly != readonly:
+                raw.set_session(readonly=readonly)
+            return PostgresConnection(raw, self)
+        except Exception:
+            self._available.release()
+            raise
+
+    def release(self, conn):
+        raw, conn.raw = conn.raw, None
+        if raw is None:
+            return
+        try:
+            if raw.closed:
+                self._pool.putconn(raw, close=True)
+                return
+            if raw.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                raw.rollback()
+            self._pool.putconn(raw)
+        finally:
+            self._available.release()
+
+    def close(self):
+        self._pool.closeall()
+
+
+def connect(dsn):
+    """Open an unpooled connection; the caller closes it"""
+    if not PSYCOPG2_AVAILABLE:
+        raise RuntimeError('DATABASE_URL points at PostgreSQL but psycopg2 is not installed')
+    return PostgresConnection(psycopg2.connect(dsn, options=CONNECT_OPTIONS))
@@ -0,0 +1,578 @@
+"""
+Repository Layer
+Typed read access to the tournament database. Each repository keeps its SQL
+as module-level constants (so sqlite3's statement cache reuses the prepared
+statements) and returns compact __slots__ row objects built directly by the
+cursor's row_factory - no tuple -> list -> tuple copies in the routes.
+"""
+import base64
+import json
+from datetime import datetime
+
+
+class Record:
+    """Base class for read-only row objects
+
+    Subclasses list their columns in __slots__, in the same order as the
+    SELECT that feeds them.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def factory(cls, cursor, row):
+        """sqlite3 row_factory that builds the record straight from the row"""
+        return cls(*row)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class CurrentUser(Record):
+    """The logged-in user's row, as needed by the decorators and context processors"""
+    __slots__ = ('id', 'username', 'is_paid', 'avatar_filename', 'is_admin', 'admin_level', 'is_blocked')
+
+
+class VideoCard(Record):
+    """Video as shown in listings, the homepage and the sidebar"""
+    __slots__ = ('id', 'title', 'filename', 'total_votes', 'average_rating',
+                 'username', 'upload_date', 'avatar_filename')
+
+
+class VideoDetail(Record):
+    """Video with its uploader, as shown on the video page"""
+    __slots__ = ('id', 'user_id', 'title', 'description', 'filename', 'upload_date',
+                 'total_votes', 'average_rating', 'view_count', 'username', 'avatar_filename',
+                 'comment_count')
+
+
+class UserVideo(Record):
+    """Video as listed on its owner's dashboard"""
+    __slots__ = ('id', 'title', 'filename', 'total_votes', 'average_rating', 'upload_date')
+
+
+class LeaderboardEntry(Record):
+    """Participant totals and position on the leaderboard"""
+    __slots__ = ('rank', 'username', 'video_count', 'avg_rating', 'total_votes')
+
+
+class CommentView(Record):
+    """Top-level comment with its counts, the viewer's like/dislike state and
+    (when prefetched) its first replies"""
+    __slots__ = ('text', 'date', 'username', 'id', 'reply_count', 'avatar',
+                 'like_count', 'user_liked', 'user_disliked', 'replies', 'next_reply_cursor')
+
+    def __init__(self, *values):
+        super().__init__(*values)
+        self.replies = []
+        self.next_reply_cursor = None
+
+    def as_dict(self):
+        data = super().as_dict()
+        data['replies'] = [reply.as_dict() for reply in self.replies]
+        return data
+
+
+class ReplyView(Record):
+    """Reply in a comment thread, with the viewer's like/dislike state"""
+    __slots__ = ('text', 'date', 'username', 'id', 'avatar', 'like_count',
+                 'user_liked', 'user_disliked', 'parent_id')
+
+
+class CommentReactions(Record):
+    """A comment's like count and one user's like/dislike state, after a click"""
+    __slots__ = ('like_count', 'user_liked', 'user_disliked')
+
+
+class RatingState(Record):
+    """A video's vote aggregates and one user's current rating, before a re-rate"""
+    __slots__ = ('total_votes', 'rating_sum', 'rating_count', 'user_rating')
+
+
+class TournamentSettings(Record):
+    """The single tournament_settings row"""
+    __slots__ = ('is_open', 'last_updated', 'updated_by', 'generation')
+
+
+# Column lists are coalesced/cast in SQL so rows arrive ready to render
+VIDEO_CARD_COLUMNS = '''v.id, v.title, v.filename, COALESCE(v.total_votes, 0),
+                        COALESCE(CAST(v.average_rating AS REAL), 0.0), u.username,
+                        v.upload_date, u.avatar_filename'''
+
+SQL_TOP_VIDEOS = f'''SELECT {VIDEO_CARD_COLUMNS}
+                     FROM videos v JOIN users u ON v.user_id = u.id
+                     WHERE v.is_approved = 1 AND v.is_blocked = 0
+                     ORDER BY v.total_votes DESC, v.upload_date DESC LIMIT ?'''
+
+# /videos pages are keyset-paginated: the next page starts after the last
+# card's sort key (see encode_cursor), so every page is one index range scan
+SQL_VIDEOS_MOST_VOTED = f'''SELECT {VIDEO_CARD_COLUMNS}
+                            FROM videos v JOIN users u ON v.user_id = u.id
+                            WHERE v.is_approved = 1 AND v.is_blocked = 0
+                            ORDER BY v.total_votes DESC, v.upload_date DESC, v.id DESC LIMIT ?'''
+
+SQL_VIDEOS_MOST_VOTED_AFTER = f'''SELECT {VIDEO_CARD_COLUMNS}
+                                  FROM videos v JOIN users u ON v.user_id = u.id
+                                  WHERE v.is_approved = 1 AND v.is_blocked = 0
+                                    AND (v.total_votes, v.upload_date, v.id) < (?, ?, ?)
+                                  ORDER BY v.total_votes DESC, v.upload_date DESC, v.id DESC LIMIT ?'''
+
+SQL_VIDEOS_RECENT = f'''SELECT {VIDEO_CARD_COLUMNS}
+                        FROM videos v JOIN users u ON v.user_id = u.id
+                        WHERE v.is_approved = 1 AND v.is_blocked = 0
+                        ORDER BY v.upload_date DESC, v.id DESC LIMIT ?'''
+
+SQL_VIDEOS_RECENT_AFTER = f'''SELECT {VIDEO_CARD_COLUMNS}
+                              FROM videos v JOIN users u ON v.user_id = u.id
+                              WHERE v.is_approved = 1 AND v.is_blocked = 0
+                                AND (v.upload_date, v.id) < (?, ?)
+                              ORDER BY v.upload_date DESC, v.id DESC LIMIT ?'''
+
+SQL_TOP_RATED_VIDEOS = f'''SELECT {VIDEO_CARD_COLUMNS}
+                           FROM videos v JOIN users u ON v.user_id = u.id
+                           WHERE v.is_approved = 1 AND v.is_blocked = 0
+                           ORDER BY v.average_rating DESC, v.total_votes DESC LIMIT ?'''
+
+SQL_VIDEO_DETAIL = '''SELECT v.id, v.user_id, v.title, v.description, v.filename, v.upload_date,
+                             COALESCE(v.total_votes, 0), COALESCE(CAST(v.average_rating AS REAL), 0.0),
+                             COALESCE(v.view_count, 0), u.username, u.avatar_filename, v.comment_count
+                      FROM videos v JOIN users u ON v.user_id = u.id
+                      WHERE v.id = ?'''
+
+SQL_USER_VIDEOS = '''SELECT id, title, filename, COALESCE(total_votes, 0),
+                            COALESCE(CAST(average_rating AS REAL), 0.0), upload_date
+                     FROM videos WHERE user_id = ? ORDER BY upload_date DESC'''
+
+SQL_COUNT_VIDEOS = 'SELECT COUNT(*) FROM videos'
+
+# Write statement: view_count is the number of unique (user, video) views
+SQL_REFRESH_VIEW_COUNT = '''UPDATE videos SET view_count = (SELECT COUNT(*) FROM video_views WHERE video_id = ?)
+                            WHERE id = ?'''
+
+# The leaderboard table and its ranks are trigger-maintained (migration 8);
+# a page is a range of ranks, however many users there are
+SQL_LEADERBOARD = '''SELECT l.rank, u.username, l.video_count, l.avg_rating, l.total_votes
+                     FROM leaderboard l JOIN users u ON u.id = l.user_id
+                     WHERE l.rank BETWEEN ? AND ?
+                     ORDER BY l.rank'''
+SQL_LEADERBOARD_SIZE = 'SELECT MAX(rank) FROM leaderboard'
+
+SQL_COUNT_USERS = 'SELECT COUNT(*) FROM users'
+SQL_USER_IS_PAID = 'SELECT is_paid FROM users WHERE id = ?'
+SQL_USER_AVATAR = 'SELECT avatar_filename FROM users WHERE id = ?'
+SQL_CURRENT_USER = '''SELECT id, username, is_paid, avatar_filename, is_admin, admin_level, is_blocked
+                      FROM users WHERE id = ?'''
+
+# reply_count and like_count are trigger-maintained (migration 5). Comments
+# are keyset-paginated like /videos; the viewer's like/dislike flags start
+# out false and are filled in for the whole page by SQL_VIEWER_REACTIONS
+COMMENT_VIEW_COLUMNS = '''c.comment, c.comment_date, u.username, c.id, c.reply_count,
+                          u.avatar_filename, c.like_count, FALSE, FALSE'''
+
+SQL_VIDEO_COMMENTS = f'''SELECT {COMMENT_VIEW_COLUMNS}
+                         FROM comments c JOIN users u ON c.user_id = u.id
+                         WHERE c.video_id = ? AND c.parent_id IS NULL
+                         ORDER BY c.comment_date DESC, c.id DESC LIMIT ?'''
+
+SQL_VIDEO_COMMENTS_AFTER = f'''SELECT {COMMENT_VIEW_COLUMNS}
+                               FROM comments c JOIN users u ON c.user_id = u.id
+                               WHERE c.video_id = ? AND c.parent_id IS NULL
+                                 AND (c.comment_date, c.id) < (?, ?)
+                               ORDER BY c.comment_date DESC, c.id DESC LIMIT ?'''
+
+# Replies read oldest first. A page of threads prefetches the first few
+# replies of every comment in one windowed query (formatted with one
+# placeholder per parent id; ReplyView ignores the trailing position
+# column); the rest of a thread is keyset-paginated
+REPLY_VIEW_COLUMNS = '''c.comment, c.comment_date, u.username, c.id, u.avatar_filename,
+                        c.like_count, FALSE, FALSE, c.parent_id'''
+
+SQL_REPLY_PREVIEWS = f'''SELECT * FROM (
+                             SELECT {REPLY_VIEW_COLUMNS},
+                                    ROW_NUMBER() OVER (PARTITION BY c.parent_id
+                                                       ORDER BY c.comment_date, c.id) AS position
+                             FROM comments c JOIN users u ON c.user_id = u.id
+                             WHERE c.parent_id IN ({{ids}})
+                         ) previews
+                         WHERE position <= ?'''
+
+SQL_REPLIES = f'''SELECT {REPLY_VIEW_COLUMNS}
+                  FROM comments c JOIN users u ON c.user_id = u.id
+                  WHERE c.parent_id = ?
+                  ORDER BY c.comment_date, c.id LIMIT ?'''
+
+SQL_REPLIES_AFTER = f'''SELECT {REPLY_VIEW_COLUMNS}
+                        FROM comments c JOIN users u ON c.user_id = u.id
+                        WHERE c.parent_id = ? AND (c.comment_date, c.id) > (?, ?)
+                        ORDER BY c.comment_date, c.id LIMIT ?'''
+
+# Formatted with one placeholder per comment id (see in_placeholders)
+SQL_VIEWER_REACTIONS = '''SELECT comment_id, 1 FROM comment_likes
+                           WHERE user_id = ? AND comment_id IN ({ids})
+                           UNION ALL
+                           SELECT comment_id, 0 FROM comment_dislikes
+                           WHERE user_id = ? AND comment_id IN ({ids})'''
+
+SQL_COMMENT_REACTIONS = '''SELECT c.like_count,
+                                  EXISTS(SELECT 1 FROM comment_likes
+                                         WHERE comment_id = c.id AND user_id = ?),
+                                  EXISTS(SELECT 1 FROM comment_dislikes
+                                         WHERE comment_id = c.id AND user_id = ?)
+                           FROM comments c WHERE c.id = ?'''
+
+SQL_USER_RATING = 'SELECT rating FROM votes WHERE user_id = ? AND video_id = ?'
+
+# Only rateable (unblocked) videos; user_rating is NULL if the user hasn't rated it
+SQL_RATING_STATE = '''SELECT COALESCE(v.total_votes, 0), v.rating_sum, v.rating_count, vo.rating
+                      FROM videos v
+                      LEFT JOIN votes vo ON vo.video_id = v.id AND vo.user_id = ?
+                      WHERE v.id = ? AND v.is_blocked = 0'''
+SQL_VOTE_EXISTS = 'SELECT 1 FROM votes WHERE user_id = ? AND video_id = ?'
+
+SQL_TOURNAMENT_SETTINGS = 'SELECT is_open, last_updated, updated_by, generation FROM tournament_settings WHERE id = 1'
+SQL_TOURNAMENT_GENERATION = 'SELECT generation FROM tournament_settings WHERE id = 1'
+
+SQL_VOTING_FEE_PAID = '''SELECT 1 FROM voting_fees
+                         WHERE user_id = ? AND video_id = ? AND status = 'successful' '''
+
+# Statements app.py still issues itself (tuple rows), kept here so the query
+# plan suite checks exactly what runs
+SQL_VIEW_EXISTS = 'SELECT id FROM video_views WHERE user_id = ? AND video_id = ?'
+SQL_COUNT_VIDEO_VIEWS = 'SELECT COUNT(*) FROM video_views WHERE video_id = ?'
+
+SQL_PROFILE_RECENT_COMMENTS = '''SELECT c.comment, c.comment_date, v.title, v.id
+                                 FROM comments c
+                                 JOIN videos v ON c.video_id = v.id
+                                 WHERE c.user_id = ?
+                                 ORDER BY c.comment_date DESC
+                                 LIMIT 5'''
+
+SQL_ADMIN_RECENT_ACTIVITY = '''SELECT action, target_type, target_id, details, timestamp, u.username
+                               FROM admin_logs al JOIN users u ON al.admin_id = u.id
+                               ORDER BY timestamp DESC LIMIT 10'''
+
+# Separate statements so a status filter can use idx_reports_status
+_ADMIN_REPORTS = '''SELECT r.id, r.reported_type, r.reported_id, r.reason, r.description,
+                           r.report_date, r.status, u1.username as reporter, u2.username as handler
+                    FROM reports r
+                    JOIN users u1 ON r.reporter_id = u1.id
+                    LEFT JOIN users u2 ON r.handled_by = u2.id
+                    {where}
+                    ORDER BY r.report_date DESC
+                    LIMIT 50'''
+SQL_ADMIN_REPORTS = _ADMIN_REPORTS.format(where='')
+SQL_ADMIN_REPORTS_BY_STATUS = _ADMIN_REPORTS.format(where='WHERE r.status = ?')
+# Every status counted in one pass over the status index
+SQL_ADMIN_REPORT_COUNTS = 'SELECT status, COUNT(*) FROM reports GROUP BY status'
+
+# Admin user/video consoles: rows matching ?filter=, optionally restricted to
+# the ids a search subquery selects (see search.matching_ids), newest first
+ADMIN_USER_FILTERS = {
+    'all': '',
+    'blocked': ' AND is_blocked = 1',
+    'admin': ' AND is_admin = 1',
+    'participants': ' AND is_paid = 1',
+    'regular': ' AND is_paid = 0',
+}
+ADMIN_VIDEO_FILTERS = {
+    'all': '',
+    'pending': ' AND v.is_approved = 0 AND v.is_blocked = 0',
+    'approved': ' AND v.is_approved = 1 AND v.is_blocked = 0',
+    'blocked': ' AND v.is_blocked = 1',
+}
+
+
+def admin_users_sql(filter_type='all', search_ids=None, after=False):
+    """
+    Statements of one admin users page
+
+    Args:
+        filter_type: Key of ADMIN_USER_FILTERS (unknown values mean 'all')
+        search_ids: Subquery selecting the ids of matching users (one ? parameter), or None
+        after: Whether the page continues after a (registration_date, id) keyset
+
+    Returns:
+        tuple: (page SQL, SQL selecting one row per matching user, for counting)
+    """
+    where = 'WHERE 1=1' + ADMIN_USER_FILTERS.get(filter_type, '')
+    if search_ids:
+        where += f' AND id IN ({search_ids})'
+    keyset = ' AND (registration_date, id) < (?, ?)' if after else ''
+    page = f'''SELECT id, username, email, first_name, last_name, is_admin,
+                      is_blocked, registration_date, last_login, login_count, admin_level, is_paid
+               FROM users {where}{keyset}
+               ORDER BY registration_date DESC, id DESC
+               LIMIT ?'''
+    return page, f'SELECT 1 FROM users {where}'
+
+
+def admin_videos_sql(filter_type='all', search_ids=None, after=False):
+    """
+    Statements of one admin videos page (see admin_users_sql)
+
+    Args:
+        filter_type: Key of ADMIN_VIDEO_FILTERS (unknown values mean 'all')
+        search_ids: Subquery selecting the ids of matching videos (one ? parameter), or None
+        after: Whether the page continues after an (upload_date, id) keyset
+
+    Returns:
+        tuple: (page SQL, SQL selecting one row per matching video, for counting)
+    """
+    where = 'WHERE 1=1' + ADMIN_VIDEO_FILTERS.get(filter_type, '')
+    if search_ids:
+        where += f' AND v.id IN ({search_ids})'
+    keyset = ' AND (v.upload_date, v.id) < (?, ?)' if after else ''
+    page = f'''SELECT v.id, v.title, v.filename, v.upload_date, v.is_approved, v.is_blocked,
+                      v.total_votes, v.average_rating, v.file_size, u.username, v.view_count
+               FROM videos v JOIN users u ON v.user_id = u.id {where}{keyset}
+               ORDER BY v.upload_date DESC, v.id DESC
+               LIMIT ?'''
+    return page, f'SELECT 1 FROM videos v {where}'
+
+
+# Header count of an admin console: stops after the first cap + 1 rows
+SQL_CAPPED_COUNT = 'SELECT COUNT(*) FROM ({query} LIMIT ?) capped'
+
+
+def in_placeholders(count):
+    """'?, ?, ?' for an IN list of count values"""
+    return ', '.join('?' * count)
+
+
+def encode_cursor(key):
+    """Opaque, URL-safe page cursor for a sort key tuple"""
+    payload = json.dumps([str(value) if isinstance(value, datetime) else value for value in key])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size):
+    """
+    Sort key tuple from a page cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or has the wrong number of values
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f'Invalid cursor: {cursor!r}') from e
+    if (not isinstance(key, list) or len(key) != size
+            or not all(isinstance(value, (int, float, str)) for value in key)):
+        raise ValueError(f'Invalid cursor: {cursor!r}')
+    return tuple(key)
+
+
+class Repository:
+    """Base repository bound to one connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def _all(self, record, sql, params=()):
+        cursor = self.conn.cursor()
+        cursor.row_factory = record.factory
+        return cursor.execute(sql, params).fetchall()
+
+    def _one(self, record, sql, params=()):
+        cursor = self.conn.cursor()
+        cursor.row_factory = record.factory
+        return cursor.execute(sql, params).fetchone()
+
+    def _scalar(self, sql, params=(), default=None):
+        row = self.conn.execute(sql, params).fetchone()
+        return row[0] if row else default
+
+
+class UserRepository(Repository):
+
+    def count(self):
+        return self._scalar(SQL_COUNT_USERS)
+
+    def is_paid(self, user_id):
+        return bool(self._scalar(SQL_USER_IS_PAID, (user_id,), False))
+
+    def avatar(self, user_id):
+        return self._scalar(SQL_USER_AVATAR, (user_id,)) or None
+
+    def leaderboard(self, page=1, per_page=50):
+        """One page of the leaderboard, best first"""
+        first = (page - 1) * per_page + 1
+        return self._all(LeaderboardEntry, SQL_LEADERBOARD, (first, first + per_page - 1))
+
+    def leaderboard_size(self):
+        return self._scalar(SQL_LEADERBOARD_SIZE) or 0
+
+    def current(self, user_id):
+        return self._one(CurrentUser, SQL_CURRENT_USER, (user_id,))
+
+
+class VideoRepository(Repository):
+
+    def count(self):
+        return self._scalar(SQL_COUNT_VIDEOS)
+
+    def top(self, limit=5):
+        """Approved videos ranked by votes (tournament ranking)"""
+        return self._all(VideoCard, SQL_TOP_VIDEOS, (limit,))
+
+    def page(self, sort_by='most_voted', after=None, limit=12):
+        """One page of approved, unblocked videos in the requested order
+
+        Args:
+            sort_by: 'most_voted' (default) or 'recent'
+            after: Cursor of the previous page's last card (see next_cursor), or None
+            limit: Cards per page
+
+        Returns:
+            tuple: (list of VideoCard, cursor of the next page or None)
+        """
+        recent = sort_by == 'recent'
+        if after is None:
+            cards = self._all(VideoCard, SQL_VIDEOS_RECENT if recent else SQL_VIDEOS_MOST_VOTED, (limit + 1,))
+        else:
+            key = decode_cursor(after, 2 if recent else 3)
+            cards = self._all(VideoCard, SQL_VIDEOS_RECENT_AFTER if recent else SQL_VIDEOS_MOST_VOTED_AFTER,
+                              key + (limit + 1,))
+        if len(cards) <= limit:
+            return cards, None
+        cards = cards[:limit]
+        last = cards[-1]
+        key = (last.upload_date, last.id) if recent else (last.total_votes, last.upload_date, last.id)
+        return cards, encode_cursor(key)
+
+    def top_rated(self, limit=10):
+        return self._all(VideoCard, SQL_TOP_RATED_VIDEOS, (limit,))
+
+    def get(self, video_id):
+        return self._one(VideoDetail, SQL_VIDEO_DETAIL, (video_id,))
+
+    def for_user(self, user_id):
+        return self._all(UserVideo, SQL_USER_VIDEOS, (user_id,))
+
+
+class CommentRepository(Repository):
+
+    def page(self, video_id, viewer_id=None, after=None, limit=20, reply_previews=0):
+        """One page of a video's top-level comments, newest first
+
+        Args:
+            video_id: Video whose comments to load
+            viewer_id: Logged-in user, used for the liked/disliked flags
+            after: Cursor of the previous page's last comment, or None
+            limit: Comments per page
+            reply_previews: Replies to prefetch into each comment's replies
+                (with next_reply_cursor set if the thread goes on)
+
+        Returns:
+            tuple: (list of CommentView, cursor of the next page or None)
+        """
+        if after is None:
+            comments = self._all(CommentView, SQL_VIDEO_COMMENTS, (video_id, limit + 1))
+        else:
+            comments = self._all(CommentView, SQL_VIDEO_COMMENTS_AFTER,
+                                 (video_id,) + decode_cursor(after, 2) + (limit + 1,))
+        next_cursor = None
+        if len(comments) > limit:
+            comments = comments[:limit]
+            next_cursor = encode_cursor((comments[-1].date, comments[-1].id))
+
+        replies = []
+        if reply_previews:
+            replies = self._prefetch_replies(comments, reply_previews)
+        if viewer_id is not None and comments:
+            self._fill_viewer_reactions(comments + replies, viewer_id)
+        return comments, next_cursor
+
+    def replies(self, comment_id, viewer_id=None, after=None, limit=10):
+        """One page of a comment's replies, oldest first
+
+        Args:
+            comment_id: Parent comment
+            viewer_id: Logged-in user, used for the liked/disliked flags
+            after: Cursor of the last reply already shown (see next_reply_cursor), or None
+            limit: Replies per page
+
+        Returns:
+            tuple: (list of ReplyView, cursor of the next page or None)
+        """
+        if after is None:
+            replies = self._all(ReplyView, SQL_REPLIES, (comment_id, limit + 1))
+        else:
+            replies = self._all(ReplyView, SQL_REPLIES_AFTER,
+                                (comment_id,) + decode_cursor(after, 2) + (limit + 1,))
+        next_cursor = None
+        if len(replies) > limit:
+            replies = replies[:limit]
+            next_cursor = encode_cursor((replies[-1].date, replies[-1].id))
+        if viewer_id is not None and replies:
+            self._fill_viewer_reactions(replies, viewer_id)
+        return replies, next_cursor
+
+    def _prefetch_replies(self, comments, limit):
+        """Attach the first replies of every comment with one query; returns all of them"""
+        threads = {comment.id: comment for comment in comments if comment.reply_count}
+        if not threads:
+            return []
+        ids = tuple(threads)
+        replies = self._all(ReplyView, SQL_REPLY_PREVIEWS.format(ids=in_placeholders(len(ids))),
+                            ids + (limit,))
+        replies.sort(key=lambda reply: (reply.date, reply.id))
+        for reply in replies:
+            threads[reply.parent_id].replies.append(reply)
+        for comment in threads.values():
+            # reply_count is trigger-maintained, so it tells whether the thread goes on
+            if comment.replies and comment.reply_count > len(comment.replies):
+                last = comment.replies[-1]
+                comment.next_reply_cursor = encode_cursor((last.date, last.id))
+        return replies
+
+    def _fill_viewer_reactions(self, comments, viewer_id):
+        """Set user_liked/user_disliked on a page of comments (or replies) with one query"""
+        by_id = {comment.id: comment for comment in comments}
+        ids = tuple(by_id)
+        sql = SQL_VIEWER_REACTIONS.format(ids=in_placeholders(len(ids)))
+        for comment_id, liked in self.conn.execute(sql, (viewer_id,) + ids + (viewer_id,) + ids):
+            if liked:
+                by_id[comment_id].user_liked = True
+            else:
+                by_id[comment_id].user_disliked = True
+
+    def reactions(self, comment_id, user_id):
+        return self._one(CommentReactions, SQL_COMMENT_REACTIONS, (user_id, user_id, comment_id))
+
+
+class VoteRepository(Repository):
+
+    def user_rating(self, user_id, video_id):
+        return self._scalar(SQL_USER_RATING, (user_id, video_id))
+
+    def has_voted(self, user_id, video_id):
+        return self._scalar(SQL_VOTE_EXISTS, (user_id, video_id)) is not None
+
+    def rating_state(self, user_id, video_id):
+        """RatingState for an unblocked video, or None if it can't be rated"""
+        return self._one(RatingState, SQL_RATING_STATE, (user_id, video_id))
+
+
+class PaymentRepository(Repository):
+
+    def has_paid_voting_fee(self, user_id, video_id):
+        return self._scalar(SQL_VOTING_FEE_PAID, (user_id, video_id)) is not None
+
+
+class TournamentRepository(Repository):
+
+    def settings(self):
+        """TournamentSettings, or None if the row is missing"""
+        return self._one(TournamentSettings, SQL_TOURNAMENT_SETTINGS)
+
+    def generation(self):
+        """Counter bumped by every change to the settings row, or None if the row is missing"""
+        return self._scalar(SQL_TOURNAMENT_GENERATION)
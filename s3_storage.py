@@ -277,6 +277,30 @@ class S3StorageService:
             str: Public URL of the file
         """
         return f"https://{self.bucket_name}.s3.{self.region}.amazonaws.com/{s3_key}"
+    
+    def get_presigned_url(self, s3_key, expires_in=3600):
+        """
+        Get a time-limited URL for a file in S3
+        
+        Args:
+            s3_key: The key (path) of the file
+            expires_in: Seconds the URL stays valid
+            
+        Returns:
+            str: Presigned URL, or the public URL if signing is not possible
+        """
+        if not self.is_available():
+            return self.get_file_url(s3_key)
+        
+        try:
+            return self.s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': self.bucket_name, 'Key': s3_key},
+                ExpiresIn=expires_in
+            )
+        except ClientError as e:
+            print(f"❌ S3 URL signing failed: {str(e)}")
+            return self.get_file_url(s3_key)
 
 # Global instance
 s3_storage = S3StorageService()
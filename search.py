@@ -0,0 +1,183 @@
+"""
+Full-Text Search
+Query side of the search tables from migration 11:
+
+    users_fts    username, email, first_name, last_name
+    videos_fts   title, tags, uploader username, description
+
+Both hold one row per user/video under its id (rowid) and are kept in step
+by triggers, so a search never reads the source tables with LIKE '%term%'.
+What people type is turned into a prefix match of every word, so "ali smi"
+finds "Alice Smith" as it is being typed.
+
+On SQLite the tables are FTS5 tables queried with MATCH; on PostgreSQL they
+hold a weighted tsvector queried with @@ to_tsquery().
+
+VideoSearch serves the public /search page and the search box typeahead:
+approved, unblocked videos ranked by relevance (bm25() / ts_rank()) boosted
+by their votes. The boost uses ln(), which database.ensure_math_functions()
+provides on SQLite builds without the math functions.
+"""
+import re
+from database import is_postgres
+from repository import Record, Repository, VideoCard, VIDEO_CARD_COLUMNS, decode_cursor, encode_cursor
+
+# Words as the tokenizers see them (underscores separate words too)
+_WORDS = re.compile(r'[^\W_]+')
+MAX_TERMS = 8
+
+
+def search_terms(text):
+    """Lowercased words of a search box entry (at most MAX_TERMS)"""
+    return _WORDS.findall((text or '').lower())[:MAX_TERMS]
+
+
+def match_query(conn, text):
+    """
+    Query string matching rows that contain a word starting with each typed word
+
+    Returns:
+        str: FTS5 MATCH or to_tsquery() argument, or None if text has no words
+    """
+    terms = search_terms(text)
+    if not terms:
+        return None
+    if is_postgres(conn):
+        return ' & '.join(f'{term}:*' for term in terms)
+    # Quoted, so words like AND/NOT/NEAR are searched for, not parsed
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matching_ids(conn, table):
+    """
+    Subquery selecting the ids (rowids) of a search table's rows that match
+    the one ? parameter (a match_query() string)
+
+    Used as "... WHERE u.id IN (<subquery>)".
+    """
+    if is_postgres(conn):
+        return f"SELECT rowid FROM {table} WHERE document @@ to_tsquery('simple', ?)"
+    return f'SELECT rowid FROM {table} WHERE {table} MATCH ?'
+
+
+class SearchHit(Record):
+    """Video card of a search result, with the score it was ranked by (see SCORE_SCALE)"""
+    __slots__ = VideoCard.__slots__ + ('score',)
+
+
+class VideoSuggestion(Record):
+    """Typeahead entry of the search box"""
+    __slots__ = ('id', 'title', 'username')
+
+
+# Relevance times a boost that grows with the log of the votes, so popularity
+# breaks near-ties without burying a better match. The videos_fts columns
+# (title, tags, uploader, description) weigh 10:5:3:1; ts_rank() takes the
+# same weights for the A-D labels migration 11 gives them, listed D first.
+# bm25() is negative (lower is better), hence the minus.
+def _vote_boost(votes):
+    return f'(1 + ln(1 + COALESCE({votes}, 0)))'
+
+
+# Scores are ranked and paged as integers (the score times SCORE_SCALE, rounded):
+# a float carried through the JSON cursor and compared again in SQL may not
+# equal the value it came from, which would skip or repeat results at the seam
+SCORE_SCALE = 1000000000
+_DIALECTS = {
+    False: {
+        'relevance': '-bm25(videos_fts, 10.0, 5.0, 3.0, 1.0)',
+        'source': 'videos_fts',
+        'match': 'videos_fts MATCH ?',
+    },
+    True: {
+        'relevance': "ts_rank('{0.1, 0.3, 0.5, 1.0}', videos_fts.document, query)",
+        'source': "videos_fts CROSS JOIN to_tsquery('simple', ?) query",
+        'match': 'videos_fts.document @@ query',
+    },
+}
+
+
+def _search_statements(relevance, source, match):
+    score = f'CAST(ROUND({relevance} * {_vote_boost("v.total_votes")} * {SCORE_SCALE}) AS BIGINT)'
+
+    def ranked(after=''):
+        return f'''SELECT {VIDEO_CARD_COLUMNS}, {score} AS score
+                   FROM {source} JOIN videos v ON v.id = videos_fts.rowid JOIN users u ON v.user_id = u.id
+                   WHERE {match} AND v.is_approved = 1 AND v.is_blocked = 0{after}
+                   ORDER BY score DESC, v.id DESC LIMIT ?'''
+
+    return {
+        # Ranking needs every match scored; pages continue after the last (score, id)
+        'results': ranked(),
+        'results_after': ranked(f' AND ({score}, v.id) < (?, ?)'),
+        # Typeahead re-ranks by votes only the most relevant public matches,
+        # so the vote boost is computed for a bounded number of rows
+        'suggestions': f'''SELECT hits.id, hits.title, u.username
+                          FROM (SELECT v.id, v.title, v.user_id, v.total_votes, {relevance} AS relevance
+                                FROM {source} JOIN videos v ON v.id = videos_fts.rowid
+                                WHERE {match} AND v.is_approved = 1 AND v.is_blocked = 0
+                                ORDER BY relevance DESC, v.id DESC LIMIT ?) hits
+                          JOIN users u ON hits.user_id = u.id
+                          ORDER BY hits.relevance * {_vote_boost("hits.total_votes")} DESC, hits.id DESC
+                          LIMIT ?''',
+    }
+
+
+# Built once per dialect so the statement cache reuses them
+SQL_SEARCH = {postgres: _search_statements(**parts) for postgres, parts in _DIALECTS.items()}
+
+
+class VideoSearch(Repository):
+    """Ranked search over approved, unblocked videos"""
+
+    def _sql(self, name):
+        return SQL_SEARCH[is_postgres(self.conn)][name]
+
+    def page(self, text, after=None, limit=12):
+        """
+        One page of results, best first
+
+        Args:
+            text: What was typed in the search box
+            after: Cursor of the previous page's last result (see next_cursor), or None
+            limit: Results per page
+
+        Returns:
+            tuple: (list of SearchHit, cursor of the next page or None)
+
+        Raises:
+            ValueError: If after is not a valid cursor
+        """
+        query = match_query(self.conn, text)
+        if query is None:
+            return [], None
+        if after is None:
+            hits = self._all(SearchHit, self._sql('results'), (query, limit + 1))
+        else:
+            score, video_id = decode_cursor(after, 2)
+            if not isinstance(score, int) or not isinstance(video_id, int):
+                raise ValueError(f'Invalid cursor: {after!r}')
+            hits = self._all(SearchHit, self._sql('results_after'), (query, score, video_id, limit + 1))
+        if len(hits) <= limit:
+            return hits, None
+        hits = hits[:limit]
+        return hits, encode_cursor((hits[-1].score, hits[-1].id))
+
+    def suggest(self, text, limit=8, candidates=500, min_length=3):
+        """
+        Typeahead suggestions for a partly typed query
+
+        Args:
+            text: What has been typed so far
+            limit: Suggestions to return
+            candidates: How many of the most relevant public matches are re-ranked by votes
+            min_length: Words shorter than this are left out of the match, since a
+                one- or two-letter prefix expands to most of the vocabulary
+
+        Returns:
+            list: VideoSuggestion records, best first
+        """
+        query = match_query(self.conn, ' '.join(term for term in search_terms(text) if len(term) >= min_length))
+        if query is None:
+            return []
+        return self._all(VideoSuggestion, self._sql('suggestions'), (query, candidates, limit))
@@ -0,0 +1,29 @@
+// Translation helper function
+function t(key) {
+    const keys = key.split('.');
+    let value = window.translations;
+
+    for (const k of keys) {
+        if (value && typeof value === 'object' && k in value) {
+            value = value[k];
+        } else {
+            return key; // Return key if translation not found
+        }
+    }
+
+    return value || key;
+}
+
+// Update all elements with data-i18n attribute
+function updateTranslations() {
+    document.querySelectorAll('[data-i18n]').forEach(element => {
+        const key = element.getAttribute('data-i18n');
+        const translation = t(key);
+        if (translation !== key) {
+            element.textContent = translation;
+        }
+    });
+}
+
+// Run on page load
+document.addEventListener('DOMContentLoaded', updateTranslations);
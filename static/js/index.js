@@ -0,0 +1,1997 @@
+document.addEventListener('DOMContentLoaded', function() {
+    // Enhanced Animations for Hero Section and Carousel
+    function animateOnLoad() {
+        // Hero Section Animations
+        const heroTitle = document.querySelector('.hero-title');
+        const heroSubtitle = document.querySelector('.hero-subtitle');
+        const heroButtons = document.querySelector('.hero-buttons');
+        const heroFeatures = document.querySelector('.hero-features');
+        const heroStats = document.querySelector('.hero-stats');
+        const carouselHeader = document.querySelector('.carousel-header');
+
+        // Animate hero title
+        if (heroTitle) {
+            setTimeout(() => {
+                heroTitle.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                heroTitle.style.opacity = '1';
+                heroTitle.style.transform = 'translateY(0)';
+            }, 200);
+        }
+
+        // Animate hero subtitle
+        if (heroSubtitle) {
+            setTimeout(() => {
+                heroSubtitle.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                heroSubtitle.style.opacity = '1';
+                heroSubtitle.style.transform = 'translateY(0)';
+            }, 400);
+        }
+
+        // Animate hero buttons or phone voting section
+        if (heroButtons) {
+            setTimeout(() => {
+                heroButtons.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                heroButtons.style.opacity = '1';
+                heroButtons.style.transform = 'translateY(0)';
+            }, 600);
+        }
+
+        // Animate phone voting section (for non-logged in users)
+        const phoneVotingSection = document.querySelector('.phone-voting-section');
+        if (phoneVotingSection) {
+            setTimeout(() => {
+                phoneVotingSection.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                phoneVotingSection.style.opacity = '1';
+                phoneVotingSection.style.transform = 'translateY(0)';
+            }, 600);
+        }
+
+        // Animate hero features
+        if (heroFeatures) {
+            setTimeout(() => {
+                heroFeatures.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                heroFeatures.style.opacity = '1';
+                heroFeatures.style.transform = 'translateY(0)';
+            }, 800);
+        }
+
+        // Animate hero stats with scaling effect
+        if (heroStats) {
+            setTimeout(() => {
+                heroStats.style.transition = 'all 1s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                heroStats.style.opacity = '1';
+                heroStats.style.transform = 'translateX(0)';
+
+                // Scale up stats cards individually
+                const statsCards = heroStats.querySelectorAll('.stats-card');
+                statsCards.forEach((card, index) => {
+                    setTimeout(() => {
+                        card.style.transform = 'scale(1)';
+                    }, index * 150);
+                });
+
+                // Start counter animation for stats
+                setTimeout(() => {
+                    animateCounters();
+                }, 500);
+            }, 1000);
+        }
+
+        // Animate carousel header when it comes into view
+        if (carouselHeader) {
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        entry.target.style.transition = 'all 0.8s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                        entry.target.style.opacity = '1';
+                        entry.target.style.transform = 'translateY(0)';
+                        observer.unobserve(entry.target);
+                    }
+                });
+            }, { threshold: 0.3 });
+
+            observer.observe(carouselHeader);
+        }
+
+        // Add feature hover animations
+        const featureItems = document.querySelectorAll('.feature-item');
+        featureItems.forEach(item => {
+            item.addEventListener('mouseenter', function() {
+                this.style.transform = 'translateX(10px)';
+                const icon = this.querySelector('.feature-icon i');
+                if (icon) {
+                    icon.style.transform = 'scale(1.2) rotate(5deg)';
+                    icon.style.transition = 'all 0.3s ease';
+                }
+            });
+
+            item.addEventListener('mouseleave', function() {
+                this.style.transform = 'translateX(0)';
+                const icon = this.querySelector('.feature-icon i');
+                if (icon) {
+                    icon.style.transform = 'scale(1) rotate(0deg)';
+                }
+            });
+        });
+    }
+
+    // Counter animation function
+    function animateCounters() {
+        const counters = document.querySelectorAll('.counter');
+
+        counters.forEach(counter => {
+            const target = parseInt(counter.dataset.target);
+            if (isNaN(target)) return;
+
+            let current = 0;
+            const increment = target / 60; // Animation duration roughly 1 second at 60fps
+
+            const updateCounter = () => {
+                if (current < target) {
+                    current += increment;
+                    counter.textContent = Math.floor(current);
+                    requestAnimationFrame(updateCounter);
+                } else {
+                    counter.textContent = target;
+                }
+            };
+
+            updateCounter();
+        });
+    }
+
+    // Add floating animation to brand elements
+    function addFloatingAnimation() {
+        const brandElements = document.querySelectorAll('.brand-section, .brand-web');
+
+        brandElements.forEach((element, index) => {
+            element.style.animation = `float 3s ease-in-out infinite ${index * 0.5}s`;
+        });
+    }
+
+    // Enhanced CSS Animation keyframes (added programmatically)
+    const style = document.createElement('style');
+    style.textContent = `
+        @keyframes float {
+            0%, 100% { transform: translateY(0px); }
+            50% { transform: translateY(-5px); }
+        }
+
+        @keyframes pulse {
+            0%, 100% { transform: scale(1); }
+            50% { transform: scale(1.05); }
+        }
+
+        .stats-card:hover {
+            transform: scale(1.05) !important;
+            box-shadow: 0 10px 25px rgba(0,0,0,0.3) !important;
+        }
+
+        .hero-buttons .btn:hover {
+            transform: translateY(-2px) scale(1.05);
+            box-shadow: 0 8px 20px rgba(0,0,0,0.3);
+        }
+
+        .carousel-header h2 {
+            animation: pulse 4s ease-in-out infinite;
+        }
+
+        /* Enhanced Carousel Styles */
+        .video-carousel-card {
+            transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        }
+
+        .video-carousel-card:hover {
+            transform: translateY(-8px) scale(1.02);
+            box-shadow: 0 20px 40px rgba(0,102,204,0.15);
+        }
+
+        .video-container:hover video {
+            transform: scale(1.02);
+            filter: brightness(1.1) contrast(1.05);
+        }
+
+        .carousel-control-prev:hover,
+        .carousel-control-next:hover {
+            opacity: 1 !important;
+        }
+
+        .carousel-control-prev:hover .carousel-control-icon,
+        .carousel-control-next:hover .carousel-control-icon {
+            transform: scale(1.1);
+            background: rgba(0,102,204,0.1) !important;
+        }
+
+        .carousel-indicators button:hover {
+            opacity: 1 !important;
+            transform: scale(1.3);
+        }
+
+        .carousel-indicators button.active {
+            opacity: 1 !important;
+            transform: scale(1.2);
+            background: linear-gradient(135deg, #ffd700, #ffc107) !important;
+            box-shadow: 0 4px 15px rgba(255, 215, 0, 0.4) !important;
+        }
+
+        .btn-primary:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 8px 25px rgba(0,102,204,0.3) !important;
+        }
+
+        .btn-outline-primary:hover,
+        .btn-outline-secondary:hover {
+            transform: translateY(-1px);
+            box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+        }
+
+        /* Professional Video Carousel Styles with Enhanced Shadows */
+        .video-carousel-container {
+            position: relative;
+            padding: 20px 0;
+            background: linear-gradient(145deg, #f8f9fa, #e9ecef);
+            border-radius: 20px;
+            box-shadow: inset 0 0 0 1px rgba(255,255,255,0.1), 
+                        0 10px 40px rgba(0,0,0,0.05),
+                        0 0 100px rgba(0,102,204,0.03);
+            backdrop-filter: blur(10px);
+        }
+
+        .video-carousel-container::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: radial-gradient(circle at 20% 80%, rgba(0,102,204,0.05) 0%, transparent 50%),
+                        radial-gradient(circle at 80% 20%, rgba(255,193,7,0.05) 0%, transparent 50%);
+            border-radius: 20px;
+            pointer-events: none;
+            z-index: 0;
+        }
+
+        #video-carousel {
+            scroll-snap-type: x mandatory;
+            scroll-padding: 0 15px;
+            scrollbar-width: none;
+            -ms-overflow-style: none;
+            position: relative;
+            z-index: 1;
+        }
+
+        #video-carousel::-webkit-scrollbar {
+            display: none;
+        }
+
+        .video-card-modern {
+            scroll-snap-align: start;
+            transition: all 0.5s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+            filter: drop-shadow(0 4px 8px rgba(0,0,0,0.1));
+        }
+
+        .video-card-modern .card {
+            box-shadow: 0 8px 32px rgba(0,0,0,0.12), 
+                        0 2px 8px rgba(0,0,0,0.08),
+                        inset 0 1px 0 rgba(255,255,255,0.2);
+            border: 1px solid rgba(255,255,255,0.3);
+            backdrop-filter: blur(20px);
+        }
+
+        .video-card-modern:hover {
+            transform: translateY(-12px) scale(1.03);
+            box-shadow: 0 25px 60px rgba(0,0,0,0.25), 
+                        0 8px 32px rgba(0,102,204,0.15),
+                        0 0 0 1px rgba(0,102,204,0.2);
+            z-index: 10;
+            filter: drop-shadow(0 15px 35px rgba(0,0,0,0.2)) 
+                    drop-shadow(0 5px 15px rgba(0,102,204,0.1));
+        }
+
+        .video-card-modern:hover .card {
+            box-shadow: 0 15px 50px rgba(0,0,0,0.2), 
+                        0 5px 20px rgba(0,102,204,0.15),
+                        inset 0 1px 0 rgba(255,255,255,0.4);
+            border-color: rgba(0,102,204,0.3);
+        }
+
+        .video-thumbnail-container {
+            position: relative;
+            overflow: hidden;
+            border-radius: 12px;
+            box-shadow: 0 4px 16px rgba(0,0,0,0.1);
+            transition: all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        }
+
+        .video-thumbnail-container:hover {
+            box-shadow: 0 8px 32px rgba(0,0,0,0.15), 
+                        0 0 20px rgba(0,102,204,0.1);
+            transform: scale(1.01);
+        }
+
+        .video-thumbnail-container:hover .video-preview {
+            transform: scale(1.08);
+            filter: brightness(1.15) contrast(1.1) saturate(1.1);
+        }
+
+        .video-preview {
+            transition: all 0.6s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        }
+
+        .play-overlay {
+            transition: all 0.4s cubic-bezier(0.34, 1.56, 0.64, 1);
+            backdrop-filter: blur(10px);
+        }
+
+        .video-card-modern:hover .play-overlay {
+            transform: translate(-50%, -50%) scale(1.1);
+            animation: playPulse 2s infinite;
+        }
+
+        @keyframes playPulse {
+            0%, 100% { 
+                box-shadow: 0 0 0 0 rgba(0,102,204,0.4);
+            }
+            50% { 
+                box-shadow: 0 0 0 15px rgba(0,102,204,0);
+            }
+        }
+
+        .carousel-nav-btn {
+            transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+            border: 2px solid rgba(0,102,204,0.1);
+            box-shadow: 0 8px 24px rgba(0,0,0,0.1), 
+                        0 2px 8px rgba(0,0,0,0.05),
+                        inset 0 1px 0 rgba(255,255,255,0.3);
+            backdrop-filter: blur(20px);
+            background: rgba(255,255,255,0.95) !important;
+            cursor: pointer;
+            opacity: 0.8;
+            z-index: 9999 !important;
+            pointer-events: auto !important;
+        }
+
+        .carousel-nav-btn:hover {
+            opacity: 1 !important;
+            transform: translateY(-50%) scale(1.15);
+            box-shadow: 0 20px 50px rgba(0,102,204,0.3), 
+                        0 8px 20px rgba(0,0,0,0.1),
+                        inset 0 1px 0 rgba(255,255,255,0.5);
+            border-color: rgba(0,102,204,0.4);
+            background: rgba(255,255,255,1) !important;
+            cursor: pointer;
+        }
+
+        .carousel-nav-btn:hover i {
+            transform: scale(1.2);
+            color: #0066cc !important;
+            filter: drop-shadow(0 2px 4px rgba(0,102,204,0.3));
+        }
+
+        .carousel-nav-btn:active {
+            transform: translateY(-50%) scale(1.05);
+            box-shadow: 0 8px 20px rgba(0,102,204,0.4);
+        }
+
+        .carousel-nav-btn i {
+            transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        }
+
+        .rating-stars {
+            transition: all 0.2s ease;
+        }
+
+        .rating-stars:hover i {
+            transform: scale(1.15);
+            filter: brightness(1.2);
+        }
+
+        .btn-primary:hover {
+            transform: translateY(-1px);
+            box-shadow: 0 8px 20px rgba(0,102,204,0.3);
+            background: linear-gradient(135deg, #004499, #0066cc) !important;
+        }
+
+        .btn-outline-primary:hover {
+            transform: translateY(-1px);
+            box-shadow: 0 6px 15px rgba(0,102,204,0.2);
+        }
+
+        /* Enhanced Card Body Styling */
+        .video-card-modern .card-body {
+            backdrop-filter: blur(10px);
+            border-top: 1px solid rgba(255,255,255,0.2);
+            box-shadow: inset 0 1px 0 rgba(255,255,255,0.1);
+            transition: all 0.3s ease;
+        }
+
+        .video-card-modern:hover .card-body {
+            background: linear-gradient(145deg, #ffffff, #f8f9fa) !important;
+            box-shadow: inset 0 1px 0 rgba(255,255,255,0.3),
+                        0 -2px 10px rgba(0,0,0,0.05);
+        }
+
+        /* Enhanced Gradient Overlays */
+        .video-thumbnail-container .position-absolute[style*="gradient"] {
+            background: linear-gradient(180deg, 
+                rgba(0,0,0,0.2) 0%, 
+                rgba(0,0,0,0.1) 30%, 
+                rgba(0,0,0,0.4) 80%, 
+                rgba(0,0,0,0.7) 100%) !important;
+            backdrop-filter: blur(2px);
+            transition: all 0.3s ease;
+        }
+
+        .video-card-modern:hover .video-thumbnail-container .position-absolute[style*="gradient"] {
+            background: linear-gradient(180deg, 
+                rgba(0,0,0,0.1) 0%, 
+                rgba(0,0,0,0.05) 30%, 
+                rgba(0,0,0,0.3) 80%, 
+                rgba(0,0,0,0.6) 100%) !important;
+        }
+
+        /* Enhanced Badge Styling */
+        .video-card-modern .badge {
+            backdrop-filter: blur(15px);
+            box-shadow: 0 2px 8px rgba(0,0,0,0.2);
+            border: 1px solid rgba(255,255,255,0.2);
+            transition: all 0.3s ease;
+        }
+
+        .video-card-modern:hover .badge {
+            transform: scale(1.05);
+            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
+        }
+
+        /* TikTok-style Smooth Scrolling Effect */
+        .video-carousel-container {
+            position: relative;
+            overflow: hidden;
+        }
+
+        .video-carousel-container::after {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            background: 
+                linear-gradient(90deg, 
+                    rgba(248,249,250,0.8) 0%, 
+                    transparent 5%, 
+                    transparent 95%, 
+                    rgba(248,249,250,0.8) 100%);
+            pointer-events: none;
+            z-index: 2;
+        }
+
+        /* Mobile optimizations */
+        @media (max-width: 768px) {
+            .video-card-modern {
+                width: 250px !important;
+            }
+
+            #video-carousel {
+                padding: 10px;
+                gap: 8px;
+            }
+
+            .video-carousel-container {
+                margin: 0 -10px;
+            }
+        }
+
+        /* Smooth animations */
+        @keyframes cardEntrance {
+            from {
+                opacity: 0;
+                transform: translateY(30px) scale(0.95);
+            }
+            to {
+                opacity: 1;
+                transform: translateY(0) scale(1);
+            }
+        }
+
+        .video-card-modern.animate-in {
+            animation: cardEntrance 0.6s cubic-bezier(0.25, 0.46, 0.45, 0.94) forwards;
+        }
+
+        /* Loading states */
+        .video-preview {
+            background: linear-gradient(90deg, #f0f0f0 25%, #e0e0e0 50%, #f0f0f0 75%);
+            background-size: 200% 100%;
+            animation: loading 1.5s infinite;
+        }
+
+        @keyframes loading {
+            0% { background-position: 200% 0; }
+            100% { background-position: -200% 0; }
+        }
+
+        .video-preview[src] {
+            background: none;
+            animation: none;
+        }
+
+        /* Focus states for accessibility */
+        .carousel-nav-btn:focus {
+            outline: 2px solid #0066cc;
+            outline-offset: 4px;
+        }
+
+        .video-card-modern a:focus {
+            outline: 2px solid #0066cc;
+            outline-offset: 2px;
+            border-radius: 8px;
+        }
+    `;
+    document.head.appendChild(style);
+
+    // Initialize animations
+    animateOnLoad();
+    setTimeout(addFloatingAnimation, 1200);
+
+    // Enhanced carousel functionality
+    const carousel = document.getElementById('topVideosCarousel');
+    if (carousel) {
+        const carouselInstance = new bootstrap.Carousel(carousel, {
+            interval: 5000, // 5 seconds
+            wrap: true,
+            pause: 'hover',
+            keyboard: true,
+            touch: true
+        });
+
+        // Pause video when sliding away
+        carousel.addEventListener('slide.bs.carousel', function (e) {
+            const activeVideos = e.from !== undefined ? 
+                carousel.querySelectorAll('.carousel-item')[e.from].querySelectorAll('video') : 
+                carousel.querySelectorAll('.carousel-item.active video');
+
+            activeVideos.forEach(video => {
+                if (!video.paused) {
+                    video.pause();
+                }
+            });
+        });
+
+        // Auto-pause carousel when video is playing
+        const videos = carousel.querySelectorAll('video');
+        videos.forEach(video => {
+            video.addEventListener('play', function() {
+                carouselInstance.pause();
+            });
+
+            video.addEventListener('pause', function() {
+                carouselInstance.cycle();
+            });
+
+            video.addEventListener('ended', function() {
+                carouselInstance.cycle();
+            });
+
+            // Hover to play functionality
+            const videoContainer = video.closest('.video-container');
+            let hoverTimeout;
+
+            // Add playing state management
+            video.addEventListener('play', function() {
+                videoContainer.classList.add('playing');
+            });
+
+            video.addEventListener('pause', function() {
+                videoContainer.classList.remove('playing');
+            });
+
+            video.addEventListener('ended', function() {
+                videoContainer.classList.remove('playing');
+            });
+
+            videoContainer.addEventListener('mouseenter', function() {
+                // Pause the carousel while hovering
+                carouselInstance.pause();
+
+                // Add a small delay before auto-playing to avoid accidental triggers
+                hoverTimeout = setTimeout(() => {
+                    if (!video.paused) return; // Don't restart if already playing
+
+                    // Pause all other videos in the carousel first
+                    videos.forEach(otherVideo => {
+                        if (otherVideo !== video && !otherVideo.paused) {
+                            otherVideo.pause();
+                            otherVideo.closest('.video-container').classList.remove('playing');
+                        }
+                    });
+
+                    // Play the hovered video
+                    video.play().catch(error => {
+                        console.log('Auto-play prevented by browser:', error);
+                        // Show a subtle play indicator when auto-play is blocked
+                        showPlayIndicator(videoContainer);
+                    });
+                }, 300); // Reduced to 300ms for better responsiveness
+            });
+
+            videoContainer.addEventListener('mouseleave', function() {
+                // Clear the hover timeout if mouse leaves before delay
+                if (hoverTimeout) {
+                    clearTimeout(hoverTimeout);
+                }
+
+                // Pause the video when mouse leaves
+                if (!video.paused) {
+                    video.pause();
+                    video.currentTime = 0; // Reset to beginning for next hover
+                }
+
+                // Resume carousel auto-sliding
+                carouselInstance.cycle();
+            });
+
+            // Add click to play/pause functionality as fallback
+            video.addEventListener('click', function() {
+                if (video.paused) {
+                    video.play().catch(error => {
+                        console.log('Play prevented:', error);
+                    });
+                } else {
+                    video.pause();
+                }
+            });
+        });
+
+        // Function to show play indicator when auto-play is blocked
+        function showPlayIndicator(container) {
+            const existing = container.querySelector('.play-indicator');
+            if (existing) return; // Don't show multiple indicators
+
+            const indicator = document.createElement('div');
+            indicator.className = 'play-indicator position-absolute top-50 start-50 translate-middle';
+            indicator.style.cssText = `
+                background: rgba(0,0,0,0.7);
+                color: white;
+                padding: 8px 12px;
+                border-radius: 20px;
+                font-size: 0.9rem;
+                pointer-events: none;
+                z-index: 10;
+                animation: fadeInOut 2s ease-in-out;
+            `;
+            indicator.innerHTML = '<i class="fas fa-play me-1"></i>Click to play';
+
+            container.appendChild(indicator);
+
+            // Remove indicator after animation
+            setTimeout(() => {
+                if (indicator.parentNode) {
+                    indicator.remove();
+                }
+            }, 2000);
+        }
+
+        // Add smooth scroll to view when carousel navigation is used
+        const indicators = carousel.querySelectorAll('.carousel-indicators button');
+        const controls = carousel.querySelectorAll('.carousel-control-prev, .carousel-control-next');
+
+        [...indicators, ...controls].forEach(control => {
+            control.addEventListener('click', function() {
+                setTimeout(() => {
+                    carousel.scrollIntoView({ behavior: 'smooth', block: 'center' });
+                }, 100);
+            });
+        });
+
+        // Add keyboard navigation enhancement
+        document.addEventListener('keydown', function(e) {
+            if (carousel.matches(':hover') || document.activeElement.closest('#topVideosCarousel')) {
+                if (e.key === 'ArrowLeft') {
+                    e.preventDefault();
+                    carouselInstance.prev();
+                } else if (e.key === 'ArrowRight') {
+                    e.preventDefault();
+                    carouselInstance.next();
+                } else if (e.key === ' ') {
+                    e.preventDefault();
+                    const activeVideo = carousel.querySelector('.carousel-item.active video');
+                    if (activeVideo) {
+                        if (activeVideo.paused) {
+                            activeVideo.play();
+                        } else {
+                            activeVideo.pause();
+                        }
+                    }
+                }
+            }
+        });
+
+        // Simple visual feedback for auto-advance timing
+        function addVisualFeedback() {
+            const indicators = carousel.querySelectorAll('.carousel-indicators button');
+            let currentIndex = 0;
+
+            function updateIndicators() {
+                indicators.forEach((indicator, index) => {
+                    if (index === currentIndex) {
+                        indicator.style.transform = 'scale(1.3)';
+                        indicator.style.boxShadow = '0 2px 8px rgba(0, 102, 204, 0.4)';
+                    } else {
+                        indicator.style.transform = 'scale(1)';
+                        indicator.style.boxShadow = 'none';
+                    }
+                });
+            }
+
+            carousel.addEventListener('slide.bs.carousel', function(e) {
+                currentIndex = e.to;
+                setTimeout(updateIndicators, 100);
+            });
+
+            updateIndicators();
+        }
+
+        // Initialize visual feedback
+        if (carousel.querySelectorAll('.carousel-indicators button').length > 0) {
+            addVisualFeedback();
+        }
+
+        // Add touch/swipe support enhancement for mobile
+        let touchStartX = 0;
+        let touchEndX = 0;
+
+        carousel.addEventListener('touchstart', function(e) {
+            touchStartX = e.changedTouches[0].screenX;
+        });
+
+        carousel.addEventListener('touchend', function(e) {
+            touchEndX = e.changedTouches[0].screenX;
+            handleSwipe();
+        });
+
+        function handleSwipe() {
+            const swipeThreshold = 50;
+            const diff = touchStartX - touchEndX;
+
+            if (Math.abs(diff) > swipeThreshold) {
+                if (diff > 0) {
+                    carouselInstance.next();
+                } else {
+                    carouselInstance.prev();
+                }
+            }
+        }
+
+        // Add intersection observer for performance
+        const observer = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    carouselInstance.cycle();
+                } else {
+                    carouselInstance.pause();
+                }
+            });
+        }, { threshold: 0.5 });
+
+        observer.observe(carousel);
+    }
+
+    // Animate stats cards on scroll
+    const statsCards = document.querySelectorAll('.stats-card');
+    if (statsCards.length > 0) {
+        const statsObserver = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    entry.target.style.animation = 'fadeInUp 0.6s ease-out';
+                }
+            });
+        }, { threshold: 0.3 });
+
+        statsCards.forEach(card => statsObserver.observe(card));
+    }
+
+    // Enhanced "How It Works" Animation System
+    function initHowItWorksAnimation() {
+        const howItWorksSection = document.getElementById('how-it-works-steps');
+        const steps = document.querySelectorAll('.how-it-works-step');
+
+        if (!howItWorksSection || steps.length === 0) return;
+
+        // Set initial state - hide all steps
+        steps.forEach(step => {
+            step.style.opacity = '0';
+            step.style.transform = 'translateY(50px) scale(0.8)';
+            step.style.transition = 'all 0.8s cubic-bezier(0.16, 1, 0.3, 1)';
+        });
+
+        // Create intersection observer for the section
+        const howItWorksObserver = new IntersectionObserver((entries) => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    // Trigger sequential animations
+                    animateStepsSequentially();
+
+
+
+                    // Add periodic pulse animation
+                    setTimeout(() => {
+                        addPeriodicPulseAnimation();
+                    }, 2000);
+
+                    // Disconnect observer after animation starts
+                    howItWorksObserver.unobserve(entry.target);
+                }
+            });
+        }, {
+            threshold: 0.3,
+            rootMargin: '0px 0px -50px 0px'
+        });
+
+        howItWorksObserver.observe(howItWorksSection);
+
+        // Sequential animation function
+        function animateStepsSequentially() {
+            steps.forEach((step, index) => {
+                const delay = parseInt(step.dataset.delay) || (index * 200);
+
+                setTimeout(() => {
+                    // Main entrance animation
+                    step.style.opacity = '1';
+                    step.style.transform = 'translateY(0) scale(1)';
+
+                    // Add bounce effect to icon
+                    const icon = step.querySelector('.step-icon');
+                    if (icon) {
+                        setTimeout(() => {
+                            icon.style.animation = 'iconBounce 0.6s ease-out';
+                        }, 200);
+                    }
+
+                    // Animate text elements
+                    const title = step.querySelector('.step-title');
+                    const description = step.querySelector('.step-description');
+
+                    if (title) {
+                        setTimeout(() => {
+                            title.style.animation = 'slideInLeft 0.5s ease-out';
+                        }, 300);
+                    }
+
+                    if (description) {
+                        setTimeout(() => {
+                            description.style.animation = 'fadeInUp 0.5s ease-out';
+                        }, 400);
+                    }
+
+                }, delay);
+            });
+        }
+
+
+
+        // Periodic pulse animation for enhanced engagement
+        function addPeriodicPulseAnimation() {
+            steps.forEach((step, index) => {
+                const icon = step.querySelector('.step-icon');
+                if (icon) {
+                    // Add periodic pulse every 4 seconds with offset
+                    setInterval(() => {
+                        icon.style.animation = 'none';
+                        setTimeout(() => {
+                            icon.style.animation = 'pulseGlow 1.5s ease-in-out';
+                        }, 50);
+                    }, 4000 + (index * 1000));
+                }
+            });
+        }
+
+        // Add hover interactions
+        steps.forEach(step => {
+            const icon = step.querySelector('.step-icon');
+            const stepNumber = step.dataset.step;
+
+            step.addEventListener('mouseenter', function() {
+                this.style.transform = 'translateY(-10px) scale(1.05)';
+                if (icon) {
+                    icon.style.animation = 'hoverBounce 0.4s ease-out';
+                    icon.style.boxShadow = '0 8px 25px rgba(0,0,0,0.3)';
+                }
+
+                // Highlight connected steps
+                highlightConnectedSteps(parseInt(stepNumber));
+            });
+
+            step.addEventListener('mouseleave', function() {
+                this.style.transform = 'translateY(0) scale(1)';
+                if (icon) {
+                    icon.style.boxShadow = 'none';
+                }
+
+                // Remove highlights
+                removeStepHighlights();
+            });
+        });
+
+        // Step highlighting system
+        function highlightConnectedSteps(currentStep) {
+            steps.forEach((step, index) => {
+                const stepIndex = index + 1;
+                if (stepIndex <= currentStep) {
+                    step.classList.add('step-highlighted');
+                } else {
+                    step.classList.add('step-dimmed');
+                }
+            });
+        }
+
+        function removeStepHighlights() {
+            steps.forEach(step => {
+                step.classList.remove('step-highlighted', 'step-dimmed');
+            });
+        }
+
+        // Mobile touch interactions
+        if ('ontouchstart' in window) {
+            steps.forEach(step => {
+                step.addEventListener('touchstart', function() {
+                    this.classList.add('step-touched');
+                });
+
+                step.addEventListener('touchend', function() {
+                    setTimeout(() => {
+                        this.classList.remove('step-touched');
+                    }, 300);
+                });
+            });
+        }
+    }
+
+    // Initialize the animation system
+    initHowItWorksAnimation();
+
+    // Professional Video Carousel - YouTube/TikTok Style
+    function initVideoCarousel() {
+        const carousel = document.getElementById('video-carousel');
+        const prevBtn = document.getElementById('carousel-prev');
+        const nextBtn = document.getElementById('carousel-next');
+
+        if (!carousel) return;
+
+        let isScrolling = false;
+        let scrollTimeout;
+
+        // Card dimensions
+        const cardWidth = 280; // card width
+        const gap = 12; // gap between cards
+        const scrollAmount = cardWidth + gap;
+
+        // Enhanced smooth scrolling with momentum (TikTok/YouTube style)
+        function smoothScroll(direction) {
+            if (isScrolling) return;
+
+            isScrolling = true;
+            const currentScroll = carousel.scrollLeft;
+            const maxScroll = carousel.scrollWidth - carousel.clientWidth;
+
+            // Calculate optimal scroll distance
+            const visibleCards = Math.floor(carousel.clientWidth / (cardWidth + gap));
+            const scrollDistance = Math.max(1, Math.min(3, visibleCards)) * scrollAmount;
+
+            let targetScroll = currentScroll + (direction * scrollDistance);
+
+            // Ensure we don't scroll past boundaries
+            targetScroll = Math.max(0, Math.min(targetScroll, maxScroll));
+
+            // Add momentum-based easing
+            const distance = Math.abs(targetScroll - currentScroll);
+            const duration = Math.min(800, Math.max(300, distance / 2));
+
+            // Custom smooth scroll with momentum
+            animateScrollTo(carousel, targetScroll, duration);
+
+            setTimeout(() => {
+                isScrolling = false;
+                updateNavButtons();
+            }, duration + 100);
+        }
+
+        // Custom scroll animation with momentum
+        function animateScrollTo(element, targetPosition, duration) {
+            const startPosition = element.scrollLeft;
+            const distance = targetPosition - startPosition;
+            let startTime = null;
+
+            function scrollStep(currentTime) {
+                if (!startTime) startTime = currentTime;
+
+                const timeElapsed = currentTime - startTime;
+                const progress = Math.min(timeElapsed / duration, 1);
+
+                // Momentum easing function (ease-out-quart)
+                const easeOutQuart = 1 - Math.pow(1 - progress, 4);
+
+                element.scrollLeft = startPosition + (distance * easeOutQuart);
+
+                if (progress < 1) {
+                    requestAnimationFrame(scrollStep);
+                }
+            }
+
+            requestAnimationFrame(scrollStep);
+        }
+
+        // Navigation button functionality
+        if (prevBtn && nextBtn) {
+            prevBtn.addEventListener('click', () => smoothScroll(-1));
+            nextBtn.addEventListener('click', () => smoothScroll(1));
+        }
+
+        // Update navigation button states
+        function updateNavButtons() {
+            if (!prevBtn || !nextBtn) return;
+
+            const maxScroll = carousel.scrollWidth - carousel.clientWidth;
+            const currentScroll = carousel.scrollLeft;
+
+            // Previous button
+            if (currentScroll <= 10) {
+                prevBtn.style.opacity = '0.3';
+                prevBtn.style.pointerEvents = 'none';
+                prevBtn.style.transform = 'translateY(-50%) scale(0.9)';
+            } else {
+                prevBtn.style.opacity = '0.9';
+                prevBtn.style.pointerEvents = 'auto';
+                prevBtn.style.transform = 'translateY(-50%) scale(1)';
+            }
+
+            // Next button
+            if (currentScroll >= maxScroll - 10) {
+                nextBtn.style.opacity = '0.3';
+                nextBtn.style.pointerEvents = 'none';
+                nextBtn.style.transform = 'translateY(-50%) scale(0.9)';
+            } else {
+                nextBtn.style.opacity = '0.9';
+                nextBtn.style.pointerEvents = 'auto';
+                nextBtn.style.transform = 'translateY(-50%) scale(1)';
+            }
+        }
+
+        // Scroll event listener with throttling
+        carousel.addEventListener('scroll', () => {
+            clearTimeout(scrollTimeout);
+            scrollTimeout = setTimeout(updateNavButtons, 50);
+        });
+
+        // Touch/swipe support for mobile
+        let startX = 0;
+        let startY = 0;
+        let isTouch = false;
+
+        carousel.addEventListener('touchstart', (e) => {
+            startX = e.touches[0].clientX;
+            startY = e.touches[0].clientY;
+            isTouch = true;
+        }, { passive: true });
+
+        carousel.addEventListener('touchmove', (e) => {
+            if (!isTouch) return;
+
+            const deltaY = Math.abs(e.touches[0].clientY - startY);
+            const deltaX = Math.abs(e.touches[0].clientX - startX);
+
+            // Prevent vertical scrolling if horizontal swipe is detected
+            if (deltaX > deltaY) {
+                e.preventDefault();
+            }
+        }, { passive: false });
+
+        carousel.addEventListener('touchend', () => {
+            isTouch = false;
+        });
+
+        // Mouse wheel horizontal scrolling
+        carousel.addEventListener('wheel', (e) => {
+            e.preventDefault();
+            carousel.scrollLeft += e.deltaY;
+            updateNavButtons();
+        }, { passive: false });
+
+        // Keyboard navigation
+        document.addEventListener('keydown', (e) => {
+            if (carousel.matches(':hover') || document.activeElement.closest('#video-carousel')) {
+                if (e.key === 'ArrowLeft') {
+                    e.preventDefault();
+                    smoothScroll(-1);
+                } else if (e.key === 'ArrowRight') {
+                    e.preventDefault();
+                    smoothScroll(1);
+                }
+            }
+        });
+
+        // Initialize button states
+        setTimeout(updateNavButtons, 100);
+    }
+
+    // Enhanced video card interactions with TikTok-style effects
+    function initVideoCardEffects() {
+        const videoCards = document.querySelectorAll('.video-card-modern');
+
+        videoCards.forEach((card, index) => {
+            const video = card.querySelector('.video-preview');
+            const playOverlay = card.querySelector('.play-overlay');
+            const gradientOverlay = card.querySelector('.video-thumbnail-container .position-absolute[style*="gradient"]');
+            const thumbnailContainer = card.querySelector('.video-thumbnail-container');
+
+            let hoverTimeout;
+            let playTimeout;
+            let isHovered = false;
+
+            // Enhanced card hover effects with momentum
+            card.addEventListener('mouseenter', () => {
+                isHovered = true;
+
+                // TikTok-style lift and scale effect
+                card.style.transform = 'translateY(-12px) scale(1.03)';
+                card.style.transition = 'all 0.5s cubic-bezier(0.34, 1.56, 0.64, 1)';
+                card.style.zIndex = '15';
+
+                // Enhanced shadow effect
+                card.style.filter = 'drop-shadow(0 15px 35px rgba(0,0,0,0.2)) drop-shadow(0 5px 15px rgba(0,102,204,0.1))';
+
+                // Show play overlay with bounce
+                if (playOverlay) {
+                    playOverlay.style.opacity = '1';
+                    playOverlay.style.transform = 'translate(-50%, -50%) scale(1.1)';
+                    playOverlay.style.transition = 'all 0.4s cubic-bezier(0.34, 1.56, 0.64, 1)';
+                }
+
+                // Enhanced gradient overlay
+                if (gradientOverlay) {
+                    gradientOverlay.style.opacity = '1';
+                    gradientOverlay.style.transition = 'opacity 0.3s ease';
+                }
+
+                // Thumbnail container effect
+                if (thumbnailContainer) {
+                    thumbnailContainer.style.boxShadow = '0 8px 32px rgba(0,0,0,0.15), 0 0 20px rgba(0,102,204,0.1)';
+                }
+
+                // Auto-play video with momentum delay
+                clearTimeout(hoverTimeout);
+                hoverTimeout = setTimeout(() => {
+                    if (video && isHovered && video.paused) {
+                        video.play().catch(e => {
+                            console.log('Video play prevented:', e);
+                            // Add visual feedback when autoplay is blocked
+                            showAutoPlayBlocked(card);
+                        });
+                    }
+                }, 300); // Reduced delay for better responsiveness
+            });
+
+            card.addEventListener('mouseleave', () => {
+                isHovered = false;
+
+                // Smooth reset with momentum
+                card.style.transform = 'translateY(0) scale(1)';
+                card.style.transition = 'all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+                card.style.zIndex = '1';
+                card.style.filter = 'drop-shadow(0 4px 8px rgba(0,0,0,0.1))';
+
+                // Hide play overlay with smooth transition
+                if (playOverlay) {
+                    playOverlay.style.opacity = '0';
+                    playOverlay.style.transform = 'translate(-50%, -50%) scale(0.8)';
+                    playOverlay.style.transition = 'all 0.3s ease';
+                }
+
+                // Hide gradient overlay
+                if (gradientOverlay) {
+                    gradientOverlay.style.opacity = '0';
+                }
+
+                // Reset thumbnail container
+                if (thumbnailContainer) {
+                    thumbnailContainer.style.boxShadow = '0 4px 16px rgba(0,0,0,0.1)';
+                }
+
+                // Stop and reset video with fade
+                clearTimeout(hoverTimeout);
+                if (video && !video.paused) {
+                    video.style.transition = 'opacity 0.2s ease';
+                    video.style.opacity = '0.8';
+
+                    setTimeout(() => {
+                        video.pause();
+                        video.currentTime = 0;
+                        video.style.opacity = '1';
+                        video.style.transition = '';
+                    }, 200);
+                }
+            });
+
+            // Enhanced click to play/pause with visual feedback
+            if (video) {
+                video.addEventListener('click', (e) => {
+                    e.preventDefault();
+                    e.stopPropagation();
+
+                    if (video.paused) {
+                        video.play().catch(e => {
+                            console.log('Video play prevented:', e);
+                            showPlayError(card);
+                        });
+
+                        // Visual feedback for play
+                        if (playOverlay) {
+                            playOverlay.style.transform = 'translate(-50%, -50%) scale(0.8)';
+                            setTimeout(() => {
+                                playOverlay.style.transform = 'translate(-50%, -50%) scale(1.1)';
+                            }, 100);
+                        }
+                    } else {
+                        video.pause();
+
+                        // Visual feedback for pause
+                        if (playOverlay) {
+                            playOverlay.style.transform = 'translate(-50%, -50%) scale(1.2)';
+                            setTimeout(() => {
+                                playOverlay.style.transform = 'translate(-50%, -50%) scale(1)';
+                            }, 100);
+                        }
+                    }
+                });
+
+                // Video progress visual feedback
+                video.addEventListener('timeupdate', () => {
+                    if (video.duration > 0) {
+                        const progress = (video.currentTime / video.duration) * 100;
+                        updateVideoProgress(card, progress);
+                    }
+                });
+            }
+
+            // Touch interactions for mobile (TikTok-style)
+            let touchStartY = 0;
+            let touchStartX = 0;
+
+            card.addEventListener('touchstart', (e) => {
+                touchStartY = e.touches[0].clientY;
+                touchStartX = e.touches[0].clientX;
+
+                // Add touch feedback
+                card.style.transform = 'scale(0.98)';
+                card.style.transition = 'transform 0.1s ease';
+            }, { passive: true });
+
+            card.addEventListener('touchend', (e) => {
+                const touchEndY = e.changedTouches[0].clientY;
+                const touchEndX = e.changedTouches[0].clientX;
+                const deltaY = touchStartY - touchEndY;
+                const deltaX = touchStartX - touchEndX;
+
+                // Reset touch feedback
+                card.style.transform = 'scale(1)';
+                card.style.transition = 'all 0.4s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+
+                // Detect swipe gestures
+                if (Math.abs(deltaY) > Math.abs(deltaX) && Math.abs(deltaY) > 50) {
+                    // Vertical swipe - show more info or navigate
+                    if (deltaY > 0) {
+                        showCardDetails(card);
+                    }
+                } else if (Math.abs(deltaX) > 50) {
+                    // Horizontal swipe - navigate carousel
+                    if (deltaX > 0) {
+                        document.getElementById('carousel-next')?.click();
+                    } else {
+                        document.getElementById('carousel-prev')?.click();
+                    }
+                }
+            });
+
+            // Double tap to like (TikTok-style)
+            let lastTap = 0;
+            card.addEventListener('touchend', (e) => {
+                const currentTime = new Date().getTime();
+                const tapLength = currentTime - lastTap;
+
+                if (tapLength < 500 && tapLength > 0) {
+                    // Double tap detected
+                    showLikeAnimation(card);
+                    e.preventDefault();
+                }
+                lastTap = currentTime;
+            });
+
+            // Intersection Observer for lazy loading and animations
+            const observer = new IntersectionObserver((entries) => {
+                entries.forEach(entry => {
+                    if (entry.isIntersecting) {
+                        // Animate card entrance
+                        setTimeout(() => {
+                            entry.target.style.opacity = '1';
+                            entry.target.style.transform = 'translateY(0)';
+                        }, index * 100);
+
+                        observer.unobserve(entry.target);
+                    }
+                });
+            }, { threshold: 0.1 });
+
+            // Initial state for animation
+            card.style.opacity = '0';
+            card.style.transform = 'translateY(20px)';
+            card.style.transition = 'all 0.6s cubic-bezier(0.25, 0.46, 0.45, 0.94)';
+
+            observer.observe(card);
+        });
+    }
+
+    // Helper functions for enhanced interactions
+    function showAutoPlayBlocked(card) {
+        const indicator = document.createElement('div');
+        indicator.className = 'autoplay-indicator position-absolute top-50 start-50 translate-middle';
+        indicator.style.cssText = `
+            background: rgba(0,0,0,0.8);
+            color: white;
+            padding: 8px 16px;
+            border-radius: 25px;
+            font-size: 0.85rem;
+            pointer-events: none;
+            z-index: 20;
+            backdrop-filter: blur(10px);
+            animation: slideInFade 0.3s ease-out;
+        `;
+        indicator.innerHTML = '<i class="fas fa-volume-mute me-2"></i>Click to play';
+
+        const container = card.querySelector('.video-thumbnail-container');
+        if (container) {
+            container.appendChild(indicator);
+
+            setTimeout(() => {
+                if (indicator.parentNode) {
+                    indicator.style.animation = 'slideOutFade 0.3s ease-in';
+                    setTimeout(() => indicator.remove(), 300);
+                }
+            }, 2500);
+        }
+    }
+
+    function showPlayError(card) {
+        const indicator = document.createElement('div');
+        indicator.className = 'play-error-indicator position-absolute top-50 start-50 translate-middle';
+        indicator.style.cssText = `
+            background: rgba(220,53,69,0.9);
+            color: white;
+            padding: 6px 12px;
+            border-radius: 20px;
+            font-size: 0.8rem;
+            pointer-events: none;
+            z-index: 20;
+            animation: shake 0.5s ease-in-out;
+        `;
+        indicator.innerHTML = '<i class="fas fa-exclamation-triangle me-1"></i>Playback error';
+
+        const container = card.querySelector('.video-thumbnail-container');
+        if (container) {
+            container.appendChild(indicator);
+            setTimeout(() => indicator.remove(), 2000);
+        }
+    }
+
+    function updateVideoProgress(card, progress) {
+        let progressBar = card.querySelector('.video-progress-bar');
+        if (!progressBar) {
+            progressBar = document.createElement('div');
+            progressBar.className = 'video-progress-bar position-absolute bottom-0 start-0';
+            progressBar.style.cssText = `
+                height: 3px;
+                background: linear-gradient(90deg, #0066cc 0%, #004499 100%);
+                transition: width 0.1s linear;
+                border-radius: 0 0 0 12px;
+                box-shadow: 0 0 8px rgba(0,102,204,0.4);
+                z-index: 10;
+            `;
+
+            const container = card.querySelector('.video-thumbnail-container');
+            if (container) container.appendChild(progressBar);
+        }
+
+        progressBar.style.width = `${progress}%`;
+
+        if (progress >= 100) {
+            setTimeout(() => {
+                progressBar.style.opacity = '0';
+                setTimeout(() => progressBar.remove(), 300);
+            }, 500);
+        }
+    }
+
+    function showCardDetails(card) {
+        // Add a subtle bounce animation to indicate interaction
+        card.style.transform = 'translateY(-5px) scale(1.01)';
+        setTimeout(() => {
+            card.style.transform = 'translateY(0) scale(1)';
+        }, 200);
+
+        // Could expand to show more video details
+        console.log('Card details interaction');
+    }
+
+    function showLikeAnimation(card) {
+        const heart = document.createElement('div');
+        heart.className = 'like-animation position-absolute';
+        heart.style.cssText = `
+            top: 50%;
+            left: 50%;
+            transform: translate(-50%, -50%);
+            font-size: 3rem;
+            color: #ff3040;
+            pointer-events: none;
+            z-index: 25;
+            animation: likeHeart 1s ease-out forwards;
+        `;
+        heart.innerHTML = '<i class="fas fa-heart"></i>';
+
+        const container = card.querySelector('.video-thumbnail-container');
+        if (container) {
+            container.appendChild(heart);
+            setTimeout(() => heart.remove(), 1000);
+        }
+    }
+
+    // Initialize everything
+    initVideoCarousel();
+    initVideoCardEffects();
+});
+
+// Add CSS animations for stats cards and How It Works section
+const style = document.createElement('style');
+style.textContent = `
+    @keyframes fadeInUp {
+        from {
+            opacity: 0;
+            transform: translateY(30px);
+        }
+        to {
+            opacity: 1;
+            transform: translateY(0);
+        }
+    }
+
+    @keyframes slideInLeft {
+        from {
+            opacity: 0;
+            transform: translateX(-30px);
+        }
+        to {
+            opacity: 1;
+            transform: translateX(0);
+        }
+    }
+
+    @keyframes iconBounce {
+        0%, 20%, 50%, 80%, 100% {
+            transform: translateY(0) scale(1);
+        }
+        40% {
+            transform: translateY(-15px) scale(1.1);
+        }
+        60% {
+            transform: translateY(-7px) scale(1.05);
+        }
+    }
+
+    @keyframes hoverBounce {
+        0%, 100% {
+            transform: scale(1);
+        }
+        50% {
+            transform: scale(1.1);
+        }
+    }
+
+    @keyframes pulseGlow {
+        0%, 100% {
+            transform: scale(1);
+            box-shadow: 0 0 0 0 rgba(255, 255, 255, 0.4);
+        }
+        50% {
+            transform: scale(1.05);
+            box-shadow: 0 0 0 10px rgba(255, 255, 255, 0);
+        }
+    }
+
+
+
+    .stats-card {
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
+    }
+
+    .stats-card:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 10px 25px rgba(0,0,0,0.1);
+    }
+
+    /* How It Works Enhanced Styles */
+    .how-it-works-step {
+        position: relative;
+        cursor: pointer;
+        transition: all 0.4s cubic-bezier(0.16, 1, 0.3, 1);
+    }
+
+    .how-it-works-step:hover {
+        z-index: 10;
+    }
+
+    .step-icon {
+        transition: all 0.4s cubic-bezier(0.16, 1, 0.3, 1);
+        position: relative;
+        overflow: hidden;
+    }
+
+
+
+
+
+    .step-highlighted {
+        transform: translateY(-5px) scale(1.02);
+        filter: brightness(1.1);
+    }
+
+    .step-highlighted .step-icon {
+        box-shadow: 0 8px 25px rgba(0, 123, 255, 0.4);
+    }
+
+    .step-dimmed {
+        opacity: 0.6;
+        transform: scale(0.98);
+    }
+
+    .step-touched {
+        transform: scale(0.95);
+    }
+
+    .step-title {
+        font-weight: 600;
+        margin-bottom: 0.75rem;
+        transition: color 0.3s ease;
+    }
+
+    .how-it-works-step:hover .step-title {
+        color: #007bff;
+    }
+
+    .step-description {
+        transition: all 0.3s ease;
+        line-height: 1.6;
+    }
+
+    .how-it-works-step:hover .step-description {
+        color: #495057;
+        font-weight: 500;
+    }
+
+    /* Mobile Responsive Enhancements */
+    @media (max-width: 768px) {
+        .how-it-works-step {
+            margin-bottom: 2rem;
+        }
+
+
+
+        .how-it-works-step:hover {
+            transform: translateY(-5px) scale(1.02);
+        }
+    }
+
+    /* Accessibility improvements */
+    @media (prefers-reduced-motion: reduce) {
+        .how-it-works-step,
+        .step-icon,
+        .step-title,
+        .step-description {
+            transition: none !important;
+            animation: none !important;
+        }
+    }
+
+    /* Focus states for keyboard navigation */
+    .how-it-works-step:focus-within {
+        outline: 2px solid #007bff;
+        outline-offset: 4px;
+        border-radius: 8px;
+    }
+
+    /* Enhanced Carousel Animations */
+    @keyframes slideInFade {
+        from {
+            opacity: 0;
+            transform: translate(-50%, -60%);
+        }
+        to {
+            opacity: 1;
+            transform: translate(-50%, -50%);
+        }
+    }
+
+    @keyframes slideOutFade {
+        from {
+            opacity: 1;
+            transform: translate(-50%, -50%);
+        }
+        to {
+            opacity: 0;
+            transform: translate(-50%, -40%);
+        }
+    }
+
+    @keyframes shake {
+        0%, 100% { transform: translate(-50%, -50%); }
+        10%, 30%, 50%, 70%, 90% { transform: translate(-52%, -50%); }
+        20%, 40%, 60%, 80% { transform: translate(-48%, -50%); }
+    }
+
+    @keyframes likeHeart {
+        0% {
+            transform: translate(-50%, -50%) scale(0);
+            opacity: 1;
+        }
+        15% {
+            transform: translate(-50%, -50%) scale(1.2);
+        }
+        50% {
+            transform: translate(-50%, -50%) scale(1);
+            opacity: 1;
+        }
+        100% {
+            transform: translate(-50%, -70%) scale(0.8);
+            opacity: 0;
+        }
+    }
+
+    @keyframes cardEntrance {
+        from {
+            opacity: 0;
+            transform: translateY(30px) scale(0.95);
+        }
+        to {
+            opacity: 1;
+            transform: translateY(0) scale(1);
+        }
+    }
+
+    /* Enhanced Button Animations */
+    .carousel-nav-btn {
+        animation: navButtonFloat 3s ease-in-out infinite;
+    }
+
+    .carousel-nav-prev {
+        animation-delay: 0s;
+    }
+
+    .carousel-nav-next {
+        animation-delay: 1.5s;
+    }
+
+    @keyframes navButtonFloat {
+        0%, 100% {
+            transform: translateY(-50%) translateX(0);
+        }
+        50% {
+            transform: translateY(-50%) translateX(2px);
+        }
+    }
+
+    /* Video Card Loading Shimmer */
+    .video-card-modern.loading {
+        position: relative;
+        overflow: hidden;
+    }
+
+    .video-card-modern.loading::before {
+        content: '';
+        position: absolute;
+        top: 0;
+        left: -100%;
+        width: 100%;
+        height: 100%;
+        background: linear-gradient(
+            90deg,
+            transparent,
+            rgba(255, 255, 255, 0.2),
+            transparent
+        );
+        animation: shimmer 2s infinite;
+        z-index: 5;
+    }
+
+    @keyframes shimmer {
+        0% { left: -100%; }
+        100% { left: 100%; }
+    }
+
+    /* Enhanced Hover States */
+    .video-card-modern {
+        transform-origin: center center;
+        will-change: transform, box-shadow, filter;
+    }
+
+    .video-card-modern:hover {
+        animation: cardHover 0.6s ease-out;
+    }
+
+    @keyframes cardHover {
+        0% {
+            transform: translateY(0) scale(1);
+        }
+        50% {
+            transform: translateY(-6px) scale(1.01);
+        }
+        100% {
+            transform: translateY(-12px) scale(1.03);
+        }
+    }
+
+    /* Smooth Transitions for All Interactive Elements */
+    .video-thumbnail-container,
+    .play-overlay,
+    .carousel-nav-btn,
+    .video-card-modern .badge,
+    .video-card-modern .card-body {
+        will-change: transform, opacity, box-shadow;
+    }
+
+    /* Performance Optimization */
+    .video-carousel-container,
+    .video-card-modern,
+    .carousel-nav-btn {
+        transform: translateZ(0);
+        backface-visibility: hidden;
+        perspective: 1000px;
+    }
+
+    /* Enhanced Card Link Styling */
+    .video-card-link {
+        transition: all 0.3s cubic-bezier(0.25, 0.46, 0.45, 0.94);
+        border-radius: 16px;
+        overflow: hidden;
+    }
+
+    .video-card-link:hover {
+        text-decoration: none !important;
+        color: inherit;
+    }
+
+    .video-card-link:focus {
+        outline: 3px solid rgba(0,102,204,0.4);
+        outline-offset: 2px;
+    }
+
+    /* Prevent video interaction conflicts */
+    .video-card-link .video-preview {
+        pointer-events: none;
+    }
+
+    /* Enhanced hover states for clickable cards */
+    .video-card-link:hover .card {
+        transform: translateY(-2px);
+    }
+
+    .video-card-link:active .card {
+        transform: translateY(0) scale(0.98);
+        transition: transform 0.1s ease;
+    }
+
+    /* Visual feedback for card interaction */
+    .video-card-modern:hover .video-card-link .card-title {
+        color: #0066cc !important;
+    }
+
+    .video-card-modern .card-title {
+        transition: color 0.3s ease;
+    }
+
+    /* Action button styling when non-interactive */
+    .video-card-link .btn[style*="pointer-events: none"] {
+        box-shadow: none !important;
+        transform: none !important;
+    }
+`;
+document.head.appendChild(style);
+
+// Phone Voting Functionality
+function copyPhoneNumber() {
+    const phoneNumber = "+2425537224";
+
+    // Copy to clipboard
+    if (navigator.clipboard) {
+        navigator.clipboard.writeText(phoneNumber).then(() => {
+            showCopyNotification(t('home.phoneNumberCopied') || 'Phone number copied to clipboard!');
+        });
+    } else {
+        // Fallback for older browsers
+        const textArea = document.createElement('textarea');
+        textArea.value = phoneNumber;
+        document.body.appendChild(textArea);
+        textArea.select();
+        document.execCommand('copy');
+        document.body.removeChild(textArea);
+        showCopyNotification(t('home.phoneNumberCopied') || 'Phone number copied to clipboard!');
+    }
+
+    // Add visual feedback to the clicked element
+    const phoneDisplay = document.querySelector('.phone-number-display');
+    if (phoneDisplay) {
+        phoneDisplay.style.transform = 'scale(0.96)';
+        phoneDisplay.style.background = 'rgba(40, 167, 69, 0.15)';
+        phoneDisplay.style.borderColor = 'rgba(40, 167, 69, 0.5)';
+        setTimeout(() => {
+            phoneDisplay.style.transform = 'scale(1)';
+            phoneDisplay.style.background = 'rgba(255,255,255,0.1)';
+            phoneDisplay.style.borderColor = 'rgba(255,255,255,0.3)';
+        }, 250);
+    }
+}
+
+// Auto-copy phone number when clicking to call
+function copyPhoneNumberAuto(event) {
+    const phoneNumber = "+2425537224";
+
+    // Copy to clipboard automatically
+    if (navigator.clipboard) {
+        navigator.clipboard.writeText(phoneNumber).then(() => {
+            showCopyNotification(t('home.phoneNumberCopied') || 'Phone number copied! Redirecting to call...');
+        }).catch(() => {
+            // Silent fail on copy, but still allow the call
+        });
+    } else {
+        // Fallback for older browsers
+        try {
+            const textArea = document.createElement('textarea');
+            textArea.value = phoneNumber;
+            textArea.style.position = 'fixed';
+            textArea.style.opacity = '0';
+            document.body.appendChild(textArea);
+            textArea.select();
+            document.execCommand('copy');
+            document.body.removeChild(textArea);
+            showCopyNotification(t('home.phoneNumberCopied') || 'Phone number copied! Redirecting to call...');
+        } catch (err) {
+            // Silent fail on copy, but still allow the call
+        }
+    }
+
+    // Add visual feedback
+    const phoneHero = event.currentTarget;
+    if (phoneHero) {
+        phoneHero.style.transform = 'scale(0.95)';
+        phoneHero.style.boxShadow = '0 2px 10px rgba(102, 126, 234, 0.5)';
+        setTimeout(() => {
+            phoneHero.style.transform = 'scale(1)';
+            phoneHero.style.boxShadow = '0 4px 15px rgba(0,0,0,0.2)';
+        }, 200);
+    }
+
+    // Allow the link to proceed to tel:
+    return true;
+}
+
+function showCopyNotification(message) {
+    // Create notification element
+    const notification = document.createElement('div');
+    notification.innerHTML = `
+        <i class="fas fa-check-circle me-2"></i>
+        ${message}
+    `;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: linear-gradient(135deg, #28a745, #20c997);
+        color: white;
+        padding: 12px 20px;
+        border-radius: 25px;
+        font-weight: 600;
+        z-index: 10000;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+        animation: slideInFromRight 0.5s ease-out;
+        font-size: 0.9rem;
+        max-width: 300px;
+    `;
+
+    document.body.appendChild(notification);
+
+    // Remove notification after 3 seconds
+    setTimeout(() => {
+        notification.style.animation = 'slideOutToRight 0.5s ease-out';
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 500);
+    }, 3000);
+}
+
+// Add notification animation CSS
+const phoneNotificationStyle = document.createElement('style');
+phoneNotificationStyle.textContent = `
+    @keyframes slideInFromRight {
+        from {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+        to {
+            transform: translateX(0);
+            opacity: 1;
+        }
+    }
+
+    @keyframes slideOutToRight {
+        from {
+            transform: translateX(0);
+            opacity: 1;
+        }
+        to {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+    }
+
+    /* Phone Voting Animations */
+    @keyframes phoneRing {
+        0%, 100% { transform: rotate(0deg); }
+        25% { transform: rotate(-5deg); }
+        75% { transform: rotate(5deg); }
+    }
+
+    @keyframes phonePulse {
+        0%, 100% { 
+            transform: scale(1); 
+            box-shadow: 0 0 0 0 rgba(255, 215, 0, 0.7);
+        }
+        50% { 
+            transform: scale(1.05); 
+            box-shadow: 0 0 0 10px rgba(255, 215, 0, 0);
+        }
+    }
+
+    @keyframes numberShine {
+        0% { background-position: -100% 0; }
+        100% { background-position: 100% 0; }
+    }
+
+    .phone-icon {
+        animation: phoneRing 3s ease-in-out infinite;
+    }
+
+    .phone-voting-card:hover .phone-number-display {
+        transform: translateY(-1px);
+        box-shadow: 0 4px 12px rgba(255,255,255,0.1);
+        background: rgba(255,255,255,0.15);
+    }
+
+    .phone-number {
+        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
+        background-size: 200% 100%;
+        animation: numberShine 4s ease-in-out infinite;
+    }
+
+    .phone-voting-section {
+        animation: slideInUp 0.8s ease-out 0.6s both;
+    }
+
+    @keyframes slideInUp {
+        from {
+            transform: translateY(50px);
+            opacity: 0;
+        }
+        to {
+            transform: translateY(0);
+            opacity: 1;
+        }
+    }
+`;
+document.head.appendChild(phoneNotificationStyle);
@@ -0,0 +1,67 @@
+// Keyset "Load more" pagination shared by /videos and the video page comments.
+// When the more block comes into view (or its link is clicked), fetch the next
+// page from the block's data-api URL with ?after=<data-next-cursor> and append
+// the returned HTML to the list. The link itself works without JavaScript.
+function initLoadMore(list, more, label) {
+    if (!list || !more) {
+        return;
+    }
+
+    let loading = false;
+    let observer = null;
+
+    function loadNextPage() {
+        const cursor = more.dataset.nextCursor;
+        if (loading || !cursor) {
+            return;
+        }
+        loading = true;
+        const url = new URL(more.dataset.api, window.location.href);
+        url.searchParams.set('after', cursor);
+        fetch(url, {
+            headers: { 'Accept': 'application/json' },
+            credentials: 'same-origin'
+        })
+            .then(response => response.json())
+            .then(data => {
+                if (!data.success) {
+                    throw new Error(data.error || `Could not load more ${label}`);
+                }
+                list.insertAdjacentHTML('beforeend', data.html);
+                if (typeof updateTranslations === 'function') {
+                    updateTranslations();
+                }
+                loading = false;
+                if (data.next_cursor) {
+                    more.dataset.nextCursor = data.next_cursor;
+                    // The observer only fires on changes; keep going while the block is still in view
+                    if (more.getBoundingClientRect().top < window.innerHeight + 600) {
+                        loadNextPage();
+                    }
+                } else {
+                    if (observer) {
+                        observer.disconnect();
+                    }
+                    more.remove();
+                }
+            })
+            .catch(error => {
+                loading = false;
+                console.error(`Error loading ${label}:`, error);
+            });
+    }
+
+    more.querySelector('a').addEventListener('click', function(event) {
+        event.preventDefault();
+        loadNextPage();
+    });
+
+    if ('IntersectionObserver' in window) {
+        observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                loadNextPage();
+            }
+        }, { rootMargin: '600px 0px' });
+        observer.observe(more);
+    }
+}
@@ -0,0 +1,325 @@
+let selectedProvider = '';
+let selectedCard = null;
+
+
+// Enhanced payment method selection with animations
+function selectPaymentMethod(card, provider) {
+    // Remove active class from all cards
+    document.querySelectorAll('.payment-method-card').forEach(c => {
+        c.classList.remove('active');
+        c.style.transform = 'translateY(0)';
+    });
+
+    // Add active class to selected card
+    card.classList.add('active');
+    selectedCard = card;
+    selectedProvider = provider;
+
+    // Animate selected card
+    card.style.transform = 'translateY(-2px)';
+
+    // Update pay button
+    const payButton = document.getElementById('payButton');
+    payButton.disabled = false;
+    payButton.innerHTML = '<i class="fas fa-mobile-alt me-2"></i>Proceed with Payment';
+    payButton.classList.add('btn-enabled');
+
+    // Add ripple effect
+    createRippleEffect(card);
+}
+
+// Create ripple animation effect
+function createRippleEffect(element) {
+    const ripple = document.createElement('div');
+    ripple.style.cssText = `
+        position: absolute;
+        border-radius: 50%;
+        background: rgba(79, 70, 229, 0.3);
+        transform: scale(0);
+        animation: ripple 0.6s linear;
+        pointer-events: none;
+        left: 50%;
+        top: 50%;
+        width: 20px;
+        height: 20px;
+        margin-left: -10px;
+        margin-top: -10px;
+    `;
+
+    element.style.position = 'relative';
+    element.appendChild(ripple);
+
+    setTimeout(() => {
+        ripple.remove();
+    }, 600);
+}
+
+// Enhanced proceed to payment function
+function proceedToPayment() {
+    if (!selectedProvider) {
+        alert('Please select a payment method first');
+        return;
+    }
+
+    // Provider names and icons
+    const providerData = {
+        'mtn_momo': {
+            name: 'MTN Mobile Money',
+            icon: 'fas fa-mobile-alt',
+            color: '#FFD700'
+        },
+        'orange_money': {
+            name: 'Orange Money',
+            icon: 'fas fa-mobile-alt',
+            color: '#FF6600'
+        },
+        'airtel_money': {
+            name: 'Airtel Money',
+            icon: 'fas fa-mobile-alt',
+            color: '#DC143C'
+        }
+    };
+
+    const provider = providerData[selectedProvider];
+
+    // Update modal content
+    document.getElementById('phoneModalLabel').innerHTML = 
+        `<i class="${provider.icon} me-2"></i>${provider.name}`;
+
+    document.getElementById('providerIcon').innerHTML = 
+        `<i class="${provider.icon} fa-3x" style="color: ${provider.color}"></i>`;
+
+    document.getElementById('selectedProvider').value = selectedProvider;
+
+    // Show modal with animation
+    const modal = new bootstrap.Modal(document.getElementById('phoneModal'));
+    modal.show();
+
+    // Focus on phone input after modal animation
+    setTimeout(() => {
+        document.getElementById('phoneNumber').focus();
+    }, 500);
+}
+
+// Enhanced process payment with better UI feedback
+function processPayment() {
+    const phoneNumber = document.getElementById('phoneNumber').value;
+    const payButton = document.getElementById('processPaymentBtn');
+
+    // Validate phone number
+    if (!phoneNumber || phoneNumber.trim().length < 8) {
+        showErrorMessage('Please enter a valid phone number');
+        return;
+    }
+
+    // Start loading animation
+    startPaymentProcessing(payButton);
+
+    // Prepare payment data
+    const paymentData = {
+        provider: selectedProvider,
+        phone_number: phoneNumber.trim()
+    };
+
+    // Add video ID if available
+    if (pageConfig.videoId) {
+        paymentData.video_id = pageConfig.videoId;
+    }
+
+    // Make payment request with enhanced error handling
+    fetch('/initiate_voting_fee_payment', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(paymentData)
+    })
+    .then(response => {
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data.success) {
+            showSuccessAnimation();
+
+            setTimeout(() => {
+                // Hide modal
+                bootstrap.Modal.getInstance(document.getElementById('phoneModal')).hide();
+
+                // Show success notification
+                showSuccessNotification(data.message || 'Voting fee paid successfully!');
+
+                // Redirect after delay
+                setTimeout(() => {
+                    if (pageConfig.videoId) {
+                        window.location.href = '/video/' + pageConfig.videoId;
+                    } else {
+                        window.location.href = '/videos';
+                    }
+                }, 2000);
+            }, 1500);
+
+        } else {
+            stopPaymentProcessing(payButton);
+            showErrorMessage(data.error || 'Payment failed. Please try again.');
+        }
+    })
+    .catch(error => {
+        console.error('Payment error:', error);
+        stopPaymentProcessing(payButton);
+        showErrorMessage('Network error. Please check your connection and try again.');
+    });
+}
+
+// Enhanced UI feedback functions
+function startPaymentProcessing(button) {
+    button.disabled = true;
+    button.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Processing Payment...';
+    button.style.background = 'linear-gradient(135deg, #6b7280 0%, #9ca3af 100%)';
+
+    // Add pulse animation to modal
+    document.querySelector('.modal-content').style.animation = 'pulse 1.5s infinite';
+}
+
+function stopPaymentProcessing(button) {
+    button.disabled = false;
+    button.innerHTML = '<i class="fas fa-credit-card me-2"></i>Pay $2 Now';
+    button.style.background = 'linear-gradient(135deg, #4f46e5 0%, #7c3aed 100%)';
+
+    // Remove pulse animation
+    document.querySelector('.modal-content').style.animation = '';
+}
+
+function showSuccessAnimation() {
+    const modal = document.querySelector('.modal-content');
+    modal.innerHTML = `
+        <div class="text-center p-5">
+            <div class="success-checkmark mb-4">
+                <i class="fas fa-check-circle fa-5x text-success"></i>
+            </div>
+            <h3 class="text-success mb-3">Payment Successful!</h3>
+            <p class="text-muted">Your voting fee has been processed successfully.</p>
+            <div class="spinner-border text-primary mt-3" role="status">
+                <span class="visually-hidden">Redirecting...</span>
+            </div>
+        </div>
+    `;
+
+    // Add success animation
+    modal.style.animation = 'bounceIn 0.8s ease-out';
+}
+
+function showSuccessNotification(message) {
+    // Create toast notification
+    const toast = document.createElement('div');
+    toast.className = 'toast-notification success';
+    toast.innerHTML = `
+        <div class="d-flex align-items-center">
+            <i class="fas fa-check-circle me-3 text-success fa-2x"></i>
+            <div>
+                <strong>Success!</strong><br>
+                <small>${message}</small>
+            </div>
+        </div>
+    `;
+
+    // Add styles
+    toast.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: white;
+        padding: 1.5rem;
+        border-radius: 10px;
+        box-shadow: 0 10px 25px rgba(0,0,0,0.1);
+        border-left: 4px solid #10b981;
+        z-index: 9999;
+        animation: slideInRight 0.5s ease-out;
+        max-width: 400px;
+    `;
+
+    document.body.appendChild(toast);
+
+    // Auto remove after 5 seconds
+    setTimeout(() => {
+        toast.style.animation = 'slideOutRight 0.5s ease-in';
+        setTimeout(() => toast.remove(), 500);
+    }, 5000);
+}
+
+function showErrorMessage(message) {
+    // Enhanced error display
+    const errorDiv = document.createElement('div');
+    errorDiv.className = 'alert alert-danger alert-dismissible fade show mt-3';
+    errorDiv.innerHTML = `
+        <i class="fas fa-exclamation-triangle me-2"></i>
+        <strong>Error:</strong> ${message}
+        <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+    `;
+
+    const modalBody = document.querySelector('.modal-body');
+    const existingAlert = modalBody.querySelector('.alert');
+    if (existingAlert) {
+        existingAlert.remove();
+    }
+
+    modalBody.appendChild(errorDiv);
+
+    // Auto dismiss after 8 seconds
+    setTimeout(() => {
+        if (errorDiv.parentNode) {
+            errorDiv.remove();
+        }
+    }, 8000);
+}
+
+// Add CSS animations for new elements
+const additionalStyles = document.createElement('style');
+additionalStyles.textContent = `
+    @keyframes bounceIn {
+        0% { transform: scale(0.3); opacity: 0; }
+        50% { transform: scale(1.05); }
+        70% { transform: scale(0.9); }
+        100% { transform: scale(1); opacity: 1; }
+    }
+
+    @keyframes slideInRight {
+        from { transform: translateX(100%); opacity: 0; }
+        to { transform: translateX(0); opacity: 1; }
+    }
+
+    @keyframes slideOutRight {
+        from { transform: translateX(0); opacity: 1; }
+        to { transform: translateX(100%); opacity: 0; }
+    }
+
+    .success-checkmark i {
+        animation: bounceIn 0.8s ease-out 0.5s both;
+    }
+
+    .btn-enabled {
+        background: linear-gradient(135deg, #10b981 0%, #059669 100%) !important;
+    }
+
+    .payment-method-card:hover {
+        cursor: pointer;
+    }
+`;
+document.head.appendChild(additionalStyles);
+
+// Initialize page animations
+document.addEventListener('DOMContentLoaded', function() {
+    // Add entrance animations to elements
+    const elements = document.querySelectorAll('.payment-method-card, .benefits-list li');
+    elements.forEach((el, index) => {
+        el.style.opacity = '0';
+        el.style.transform = 'translateY(20px)';
+        setTimeout(() => {
+            el.style.transition = 'all 0.6s ease-out';
+            el.style.opacity = '1';
+            el.style.transform = 'translateY(0)';
+        }, index * 100 + 300);
+    });
+});
@@ -0,0 +1,4 @@
+// Infinite scroll for /search: next keyset pages come from /api/search (see load_more.js)
+document.addEventListener('DOMContentLoaded', function() {
+    initLoadMore(document.getElementById('search-results'), document.getElementById('search-results-more'), 'results');
+});
@@ -0,0 +1,93 @@
+// Navbar search box typeahead: after a short pause in typing, ask
+// /api/search/suggest for a few matching titles and list them under the box.
+// Enter still submits the form to the full /search page.
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('form.search-box');
+    if (!form) {
+        return;
+    }
+    const input = form.querySelector('input[name="q"]');
+    const menu = form.querySelector('.search-suggestions');
+    const suggestions = {};  // query -> suggestion list, for this page's lifetime
+    let timer = null;
+    let latest = '';
+
+    function hide() {
+        menu.classList.remove('show');
+        menu.innerHTML = '';
+    }
+
+    function show(items) {
+        menu.innerHTML = '';
+        items.forEach(item => {
+            const link = document.createElement('a');
+            link.className = 'dropdown-item';
+            link.href = item.url;
+            link.textContent = item.title;
+            const uploader = document.createElement('small');
+            uploader.className = 'text-muted ms-2';
+            uploader.textContent = item.username;
+            link.appendChild(uploader);
+            menu.appendChild(link);
+        });
+        menu.classList.toggle('show', items.length > 0);
+    }
+
+    function suggest(query) {
+        if (suggestions[query]) {
+            show(suggestions[query]);
+            return;
+        }
+        const url = new URL(input.dataset.suggestUrl, window.location.href);
+        url.searchParams.set('q', query);
+        fetch(url, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(data => {
+                suggestions[query] = data.suggestions || [];
+                // Answers can arrive out of order; only show the one for the current text
+                if (query === latest) {
+                    show(suggestions[query]);
+                }
+            })
+            .catch(error => console.error('Error loading search suggestions:', error));
+    }
+
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        latest = input.value.trim();
+        if (latest.length < 3) {
+            hide();
+            return;
+        }
+        timer = setTimeout(() => suggest(latest), 150);
+    });
+
+    input.addEventListener('keydown', function(event) {
+        if (event.key === 'Escape') {
+            hide();
+        } else if (event.key === 'ArrowDown' && menu.firstChild) {
+            event.preventDefault();
+            menu.firstChild.focus();
+        }
+    });
+
+    menu.addEventListener('keydown', function(event) {
+        const item = document.activeElement;
+        if (event.key === 'ArrowDown' && item.nextSibling) {
+            event.preventDefault();
+            item.nextSibling.focus();
+        } else if (event.key === 'ArrowUp') {
+            event.preventDefault();
+            (item.previousSibling || input).focus();
+        } else if (event.key === 'Escape') {
+            hide();
+            input.focus();
+        }
+    });
+
+    document.addEventListener('click', function(event) {
+        if (!form.contains(event.target)) {
+            hide();
+        }
+    });
+});
@@ -0,0 +1,526 @@
+let currentTransactionId = null;
+let selectedProvider = null;
+
+// Provider selection and animations
+document.addEventListener('DOMContentLoaded', function() {
+    const providerBtns = document.querySelectorAll('.provider-btn');
+
+    providerBtns.forEach(btn => {
+        btn.addEventListener('click', function() {
+            // Remove active class from all buttons
+            providerBtns.forEach(b => b.classList.remove('active'));
+            // Add active class to clicked button
+            this.classList.add('active');
+            selectedProvider = this.dataset.provider;
+        });
+    });
+
+    // Initialize animations
+    initializeAnimations();
+});
+
+// Animation functions
+function initializeAnimations() {
+    // Create intersection observer for scroll animations
+    const observerOptions = {
+        threshold: 0.2,
+        rootMargin: '0px 0px -50px 0px'
+    };
+
+    const observer = new IntersectionObserver(function(entries) {
+        entries.forEach(entry => {
+            if (entry.isIntersecting) {
+                animateElement(entry.target);
+            }
+        });
+    }, observerOptions);
+
+    // Observe tournament info section
+    const tournamentInfo = document.getElementById('tournament-info');
+    if (tournamentInfo) {
+        observer.observe(tournamentInfo);
+    }
+
+    // Add entrance animation to payment card
+    setTimeout(() => {
+        const paymentCard = document.getElementById('payment-card');
+        if (paymentCard) {
+            paymentCard.classList.add('show');
+        }
+    }, 500);
+}
+
+function animateElement(element) {
+    // Animate the main tournament info container
+    element.classList.add('animate');
+
+    // Animate feature cards with staggered timing
+    const featureCards = element.querySelectorAll('.feature-card');
+    featureCards.forEach((card, index) => {
+        const delay = parseInt(card.dataset.delay) || index * 200;
+        setTimeout(() => {
+            card.classList.add('animate');
+        }, delay);
+    });
+
+    // Add hover effects to feature cards
+    featureCards.forEach(card => {
+        card.addEventListener('mouseenter', function() {
+            this.style.transform = 'translateY(-15px) scale(1.05)';
+            this.style.boxShadow = '0 20px 50px rgba(0,0,0,0.2)';
+        });
+
+        card.addEventListener('mouseleave', function() {
+            this.style.transform = 'translateY(0) scale(1)';
+            this.style.boxShadow = '0 5px 15px rgba(0,0,0,0.1)';
+        });
+    });
+}
+
+function showMessage(message, type = 'info') {
+    const messagesDiv = document.getElementById('payment-messages');
+    const alertClass = type === 'error' ? 'alert-danger' : type === 'success' ? 'alert-success' : 'alert-info';
+
+    messagesDiv.innerHTML = `
+        <div class="alert ${alertClass} alert-custom">
+            <i class="fas fa-${type === 'error' ? 'exclamation-circle' : type === 'success' ? 'check-circle' : 'info-circle'} me-2"></i>
+            ${message}
+        </div>
+    `;
+}
+
+function clearMessages() {
+    document.getElementById('payment-messages').innerHTML = '';
+}
+
+function fillTestNumber(number) {
+    document.getElementById('phone_number').value = number;
+}
+
+async function initiatePayment() {
+    const phoneNumber = document.getElementById('phone_number').value.trim();
+    const submitBtn = document.getElementById('submit-payment');
+    const btnText = submitBtn.querySelector('.btn-text');
+    const loadingAnimation = submitBtn.querySelector('.loading-animation');
+
+    // Validation
+    if (!selectedProvider) {
+        showMessage(t('payment.selectProvider') || 'Please select a mobile money provider', 'error');
+        return;
+    }
+
+    if (!phoneNumber) {
+        showMessage(t('payment.enterPhone') || 'Please enter your mobile money phone number', 'error');
+        return;
+    }
+
+    // Basic phone number validation
+    const cleanedPhone = phoneNumber.replace(/[^\d]/g, '');
+    if (cleanedPhone.length < 8) {
+        showMessage(t('payment.validPhone') || 'Please enter a valid phone number (minimum 8 digits)', 'error');
+        return;
+    }
+
+    // Show loading animation
+    submitBtn.disabled = true;
+    btnText.style.opacity = '0';
+    loadingAnimation.style.display = 'block';
+    clearMessages();
+
+    try {
+        const response = await fetch('/initiate_mobile_payment', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                provider: selectedProvider,
+                phone_number: phoneNumber
+            })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            currentTransactionId = result.transaction_id;
+
+            // Show processing message with animation
+            showMessage(t('payment.paymentInitiated') || 'Payment initiated successfully! Processing...', 'success');
+
+            // Start transaction animation
+            startTransactionAnimation();
+
+            // For demo mode or immediate success, redirect after animation
+            console.log('Payment result:', result);
+
+            // Always treat as successful in demo mode and redirect
+            setTimeout(() => {
+                showSuccessMessage();
+                setTimeout(() => {
+                    redirectToUpload();
+                }, 2000);
+            }, 3000); // Show processing animation for 3 seconds
+
+        } else {
+            showMessage(result.message || result.error, 'error');
+            resetButton();
+        }
+    } catch (error) {
+        showMessage(t('payment.networkError') || 'Network error. Please try again.', 'error');
+        console.error('Payment error:', error);
+        resetButton();
+    }
+}
+
+function resetButton() {
+    const submitBtn = document.getElementById('submit-payment');
+    const btnText = submitBtn.querySelector('.btn-text');
+    const loadingAnimation = submitBtn.querySelector('.loading-animation');
+
+    submitBtn.disabled = false;
+    loadingAnimation.style.display = 'none';
+    btnText.style.opacity = '1';
+}
+
+function showSuccessMessage() {
+    const submitBtn = document.getElementById('submit-payment');
+    const btnText = submitBtn.querySelector('.btn-text');
+    const paymentCard = document.getElementById('payment-card');
+
+    // Remove processing animation
+    paymentCard.classList.remove('processing-animation');
+
+    // Update button to show success
+    btnText.innerHTML = '<i class="fas fa-check-circle me-2"></i>Payment Successful!';
+    btnText.style.color = '#28a745';
+
+    // Show success message
+    showMessage('🎉 Payment successful! Welcome to the tournament!', 'success');
+
+    // Add success animation to payment card
+    paymentCard.classList.add('success-glow');
+
+    // Update transaction status
+    const transactionStatus = document.getElementById('transaction-status');
+    if (transactionStatus) {
+        transactionStatus.innerHTML = `
+            <div class="d-flex align-items-center">
+                <i class="fas fa-check-circle text-success me-3" style="font-size: 1.2em;"></i>
+                <div>
+                    <strong class="text-success">Payment Confirmed!</strong>
+                    <div class="mt-1">
+                        <small class="text-success">You are now a tournament participant. Redirecting to upload...</small>
+                    </div>
+                </div>
+            </div>
+        `;
+        transactionStatus.className = 'alert alert-success alert-custom';
+    }
+}
+
+function showSuccessAndRedirect() {
+    const paymentCard = document.getElementById('payment-card');
+    const successState = document.getElementById('success-state');
+
+    // Fade out payment card
+    paymentCard.classList.add('fade-out');
+
+    setTimeout(() => {
+        paymentCard.style.display = 'none';
+        successState.style.display = 'block';
+        successState.classList.add('success-animation');
+
+        // Auto redirect after 3 seconds
+        setTimeout(() => {
+            redirectToUpload();
+        }, 3000);
+    }, 1000);
+}
+
+function redirectToUpload() {
+    // Smooth redirect with loading indication
+    showMessage('Redirecting to upload page...', 'success');
+
+    setTimeout(() => {
+        window.location.href = '/upload_video';
+    }, 1500);
+}
+
+// Transaction Animation Functions
+function startTransactionAnimation() {
+    const submitBtn = document.getElementById('submit-payment');
+    const btnText = submitBtn.querySelector('.btn-text');
+    const loadingAnimation = submitBtn.querySelector('.loading-animation');
+
+    // Update button to show processing state
+    btnText.innerHTML = '<i class="fas fa-credit-card me-2"></i>Processing Payment...';
+    btnText.style.opacity = '1';
+    loadingAnimation.style.display = 'none';
+
+    // Add processing animation to payment card
+    const paymentCard = document.getElementById('payment-card');
+    paymentCard.classList.add('processing-animation');
+
+    // Create transaction status display
+    const messagesDiv = document.getElementById('payment-messages');
+    messagesDiv.innerHTML = `
+        <div class="alert alert-info alert-custom" id="transaction-status">
+            <div class="d-flex align-items-center">
+                <div class="spinner-border spinner-border-sm me-3" role="status">
+                    <span class="visually-hidden">${t('common.loading') || 'Loading...'}</span>
+                </div>
+                <div>
+                    <i class="fas fa-mobile-alt me-2"></i>
+                    <strong>Processing your payment...</strong>
+                    <div class="mt-1">
+                        <small id="transaction-step">Connecting to mobile money provider...</small>
+                    </div>
+                </div>
+            </div>
+        </div>
+    `;
+
+    // Animate transaction steps
+    const steps = [
+        'Connecting to mobile money provider...',
+        'Validating phone number...',
+        'Processing payment request...',
+        'Awaiting confirmation...',
+        'Finalizing transaction...'
+    ];
+
+    let stepIndex = 0;
+    const stepInterval = setInterval(() => {
+        stepIndex++;
+        if (stepIndex < steps.length) {
+            const stepElement = document.getElementById('transaction-step');
+            if (stepElement) {
+                stepElement.textContent = steps[stepIndex];
+            }
+        } else {
+            clearInterval(stepInterval);
+        }
+    }, 800);
+
+    // Store interval for cleanup
+    window.transactionStepInterval = stepInterval;
+}
+
+function startPaymentStatusPolling() {
+    if (!currentTransactionId) return;
+
+    let pollCount = 0;
+    const maxPolls = 30; // Poll for up to 5 minutes (30 * 10 seconds)
+
+    const pollInterval = setInterval(async () => {
+        pollCount++;
+
+        try {
+            const response = await fetch(`/check_payment_status/${currentTransactionId}`);
+            const result = await response.json();
+
+            if (result.success && result.status === 'successful') {
+                clearInterval(pollInterval);
+                clearInterval(window.transactionStepInterval);
+                showTransactionSuccess();
+                setTimeout(() => showSuccessAndRedirect(), 2000);
+            } else if (result.status === 'failed') {
+                clearInterval(pollInterval);
+                clearInterval(window.transactionStepInterval);
+                showTransactionFailure();
+            } else if (pollCount >= maxPolls) {
+                clearInterval(pollInterval);
+                clearInterval(window.transactionStepInterval);
+                showTransactionTimeout();
+            }
+            // Continue polling if status is still pending
+        } catch (error) {
+            console.error('Payment status check error:', error);
+            if (pollCount >= maxPolls) {
+                clearInterval(pollInterval);
+                clearInterval(window.transactionStepInterval);
+                showTransactionTimeout();
+            }
+        }
+    }, 10000); // Poll every 10 seconds
+}
+
+function showTransactionSuccess() {
+    const statusDiv = document.getElementById('transaction-status');
+    if (statusDiv) {
+        statusDiv.innerHTML = `
+            <div class="d-flex align-items-center">
+                <div class="text-success me-3">
+                    <i class="fas fa-check-circle fa-2x"></i>
+                </div>
+                <div>
+                    <strong class="text-success">Payment Successful!</strong>
+                    <div class="mt-1">
+                        <small>Your account has been upgraded. Redirecting to upload page...</small>
+                    </div>
+                </div>
+            </div>
+        `;
+        statusDiv.className = 'alert alert-success alert-custom';
+    }
+
+    // Stop processing animation and add success bounce
+    const paymentCard = document.getElementById('payment-card');
+    paymentCard.classList.remove('processing-animation');
+    paymentCard.classList.add('success-bounce');
+}
+
+function showTransactionFailure() {
+    const statusDiv = document.getElementById('transaction-status');
+    if (statusDiv) {
+        statusDiv.innerHTML = `
+            <div class="d-flex align-items-center">
+                <div class="text-danger me-3">
+                    <i class="fas fa-times-circle fa-2x"></i>
+                </div>
+                <div>
+                    <strong class="text-danger">Payment Failed</strong>
+                    <div class="mt-1">
+                        <small>Please try again or contact support if the issue persists.</small>
+                    </div>
+                </div>
+            </div>
+        `;
+        statusDiv.className = 'alert alert-danger alert-custom';
+    }
+
+    resetButton();
+    const paymentCard = document.getElementById('payment-card');
+    paymentCard.classList.remove('processing-animation');
+}
+
+function showTransactionTimeout() {
+    const statusDiv = document.getElementById('transaction-status');
+    if (statusDiv) {
+        statusDiv.innerHTML = `
+            <div class="d-flex align-items-center">
+                <div class="text-warning me-3">
+                    <i class="fas fa-clock fa-2x"></i>
+                </div>
+                <div>
+                    <strong class="text-warning">Payment Processing</strong>
+                    <div class="mt-1">
+                        <small>Your payment is still being processed. Please check back in a few minutes.</small>
+                    </div>
+                    <button class="btn btn-sm btn-outline-primary mt-2" onclick="checkPaymentStatus()">
+                        <i class="fas fa-sync me-1"></i>Check Status
+                    </button>
+                </div>
+            </div>
+        `;
+        statusDiv.className = 'alert alert-warning alert-custom';
+    }
+
+    resetButton();
+    const paymentCard = document.getElementById('payment-card');
+    paymentCard.classList.remove('processing-animation');
+}
+
+function goToDashboard() {
+    // Smooth redirect to dashboard
+    showMessage('Going to dashboard...', 'info');
+
+    setTimeout(() => {
+        window.location.href = '/dashboard';
+    }, 1500);
+}
+
+// Optional: Check payment status function (simplified)
+async function checkPaymentStatus() {
+    if (!currentTransactionId) {
+        showMessage('No transaction to check', 'error');
+        return;
+    }
+
+    try {
+        const response = await fetch(`/check_payment_status/${currentTransactionId}`);
+        const result = await response.json();
+
+        if (result.success && result.status === 'successful') {
+            showSuccessAndRedirect();
+        } else if (result.status === 'failed') {
+            showMessage('Payment failed. Please try again.', 'error');
+        } else {
+            showMessage('Payment is still being processed...', 'info');
+        }
+    } catch (error) {
+        showMessage('Network error while checking status', 'error');
+        console.error('Status check error:', error);
+    } finally {
+        checkBtn.disabled = false;
+        checkBtn.innerHTML = '<i class="fas fa-sync me-1"></i>Check Status';
+    }
+}
+
+// Professional entrance animations
+document.addEventListener('DOMContentLoaded', function() {
+    // Staggered card animations
+    const cards = document.querySelectorAll('.card');
+    cards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(30px)';
+
+        setTimeout(() => {
+            card.style.transition = 'all 0.8s cubic-bezier(0.4, 0, 0.2, 1)';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, 300 + (index * 150));
+    });
+
+    // Add smooth scroll behavior
+    document.documentElement.style.scrollBehavior = 'smooth';
+});
+
+// Debug Functions
+async function checkUserStatus() {
+    try {
+        const response = await fetch('/debug/user_status');
+        const status = await response.json();
+
+        console.log('User Status Debug:', status);
+
+        let message = `
+            User ID: ${status.user_id}<br>
+            Session is_paid: ${status.session_is_paid}<br>
+            Database is_paid: ${status.current_user_is_paid}<br>
+            Recent transactions: ${status.recent_transactions.length}
+        `;
+
+        showMessage(message, status.current_user_is_paid ? 'success' : 'error');
+
+    } catch (error) {
+        console.error('Status check error:', error);
+        showMessage('Failed to check status', 'error');
+    }
+}
+
+async function forceUpgrade() {
+    try {
+        const response = await fetch('/debug/force_upgrade', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            }
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showMessage('✅ Force upgrade successful! You can now access upload.', 'success');
+            setTimeout(() => {
+                window.location.href = '/upload_video';
+            }, 2000);
+        } else {
+            showMessage('❌ Force upgrade failed', 'error');
+        }
+
+    } catch (error) {
+        console.error('Force upgrade error:', error);
+        showMessage('Failed to force upgrade', 'error');
+    }
+}
@@ -0,0 +1,1433 @@
+// Simple vote functionality
+document.addEventListener('DOMContentLoaded', function() {
+    const voteBtn = document.getElementById('voteBtn');
+    if (voteBtn) {
+        voteBtn.addEventListener('click', function() {
+            const videoId = this.dataset.videoId;
+
+            // Disable button during request
+            this.disabled = true;
+            this.innerHTML = '<i class="fas fa-spinner fa-spin me-2"></i>Processing...';
+
+            fetch('/vote', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `video_id=${videoId}`
+            })
+            .then(response => response.json())
+            .then(data => {
+                // Re-enable button
+                this.disabled = false;
+                this.innerHTML = '<i class="fas fa-vote-yea me-2"></i>Vote for This Video';
+
+                if (data.success) {
+                    // Show success toast
+                    const toast = document.createElement('div');
+                    toast.className = 'toast align-items-center text-white bg-success border-0 show';
+                    toast.style.cssText = `
+                        position: fixed;
+                        top: 80px;
+                        right: 20px;
+                        z-index: 1060;
+                        min-width: 350px;
+                        max-width: 400px;
+                        border-radius: 10px;
+                        box-shadow: 0 8px 25px rgba(0,0,0,0.15);
+                        animation: slideInRight 0.4s ease-out;
+                    `;
+
+                    toast.innerHTML = `
+                        <div class="d-flex">
+                            <div class="toast-body">
+                                <div class="d-flex align-items-center mb-2">
+                                    <i class="fas fa-check-circle me-2 text-white" style="font-size: 1.1em;"></i>
+                                    <strong>Vote Cast Successfully!</strong>
+                                </div>
+                                <div class="mb-2">
+                                    This video now has <strong>${data.total_votes} votes</strong>
+                                </div>
+                                <div class="mt-2">
+                                    <a href="/videos?sort=votes" class="btn btn-sm btn-light text-success fw-bold">
+                                        <i class="fas fa-trophy me-1"></i> View Top Videos
+                                    </a>
+                                </div>
+                            </div>
+                            <button type="button" class="btn-close btn-close-white me-2 m-auto" onclick="this.parentElement.parentElement.remove()"></button>
+                        </div>
+                    `;
+
+                    document.body.appendChild(toast);
+
+                    // Auto-remove toast after 5 seconds
+                    setTimeout(() => {
+                        if (toast.parentNode) {
+                            toast.remove();
+                        }
+                    }, 5000);
+
+                    // Reload page to show updated vote count
+                    setTimeout(() => location.reload(), 2000);
+
+                } else if (data.requires_voting_fee) {
+                    // Redirect to payment page for this specific video
+                    window.location.href = data.redirect_url || `/pay_voting_fee/${data.video_id || videoId}`;
+                } else if (data.already_voted) {
+                    // Show already voted message
+                    alert('You have already voted on this video!');
+                } else {
+                    // Show error message
+                    alert(data.message || 'An error occurred while voting');
+                }
+            })
+            .catch(error => {
+                // Re-enable button on error
+                this.disabled = false;
+                this.innerHTML = '<i class="fas fa-vote-yea me-2"></i>Vote for This Video';
+                alert('Network error. Please try again.');
+            });
+        });
+    }
+});
+
+// Star Rating System
+document.addEventListener('DOMContentLoaded', function() {
+    const starRating = document.querySelector('.star-rating');
+    const ratingMessage = document.getElementById('rating-message');
+    const ratingContainer = document.querySelector('.rating-container');
+
+    if (starRating) {
+        const stars = starRating.querySelectorAll('.star');
+        const videoId = starRating.dataset.videoId;
+        let currentRating = 0;
+        let hasRated = false;
+
+        // Initialize rating interface
+        initializeRatingInterface(videoId);
+
+        // Star hover effects - always allow interaction
+        stars.forEach((star, index) => {
+            star.addEventListener('mouseenter', function() {
+                highlightStars(index + 1);
+                updateRatingMessage(index + 1);
+            });
+
+            star.addEventListener('mouseleave', function() {
+                // Restore current rating display
+                highlightStars(currentRating);
+                if (currentRating === 0) {
+                    ratingMessage.textContent = t('video.clickToRate') || 'Click a star to rate';
+                } else {
+                    ratingMessage.innerHTML = `<i class="fas fa-star text-warning me-1"></i>${t('video.yourRating') || 'Your rating'}: ${currentRating} ${t('rating.stars') || 'stars'} (${t('video.clickToChange') || 'click to change'})`;
+                }
+            });
+
+            star.addEventListener('click', function() {
+                const rating = index + 1;
+                submitRating(videoId, rating);
+
+                // Add animation to clicked star
+                star.classList.add('animate');
+                setTimeout(() => star.classList.remove('animate'), 300);
+            });
+        });
+
+        function highlightStars(rating) {
+            stars.forEach((star, index) => {
+                if (index < rating) {
+                    star.classList.add('filled');
+                    star.classList.add('active');
+                } else {
+                    star.classList.remove('filled');
+                    star.classList.remove('active');
+                }
+            });
+        }
+
+        function updateRatingMessage(rating) {
+            const messages = {
+                1: t('rating.poor') || 'Poor - 1 star',
+                2: t('rating.fair') || 'Fair - 2 stars',
+                3: t('rating.good') || 'Good - 3 stars',
+                4: t('rating.veryGood') || 'Very Good - 4 stars',
+                5: t('rating.excellent') || 'Excellent - 5 stars'
+            };
+            ratingMessage.textContent = messages[rating] || t('video.clickToRate') || 'Click a star to rate';
+        }
+
+        function initializeRatingInterface(videoId) {
+            // Set initial state
+            currentRating = 0;
+            hasRated = false;
+            ratingMessage.textContent = t('video.clickToRate') || 'Click a star to rate';
+            highlightStars(0);
+
+            // Check if user already rated this video
+            fetch(`/get_user_rating/${videoId}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success && data.rating) {
+                        // User has already rated - but can update rating
+                        currentRating = data.rating;
+                        highlightStars(currentRating);
+                        ratingMessage.innerHTML = `<i class="fas fa-star text-warning me-1"></i>${t('video.yourRating') || 'Your rating'}: ${currentRating} ${t('rating.stars') || 'stars'} (${t('video.clickToChange') || 'click to change'})`;
+
+                        // Keep stars interactive so user can update rating
+                        stars.forEach(star => {
+                            star.classList.add('active');
+                        });
+                    } else {
+                        // No existing rating - user can rate
+                        ratingMessage.textContent = t('video.clickToRate') || 'Click a star to rate';
+                    }
+                })
+                .catch(error => {
+                    console.log('No existing rating found - user can rate');
+                    ratingMessage.textContent = t('video.clickToRate') || 'Click a star to rate';
+                });
+        }
+
+        function submitRating(videoId, rating) {
+            // Disable interaction during submission
+            stars.forEach(star => star.style.pointerEvents = 'none');
+            ratingMessage.innerHTML = `<i class="fas fa-spinner fa-spin me-2"></i>${t('rating.submittingRating') || 'Submitting rating...'}`;
+
+            fetch('/submit_rating', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({
+                    video_id: videoId,
+                    rating: rating
+                })
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    const oldRating = currentRating;
+                    currentRating = rating;
+                    highlightStars(rating);
+
+                    // Show appropriate message based on whether it's an update or new rating
+                    if (data.is_update) {
+                        ratingMessage.innerHTML = `<i class="fas fa-check-circle text-success me-1"></i>${t('rating.ratingUpdated') || 'Rating updated from'} ${data.old_rating} ${t('rating.to') || 'to'} ${rating} ${t('rating.stars') || 'stars'}! (${t('video.clickToChange') || 'click to change again'})`;
+                    } else {
+                        ratingMessage.innerHTML = `<i class="fas fa-check-circle text-success me-1"></i>${t('rating.ratingSubmitted') || 'Thank you! You rated this video'} ${rating} ${t('rating.stars') || 'stars'} (${t('video.clickToChange') || 'click to change'})`;
+                    }
+
+                    // Add success animation
+                    ratingContainer.classList.add('success');
+                    setTimeout(() => ratingContainer.classList.remove('success'), 1000);
+
+                    // Update page stats if available
+                    if (data.new_average) {
+                        updateRatingDisplay(data.new_average, data.total_votes || 0);
+                    }
+
+                    // Show success toast
+                    showRatingToast(data.message, 'success');
+
+                    // Keep stars interactive for future updates
+                    stars.forEach(star => {
+                        star.style.pointerEvents = 'auto';
+                        star.style.cursor = 'pointer';
+                        star.classList.add('active');
+                    });
+
+                } else {
+                    ratingMessage.innerHTML = `<i class="fas fa-times-circle text-danger me-1"></i>${data.message || (t('messages.error') || 'Rating failed')}`;
+                    showRatingToast(data.message || (t('messages.error') || 'Rating failed. Please try again.'), 'error');
+
+                    // Re-enable interaction
+                    stars.forEach(star => star.style.pointerEvents = 'auto');
+                }
+            })
+            .catch(error => {
+                console.error('Rating error:', error);
+                ratingMessage.innerHTML = `<i class="fas fa-times-circle text-danger me-1"></i>${t('rating.networkError') || 'Network error. Please try again.'}`;
+                showRatingToast(t('rating.networkError') || 'Network error. Please try again.', 'error');
+
+                // Re-enable interaction
+                stars.forEach(star => star.style.pointerEvents = 'auto');
+            });
+        }
+
+        function updateRatingDisplay(newAverage, totalRatings) {
+            // Update the current rating display if it exists
+            const currentRatingEl = document.querySelector('.current-rating');
+            if (currentRatingEl) {
+                const avgStars = currentRatingEl.querySelector('.average-stars');
+                const ratingText = currentRatingEl.querySelector('.text-muted');
+
+                if (avgStars && ratingText) {
+                    // Update star display
+                    avgStars.innerHTML = '';
+                    for (let i = 1; i <= 5; i++) {
+                        const star = document.createElement('i');
+                        if (i <= newAverage) {
+                            star.className = 'fas fa-star text-warning';
+                        } else if (i - 0.5 <= newAverage) {
+                            star.className = 'fas fa-star-half-alt text-warning';
+                        } else {
+                            star.className = 'far fa-star text-muted';
+                        }
+                        avgStars.appendChild(star);
+                    }
+
+                    // Update rating text
+                    ratingText.innerHTML = `${newAverage.toFixed(1)} ${t('video.outOf5') || 'out of 5'} <small>(${totalRatings} ${t('video.ratings') || 'ratings'})</small>`;
+                }
+            }
+        }
+
+        function showRatingToast(message, type) {
+            const toast = document.createElement('div');
+            toast.className = `toast align-items-center text-white ${type === 'success' ? 'bg-success' : 'bg-danger'} border-0 show`;
+            toast.style.cssText = `
+                position: fixed;
+                top: 100px;
+                right: 20px;
+                z-index: 1060;
+                min-width: 300px;
+                border-radius: 10px;
+                box-shadow: 0 8px 25px rgba(0,0,0,0.15);
+                animation: slideInRight 0.4s ease-out;
+            `;
+
+            toast.innerHTML = `
+                <div class="d-flex">
+                    <div class="toast-body">
+                        <i class="fas ${type === 'success' ? 'fa-star' : 'fa-exclamation-triangle'} me-2"></i>
+                        ${message}
+                    </div>
+                    <button type="button" class="btn-close btn-close-white me-2 m-auto" onclick="this.parentElement.parentElement.remove()"></button>
+                </div>
+            `;
+
+            document.body.appendChild(toast);
+
+            // Auto remove after 5 seconds
+            setTimeout(() => {
+                if (toast.parentElement) {
+                    toast.style.animation = 'slideOutRight 0.4s ease-in';
+                    setTimeout(() => toast.remove(), 400);
+                }
+            }, 5000);
+        }
+    }
+});
+
+// YouTube-style Comments System
+document.addEventListener('DOMContentLoaded', function() {
+    // Video overlay handling
+    const video = document.querySelector('video');
+    const overlay = document.querySelector('.video-overlay');
+
+    if (video && overlay) {
+        // Show overlay when video is paused/ended
+        video.addEventListener('pause', function() {
+            overlay.style.opacity = '1';
+        });
+
+        video.addEventListener('ended', function() {
+            overlay.style.opacity = '1';
+        });
+
+        // Hide overlay when video is playing
+        video.addEventListener('play', function() {
+            overlay.style.opacity = '0';
+        });
+
+        // Hide overlay when video is loading/buffering
+        video.addEventListener('loadstart', function() {
+            overlay.style.opacity = '0';
+        });
+
+        // Click overlay to play video
+        overlay.addEventListener('click', function() {
+            if (video.paused) {
+                video.play().catch(error => {
+                    console.error('Error playing video:', error);
+                    // Show user-friendly error message
+                    const errorMsg = document.createElement('div');
+                    errorMsg.className = 'alert alert-warning mt-2';
+                    errorMsg.innerHTML = '<i class="fas fa-exclamation-triangle me-2"></i>Unable to play video. Please check if the video file exists and is in a supported format.';
+                    video.parentElement.appendChild(errorMsg);
+                });
+            }
+        });
+
+        // Enable pointer events only when overlay is visible
+        video.addEventListener('pause', function() {
+            overlay.style.pointerEvents = 'auto';
+        });
+
+        video.addEventListener('play', function() {
+            overlay.style.pointerEvents = 'none';
+        });
+
+        // Video error handling
+        video.addEventListener('error', function(e) {
+            console.error('Video error:', e);
+            const errorMsg = document.createElement('div');
+            errorMsg.className = 'alert alert-danger mt-2';
+            errorMsg.innerHTML = `
+                <h6><i class="fas fa-exclamation-circle me-2"></i>Video Error</h6>
+                <p class="mb-1">Failed to load video: <code></code></p>
+                <small class="text-muted">Error code: ${video.error ? video.error.code : 'Unknown'}</small>
+                <br><small class="text-muted">Please ensure the video file exists in the uploads directory.</small>
+            `;
+            errorMsg.querySelector('code').textContent = window.videoPage.filename;
+            video.parentElement.appendChild(errorMsg);
+        });
+
+        // Log video path for debugging
+        console.log('Video source:', video.currentSrc || video.src);
+        console.log('Video ready state:', video.readyState);
+    }
+
+    // Navbar positioning
+    const navbar = document.querySelector('.navbar');
+    const sidebar = document.querySelector('.sticky-top');
+
+    if (navbar && sidebar) {
+        function updateStickyPosition() {
+            const navbarHeight = navbar.offsetHeight;
+            sidebar.style.top = (navbarHeight + 10) + 'px';
+        }
+
+        updateStickyPosition();
+        window.addEventListener('resize', updateStickyPosition);
+
+        function handleResponsive() {
+            if (window.innerWidth < 992) {
+                sidebar.style.position = 'relative';
+                sidebar.style.top = 'auto';
+            } else {
+                sidebar.style.position = 'sticky';
+                updateStickyPosition();
+            }
+        }
+
+        handleResponsive();
+        window.addEventListener('resize', handleResponsive);
+    }
+
+    // Main comment form handling
+    const mainCommentInput = document.getElementById('main-comment-input');
+    const commentActions = document.getElementById('comment-actions');
+    const mainCommentForm = document.getElementById('main-comment-form');
+    const cancelComment = document.getElementById('cancel-comment');
+
+    if (mainCommentInput) {
+        // Show comment actions when user focuses on input
+        mainCommentInput.addEventListener('focus', function() {
+            this.rows = 3;
+            commentActions.classList.remove('d-none');
+            commentActions.classList.add('d-flex');
+            updateCommentButton();
+        });
+
+        // Enable/disable comment button based on input content
+        mainCommentInput.addEventListener('input', function() {
+            updateCommentButton();
+        });
+
+        // Handle keyboard shortcuts (Enter to submit, Shift+Enter for new line)
+        mainCommentInput.addEventListener('keydown', function(e) {
+            if (e.key === 'Enter' && !e.shiftKey) {
+                e.preventDefault();
+                if (mainCommentInput.value.trim() && !document.getElementById('submit-comment').disabled) {
+                    mainCommentForm.dispatchEvent(new Event('submit'));
+                }
+            }
+        });
+
+        // Handle cancel button
+        cancelComment.addEventListener('click', function() {
+            mainCommentInput.rows = 1;
+            mainCommentInput.value = '';
+            commentActions.classList.add('d-none');
+            commentActions.classList.remove('d-flex');
+            mainCommentInput.blur();
+            updateCommentButton();
+        });
+
+        // Function to enable/disable comment button
+        function updateCommentButton() {
+            const submitBtn = document.getElementById('submit-comment');
+            const hasContent = mainCommentInput.value.trim().length > 0;
+
+            if (submitBtn) {
+                submitBtn.disabled = !hasContent;
+                if (hasContent) {
+                    submitBtn.classList.remove('btn-outline-primary');
+                    submitBtn.classList.add('btn-primary');
+                } else {
+                    submitBtn.classList.remove('btn-primary');
+                    submitBtn.classList.add('btn-outline-primary');
+                }
+            }
+        }
+
+        // Submit main comment
+        mainCommentForm.addEventListener('submit', function(e) {
+            e.preventDefault();
+            const commentText = mainCommentInput.value.trim();
+            const videoId = document.getElementById('submit-comment').dataset.videoId;
+
+            if (!commentText) return;
+
+            fetch('/add_comment', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `video_id=${videoId}&comment=${encodeURIComponent(commentText)}`
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    addCommentToDOM(data.comment, false);
+                    mainCommentInput.value = '';
+                    cancelComment.click();
+
+                    // Hide "no comments" message
+                    const noComments = document.getElementById('no-comments');
+                    if (noComments) noComments.style.display = 'none';
+
+                    // Update comment count
+                    updateCommentCount(1);
+
+                    // Show success feedback
+                    showNotification('Comment added successfully!', 'success');
+                } else {
+                    alert(data.message);
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('Error adding comment');
+            });
+        });
+    }
+
+    // Later pages of comments come from /api/videos/<id>/comments (see load_more.js);
+    // their buttons work through the delegated click handlers below
+    initLoadMore(document.getElementById('comments-container'), document.getElementById('comments-more'), 'comments');
+
+    // Reply button handlers
+    document.addEventListener('click', function(e) {
+        // Show/hide reply form
+        if (e.target.closest('.reply-btn')) {
+            const commentId = e.target.closest('.reply-btn').dataset.commentId;
+            const replyForm = document.querySelector(`.reply-form[data-comment-id="${commentId}"]`);
+            if (replyForm) {
+                replyForm.style.display = replyForm.style.display === 'none' ? 'block' : 'none';
+                if (replyForm.style.display === 'block') {
+                    replyForm.querySelector('.reply-input').focus();
+                }
+            }
+        }
+
+        // Cancel reply
+        if (e.target.closest('.cancel-reply')) {
+            const replyForm = e.target.closest('.reply-form');
+            replyForm.style.display = 'none';
+            replyForm.querySelector('.reply-input').value = '';
+        }
+
+        // Submit reply
+        if (e.target.closest('.submit-reply')) {
+            e.preventDefault();
+            const btn = e.target.closest('.submit-reply');
+            const replyForm = btn.closest('.reply-form');
+            const replyText = replyForm.querySelector('.reply-input').value.trim();
+            const videoId = btn.dataset.videoId;
+            const parentId = btn.dataset.parentId;
+
+            if (!replyText) return;
+
+            // Disable button during submission
+            btn.disabled = true;
+            btn.innerHTML = '<i class="fas fa-spinner fa-spin me-1"></i>Replying...';
+
+            fetch('/add_comment', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `video_id=${videoId}&comment=${encodeURIComponent(replyText)}&parent_id=${parentId}`
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    addCommentToDOM(data.comment, true, parentId);
+                    replyForm.querySelector('.reply-input').value = '';
+                    replyForm.style.display = 'none';
+
+                    // Update reply count and show replies button
+                    updateReplyCount(parentId, 1);
+                    // The header badge counts replies too (videos.comment_count)
+                    updateCommentCount(1);
+
+                    // Show success feedback
+                    showNotification('Reply added successfully!', 'success');
+                } else {
+                    alert(data.message);
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                alert('Error adding reply');
+            })
+            .finally(() => {
+                // Re-enable button
+                btn.disabled = false;
+                btn.innerHTML = 'Reply';
+            });
+        }
+    });
+
+    // Handle keyboard shortcuts for reply inputs
+    document.addEventListener('keydown', function(e) {
+        if (e.target.classList.contains('reply-input')) {
+            if (e.key === 'Enter' && !e.shiftKey) {
+                e.preventDefault();
+                if (e.target.value.trim()) {
+                    const submitBtn = e.target.closest('.reply-form').querySelector('.submit-reply');
+                    submitBtn.click();
+                }
+            }
+            if (e.key === 'Escape') {
+                const cancelBtn = e.target.closest('.reply-form').querySelector('.cancel-reply');
+                cancelBtn.click();
+            }
+        }
+    });
+
+    // Handle toggle replies and like buttons
+    document.addEventListener('click', function(e) {
+        // Toggle replies dropdown
+        if (e.target.closest('.toggle-replies')) {
+            const btn = e.target.closest('.toggle-replies');
+            const commentId = btn.dataset.commentId;
+            const isExpanded = btn.dataset.expanded === 'true';
+            const repliesContainer = document.querySelector(`.replies-container[data-comment-id="${commentId}"]`);
+            const icon = btn.querySelector('i');
+            const text = btn.querySelector('.reply-count-text');
+
+            if (isExpanded) {
+                // Collapse replies
+                repliesContainer.style.display = 'none';
+                icon.className = 'fas fa-chevron-down me-2';
+                // Get reply count from text and format properly
+                const replyCount = text.textContent.match(/\d+/)?.[0] || '0';
+                text.textContent = `${replyCount} ${replyCount === '1' ? 'reply' : 'replies'}`;
+                btn.dataset.expanded = 'false';
+            } else {
+                // Expand replies - the first ones come prefetched with the page;
+                // load them only for threads that have none yet
+                if (repliesContainer.children.length === 0) {
+                    loadReplies(repliesContainer, null, null);
+                }
+
+                repliesContainer.style.display = 'block';
+                icon.className = 'fas fa-chevron-up me-2';
+                text.textContent = 'Hide replies';
+                btn.dataset.expanded = 'true';
+            }
+        }
+
+        // Next page of a long thread
+        if (e.target.closest('.more-replies')) {
+            const moreBtn = e.target.closest('.more-replies');
+            const repliesContainer = moreBtn.closest('.replies-container');
+            moreBtn.disabled = true;
+            loadReplies(repliesContainer, moreBtn.dataset.nextCursor, moreBtn);
+        }
+
+        // Like/Dislike handlers
+        if (e.target.closest('.like-btn')) {
+            const btn = e.target.closest('.like-btn');
+            const commentId = btn.dataset.commentId;
+            const isLiked = btn.dataset.liked === 'true';
+            const action = isLiked ? 'unlike' : 'like';
+
+            fetch('/like_comment', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `comment_id=${commentId}&action=${action}`
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    btn.dataset.liked = data.user_liked;
+                    btn.querySelector('.like-count').textContent = data.like_count;
+                    const icon = btn.querySelector('i');
+
+                    if (data.user_liked) {
+                        // Liked state - solid blue icon
+                        icon.className = 'fas fa-thumbs-up me-1';
+                        icon.style.color = '#0d6efd'; // Bootstrap primary blue
+                        btn.classList.remove('btn-outline-secondary');
+                        btn.classList.add('btn-outline-primary');
+                    } else {
+                        // Unliked state - regular gray icon
+                        icon.className = 'far fa-thumbs-up me-1';
+                        icon.style.color = '#6c757d'; // Bootstrap secondary gray
+                        btn.classList.remove('btn-outline-primary');
+                        btn.classList.add('btn-outline-secondary');
+                    }
+
+                    // Update dislike button state (mutual exclusivity handled by backend)
+                    const dislikeBtn = btn.parentElement.querySelector('.dislike-btn');
+                    if (dislikeBtn) {
+                        dislikeBtn.dataset.disliked = data.user_disliked;
+                        const dislikeIcon = dislikeBtn.querySelector('i');
+                        if (data.user_disliked) {
+                            dislikeIcon.className = 'fas fa-thumbs-down';
+                            dislikeIcon.style.color = '#dc3545';
+                            dislikeBtn.classList.remove('btn-outline-secondary');
+                            dislikeBtn.classList.add('btn-outline-danger');
+                        } else {
+                            dislikeIcon.className = 'far fa-thumbs-down';
+                            dislikeIcon.style.color = '#6c757d';
+                            dislikeBtn.classList.remove('btn-outline-danger');
+                            dislikeBtn.classList.add('btn-outline-secondary');
+                        }
+                    }
+                } else {
+                    alert(data.message);
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                // Revert button state on error
+                const icon = btn.querySelector('i');
+                icon.style.color = '#6c757d';
+                icon.className = 'far fa-thumbs-up me-1';
+            });
+        }
+
+        // Dislike button handler
+        if (e.target.closest('.dislike-btn')) {
+            const btn = e.target.closest('.dislike-btn');
+            const commentId = btn.dataset.commentId;
+            const isDisliked = btn.dataset.disliked === 'true';
+            const action = isDisliked ? 'undislike' : 'dislike';
+
+            fetch('/dislike_comment', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/x-www-form-urlencoded',
+                },
+                body: `comment_id=${commentId}&action=${action}`
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.success) {
+                    btn.dataset.disliked = data.user_disliked;
+                    const icon = btn.querySelector('i');
+
+                    if (data.user_disliked) {
+                        // Disliked state - solid red icon
+                        icon.className = 'fas fa-thumbs-down';
+                        icon.style.color = '#dc3545'; // Bootstrap danger red
+                        btn.classList.remove('btn-outline-secondary');
+                        btn.classList.add('btn-outline-danger');
+                    } else {
+                        // Not disliked state - regular gray icon
+                        icon.className = 'far fa-thumbs-down';
+                        icon.style.color = '#6c757d'; // Bootstrap secondary gray
+                        btn.classList.remove('btn-outline-danger');
+                        btn.classList.add('btn-outline-secondary');
+                    }
+
+                    // Update like button state (mutual exclusivity handled by backend)
+                    const likeBtn = btn.parentElement.querySelector('.like-btn');
+                    if (likeBtn) {
+                        likeBtn.dataset.liked = data.user_liked;
+                        likeBtn.querySelector('.like-count').textContent = data.like_count;
+                        const likeIcon = likeBtn.querySelector('i');
+                        if (data.user_liked) {
+                            likeIcon.className = 'fas fa-thumbs-up me-1';
+                            likeIcon.style.color = '#0d6efd';
+                            likeBtn.classList.remove('btn-outline-secondary');
+                            likeBtn.classList.add('btn-outline-primary');
+                        } else {
+                            likeIcon.className = 'far fa-thumbs-up me-1';
+                            likeIcon.style.color = '#6c757d';
+                            likeBtn.classList.remove('btn-outline-primary');
+                            likeBtn.classList.add('btn-outline-secondary');
+                        }
+                    }
+                } else {
+                    alert(data.message);
+                }
+            })
+            .catch(error => {
+                console.error('Error:', error);
+                // Revert button state on error
+                const icon = btn.querySelector('i');
+                icon.style.color = '#6c757d';
+                icon.className = 'far fa-thumbs-down';
+            });
+        }
+    });
+
+    // Load one page of a thread's replies (after the given cursor) into its container.
+    // Replies already shown - e.g. one the user just posted - are not added twice.
+    function loadReplies(repliesContainer, cursor, moreBtn) {
+        const commentId = repliesContainer.dataset.commentId;
+        const url = `/api/comments/${commentId}/replies` + (cursor ? `?after=${encodeURIComponent(cursor)}` : '');
+        fetch(url, { headers: { 'Accept': 'application/json' }, credentials: 'same-origin' })
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success) {
+                throw new Error(data.message || 'Could not load replies');
+            }
+            const page = document.createElement('template');
+            page.innerHTML = data.html;
+            page.content.querySelectorAll('[data-reply-id]').forEach(reply => {
+                if (repliesContainer.querySelector(`[data-reply-id="${reply.dataset.replyId}"]`)) {
+                    reply.remove();
+                }
+            });
+            if (moreBtn) {
+                repliesContainer.insertBefore(page.content, moreBtn);
+            } else {
+                repliesContainer.appendChild(page.content);
+            }
+
+            if (data.next_cursor) {
+                if (!moreBtn) {
+                    moreBtn = document.createElement('button');
+                    moreBtn.className = 'btn btn-sm btn-link text-primary fw-bold ms-4 p-0 more-replies';
+                    moreBtn.dataset.commentId = commentId;
+                    moreBtn.style.textDecoration = 'none';
+                    moreBtn.innerHTML = '<i class="fas fa-level-down-alt me-2"></i>Show more replies';
+                    repliesContainer.appendChild(moreBtn);
+                }
+                moreBtn.dataset.nextCursor = data.next_cursor;
+                moreBtn.disabled = false;
+            } else if (moreBtn) {
+                moreBtn.remove();
+            }
+        })
+        .catch(error => {
+            if (moreBtn) {
+                moreBtn.disabled = false;
+            }
+            console.error('Error loading replies:', error);
+        });
+    }
+
+    // Function to add comment to DOM
+    function addCommentToDOM(comment, isReply, parentId) {
+        const container = isReply ? 
+            document.querySelector(`.replies-container[data-comment-id="${parentId}"]`) :
+            document.getElementById('comments-container');
+
+        const commentHtml = isReply ? createReplyHTML(comment) : createCommentHTML(comment);
+
+        if (isReply) {
+            container.insertAdjacentHTML('beforeend', commentHtml);
+            // Show replies container if it was hidden
+            if (container.style.display === 'none') {
+                container.style.display = 'block';
+                // Update toggle button state
+                const toggleBtn = document.querySelector(`.toggle-replies[data-comment-id="${parentId}"]`);
+                if (toggleBtn) {
+                    toggleBtn.dataset.expanded = 'true';
+                    toggleBtn.querySelector('i').className = 'fas fa-chevron-up me-1';
+                    toggleBtn.querySelector('.reply-count-text').textContent = 'Hide replies';
+                }
+            }
+        } else {
+            const noComments = document.getElementById('no-comments');
+            if (noComments) {
+                container.insertAdjacentHTML('afterbegin', commentHtml);
+            } else {
+                container.insertAdjacentHTML('afterbegin', commentHtml);
+            }
+        }
+    }
+
+    // Function to update reply count
+    function updateReplyCount(commentId, increment) {
+        const showRepliesBtn = document.querySelector(`.show-replies-btn[data-comment-id="${commentId}"]`);
+        let replyCountText = showRepliesBtn?.querySelector('.reply-count-text');
+
+        if (showRepliesBtn) {
+            if (!replyCountText) {
+                // Create the show replies button if it doesn't exist
+                const newBtn = `
+                    <div class="show-replies-btn mt-2" data-comment-id="${commentId}">
+                        <button class="btn btn-sm btn-link text-primary fw-bold p-0 toggle-replies d-flex align-items-center" data-comment-id="${commentId}" data-expanded="false" style="text-decoration: none;">
+                            <i class="fas fa-chevron-down me-2"></i>
+                            <span class="reply-count-text">1 reply</span>
+                        </button>
+                    </div>
+                `;
+
+                // Find the reply form and insert before it
+                const commentThread = document.querySelector(`[data-comment-id="${commentId}"]`);
+                const replyForm = commentThread.querySelector('.reply-form');
+                replyForm.insertAdjacentHTML('beforebegin', newBtn);
+                return;
+            }
+
+            const currentCount = parseInt(replyCountText.textContent.match(/\d+/)?.[0]) || 0;
+            const newCount = currentCount + increment;
+
+            replyCountText.textContent = `${newCount} ${newCount === 1 ? 'reply' : 'replies'}`;
+
+            if (newCount > 0) {
+                showRepliesBtn.style.display = 'block';
+            } else {
+                showRepliesBtn.style.display = 'none';
+            }
+        }
+    }
+
+    function createCommentHTML(comment) {
+        const avatarHtml = comment.avatar 
+            ? `<img src="/static/avatars/${comment.avatar}" alt="${comment.username}'s Avatar" class="rounded-circle shadow-sm border border-2 border-light" style="width: 40px; height: 40px; object-fit: cover;">`
+            : `<div class="bg-primary rounded-circle d-flex align-items-center justify-content-center shadow-sm border border-2 border-light" style="width: 40px; height: 40px;"><i class="fas fa-user text-white"></i></div>`;
+
+        return `
+            <div class="comment-thread mb-4" data-comment-id="${comment.id}">
+                <div class="d-flex comment-item">
+                    <div class="flex-shrink-0 me-3">
+                        ${avatarHtml}
+                    </div>
+                    <div class="flex-grow-1">
+                        <div class="d-flex align-items-center mb-1">
+                            <h6 class="mb-0 me-2">${comment.username}</h6>
+                            <small class="text-muted">${comment.date}</small>
+                        </div>
+                        <p class="mb-2">${comment.text}</p>
+
+                        <div class="comment-actions d-flex align-items-center gap-3">
+                            <button class="btn btn-sm btn-outline-secondary like-btn" data-comment-id="${comment.id}" data-liked="false" title="Like">
+                                <i class="far fa-thumbs-up me-1"></i>
+                                <span class="like-count">0</span>
+                            </button>
+                            <button class="btn btn-sm btn-outline-secondary dislike-btn" data-comment-id="${comment.id}" data-disliked="false" title="Dislike">
+                                <i class="far fa-thumbs-down"></i>
+                            </button>
+                            <button class="btn btn-sm btn-link text-muted reply-btn" data-comment-id="${comment.id}">
+                                <i class="fas fa-reply me-1"></i>Reply
+                            </button>
+                        </div>
+
+                        <div class="show-replies-btn mt-2" data-comment-id="${comment.id}" style="display: none;">
+                            <button class="btn btn-sm btn-link text-primary fw-bold p-0 toggle-replies d-flex align-items-center" data-comment-id="${comment.id}" data-expanded="false" style="text-decoration: none;">
+                                <i class="fas fa-chevron-down me-2"></i>
+                                <span class="reply-count-text">0 replies</span>
+                            </button>
+                        </div>
+
+                        <div class="reply-form mt-3" style="display: none;" data-comment-id="${comment.id}">
+                            <div class="d-flex">
+                                <div class="me-2">
+                                    <div class="bg-success rounded-circle d-flex align-items-center justify-content-center" 
+                                         style="width: 32px; height: 32px;">
+                                        <i class="fas fa-user text-white" style="font-size: 0.8rem;"></i>
+                                    </div>
+                                </div>
+                                <div class="flex-grow-1">
+                                    <textarea class="form-control border-0 border-bottom rounded-0 reply-input" 
+                                              rows="2" placeholder="Add a reply..."></textarea>
+                                    <div class="d-flex justify-content-end mt-2 gap-2">
+                                        <button class="btn btn-sm btn-outline-secondary cancel-reply">Cancel</button>
+                                        <button class="btn btn-sm btn-primary submit-reply" data-video-id="${document.getElementById('submit-comment').dataset.videoId}" data-parent-id="${comment.id}">Reply</button>
+                                    </div>
+                                </div>
+                            </div>
+                        </div>
+
+                        <div class="replies-container mt-3" data-comment-id="${comment.id}" style="display: none;"></div>
+                    </div>
+                </div>
+            </div>
+        `;
+    }
+
+    function createReplyHTML(comment) {
+        const avatarHtml = comment.avatar 
+            ? `<img src="/static/avatars/${comment.avatar}" alt="${comment.username}'s Avatar" class="rounded-circle shadow-sm border border-2 border-light" style="width: 32px; height: 32px; object-fit: cover;">`
+            : `<div class="bg-success rounded-circle d-flex align-items-center justify-content-center shadow-sm border border-2 border-light" style="width: 32px; height: 32px;"><i class="fas fa-user text-white" style="font-size: 0.8rem;"></i></div>`;
+
+        return `
+            <div class="d-flex comment-item mb-3 ms-4" data-reply-id="${comment.id}">
+                <div class="flex-shrink-0 me-3">
+                    ${avatarHtml}
+                </div>
+                <div class="flex-grow-1">
+                    <div class="d-flex align-items-center mb-1">
+                        <h6 class="mb-0 me-2" style="font-size: 0.9rem;">${comment.username}</h6>
+                        <small class="text-muted">${comment.date}</small>
+                    </div>
+                    <p class="mb-2" style="font-size: 0.9rem;">${comment.text}</p>
+
+                    <div class="comment-actions d-flex align-items-center gap-3">
+                        <button class="btn btn-sm btn-outline-secondary like-btn" data-comment-id="${comment.id}" data-liked="false" title="Like">
+                            <i class="far fa-thumbs-up me-1"></i>
+                            <span class="like-count">0</span>
+                        </button>
+                        <button class="btn btn-sm btn-outline-secondary dislike-btn" data-comment-id="${comment.id}" data-disliked="false" title="Dislike">
+                            <i class="far fa-thumbs-down"></i>
+                        </button>
+                    </div>
+                </div>
+            </div>
+        `;
+    }
+
+    // Function to update comment count
+    function updateCommentCount(increment) {
+        const commentBadge = document.querySelector('.badge.bg-light.text-dark');
+        if (commentBadge) {
+            const currentCount = parseInt(commentBadge.textContent) || 0;
+            const newCount = currentCount + increment;
+            commentBadge.textContent = newCount;
+        }
+    }
+
+    // Star Rating System
+    // Function to initialize the rating system
+    function initRatingSystem() {
+        const stars = document.querySelectorAll('.star-rating .star');
+        const ratingContainer = document.querySelector('.rating-container');
+        const ratingMessage = document.getElementById('rating-message');
+        const videoId = document.querySelector('.star-rating').dataset.videoId;
+
+        // Get user's current rating
+        fetch(`/get_user_rating/${videoId}`)
+            .then(response => response.json())
+            .then(data => {
+                if (data.success && data.rating) {
+                    updateStarDisplay(data.rating);
+                    ratingMessage.textContent = `Your rating: ${data.rating} stars`;
+                }
+            })
+            .catch(error => console.error('Error:', error));
+
+        // Star hover effects
+        stars.forEach(star => {
+            star.addEventListener('mouseover', function() {
+                const rating = this.dataset.rating;
+                updateStarDisplay(rating, true);
+            });
+
+            star.addEventListener('mouseout', function() {
+                const currentRating = document.querySelector('.star.active');
+                if (currentRating) {
+                    updateStarDisplay(currentRating.dataset.rating);
+                } else {
+                    resetStars();
+                }
+            });
+
+            // Star click handler
+            star.addEventListener('click', function() {
+                const rating = parseInt(this.dataset.rating);
+                submitRating(videoId, rating);
+            });
+        });
+    }
+
+    // Function to submit rating
+    function submitRating(videoId, rating) {
+        // Add loading state
+        const stars = document.querySelectorAll('.star-rating .star');
+        stars.forEach(star => star.style.pointerEvents = 'none');
+        const ratingMessage = document.getElementById('rating-message');
+        ratingMessage.textContent = 'Submitting rating...';
+
+        fetch('/submit_rating', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                video_id: videoId,
+                rating: rating
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                // Update the display
+                updateStarDisplay(rating);
+
+                // Show success message
+                const ratingMessage = document.getElementById('rating-message');
+                ratingMessage.textContent = data.message;
+
+                // Update average rating display if it exists
+                const avgStars = document.querySelector('.current-rating .average-stars');
+                if (avgStars && data.new_average) {
+                    updateAverageRatingDisplay(data.new_average);
+                }
+
+                // Animate the rating container
+                const container = document.querySelector('.rating-container');
+                container.classList.add('success');
+                setTimeout(() => container.classList.remove('success'), 1000);
+
+                // Show notification
+                showNotification(data.message, 'success');
+            } else {
+                showNotification(data.message, 'danger');
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            showNotification('Error submitting rating', 'danger');
+        });
+    }
+
+    // Function to update star display
+    function updateStarDisplay(rating, isHover = false) {
+        const stars = document.querySelectorAll('.star-rating .star');
+        stars.forEach(star => {
+            const starRating = parseInt(star.dataset.rating);
+            if (starRating <= rating) {
+                star.classList.add(isHover ? 'filled' : 'active');
+                star.classList.remove(isHover ? 'active' : 'filled');
+            } else {
+                star.classList.remove('active', 'filled');
+            }
+        });
+    }
+
+    // Function to update average rating display
+    function updateAverageRatingDisplay(avgRating) {
+        const avgStarsContainer = document.querySelector('.current-rating .average-stars');
+        if (avgStarsContainer) {
+            avgStarsContainer.innerHTML = '';
+            for (let i = 1; i <= 5; i++) {
+                const star = document.createElement('i');
+                if (i <= avgRating) {
+                    star.className = 'fas fa-star text-warning';
+                } else if (i - 0.5 <= avgRating) {
+                    star.className = 'fas fa-star-half-alt text-warning';
+                } else {
+                    star.className = 'far fa-star text-muted';
+                }
+                avgStarsContainer.appendChild(star);
+            }
+
+            // Update the text display
+            const ratingText = avgStarsContainer.nextElementSibling;
+            if (ratingText) {
+                const totalRatings = ratingText.querySelector('small')?.textContent.match(/\d+/)?.[0] || '0';
+                ratingText.innerHTML = `${avgRating.toFixed(1)} out of 5 <small>(${totalRatings} ratings)</small>`;
+            }
+        }
+    }
+
+    // Function to reset stars
+    function resetStars() {
+        const stars = document.querySelectorAll('.star-rating .star');
+        stars.forEach(star => star.classList.remove('active', 'filled'));
+        const ratingMessage = document.getElementById('rating-message');
+        if (ratingMessage) ratingMessage.textContent = 'Click a star to rate';
+    }
+
+    // Initialize when document is ready
+    document.addEventListener('DOMContentLoaded', function() {
+        // Initialize rating system
+        const stars = document.querySelectorAll('.star-rating .star');
+        const ratingContainer = document.querySelector('.rating-container');
+        const ratingMessage = document.getElementById('rating-message');
+        const videoId = document.querySelector('.star-rating')?.dataset.videoId;
+
+        if (videoId && stars.length > 0) {
+            // Get user's current rating
+            fetch(`/get_user_rating/${videoId}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.success && data.rating) {
+                        updateStarDisplay(data.rating);
+                        ratingMessage.textContent = `Your rating: ${data.rating} stars`;
+                    }
+                })
+                .catch(error => console.error('Error:', error));
+
+            // Star hover effects
+            stars.forEach(star => {
+                star.addEventListener('mouseover', function() {
+                    const rating = this.dataset.rating;
+                    updateStarDisplay(rating, true);
+                });
+
+                star.addEventListener('mouseout', function() {
+                    const currentRating = document.querySelector('.star.active');
+                    if (currentRating) {
+                        updateStarDisplay(currentRating.dataset.rating);
+                    } else {
+                        resetStars();
+                    }
+                });
+
+                // Star click handler
+                star.addEventListener('click', function() {
+                    const rating = parseInt(this.dataset.rating);
+                    if (rating) {
+                        submitRating(videoId, rating);
+                    }
+                });
+            });
+        }
+    });
+
+    // Function to show notification
+    function showNotification(message, type = 'info') {
+        // Create notification element
+        const notification = document.createElement('div');
+        notification.className = `alert alert-${type === 'success' ? 'success' : 'info'} alert-dismissible fade show position-fixed`;
+        notification.style.cssText = 'top: 20px; right: 20px; z-index: 9999; min-width: 300px;';
+        notification.innerHTML = `
+            ${message}
+            <button type="button" class="btn-close" data-bs-dismiss="alert"></button>
+        `;
+
+        document.body.appendChild(notification);
+
+        // Auto remove after 3 seconds
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.remove();
+            }
+        }, 3000);
+    }
+
+
+});
+
+// Description expand/collapse functionality (YouTube-style)
+function expandDescription() {
+    document.querySelector('.description-content').classList.add('d-none');
+    document.querySelector('.description-full').classList.remove('d-none');
+}
+
+function collapseDescription() {
+    document.querySelector('.description-content').classList.remove('d-none');
+    document.querySelector('.description-full').classList.add('d-none');
+}
+
+// Phone Voting Functionality for Video Detail Page
+function copyVideoPhoneNumber() {
+    const phoneNumber = "+2425537224";
+    const videoTitle = window.videoPage.title;
+
+    // Copy to clipboard
+    if (navigator.clipboard) {
+        navigator.clipboard.writeText(phoneNumber).then(() => {
+            showVideoPhoneNotification('Phone number copied! Call to vote for this video.');
+        });
+    } else {
+        // Fallback for older browsers
+        const textArea = document.createElement('textarea');
+        textArea.value = phoneNumber;
+        document.body.appendChild(textArea);
+        textArea.select();
+        document.execCommand('copy');
+        document.body.removeChild(textArea);
+        showVideoPhoneNotification('Phone number copied! Call to vote for this video.');
+    }
+
+    // Add visual feedback to the clicked element
+    const phoneDisplay = document.querySelector('.phone-number-display');
+    if (phoneDisplay) {
+        phoneDisplay.style.transform = 'scale(0.95)';
+        phoneDisplay.style.background = 'rgba(40, 167, 69, 0.15)';
+        phoneDisplay.style.borderColor = 'rgba(40, 167, 69, 0.6)';
+        setTimeout(() => {
+            phoneDisplay.style.transform = 'scale(1)';
+            phoneDisplay.style.background = 'rgba(255,255,255,0.15)';
+            phoneDisplay.style.borderColor = 'rgba(255,255,255,0.3)';
+        }, 300);
+    }
+}
+
+function shareVideoForVoting() {
+    const videoTitle = window.videoPage.title;
+    const videoUrl = window.location.href;
+    const phoneNumber = "+2425537224";
+
+    const shareText = `Vote for this video: "${videoTitle}" by calling ${phoneNumber} or visit: ${videoUrl}`;
+
+    if (navigator.share) {
+        navigator.share({
+            title: `Vote for: ${videoTitle}`,
+            text: shareText,
+            url: videoUrl
+        }).catch(console.error);
+    } else {
+        // Fallback: copy to clipboard
+        if (navigator.clipboard) {
+            navigator.clipboard.writeText(shareText).then(() => {
+                showVideoPhoneNotification('Share link copied to clipboard!');
+            });
+        }
+    }
+}
+
+// Auto-copy phone number when clicking to call (Video page specific)
+function copyVideoPhoneNumberAuto(event) {
+    const phoneNumber = "+2425537224";
+
+    // Copy to clipboard automatically
+    if (navigator.clipboard) {
+        navigator.clipboard.writeText(phoneNumber).then(() => {
+            showVideoPhoneNotification(t('video.phoneNumberCopied') || 'Phone number copied! Redirecting to call...');
+        }).catch(() => {
+            // Silent fail on copy, but still allow the call
+        });
+    } else {
+        // Fallback for older browsers
+        try {
+            const textArea = document.createElement('textarea');
+            textArea.value = phoneNumber;
+            textArea.style.position = 'fixed';
+            textArea.style.opacity = '0';
+            document.body.appendChild(textArea);
+            textArea.select();
+            document.execCommand('copy');
+            document.body.removeChild(textArea);
+            showVideoPhoneNotification(t('video.phoneNumberCopied') || 'Phone number copied! Redirecting to call...');
+        } catch (err) {
+            // Silent fail on copy, but still allow the call
+        }
+    }
+
+    // Add visual feedback
+    const phoneHero = event.currentTarget;
+    if (phoneHero) {
+        const card = phoneHero.querySelector('div');
+        if (card) {
+            card.style.transform = 'scale(0.95)';
+            card.style.boxShadow = '0 2px 10px rgba(102, 126, 234, 0.5)';
+            setTimeout(() => {
+                card.style.transform = 'scale(1)';
+                card.style.boxShadow = '0 4px 15px rgba(0,0,0,0.2)';
+            }, 200);
+        }
+    }
+
+    // Allow the link to proceed to tel:
+    return true;
+}
+
+function showVideoPhoneNotification(message) {
+    // Create notification element
+    const notification = document.createElement('div');
+    notification.innerHTML = `
+        <i class="fas fa-check-circle me-2"></i>
+        ${message}
+    `;
+    notification.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: linear-gradient(135deg, #667eea, #764ba2);
+        color: white;
+        padding: 12px 20px;
+        border-radius: 25px;
+        font-weight: 600;
+        z-index: 10000;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+        animation: slideInFromRight 0.5s ease-out;
+        font-size: 0.9rem;
+        max-width: 320px;
+        border: 2px solid rgba(255,215,0,0.3);
+    `;
+
+    document.body.appendChild(notification);
+
+    // Remove notification after 4 seconds
+    setTimeout(() => {
+        notification.style.animation = 'slideOutToRight 0.5s ease-out';
+        setTimeout(() => {
+            if (notification.parentNode) {
+                notification.parentNode.removeChild(notification);
+            }
+        }, 500);
+    }, 4000);
+}
+
+// Add CSS animations for phone voting on video pages
+const videoPhoneStyle = document.createElement('style');
+videoPhoneStyle.textContent = `
+    @keyframes slideInFromRight {
+        from {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+        to {
+            transform: translateX(0);
+            opacity: 1;
+        }
+    }
+
+    @keyframes slideOutToRight {
+        from {
+            transform: translateX(0);
+            opacity: 1;
+        }
+        to {
+            transform: translateX(100%);
+            opacity: 0;
+        }
+    }
+
+    @keyframes pulse {
+        0%, 100% {
+            transform: scale(1);
+        }
+        50% {
+            transform: scale(1.05);
+        }
+    }
+
+    @keyframes phoneGlow {
+        0%, 100% {
+            box-shadow: 0 0 5px rgba(255, 215, 0, 0.5);
+        }
+        50% {
+            box-shadow: 0 0 20px rgba(255, 215, 0, 0.8), 0 0 30px rgba(255, 215, 0, 0.6);
+        }
+    }
+
+    .phone-bg-animation {
+        animation: pulse 4s ease-in-out infinite;
+    }
+
+    .phone-voting-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 8px 25px rgba(0,0,0,0.15) !important;
+    }
+
+    .phone-voting-card:hover .phone-number-display {
+        animation: phoneGlow 2s ease-in-out infinite;
+    }
+
+    .phone-action-buttons .btn {
+        transition: all 0.3s ease;
+    }
+
+    .phone-action-buttons .btn:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 12px rgba(0,0,0,0.2);
+    }
+`;
+document.head.appendChild(videoPhoneStyle);
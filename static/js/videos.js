@@ -0,0 +1,4 @@
+// Infinite scroll for /videos: next keyset pages come from /api/videos (see load_more.js)
+document.addEventListener('DOMContentLoaded', function() {
+    initLoadMore(document.getElementById('video-grid'), document.getElementById('video-grid-more'), 'videos');
+});
@@ -0,0 +1,58 @@
+"""
+Tests for the static asset bundles (assets.py)
+Run with: python -m pytest test_assets.py
+"""
+import os
+from assets import AssetBundles, minify_css, minify_js
+
+
+def test_minify_css_keeps_strings_and_drops_comments():
+    source = '''
+    /* header */
+    .a > .b ,
+    .c {
+        content: "/* not a comment */";
+        color: red;
+    }
+    '''
+    assert minify_css(source) == '.a>.b,.c{content: "/* not a comment */";color: red}'
+
+
+def test_minify_js_never_joins_lines():
+    source = '''
+    // setup
+    let a = 1
+    const url = 'http://example.com/`';
+    '''
+    assert minify_js(source) == "let a = 1\nconst url = 'http://example.com/`';"
+
+
+def test_minify_js_leaves_template_literals_untouched():
+    source = '''
+    const html = `
+        <p>${name}</p>
+
+        // not a comment
+    `;
+    // dropped
+    const one = `${a}`;
+    '''
+    assert minify_js(source) == ('const html = `\n        <p>${name}</p>\n\n        // not a comment\n    `;\n'
+                                 'const one = `${a}`;')
+
+
+def test_bundles_are_content_hashed_and_rebuilt_on_change(tmp_path):
+    (tmp_path / 'css').mkdir()
+    source = tmp_path / 'css' / 'page.css'
+    source.write_text('body {  color: red; }')
+    bundles = AssetBundles(lambda path: f'/static/{path}', directory=str(tmp_path),
+                           bundles={'page.css': ['css/page.css']}, check_interval=0)
+
+    url = bundles.url('page.css')
+    assert url.startswith('/static/dist/page.') and url.endswith('.css')
+    assert (tmp_path / url[len('/static/'):]).read_text() == 'body{color: red}'
+    assert bundles.url('page.css') == url
+
+    source.write_text('body { color: blue; }')
+    os.utime(source, ns=(1, 1))
+    assert bundles.url('page.css') not in (url, None)
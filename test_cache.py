@@ -0,0 +1,226 @@
+"""
+Tests for the TTL and shared caches (cache.py)
+Run with: python -m pytest test_cache.py
+"""
+import socketserver
+import threading
+import time
+import pytest
+from cache import TTLCache, SharedCache, MemoryBackend, SQLiteBackend, RedisBackend, backend_from_url
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('cache.time.monotonic', lambda: now[0])
+    cache = TTLCache(ttl=10)
+    cache.set('user:1', 'alice')
+
+    now[0] = 109.0
+    assert cache.get('user:1') == 'alice'
+    now[0] = 111.0
+    assert cache.get('user:1') is None
+    assert len(cache) == 0
+
+
+def test_get_or_load_calls_loader_once_and_skips_none():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return 'row'
+
+    assert cache.get_or_load(1, load) == 'row'
+    assert cache.get_or_load(1, load) == 'row'
+    assert len(calls) == 1
+
+    assert cache.get_or_load(2, lambda: None) is None
+    assert cache.get(2, 'missing') == 'missing'
+
+
+def test_oldest_entries_are_evicted_and_delete_clear():
+    cache = TTLCache(ttl=60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert cache.get('a') is None and cache.get('c') == 3
+
+    cache.delete('b')
+    assert cache.get('b') is None
+    cache.clear()
+    assert len(cache) == 0
+
+
+class RESPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of a Redis server (MGET/SET PX NX/DEL/INCR) to test RedisBackend"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        self.data = {}  # key -> (expires_at, value)
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), RESPHandler)
+
+    def live(self, key):
+        entry = self.data.get(key)
+        return entry[1] if entry and entry[0] > time.time() else None
+
+
+class RESPHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def bulk(self, value):
+        return b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name, args = args[0].upper(), args[1:]
+            with server.lock:
+                if name == b'MGET':
+                    reply = b'*%d\r\n' % len(args) + b''.join(self.bulk(server.live(key)) for key in args)
+                elif name == b'SET':
+                    key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+                    ttl = int(options[options.index(b'PX') + 1]) / 1000
+                    if b'NX' in options and server.live(key) is not None:
+                        reply = b'$-1\r\n'
+                    else:
+                        server.data[key] = (time.time() + ttl, value)
+                        reply = b'+OK\r\n'
+                elif name == b'DEL':
+                    reply = b':%d\r\n' % sum(server.data.pop(key, None) is not None for key in args)
+                elif name == b'INCR':
+                    value = int(server.live(args[0]) or 0) + 1
+                    server.data[args[0]] = (float('inf'), b'%d' % value)
+                    reply = b':%d\r\n' % value
+                else:
+                    reply = b'-ERR unknown command\r\n'
+            self.wfile.write(reply)
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryBackend()
+    elif request.param == 'sqlite':
+        yield SQLiteBackend(str(tmp_path / 'cache.db'))
+    else:
+        server = RESPStandIn()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        yield RedisBackend(*server.server_address)
+        server.shutdown()
+        server.server_close()
+
+
+def test_backends_bulk_get_set_add_and_incr(backend):
+    backend.set_many({'a:1': b'one', 'a:2': b'two', 'b:1': b'three'}, ttl=60)
+    assert backend.get_many(['a:1', 'a:2', 'missing']) == {'a:1': b'one', 'a:2': b'two'}
+
+    assert backend.add('lock:x', b'1', ttl=60) is True
+    assert backend.add('lock:x', b'1', ttl=60) is False
+    backend.delete_many(['lock:x'])
+    assert backend.add('lock:x', b'1', ttl=60) is True
+
+    assert backend.incr('generation:a') == 1
+    assert backend.incr('generation:a') == 2
+    assert backend.get_many(['generation:a']) == {'generation:a': b'2'}
+
+    backend.set_many({'short': b'gone'}, ttl=0.01)
+    time.sleep(0.05)
+    assert backend.get_many(['short']) == {}
+
+
+def test_shared_cache_versions_keys_and_round_trips_values(backend):
+    v1 = SharedCache(backend, 'listings', ttl=60, version='1')
+    v2 = SharedCache(backend, 'listings', ttl=60, version='2')
+    v1.set_many({('videos', 'recent'): [1, 2], ('index',): (5, 'x')})
+
+    assert v1.get_many([('videos', 'recent'), ('index',), 'other']) == {
+        ('videos', 'recent'): [1, 2], ('index',): (5, 'x')}
+    assert v2.get(('index',)) is None
+
+    v1.clear()
+    assert v1.get(('index',)) is None
+    v1.set('index', 'rebuilt')
+    assert v1.get('index') == 'rebuilt'
+
+
+def test_rebuild_running_during_clear_does_not_resurrect_old_value(backend):
+    cache = SharedCache(backend, 'listings', ttl=60)
+
+    def load_then_invalidated():
+        # A write lands (and clears the cache) while this worker is still loading
+        cache.clear()
+        return 'stale'
+
+    assert cache.get_or_load('page:1', load_then_invalidated) == 'stale'
+    assert cache.get('page:1') is None
+    assert cache.get_or_load('page:1', lambda: 'fresh') == 'fresh'
+
+
+def test_single_flight_reload_serves_stale_value_to_other_workers(backend, monkeypatch):
+    cache = SharedCache(backend, 'leaderboard', ttl=60, stale_ttl=60)
+    cache.set('page:1', 'old')
+    calls = []
+    started, release = threading.Event(), threading.Event()
+
+    def slow_load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'new'
+
+    # Make the stored entry stale without waiting for the TTL
+    real_time = time.time
+    monkeypatch.setattr('cache.time.time', lambda: real_time() + 90)
+
+    results = []
+    rebuilder = threading.Thread(target=lambda: results.append(cache.get_or_load('page:1', slow_load)))
+    rebuilder.start()
+    assert started.wait(5)
+    assert cache.get_or_load('page:1', slow_load) == 'old'
+    release.set()
+    rebuilder.join(5)
+
+    assert results == ['new'] and len(calls) == 1
+    assert cache.get('page:1') == 'new'
+
+
+def test_missing_entry_is_loaded_once_by_concurrent_callers(backend):
+    cache = SharedCache(backend, 'index', ttl=60)
+    calls = []
+
+    def load():
+        calls.append(1)
+        time.sleep(0.2)
+        return 'rows'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('index', load)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert results == ['rows'] * 4 and len(calls) == 1
+
+
+def test_backend_from_url():
+    assert isinstance(backend_from_url('memory://'), MemoryBackend)
+    assert backend_from_url('sqlite:///cache.db').path == 'cache.db'
+    assert backend_from_url('sqlite:////tmp/cache.db').path == '/tmp/cache.db'
+    redis = backend_from_url('redis://:secret@cache.internal:6380/2')
+    assert (redis.address, redis.db, redis.password) == (('cache.internal', 6380), 2, 'secret')
+    with pytest.raises(ValueError):
+        backend_from_url('memcached://localhost')
@@ -0,0 +1,82 @@
+"""
+Tests for response compression (compression.py)
+Run with: python -m pytest test_compression.py
+"""
+import gzip
+import os
+from flask import Flask, jsonify, request
+from compression import (build_static_variants, compress_response, compress_variants, pick_variant,
+                         precompressed_variant)
+
+
+def _app():
+    app = Flask(__name__)
+
+    @app.route('/page')
+    def page():
+        return '<p>hello</p>' * 500
+
+    @app.route('/small')
+    def small():
+        return jsonify(ok=True)
+
+    @app.after_request
+    def after_request(response):
+        return compress_response(response, request, min_size=1024)
+
+    return app
+
+
+def test_large_html_is_gzipped_only_when_accepted():
+    client = _app().test_client()
+    plain = client.get('/page')
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.headers['Vary'] == 'Accept-Encoding'
+
+    packed = client.get('/page', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert packed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.data) == plain.data
+    assert int(packed.headers['Content-Length']) < len(plain.data)
+    # Deterministic output keeps ETags stable between requests
+    assert client.get('/page', headers={'Accept-Encoding': 'gzip'}).data == packed.data
+
+
+def test_small_bodies_are_left_alone():
+    response = _app().test_client().get('/small', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_cached_variants_are_picked_per_client():
+    html = b'<p>hello</p>' * 500
+    variants = compress_variants(html, min_size=1024)
+    assert gzip.decompress(variants['gzip']) == html
+    assert compress_variants(b'<p>hi</p>', min_size=1024) == {}
+
+    app = _app()
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        assert pick_variant(variants, request) == ('gzip', variants['gzip'])
+    with app.test_request_context():
+        assert pick_variant(variants, request) is None
+
+
+def test_static_variants_are_built_and_found(tmp_path):
+    (tmp_path / 'app.css').write_text('body { color: red; }\n' * 200)
+    (tmp_path / 'tiny.js').write_text('x()')
+    (tmp_path / 'photo.png').write_bytes(b'\x89PNG' * 500)
+    assert build_static_variants(str(tmp_path)) >= 1
+    assert os.path.exists(tmp_path / 'app.css.gz')
+    assert not os.path.exists(tmp_path / 'tiny.js.gz') and not os.path.exists(tmp_path / 'photo.png.gz')
+
+    app = _app()
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        assert precompressed_variant(request, str(tmp_path), 'app.css') == ('app.css.gz', 'gzip')
+        assert precompressed_variant(request, str(tmp_path), '../app.css') is None
+        # A source edited after the build is served uncompressed until the next build
+        os.utime(tmp_path / 'app.css.gz', ns=(1, 1))
+        assert precompressed_variant(request, str(tmp_path), 'app.css') is None
+    with app.test_request_context():
+        assert precompressed_variant(request, str(tmp_path), 'app.css') is None
+
+    assert build_static_variants(str(tmp_path), clean=True) >= 1
+    assert not os.path.exists(tmp_path / 'app.css.gz')
@@ -0,0 +1,175 @@
+"""
+Tests for the trigger-maintained counters (migration 5) and counters.py
+Run with: python -m pytest test_counters.py
+"""
+import sqlite3
+
+import pytest
+
+import counters
+import migrations
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(':memory:')
+    migrations.migrate(connection)
+    connection.executemany('INSERT INTO users (id, username, email, password_hash) VALUES (?, ?, ?, ?)',
+                           [(1, 'alice', 'alice@example.com', 'x'), (2, 'bob', 'bob@example.com', 'x')])
+    connection.executemany('INSERT INTO videos (id, user_id, title, filename) VALUES (?, ?, ?, ?)',
+                           [(1, 1, 'First', 'a.mp4'), (2, 1, 'Second', 'b.mp4')])
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def _counters(conn, comment_id):
+    return conn.execute('SELECT reply_count, like_count, dislike_count FROM comments WHERE id = ?',
+                        (comment_id,)).fetchone()
+
+
+def test_triggers_track_inserts_and_deletes(conn):
+    conn.execute("INSERT INTO comments (id, user_id, video_id, comment) VALUES (1, 2, 1, 'Nice')")
+    conn.execute("INSERT INTO comments (id, user_id, video_id, comment, parent_id) VALUES (2, 1, 1, 'Thanks', 1)")
+    conn.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)')
+    conn.execute('INSERT OR IGNORE INTO comment_likes (comment_id, user_id) VALUES (1, 1)')  # duplicate
+    conn.execute('INSERT INTO comment_dislikes (comment_id, user_id) VALUES (1, 2)')
+
+    assert _counters(conn, 1) == (1, 1, 1)
+    assert conn.execute('SELECT comment_count FROM videos WHERE id = 1').fetchone()[0] == 2
+    assert conn.execute('SELECT video_count FROM users WHERE id = 1').fetchone()[0] == 2
+
+    conn.execute('DELETE FROM comments WHERE id = 2')
+    conn.execute('DELETE FROM comment_likes WHERE comment_id = 1')
+    conn.execute('DELETE FROM videos WHERE id = 2')
+
+    assert _counters(conn, 1) == (0, 0, 1)
+    assert conn.execute('SELECT comment_count FROM videos WHERE id = 1').fetchone()[0] == 1
+    assert conn.execute('SELECT video_count FROM users WHERE id = 1').fetchone()[0] == 1
+
+
+def test_reconcile_rebuilds_drifted_counters(conn):
+    conn.execute("INSERT INTO comments (id, user_id, video_id, comment) VALUES (1, 2, 1, 'Nice')")
+    conn.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)')
+    conn.execute('UPDATE comments SET like_count = 40, reply_count = 5')
+    conn.execute('UPDATE users SET video_count = 0')
+    conn.commit()
+
+    drift = counters.find_drift(conn)
+    assert drift['comments.like_count'] == 1
+    assert drift['comments.reply_count'] == 1
+    assert drift['users.video_count'] == 1  # bob has no videos, so his 0 is right
+    assert drift['videos.comment_count'] == 0
+
+    fixed = counters.reconcile(conn)
+    assert fixed['comments.like_count'] == 1
+    assert _counters(conn, 1) == (0, 1, 0)
+    assert conn.execute('SELECT video_count FROM users WHERE id = 1').fetchone()[0] == 2
+    assert not any(counters.find_drift(conn).values())
+
+
+def test_migration_backfills_existing_rows():
+    connection = sqlite3.connect(':memory:')
+    for version, description, steps in migrations.MIGRATIONS[:4]:
+        for step in steps:
+            step(connection) if callable(step) else connection.execute(step)
+    connection.execute(migrations.SCHEMA_VERSION_TABLE)
+    connection.execute("INSERT INTO schema_version (version, description) VALUES (4, 'test')")
+    connection.execute("INSERT INTO users (id, username, email, password_hash) VALUES (1, 'a', 'a@x', 'x')")
+    connection.execute("INSERT INTO videos (id, user_id, title, filename) VALUES (1, 1, 'v', 'v.mp4')")
+    connection.execute("INSERT INTO comments (id, user_id, video_id, comment) VALUES (1, 1, 1, 'c')")
+    connection.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)')
+    connection.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (1, 1, 4)')
+    connection.commit()
+
+    migrations.migrate(connection)
+
+    assert _counters(connection, 1) == (0, 1, 0)
+    assert connection.execute('SELECT comment_count FROM videos').fetchone()[0] == 1
+    assert connection.execute('SELECT video_count FROM users').fetchone()[0] == 1
+    assert _ratings(connection, 1) == (4, 1, 4.0)
+    assert _standings(connection) == [(1, 1, 0, 0)]  # the video is not approved yet
+    connection.close()
+
+
+def _ratings(conn, video_id):
+    return conn.execute('SELECT rating_sum, rating_count, average_rating FROM videos WHERE id = ?',
+                        (video_id,)).fetchone()
+
+
+def test_rating_aggregates_follow_votes(conn):
+    conn.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (1, 1, 5)')
+    conn.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (2, 1, 2)')
+    assert _ratings(conn, 1) == (7, 2, 3.5)
+
+    conn.execute('UPDATE votes SET rating = 4 WHERE user_id = 2 AND video_id = 1')
+    assert _ratings(conn, 1) == (9, 2, 4.5)
+
+    conn.execute('DELETE FROM votes WHERE user_id = 1')
+    assert _ratings(conn, 1) == (4, 1, 4.0)
+    conn.execute('DELETE FROM votes')
+    assert _ratings(conn, 1) == (0, 0, 0.0)
+
+
+def test_reconcile_rebuilds_rating_aggregates(conn):
+    conn.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (1, 1, 3)')
+    conn.execute('UPDATE videos SET rating_sum = 99, average_rating = 1.0 WHERE id = 1')
+    conn.commit()
+
+    drift = counters.find_drift(conn)
+    assert drift['videos.rating_sum'] == 1
+    assert drift['videos.rating_count'] == 0
+
+    counters.reconcile(conn)
+    assert _ratings(conn, 1) == (3, 1, 3.0)
+    assert not any(counters.find_drift(conn).values())
+
+
+def test_likes_and_dislikes_exclude_each_other(conn):
+    conn.execute("INSERT INTO comments (id, user_id, video_id, comment) VALUES (1, 2, 1, 'Nice')")
+    conn.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)')
+    conn.execute('INSERT INTO comment_dislikes (comment_id, user_id) VALUES (1, 1)')
+    assert _counters(conn, 1) == (0, 0, 1)
+
+    conn.execute('''INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)
+                    ON CONFLICT (comment_id, user_id) DO NOTHING''')
+    assert _counters(conn, 1) == (0, 1, 0)
+    assert conn.execute('SELECT COUNT(*) FROM comment_dislikes').fetchone()[0] == 0
+
+
+def _standings(conn):
+    return conn.execute('SELECT rank, user_id, video_count, total_votes FROM leaderboard ORDER BY rank').fetchall()
+
+
+def test_leaderboard_follows_approvals_votes_and_deletes(conn):
+    assert _standings(conn) == [(1, 1, 0, 0), (2, 2, 0, 0)]
+
+    conn.execute("INSERT INTO videos (id, user_id, title, filename, is_approved, total_votes) "
+                 "VALUES (3, 2, 'Third', 'c.mp4', 1, 4)")
+    assert _standings(conn) == [(1, 2, 1, 4), (2, 1, 0, 0)]
+
+    conn.execute('UPDATE videos SET is_approved = 1, total_votes = 6 WHERE id = 1')
+    assert _standings(conn) == [(1, 1, 1, 6), (2, 2, 1, 4)]
+
+    conn.execute('UPDATE videos SET is_blocked = 1 WHERE id = 1')
+    assert _standings(conn) == [(1, 2, 1, 4), (2, 1, 0, 0)]
+
+    conn.execute("INSERT INTO users (id, username, email, password_hash) VALUES (3, 'carol', 'c@x', 'x')")
+    conn.execute('DELETE FROM videos WHERE id = 3')
+    conn.execute('DELETE FROM users WHERE id = 1')
+    assert _standings(conn) == [(1, 2, 0, 0), (2, 3, 0, 0)]
+
+
+def test_reconcile_rebuilds_leaderboard(conn):
+    conn.execute('UPDATE videos SET is_approved = 1, total_votes = 3 WHERE id = 1')
+    conn.execute('UPDATE leaderboard SET rank = 7 WHERE user_id = 2')
+    conn.execute('UPDATE leaderboard SET total_votes = 0, video_count = 0 WHERE user_id = 1')
+    conn.commit()
+
+    drift = counters.find_drift(conn)
+    assert drift['leaderboard.total_votes'] == 1
+    assert drift['leaderboard.rank'] == 2
+
+    counters.reconcile(conn)
+    assert _standings(conn) == [(1, 1, 1, 3), (2, 2, 0, 0)]
+    assert not any(counters.find_drift(conn).values())
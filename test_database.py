@@ -0,0 +1,159 @@
+"""
+Tests for the pooled request connection layer (database.py)
+Run with: python -m pytest test_database.py
+"""
+import math
+import sqlite3
+import threading
+import time
+
+import pytest
+from flask import Flask
+
+import database
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(tmp_path / 'test.db'))
+    flask_app = Flask(__name__)
+    database.init_app(flask_app)
+    yield flask_app
+    database.close_pool()
+
+
+def test_connection_is_tuned(app):
+    with app.app_context():
+        conn = database.get_db()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == database.Config.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.execute('PRAGMA cache_size').fetchone()[0] == -database.Config.SQLITE_CACHE_SIZE_KB
+
+
+class NoMathConnection(sqlite3.Connection):
+    """SQLite built without SQLITE_ENABLE_MATH_FUNCTIONS, as far as the probe can tell"""
+
+    def execute(self, sql, *args):
+        if sql == 'SELECT ln(1)' and not getattr(self, 'registered', False):
+            raise sqlite3.OperationalError('no such function: ln')
+        return super().execute(sql, *args)
+
+    def create_function(self, name, *args, **kwargs):
+        self.registered = True
+        return super().create_function(name, *args, **kwargs)
+
+
+def test_ln_is_registered_when_sqlite_lacks_math_functions():
+    conn = database.ensure_math_functions(sqlite3.connect(':memory:', factory=NoMathConnection))
+    assert conn.registered
+    assert conn.execute('SELECT ln(1 + 4)').fetchone()[0] == pytest.approx(math.log(5))
+
+
+def test_one_connection_per_request_and_thread(app):
+    with app.app_context():
+        first = database.get_db()
+        assert database.get_db() is first
+
+    # The next request on the same thread reuses the pooled connection
+    with app.app_context():
+        assert database.get_db() is first
+
+
+def test_teardown_rolls_back_open_transaction(app):
+    with app.app_context():
+        conn = database.get_db()
+        conn.execute('CREATE TABLE items (name TEXT)')
+        conn.commit()
+        conn.execute("INSERT INTO items VALUES ('left open')")
+        assert conn.in_transaction
+
+    with app.app_context():
+        conn = database.get_db()
+        assert not conn.in_transaction
+        assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+
+
+def _create_items(app):
+    with app.test_request_context(method='POST'):
+        with database.write_transaction() as conn:
+            conn.execute('CREATE TABLE items (name TEXT)')
+
+
+def test_get_requests_read_through_read_only_connection(app):
+    _create_items(app)
+
+    with app.test_request_context(method='GET'):
+        conn = database.get_db()
+        assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO items VALUES ('nope')")
+
+    with app.test_request_context(method='POST'):
+        database.get_db().execute("INSERT INTO items VALUES ('ok')")
+
+
+def test_write_transaction_commits_and_rolls_back(app):
+    _create_items(app)
+
+    with database.write_transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('kept')")
+        # A nested block joins the outer transaction
+        with database.write_transaction() as inner:
+            assert inner is conn
+            inner.execute("INSERT INTO items VALUES ('nested')")
+
+    with pytest.raises(RuntimeError):
+        with database.write_transaction() as conn:
+            conn.execute("INSERT INTO items VALUES ('discarded')")
+            raise RuntimeError('boom')
+
+    with app.test_request_context(method='GET'):
+        names = [row[0] for row in database.get_db().execute('SELECT name FROM items ORDER BY name')]
+    assert names == ['kept', 'nested']
+
+
+def test_write_transaction_retries_while_locked(app, monkeypatch):
+    _create_items(app)
+    monkeypatch.setattr(database.Config, 'SQLITE_WRITE_RETRIES', 2)
+    monkeypatch.setattr(database.Config, 'SQLITE_WRITE_RETRY_DELAY_MS', 1)
+
+    # Another process holds the write lock for longer than every retry
+    other = sqlite3.connect(database.DATABASE_PATH, timeout=0)
+    other.execute('BEGIN IMMEDIATE')
+    with pytest.raises(sqlite3.OperationalError):
+        with database.write_transaction():
+            pass
+
+    # Once it commits the next attempt goes through
+    other.commit()
+    other.close()
+    with database.write_transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('after')")
+
+
+def test_backoff_does_not_hold_up_other_writer_threads(app, monkeypatch):
+    _create_items(app)
+    monkeypatch.setattr(database.Config, 'SQLITE_WRITE_RETRIES', 4)
+    monkeypatch.setattr(database.Config, 'SQLITE_WRITE_RETRY_DELAY_MS', 50)
+    other = sqlite3.connect(database.DATABASE_PATH, timeout=0)
+    other.execute('BEGIN IMMEDIATE')
+
+    def contended_write():
+        try:
+            with database.write_transaction():
+                pass
+        except sqlite3.OperationalError:
+            pass
+
+    writer = threading.Thread(target=contended_write)
+    writer.start()
+    time.sleep(0.02)
+    free_while_backing_off = database._writer_lock.acquire(timeout=0.2)
+    if free_while_backing_off:
+        database._writer_lock.release()
+    other.rollback()
+    other.close()
+    writer.join()
+    assert free_while_backing_off
+    assert database._writer_connection(database.DATABASE_PATH).execute('PRAGMA busy_timeout').fetchone()[0] == 0
@@ -0,0 +1,62 @@
+"""
+Tests for the HTTP caching policies (http_cache.py)
+Run with: python -m pytest test_http_cache.py
+"""
+import os
+from flask import Flask, request
+from http_cache import StaticFingerprints, apply_policy, cache_policy
+
+
+def _app():
+    app = Flask(__name__)
+
+    @app.route('/public')
+    @cache_policy('revalidate')
+    def public():
+        return 'listing'
+
+    @app.route('/private')
+    def private():
+        return 'account'
+
+    @app.after_request
+    def after_request(response):
+        view = app.view_functions.get(request.endpoint)
+        return apply_policy(response, request, getattr(view, 'cache_policy', 'no-store'))
+
+    return app
+
+
+def test_revalidated_page_answers_304_for_matching_etag():
+    client = _app().test_client()
+    first = client.get('/public')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'public, no-cache'
+    assert 'Accept-Language' in first.headers['Vary']
+    etag = first.headers['ETag']
+
+    again = client.get('/public', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_routes_without_a_policy_are_no_store():
+    response = _app().test_client().get('/private')
+    assert 'no-store' in response.headers['Cache-Control']
+    assert 'ETag' not in response.headers
+
+
+def test_fingerprint_follows_file_content(tmp_path):
+    asset = tmp_path / 'app.css'
+    asset.write_text('body { color: red; }')
+    (tmp_path / 'big.mp4').write_bytes(b'0' * 64)
+    fingerprints = StaticFingerprints(str(tmp_path), max_bytes=32, check_interval=0)
+
+    first = fingerprints.get('app.css')
+    assert first and fingerprints.get('app.css') == first
+    assert fingerprints.get('big.mp4') is None
+    assert fingerprints.get('missing.js') is None
+
+    asset.write_text('body { color: blue; }')
+    os.utime(asset, ns=(1, 1))
+    assert fingerprints.get('app.css') not in (None, first)
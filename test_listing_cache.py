@@ -0,0 +1,64 @@
+"""
+Tests for the cached public listings in app.py (invalidate_listings, render_listing_page)
+Run with: python -m pytest test_listing_cache.py
+"""
+import pytest
+
+import database
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE_PATH', str(tmp_path / 'tournament.db'))
+    import app as app_module
+    app_module.init_db()
+    conn = database.connect()
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('voter', 'voter@example.com', 'x')")
+    conn.execute('''INSERT INTO videos (user_id, title, filename, is_approved, is_blocked)
+                    VALUES (1, 'Dance battle', 'a.mp4', TRUE, FALSE)''')
+    conn.execute('''INSERT INTO voting_fees (user_id, video_id, transaction_id, provider, phone_number,
+                                             amount, currency, status)
+                    VALUES (2, 1, 'tx-1', 'mtn', '0700000000', 2, 'USD', 'successful')''')
+    conn.commit()
+    conn.close()
+    for cache in (app_module.listing_cache, app_module.anonymous_page_cache, app_module.search_cache):
+        cache.clear()
+    yield app_module
+    database.close_pool()
+
+
+def _homepage_renders(app_module, monkeypatch):
+    renders = []
+    real_render = app_module.render_template
+
+    def render_template(name, **context):
+        if name == 'index.html':
+            renders.append(name)
+        return real_render(name, **context)
+
+    monkeypatch.setattr(app_module, 'render_template', render_template)
+    return renders
+
+
+def test_votes_do_not_evict_the_anonymous_homepage(app_module, monkeypatch):
+    renders = _homepage_renders(app_module, monkeypatch)
+    visitor = app_module.app.test_client()
+    assert visitor.get('/').status_code == 200
+    assert len(renders) == 1
+
+    voter = app_module.app.test_client()
+    with voter.session_transaction() as session:
+        session['user_id'] = 2
+        session['username'] = 'voter'
+    assert voter.post('/vote', data={'video_id': 1}).get_json()['success'] is True
+    assert voter.post('/submit_rating', json={'video_id': 1, 'rating': 4}).get_json()['success'] is True
+
+    # Vote counts ride the cache TTL: the next anonymous visitor still gets the cached page
+    assert visitor.get('/').status_code == 200
+    assert len(renders) == 1
+
+    # Moderation changes what is listed, so it still clears the page at once
+    with app_module.app.test_request_context():
+        app_module.invalidate_listings()
+    assert visitor.get('/').status_code == 200
+    assert len(renders) == 2
@@ -0,0 +1,67 @@
+"""
+Tests for the media URL resolver (media.py)
+Run with: python -m pytest test_media.py
+"""
+from media import MediaURLResolver
+
+
+class FakeS3:
+    def __init__(self):
+        self.signed = []
+
+    def get_file_url(self, key):
+        return f'https://bucket.s3.us-east-1.amazonaws.com/{key}'
+
+    def get_presigned_url(self, key, expires_in):
+        self.signed.append((key, expires_in))
+        return f'https://bucket.s3.us-east-1.amazonaws.com/{key}?sig={len(self.signed)}'
+
+
+def _static(calls):
+    return lambda path: calls.append(path) or f'/static/{path}'
+
+
+def test_urls_are_resolved_once_per_filename():
+    calls = []
+    resolver = MediaURLResolver(_static(calls))
+    assert resolver.video_url('clip.mp4') == '/static/uploads/clip.mp4'
+    assert resolver.video_url('clip.mp4') == '/static/uploads/clip.mp4'
+    assert resolver.image_url('me.png') == '/static/avatars/me.png'
+    assert calls == ['uploads/clip.mp4', 'avatars/me.png']
+    assert resolver.image_url(None) is None
+
+
+def test_cdn_hosts_and_cloudinary():
+    s3 = FakeS3()
+    resolver = MediaURLResolver(_static([]), cloud_storage=lambda: True, cloudinary_cloud_name='demo',
+                                s3=s3, static_cdn_url='https://static.example.com/',
+                                s3_cdn_url='https://media.example.com/')
+    assert resolver.video_url('abc') == 'https://res.cloudinary.com/demo/video/upload/abc'
+    assert resolver.image_url('me.png') == 'https://static.example.com/static/avatars/me.png'
+    assert resolver.image_url('avatars/7/me.png') == 'https://media.example.com/avatars/7/me.png'
+    assert resolver.image_url('https://elsewhere/me.png') == 'https://elsewhere/me.png'
+
+
+def test_each_cdn_host_is_optional():
+    s3_only = MediaURLResolver(_static([]), s3=FakeS3(), s3_cdn_url='https://media.example.com')
+    assert s3_only.image_url('me.png') == '/static/avatars/me.png'
+    assert s3_only.image_url('avatars/7/me.png') == 'https://media.example.com/avatars/7/me.png'
+
+    static_only = MediaURLResolver(_static([]), s3=FakeS3(), static_cdn_url='https://static.example.com')
+    assert static_only.image_url('me.png') == 'https://static.example.com/static/avatars/me.png'
+    assert static_only.image_url('avatars/7/me.png') == 'https://bucket.s3.us-east-1.amazonaws.com/avatars/7/me.png'
+
+
+def test_presigned_urls_are_replaced_before_they_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr('cache.time.monotonic', lambda: now[0])
+    s3 = FakeS3()
+    resolver = MediaURLResolver(_static([]), s3=s3, s3_cdn_url='https://media.example.com',
+                                presign_seconds=600, presign_margin=60)
+
+    first = resolver.image_url('avatars/7/me.png')
+    assert first.endswith('?sig=1') and s3.signed == [('avatars/7/me.png', 600)]
+    now[0] += 539
+    assert resolver.image_url('avatars/7/me.png') == first
+    now[0] += 2
+    assert resolver.image_url('avatars/7/me.png').endswith('?sig=2')
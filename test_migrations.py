@@ -0,0 +1,69 @@
+"""
+Tests for the schema migration runner (migrations.py)
+Run with: python -m pytest test_migrations.py
+"""
+import sqlite3
+
+import pytest
+
+import migrations
+
+
+def columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def test_fresh_database_reaches_latest_version():
+    conn = sqlite3.connect(':memory:')
+    version = migrations.migrate(conn)
+
+    assert version == migrations.MIGRATIONS[-1][0]
+    assert migrations.get_schema_version(conn) == version
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {'users', 'videos', 'comment_dislikes', 'tournament_settings', 'tournament_history'} <= tables
+    assert conn.execute('SELECT is_open FROM tournament_settings WHERE id = 1').fetchone()[0] == 1
+
+
+def test_migrations_apply_exactly_once():
+    conn = sqlite3.connect(':memory:')
+    migrations.migrate(conn)
+    migrations.migrate(conn)
+
+    applied = conn.execute('SELECT version FROM schema_version ORDER BY version').fetchall()
+    assert [row[0] for row in applied] == [m[0] for m in migrations.MIGRATIONS]
+
+
+def test_legacy_database_gets_missing_columns():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        is_paid BOOLEAN DEFAULT FALSE
+    )''')
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('old', 'old@example.com', 'x')")
+    conn.commit()
+
+    migrations.migrate(conn)
+
+    assert {'joined_date', 'is_admin', 'is_blocked', 'can_vote', 'is_deactivated'} <= columns(conn, 'users')
+    assert conn.execute("SELECT username FROM users").fetchone()[0] == 'old'
+
+
+def test_failed_migration_rolls_back(monkeypatch):
+    conn = sqlite3.connect(':memory:')
+    migrations.migrate(conn)
+    current = migrations.get_schema_version(conn)
+
+    broken = (current + 1, 'Broken migration', [
+        'CREATE TABLE half_done (id INTEGER)',
+        'THIS IS NOT SQL'
+    ])
+    monkeypatch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS + [broken])
+
+    with pytest.raises(sqlite3.OperationalError):
+        migrations.migrate(conn)
+
+    assert migrations.get_schema_version(conn) == current
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE name = 'half_done'").fetchone()[0] == 0
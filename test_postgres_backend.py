@@ -0,0 +1,204 @@
+"""
+Tests for the DATABASE_URL backend selection and the PostgreSQL dialect layer
+Run with: python -m pytest test_postgres_backend.py
+
+The backend tests run against SQLite always, and against PostgreSQL when
+TEST_POSTGRES_URL points at a disposable database (its public schema is
+dropped and recreated for every test), e.g.
+    TEST_POSTGRES_URL=postgresql://postgres@localhost/videovote_test
+"""
+import os
+import sqlite3
+
+import pytest
+
+import counters
+import database
+import migrations
+import postgres_backend
+from postgres_backend import translate
+from repository import VideoRepository, UserRepository, VoteRepository
+
+TEST_POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+
+def test_parse_database_url():
+    assert database.parse_database_url('sqlite:///tournament.db') == ('sqlite', 'tournament.db')
+    assert database.parse_database_url('sqlite:////var/data/t.db') == ('sqlite', '/var/data/t.db')
+    assert database.parse_database_url('postgres://u:p@host/db') == ('postgresql', 'postgres://u:p@host/db')
+    assert database.parse_database_url('postgresql://host/db')[0] == 'postgresql'
+    with pytest.raises(ValueError):
+        database.parse_database_url('mysql://host/db')
+
+
+def test_translate_placeholders_and_literals():
+    sql, returns_id = translate("SELECT * FROM users WHERE username LIKE ? AND bio = '50% off?'")
+    assert sql == "SELECT * FROM users WHERE username ILIKE %s AND bio = '50%% off?'"
+    assert not returns_id
+
+    # Without parameters psycopg2 does no %-interpolation, so nothing is escaped
+    assert translate("SELECT '100%' FROM users", False)[0] == "SELECT '100%' FROM users"
+
+
+def test_translate_dialect_differences():
+    assert translate("SELECT COUNT(*) FROM votes WHERE DATE(vote_date) = DATE('now')", False)[0] == \
+        'SELECT COUNT(*) FROM votes WHERE DATE(vote_date) = CURRENT_DATE'
+    assert translate('SELECT id FROM videos v WHERE v.is_approved = 1 AND is_blocked = 0', False)[0] == \
+        'SELECT id FROM videos v WHERE v.is_approved = TRUE AND is_blocked = FALSE'
+    # Only known boolean columns are rewritten
+    assert translate('SELECT id FROM tournament_settings WHERE id = 1', False)[0] == \
+        'SELECT id FROM tournament_settings WHERE id = 1'
+
+    ddl = translate('''CREATE TABLE IF NOT EXISTS admin_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        admin_id INTEGER,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (admin_id) REFERENCES users (id)
+    )''', False)[0]
+    assert 'id SERIAL PRIMARY KEY' in ddl
+    assert 'timestamp TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP' in ddl
+    assert 'FOREIGN KEY' not in ddl
+
+
+def test_translate_inserts():
+    sql, returns_id = translate('INSERT OR IGNORE INTO categories (name) VALUES (?)')
+    assert sql == 'INSERT INTO categories (name) VALUES (%s) ON CONFLICT DO NOTHING RETURNING id'
+    assert returns_id
+
+    sql, returns_id = translate('INSERT INTO schema_version (version, description) VALUES (?, ?)')
+    assert not sql.endswith('RETURNING id') and not returns_id
+
+
+def _reset_postgres_schema():
+    conn = postgres_backend.connect(TEST_POSTGRES_URL)
+    conn.execute('DROP SCHEMA public CASCADE')
+    conn.execute('CREATE SCHEMA public')
+    conn.commit()
+    return conn
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def conn(request):
+    if request.param == 'sqlite':
+        connection = sqlite3.connect(':memory:')
+    else:
+        if not TEST_POSTGRES_URL:
+            pytest.skip('TEST_POSTGRES_URL not set')
+        connection = _reset_postgres_schema()
+
+    migrations.migrate(connection)
+    yield connection
+    connection.rollback()
+    connection.close()
+
+
+def test_migrations_reach_latest_version(conn):
+    assert migrations.get_schema_version(conn) == migrations.MIGRATIONS[-1][0]
+    assert migrations.migrate(conn) == migrations.MIGRATIONS[-1][0]
+    assert {'is_deactivated', 'was_participant'} <= migrations.table_columns(conn, 'users')
+    assert conn.execute('SELECT is_open FROM tournament_settings WHERE id = 1').fetchone()[0]
+
+
+def test_lastrowid_integrity_errors_and_booleans(conn):
+    c = conn.cursor()
+    c.execute('INSERT INTO users (username, email, password_hash, is_paid) VALUES (?, ?, ?, ?)',
+              ('alice', 'alice@example.com', 'x', True))
+    user_id = c.lastrowid
+    assert user_id
+    c.execute('INSERT INTO videos (user_id, title, filename, is_approved, is_blocked) VALUES (?, ?, ?, ?, ?)',
+              (user_id, 'Clip', 'clip.mp4', True, False))
+    conn.commit()
+
+    with pytest.raises(database.IntegrityError):
+        c.execute('INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
+                  ('alice', 'other@example.com', 'x'))
+    conn.rollback()
+
+    assert c.execute('SELECT COUNT(*) FROM users WHERE is_paid = 1').fetchone()[0] == 1
+    assert c.execute('SELECT COUNT(*) FROM users WHERE is_admin = 0').fetchone()[0] == 1
+
+
+def test_repository_on_both_backends(conn):
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('bob', 'bob@example.com', 'x')")
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'bob'").fetchone()[0]
+    conn.execute('''INSERT INTO videos (user_id, title, filename, total_votes, average_rating, is_approved, is_blocked)
+                    VALUES (?, 'Top', 'top.mp4', 7, 4.5, TRUE, FALSE)''', (user_id,))
+    conn.commit()
+
+    top = VideoRepository(conn).top(5)
+    assert [(video.title, video.total_votes, video.average_rating) for video in top] == [('Top', 7, 4.5)]
+    assert isinstance(top[0].upload_date, str)
+
+    entry = UserRepository(conn).leaderboard()[0]
+    assert (entry.username, entry.video_count, entry.total_votes) == ('bob', 1, 7)
+
+
+def test_counter_triggers_on_both_backends(conn):
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('carol', 'carol@example.com', 'x')")
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'carol'").fetchone()[0]
+    video_id = conn.execute("INSERT INTO videos (user_id, title, filename) VALUES (?, 'Clip', 'c.mp4')",
+                            (user_id,)).lastrowid
+    comment_id = conn.execute("INSERT INTO comments (user_id, video_id, comment) VALUES (?, ?, 'Hi')",
+                              (user_id, video_id)).lastrowid
+    conn.execute("INSERT INTO comments (user_id, video_id, comment, parent_id) VALUES (?, ?, 'Re', ?)",
+                 (user_id, video_id, comment_id))
+    conn.execute('INSERT OR IGNORE INTO comment_likes (comment_id, user_id) VALUES (?, ?)', (comment_id, user_id))
+    conn.execute('INSERT OR IGNORE INTO comment_likes (comment_id, user_id) VALUES (?, ?)', (comment_id, user_id))
+    conn.commit()
+
+    assert conn.execute('SELECT reply_count, like_count FROM comments WHERE id = ?',
+                        (comment_id,)).fetchone() == (1, 1)
+    assert conn.execute('SELECT comment_count FROM videos WHERE id = ?', (video_id,)).fetchone()[0] == 2
+    assert conn.execute('SELECT video_count FROM users WHERE id = ?', (user_id,)).fetchone()[0] == 1
+    assert not any(counters.find_drift(conn).values())
+
+
+def test_rating_aggregates_on_both_backends(conn):
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('dave', 'dave@example.com', 'x')")
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'dave'").fetchone()[0]
+    video_id = conn.execute("INSERT INTO videos (user_id, title, filename) VALUES (?, 'Clip', 'd.mp4')",
+                            (user_id,)).lastrowid
+    conn.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, 5)', (user_id, video_id))
+    conn.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, 2)', (user_id + 1, video_id))
+    conn.execute('UPDATE votes SET rating = 3 WHERE user_id = ?', (user_id + 1,))
+    conn.commit()
+
+    rating_sum, rating_count, average = conn.execute(
+        'SELECT rating_sum, rating_count, average_rating FROM videos WHERE id = ?', (video_id,)).fetchone()
+    assert (rating_sum, rating_count) == (8, 2)
+    assert average == pytest.approx(4.0)
+    assert not any(counters.find_drift(conn).values())
+
+
+def test_vote_and_rating_upserts_on_both_backends(conn):
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('erin', 'erin@example.com', 'x')")
+    user_id = conn.execute("SELECT id FROM users WHERE username = 'erin'").fetchone()[0]
+    video_id = conn.execute("INSERT INTO videos (user_id, title, filename) VALUES (?, 'Clip', 'e.mp4')",
+                            (user_id,)).lastrowid
+    insert_vote = '''INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)
+                     ON CONFLICT (user_id, video_id) DO NOTHING RETURNING id'''
+    assert conn.execute(insert_vote, (user_id, video_id, 5)).fetchone() is not None
+    assert conn.execute(insert_vote, (user_id, video_id, 5)).fetchone() is None
+
+    conn.execute('''INSERT INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)
+                    ON CONFLICT (user_id, video_id) DO UPDATE SET rating = excluded.rating''',
+                 (user_id, video_id, 2))
+    assert conn.execute('UPDATE videos SET total_votes = rating_count WHERE id = ? RETURNING total_votes',
+                        (video_id,)).fetchone()[0] == 1
+    assert VoteRepository(conn).rating_state(user_id, video_id).rating_sum == 2
+    conn.commit()
+
+
+def test_leaderboard_ranks_on_both_backends(conn):
+    user_ids = [conn.execute('INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
+                             (name, f'{name}@example.com', 'x')).lastrowid for name in ('fay', 'gus', 'hal')]
+    video_id = conn.execute('''INSERT INTO videos (user_id, title, filename, is_approved, is_blocked)
+                               VALUES (?, 'Clip', 'f.mp4', TRUE, FALSE)''', (user_ids[2],)).lastrowid
+    conn.execute('UPDATE videos SET total_votes = 3 WHERE id = ?', (video_id,))
+    conn.commit()
+
+    users = UserRepository(conn)
+    assert [(entry.rank, entry.username, entry.total_votes) for entry in users.leaderboard()] == [
+        (1, 'hal', 3), (2, 'fay', 0), (3, 'gus', 0)]
+    assert users.leaderboard_size() == 3
+    assert not any(counters.find_drift(conn).values())
@@ -0,0 +1,195 @@
+"""
+EXPLAIN QUERY PLAN regression suite for the hot-path queries
+Seeds a large synthetic database and checks that every hot query is
+answered from an index - no full table scans, no temp B-tree sorts.
+
+Run with: python -m pytest test_query_plans.py
+"""
+import random
+import sqlite3
+
+import pytest
+
+import counters
+import migrations
+import repository
+import search
+
+USERS = 2000
+VIDEOS = 20000
+COMMENTS = 60000
+
+# name -> (sql, params); the statements app.py and the repositories execute
+HOT_QUERIES = {
+    'homepage_top_videos': (repository.SQL_TOP_VIDEOS, (5,)),
+    'videos_most_voted': (repository.SQL_VIDEOS_MOST_VOTED, (13,)),
+    'videos_most_voted_after': (repository.SQL_VIDEOS_MOST_VOTED_AFTER, (5, '2024-06-01 00:00:00', 9000, 13)),
+    'videos_recent': (repository.SQL_VIDEOS_RECENT, (13,)),
+    'videos_recent_after': (repository.SQL_VIDEOS_RECENT_AFTER, ('2024-06-01 00:00:00', 9000, 13)),
+    'video_detail': (repository.SQL_VIDEO_DETAIL, (1,)),
+    'video_detail_comments': (repository.SQL_VIDEO_COMMENTS, (1, 21)),
+    'video_detail_comments_after': (repository.SQL_VIDEO_COMMENTS_AFTER, (1, '2024-01-01 08:00:00', 30000, 21)),
+    'video_detail_viewer_reactions': (repository.SQL_VIEWER_REACTIONS.format(ids=repository.in_placeholders(3)),
+                                      (1, 1, 2, 3, 1, 1, 2, 3)),
+    'video_detail_top_rated': (repository.SQL_TOP_RATED_VIDEOS, (10,)),
+    'video_view_exists': (repository.SQL_VIEW_EXISTS, (1, 1)),
+    'video_view_count': (repository.SQL_COUNT_VIDEO_VIEWS, (1,)),
+    'reply_previews': (repository.SQL_REPLY_PREVIEWS.format(ids=repository.in_placeholders(3)), (1, 2, 3, 3)),
+    'replies': (repository.SQL_REPLIES, (1, 11)),
+    'replies_after': (repository.SQL_REPLIES_AFTER, (1, '2024-01-01 08:00:00', 30000, 11)),
+    'vote_exists': (repository.SQL_VOTE_EXISTS, (1, 1)),
+    'user_rating': (repository.SQL_USER_RATING, (1, 1)),
+    'voting_fee_paid': (repository.SQL_VOTING_FEE_PAID, (1, 1)),
+    'dashboard_videos': (repository.SQL_USER_VIDEOS, (1,)),
+    'profile_recent_comments': (repository.SQL_PROFILE_RECENT_COMMENTS, (1,)),
+    'admin_reports_by_status': (repository.SQL_ADMIN_REPORTS_BY_STATUS, ('pending',)),
+    'admin_reports_all': (repository.SQL_ADMIN_REPORTS, ()),
+    'admin_report_counts': (repository.SQL_ADMIN_REPORT_COUNTS, ()),
+    'leaderboard_page': (repository.SQL_LEADERBOARD, (51, 100)),
+    'leaderboard_size': (repository.SQL_LEADERBOARD_SIZE, ()),
+    'admin_recent_activity': (repository.SQL_ADMIN_RECENT_ACTIVITY, ()),
+    'admin_users_page': (repository.admin_users_sql()[0], (26,)),
+    'admin_users_page_after': (repository.admin_users_sql(after=True)[0], ('2024-06-01 00:00:00', 900, 26)),
+    'admin_users_count': (repository.SQL_CAPPED_COUNT.format(query=repository.admin_users_sql()[1]), (10001,)),
+    'admin_videos_page': (repository.admin_videos_sql()[0], (26,)),
+    'admin_videos_page_after': (repository.admin_videos_sql(after=True)[0], ('2024-06-01 00:00:00', 9000, 26)),
+    'admin_videos_count': (repository.SQL_CAPPED_COUNT.format(query=repository.admin_videos_sql()[1]), (10001,)),
+}
+
+# Queries allowed to walk an index from one end: either the walk is cut
+# short by LIMIT, or it aggregates over a small covering index
+INDEX_WALKS = {'admin_reports_all', 'admin_recent_activity', 'admin_report_counts',
+               'admin_users_page', 'admin_videos_page', 'admin_users_count', 'admin_videos_count'}
+
+
+def seed(conn):
+    """Fill the schema with enough skewed data that a bad plan would show"""
+    rng = random.Random(42)
+
+    # Random vote totals would reshuffle the leaderboard ranks on every
+    # insert; bulk-load without its triggers and rebuild it in one pass
+    leaderboard_triggers = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%leaderboard%'").fetchall()
+    for name, _ in leaderboard_triggers:
+        conn.execute(f'DROP TRIGGER {name}')
+
+    conn.executemany(
+        'INSERT INTO users (id, username, email, password_hash, is_paid) VALUES (?, ?, ?, ?, ?)',
+        ((i, f'user{i}', f'user{i}@example.com', 'x', i % 3 == 0) for i in range(1, USERS + 1)))
+
+    conn.executemany(
+        '''INSERT INTO videos (id, user_id, title, filename, upload_date, total_votes,
+                               average_rating, is_approved, is_blocked)
+           VALUES (?, ?, ?, ?, datetime('2024-01-01', ?), ?, ?, ?, ?)''',
+        ((i, rng.randint(1, USERS), f'Video {i}', f'video_{i}.mp4', f'+{i} minutes',
+          rng.randint(0, 5000), rng.uniform(1, 5), rng.random() < 0.9, rng.random() < 0.02)
+         for i in range(1, VIDEOS + 1)))
+
+    conn.executemany(
+        '''INSERT INTO comments (id, user_id, video_id, comment, comment_date, parent_id)
+           VALUES (?, ?, ?, ?, datetime('2024-01-01', ?), ?)''',
+        ((i, rng.randint(1, USERS), rng.randint(1, VIDEOS), f'Comment {i}', f'+{i} seconds',
+          rng.randint(1, i - 1) if i > 1 and rng.random() < 0.4 else None)
+         for i in range(1, COMMENTS + 1)))
+
+    conn.executemany(
+        'INSERT OR IGNORE INTO comment_likes (comment_id, user_id) VALUES (?, ?)',
+        ((rng.randint(1, COMMENTS), rng.randint(1, USERS)) for _ in range(40000)))
+    conn.executemany(
+        'INSERT OR IGNORE INTO comment_dislikes (comment_id, user_id) VALUES (?, ?)',
+        ((rng.randint(1, COMMENTS), rng.randint(1, USERS)) for _ in range(10000)))
+    conn.executemany(
+        'INSERT OR IGNORE INTO votes (user_id, video_id, rating) VALUES (?, ?, ?)',
+        ((rng.randint(1, USERS), rng.randint(1, VIDEOS), rng.randint(1, 5)) for _ in range(80000)))
+    conn.executemany(
+        'INSERT OR IGNORE INTO video_views (user_id, video_id) VALUES (?, ?)',
+        ((rng.randint(1, USERS), rng.randint(1, VIDEOS)) for _ in range(80000)))
+    conn.executemany(
+        '''INSERT INTO voting_fees (user_id, video_id, transaction_id, provider, phone_number,
+                                    amount, currency, status)
+           VALUES (?, ?, ?, 'mtn_momo', '000000000', 2, 'USD', ?)''',
+        ((rng.randint(1, USERS), rng.randint(1, VIDEOS), f'tx{i}',
+          rng.choice(['successful', 'pending', 'failed'])) for i in range(20000)))
+    conn.executemany(
+        '''INSERT INTO reports (reporter_id, reported_type, reported_id, reason, status)
+           VALUES (?, 'video', ?, 'spam', ?)''',
+        ((rng.randint(1, USERS), rng.randint(1, VIDEOS),
+          rng.choice(['pending', 'resolved', 'dismissed'])) for _ in range(5000)))
+    conn.executemany(
+        '''INSERT INTO admin_logs (admin_id, action, target_type, target_id)
+           VALUES (1, 'approve_video', 'video', ?)''',
+        ((i,) for i in range(1, 5000)))
+    conn.executemany('INSERT INTO leaderboard (user_id) VALUES (?)', ((i,) for i in range(1, USERS + 1)))
+    for _, sql in leaderboard_triggers:
+        conn.execute(sql)
+    conn.commit()
+    counters.reconcile(conn)
+
+
+@pytest.fixture(scope='module')
+def conn():
+    connection = sqlite3.connect(':memory:')
+    migrations.migrate(connection)
+    seed(connection)
+    yield connection
+    connection.close()
+
+
+def plan_problems(conn, sql, params, allow_index_walk=False):
+    """Return the plan lines that show a full scan or a temp B-tree sort"""
+    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+    # Reading a subquery's rows back (e.g. to filter on a window function) is not a table scan
+    coroutines = {line[len('CO-ROUTINE '):] for line in plan if line.startswith('CO-ROUTINE ')}
+    problems = []
+    for line in plan:
+        if 'USE TEMP B-TREE' in line:
+            problems.append(line)
+        elif line.startswith('SCAN ') and line[len('SCAN '):] not in coroutines \
+                and not (allow_index_walk and 'USING' in line and 'INDEX' in line):
+            problems.append(line)
+    return plan, problems
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_index(conn, name):
+    sql, params = HOT_QUERIES[name]
+    plan, problems = plan_problems(conn, sql, params, allow_index_walk=name in INDEX_WALKS)
+
+    assert not problems, f'{name} plan regressed:\n' + '\n'.join(plan)
+    assert any('INDEX' in line or 'PRIMARY KEY' in line for line in plan), \
+        f'{name} does not use an index:\n' + '\n'.join(plan)
+
+
+@pytest.mark.parametrize('name, table', [('videos_most_voted_after', 'v'), ('videos_recent_after', 'v'),
+                                         ('video_detail_comments_after', 'c'), ('admin_users_page_after', 'users'),
+                                         ('admin_videos_page_after', 'v')])
+def test_keyset_pages_seek_into_index(conn, name, table):
+    sql, params = HOT_QUERIES[name]
+    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+    # The cursor must bound the index range, not filter a walk from the first page
+    assert any(line.startswith(f'SEARCH {table} USING INDEX') and '<' in line for line in plan), '\n'.join(plan)
+
+
+@pytest.mark.parametrize('name, params', [('results', ('"vid"*', 13)), ('results_after', ('"vid"*', 500000000, 9000, 13)),
+                                          ('suggestions', ('"vid"*', 500, 8))])
+def test_search_is_driven_by_the_fts_index(conn, name, params):
+    sql = search.SQL_SEARCH[False][name]
+    plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+    # Ranking sorts the matches, but rows are only ever reached through the full-text index
+    assert any(line.startswith('SCAN videos_fts VIRTUAL TABLE INDEX') and ':M' in line for line in plan), \
+        '\n'.join(plan)
+    assert not any(line.startswith('SCAN ') and 'videos_fts' not in line and 'hits' not in line
+                   for line in plan), '\n'.join(plan)
+
+
+@pytest.mark.parametrize('table, build', [('users_fts', repository.admin_users_sql),
+                                          ('videos_fts', repository.admin_videos_sql)])
+def test_admin_search_is_driven_by_the_fts_index(conn, table, build):
+    page_sql, count_sql = build(search_ids=search.matching_ids(conn, table))
+    for sql, params in [(page_sql, ('"user1"*', 26)),
+                        (repository.SQL_CAPPED_COUNT.format(query=count_sql), ('"user1"*', 10001))]:
+        plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+        # Only the matches are read (and sorted); the console table itself is never scanned
+        assert any(line.startswith(f'SCAN {table} VIRTUAL TABLE INDEX') for line in plan), '\n'.join(plan)
+        assert not any(line.startswith('SCAN ') and table not in line and line != 'SCAN capped'
+                       for line in plan), '\n'.join(plan)
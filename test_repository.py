@@ -0,0 +1,199 @@
+"""
+Tests for the typed repository layer (repository.py)
+Run with: python -m pytest test_repository.py
+"""
+import sqlite3
+
+import pytest
+
+import migrations
+from repository import (UserRepository, VideoRepository, CommentRepository,
+                        VoteRepository, PaymentRepository, VideoCard, LeaderboardEntry)
+
+
+@pytest.fixture
+def conn():
+    connection = sqlite3.connect(':memory:')
+    migrations.migrate(connection)
+    connection.executemany(
+        'INSERT INTO users (id, username, email, password_hash, is_paid, avatar_filename) VALUES (?, ?, ?, ?, ?, ?)',
+        [(1, 'alice', 'alice@example.com', 'x', True, 'alice.png'),
+         (2, 'bob', 'bob@example.com', 'x', False, None)])
+    connection.executemany(
+        '''INSERT INTO videos (id, user_id, title, filename, upload_date, total_votes,
+                               average_rating, is_approved, is_blocked)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)''',
+        [(1, 1, 'Old hit', 'a.mp4', '2024-01-01', 10, 4.5, 1, 0),
+         (2, 2, 'New entry', 'b.mp4', '2024-02-01', None, None, 1, 0),
+         (3, 2, 'Pending', 'c.mp4', '2024-03-01', 50, 5.0, 0, 0)])
+    connection.executemany(
+        'INSERT INTO comments (id, user_id, video_id, comment, parent_id) VALUES (?, ?, ?, ?, ?)',
+        [(1, 2, 1, 'Great', None), (2, 1, 1, 'Thanks', 1)])
+    connection.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (1, 1)')
+    connection.execute('INSERT INTO votes (user_id, video_id, rating) VALUES (2, 1, 4)')
+    connection.execute('''INSERT INTO voting_fees (user_id, video_id, transaction_id, provider,
+                                                   phone_number, amount, currency, status)
+                          VALUES (2, 1, 'tx1', 'mtn_momo', '000', 2, 'USD', 'successful')''')
+    connection.commit()
+    yield connection
+    connection.close()
+
+
+def test_listing_returns_slotted_records(conn):
+    videos, next_cursor = VideoRepository(conn).page()
+
+    assert all(isinstance(video, VideoCard) for video in videos)
+    assert not hasattr(videos[0], '__dict__')
+    assert [video.title for video in videos] == ['Old hit', 'New entry']
+    assert videos[0].avatar_filename == 'alice.png'
+    assert next_cursor is None
+
+
+def test_recent_sort_and_null_counters_default_to_zero(conn):
+    newest = VideoRepository(conn).page('recent')[0][0]
+
+    assert newest.title == 'New entry'
+    assert newest.total_votes == 0
+    assert newest.average_rating == 0.0
+
+
+def test_keyset_pages_cover_every_video_once(conn):
+    conn.executemany(
+        '''INSERT INTO videos (user_id, title, filename, upload_date, total_votes, is_approved, is_blocked)
+           VALUES (1, ?, 'x.mp4', ?, ?, 1, 0)''',
+        # Repeated vote totals and dates, so the id tiebreaker matters
+        [(f'Clip {i}', f'2024-05-0{i % 3 + 1}', i % 4) for i in range(20)])
+    conn.execute('UPDATE videos SET total_votes = 0 WHERE total_votes IS NULL')
+    videos = VideoRepository(conn)
+
+    for sort_by, key in [('most_voted', lambda v: (-v.total_votes, v.upload_date, v.id)),
+                         ('recent', lambda v: (v.upload_date, v.id))]:
+        seen, cursor = [], None
+        while True:
+            page, cursor = videos.page(sort_by, cursor, limit=7)
+            assert len(page) <= 7
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert len(seen) == 22 and len({video.id for video in seen}) == 22
+        everything = videos.page(sort_by, limit=100)[0]
+        assert [video.id for video in seen] == [video.id for video in everything]
+
+    with pytest.raises(ValueError):
+        videos.page('recent', 'not-a-cursor')
+    with pytest.raises(ValueError):
+        videos.page('most_voted', videos.page('recent', limit=1)[1])
+
+
+def test_video_detail_and_user_videos(conn):
+    videos = VideoRepository(conn)
+    video = videos.get(1)
+
+    assert (video.title, video.username, video.total_votes, video.view_count) == ('Old hit', 'alice', 10, 0)
+    assert videos.get(999) is None
+    assert [v.title for v in videos.for_user(2)] == ['Pending', 'New entry']
+
+
+def test_comments_carry_viewer_state(conn):
+    comments = CommentRepository(conn)
+
+    liked, next_cursor = comments.page(1, viewer_id=1)
+    assert len(liked) == 1 and next_cursor is None
+    assert (liked[0].reply_count, liked[0].like_count, liked[0].user_liked) == (1, 1, True)
+    assert not liked[0].user_disliked
+
+    conn.execute('INSERT INTO comment_dislikes (comment_id, user_id) VALUES (1, 2)')
+    disliked = comments.page(1, viewer_id=2)[0]
+    assert not disliked[0].user_liked and disliked[0].user_disliked
+
+    anonymous = comments.page(1)[0]
+    assert not anonymous[0].user_liked and not anonymous[0].user_disliked
+
+
+def test_comment_pages_share_one_reaction_lookup(conn):
+    conn.executemany(
+        '''INSERT INTO comments (user_id, video_id, comment, comment_date) VALUES (2, 2, ?, '2024-06-01')''',
+        [(f'Comment {i}',) for i in range(5)])
+    conn.execute('INSERT INTO comment_likes (comment_id, user_id) SELECT id, 1 FROM comments WHERE video_id = 2')
+    statements = []
+    conn.set_trace_callback(statements.append)
+    comments = CommentRepository(conn)
+
+    first, cursor = comments.page(2, viewer_id=1, limit=3)
+    second, last_cursor = comments.page(2, viewer_id=1, after=cursor, limit=3)
+    conn.set_trace_callback(None)
+
+    assert len(statements) == 4  # a page query and a reactions query per page
+    assert [c.text for c in first + second] == [f'Comment {i}' for i in range(4, -1, -1)]
+    assert all(c.user_liked for c in first + second) and last_cursor is None
+    with pytest.raises(ValueError):
+        comments.page(2, after='bogus')
+
+
+def test_reply_threads_prefetch_then_paginate(conn):
+    conn.executemany(
+        '''INSERT INTO comments (id, user_id, video_id, comment, comment_date, parent_id)
+           VALUES (?, 2, 2, ?, '2024-06-01', ?)''',
+        [(10, 'Long thread', None), (20, 'Short thread', None), (30, 'No replies', None)]
+        + [(100 + i, f'Long {i}', 10) for i in range(7)]
+        + [(200, 'Short 0', 20)])
+    conn.execute('INSERT INTO comment_likes (comment_id, user_id) VALUES (101, 1)')
+    statements = []
+    conn.set_trace_callback(statements.append)
+    comments = CommentRepository(conn)
+
+    page, _ = comments.page(2, viewer_id=1, reply_previews=3)
+    assert len(statements) == 3  # comments, every thread's first replies, every reaction
+    conn.set_trace_callback(None)
+    threads = {comment.text: comment for comment in page}
+    long_thread = threads['Long thread']
+    assert [reply.text for reply in long_thread.replies] == ['Long 0', 'Long 1', 'Long 2']
+    assert long_thread.replies[1].user_liked and not long_thread.replies[0].user_liked
+    assert [reply.text for reply in threads['Short thread'].replies] == ['Short 0']
+    assert threads['Short thread'].next_reply_cursor is None and threads['No replies'].replies == []
+    assert long_thread.as_dict()['replies'][0]['text'] == 'Long 0'
+
+    rest, cursor = comments.replies(10, after=long_thread.next_reply_cursor, limit=3)
+    assert [reply.text for reply in rest] == ['Long 3', 'Long 4', 'Long 5']
+    rest, cursor = comments.replies(10, after=cursor, limit=3)
+    assert [reply.text for reply in rest] == ['Long 6'] and cursor is None
+    assert len(comments.replies(10)[0]) == 7
+
+
+def test_leaderboard_and_user_lookups(conn):
+    users = UserRepository(conn)
+    board = users.leaderboard()
+
+    assert all(isinstance(entry, LeaderboardEntry) for entry in board)
+    # Only approved, unblocked videos count: bob's 50-vote video is still pending
+    assert [(entry.rank, entry.username, entry.total_votes) for entry in board] == [(1, 'alice', 10), (2, 'bob', 0)]
+    assert [entry.username for entry in users.leaderboard(page=2, per_page=1)] == ['bob']
+    assert users.leaderboard_size() == 2
+    assert users.count() == 2
+    assert users.is_paid(1) is True and users.is_paid(2) is False
+    assert users.avatar(1) == 'alice.png' and users.avatar(2) is None
+
+    alice = users.current(1)
+    assert (alice.username, bool(alice.is_paid), alice.avatar_filename) == ('alice', True, 'alice.png')
+    assert users.current(999) is None
+
+
+def test_votes_and_payments(conn):
+    assert VoteRepository(conn).user_rating(2, 1) == 4
+    assert VoteRepository(conn).has_voted(2, 1)
+    assert not VoteRepository(conn).has_voted(1, 1)
+    assert PaymentRepository(conn).has_paid_voting_fee(2, 1)
+    assert not PaymentRepository(conn).has_paid_voting_fee(1, 1)
+
+
+def test_comment_reactions_and_rating_state(conn):
+    comments = CommentRepository(conn)
+    assert (comments.reactions(1, 1).like_count, bool(comments.reactions(1, 1).user_liked)) == (1, True)
+    assert not comments.reactions(1, 2).user_liked
+    assert comments.reactions(999, 1) is None
+
+    votes = VoteRepository(conn)
+    state = votes.rating_state(2, 1)
+    assert (state.rating_sum, state.rating_count, state.user_rating) == (4, 1, 4)
+    assert votes.rating_state(1, 1).user_rating is None
+    assert votes.rating_state(1, 999) is None
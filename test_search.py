@@ -0,0 +1,125 @@
+"""
+Tests for the full-text search tables (migration 11) and search.py
+Run with: python -m pytest test_search.py
+
+Runs against SQLite always, and against PostgreSQL when TEST_POSTGRES_URL
+points at a disposable database (see test_postgres_backend.py).
+"""
+import os
+import sqlite3
+
+import pytest
+
+import migrations
+import postgres_backend
+from search import VideoSearch, match_query, matching_ids, search_terms
+
+TEST_POSTGRES_URL = os.environ.get('TEST_POSTGRES_URL')
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def conn(request):
+    if request.param == 'sqlite':
+        connection = sqlite3.connect(':memory:')
+    else:
+        if not TEST_POSTGRES_URL:
+            pytest.skip('TEST_POSTGRES_URL not set')
+        connection = postgres_backend.connect(TEST_POSTGRES_URL)
+        connection.execute('DROP SCHEMA public CASCADE')
+        connection.execute('CREATE SCHEMA public')
+        connection.commit()
+
+    migrations.migrate(connection)
+    connection.executemany(
+        'INSERT INTO users (username, email, password_hash, first_name, last_name) VALUES (?, ?, ?, ?, ?)',
+        [('alice', 'alice@example.com', 'x', 'Alice', 'Smith'),
+         ('bob_builder', 'bob@builders.org', 'x', 'Bob', None)])
+    connection.executemany(
+        'INSERT INTO videos (user_id, title, description, tags, filename) VALUES (?, ?, ?, ?, ?)',
+        [(1, 'Dance battle final', 'Two crews, one stage', 'hiphop,breaking', 'a.mp4'),
+         (2, 'Building a shed', 'Timelapse', None, 'b.mp4')])
+    connection.commit()
+    yield connection
+    connection.rollback()
+    connection.close()
+
+
+def _search(conn, table, text):
+    return sorted(row[0] for row in conn.execute(matching_ids(conn, table), (match_query(conn, text),)))
+
+
+def test_search_terms_and_queries():
+    assert search_terms('  Alice SMITH@example_com ') == ['alice', 'smith', 'example', 'com']
+    assert search_terms('"); DROP --') == ['drop']
+    assert search_terms(' !! ') == []
+    fts5 = sqlite3.connect(':memory:')
+    assert match_query(fts5, 'ali NEAR') == '"ali"* "near"*'
+    assert match_query(fts5, '%%') is None
+
+
+def test_prefix_search_over_every_column(conn):
+    assert _search(conn, 'users_fts', 'ali') == [1]
+    assert _search(conn, 'users_fts', 'smi ali') == [1]
+    assert _search(conn, 'users_fts', 'builders.o') == [2]
+    assert _search(conn, 'users_fts', 'bob') == [2]
+    assert _search(conn, 'users_fts', 'alice bob') == []
+
+    assert _search(conn, 'videos_fts', 'danc fin') == [1]
+    assert _search(conn, 'videos_fts', 'hiphop') == [1]
+    assert _search(conn, 'videos_fts', 'crews') == [1]
+    assert _search(conn, 'videos_fts', 'builder') == [2]  # uploader's username
+
+
+def test_triggers_keep_search_tables_in_step(conn):
+    conn.execute('''UPDATE users SET username = 'alicia', email = 'alicia@example.com', first_name = 'Alicia'
+                    WHERE id = 1''')
+    conn.execute("UPDATE videos SET title = 'Solo routine' WHERE id = 1")
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES ('carol', 'carol@example.com', 'x')")
+    conn.commit()
+
+    assert _search(conn, 'users_fts', 'alicia') == [1]
+    assert _search(conn, 'users_fts', 'alice') == []
+    assert _search(conn, 'users_fts', 'carol') == [3]
+    assert _search(conn, 'videos_fts', 'alicia solo') == [1]  # renamed uploader, new title
+    assert _search(conn, 'videos_fts', 'battle') == []
+
+    conn.execute('DELETE FROM videos WHERE id = 2')
+    conn.execute('DELETE FROM users WHERE id = 3')
+    conn.commit()
+    assert _search(conn, 'videos_fts', 'shed') == []
+    assert _search(conn, 'users_fts', 'carol') == []
+
+
+def test_ranked_search_pages_through_public_videos(conn):
+    conn.executemany(
+        'INSERT INTO videos (user_id, title, description, tags, filename, total_votes, is_approved, is_blocked) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+        [(2, 'Dance practice', None, None, 'c.mp4', 50, True, False),
+         (2, 'Cooking', 'We dance while it bakes', None, 'd.mp4', 0, True, False),
+         (2, 'Dance blocked', None, None, 'e.mp4', 90, True, True),
+         (2, 'Dance draft', None, None, 'f.mp4', 90, False, False)])
+    conn.execute('UPDATE videos SET is_approved = 1 WHERE id = 1')
+    conn.commit()
+    search = VideoSearch(conn)
+
+    ranked, after = [], None
+    while True:
+        hits, after = search.page('danc', after, limit=1)
+        ranked += [hit.id for hit in hits]
+        if after is None:
+            break
+    # Votes lift "Dance practice" over the unvoted title match; a description match comes last
+    assert ranked == [3, 1, 4]
+    first = search.page('danc', limit=5)[0]
+    assert first[0].username == 'bob_builder'
+    assert all(isinstance(hit.score, int) for hit in first)
+    assert search.page(' !! ') == ([], None)
+    with pytest.raises(ValueError):
+        search.page('danc', after='not-a-cursor')
+
+    assert [(s.id, s.title) for s in search.suggest('dan', limit=2)] == [(3, 'Dance practice'), (1, 'Dance battle final')]
+    # Hidden videos never take a candidate slot, however many votes they have
+    assert [s.id for s in search.suggest('dan', candidates=2)] == [3, 1]
+    # Words shorter than min_length are left out of the match
+    assert [s.id for s in search.suggest('dan x')] == [3, 1, 4]
+    assert search.suggest('da') == []
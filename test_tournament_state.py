@@ -0,0 +1,64 @@
+"""
+Tests for the cached tournament state (tournament_state.py)
+Run with: python -m pytest test_tournament_state.py
+"""
+import sqlite3
+import migrations
+from repository import TournamentRepository
+from tournament_state import TournamentState
+
+
+def _conn(path):
+    conn = sqlite3.connect(path)
+    migrations.migrate(conn)
+    return conn
+
+
+def _state(conn, loads=None, **kwargs):
+    def load():
+        if loads is not None:
+            loads.append(1)
+        return TournamentRepository(conn).settings()
+    return TournamentState(load, lambda: TournamentRepository(conn).generation(), **kwargs)
+
+
+def _close_tournament(conn):
+    conn.execute('UPDATE tournament_settings SET is_open = 0, generation = generation + 1 WHERE id = 1')
+    conn.commit()
+
+
+def test_state_is_served_from_memory_until_invalidated(tmp_path):
+    conn = _conn(str(tmp_path / 'tournament.db'))
+    loads = []
+    state = _state(conn, loads, check_interval=60)
+    assert state.is_open() is True
+    _close_tournament(conn)
+    assert state.is_open() is True and len(loads) == 1
+
+    state.invalidate()
+    assert state.is_open() is False and len(loads) == 2
+
+
+def test_other_workers_follow_the_generation_in_the_database(tmp_path):
+    path = str(tmp_path / 'tournament.db')
+    # Two workers: separate state objects and connections, no shared cache at all
+    admin_conn, other_conn = _conn(path), sqlite3.connect(path)
+    loads = []
+    other_worker = _state(other_conn, loads, check_interval=0)
+    assert other_worker.is_open() is True
+    assert other_worker.is_open() is True and len(loads) == 1  # generation unchanged: no reload
+
+    _close_tournament(admin_conn)
+    assert other_worker.is_open() is False and len(loads) == 2
+
+
+def test_missing_row_counts_as_open(tmp_path):
+    conn = _conn(str(tmp_path / 'tournament.db'))
+    conn.execute('DELETE FROM tournament_settings')
+    state = _state(conn, check_interval=0)
+    assert state.get() is None and state.is_open() is True
+
+    # The row created later (generation 0) is picked up
+    conn.execute('INSERT INTO tournament_settings (id, is_open) VALUES (1, FALSE)')
+    conn.commit()
+    assert state.is_open() is False
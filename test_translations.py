@@ -0,0 +1,74 @@
+"""
+Tests for the compiled translation catalogs (translations.py)
+Run with: python -m pytest test_translations.py
+"""
+import json
+import os
+
+import pytest
+
+from translations import TranslationCatalogs
+
+
+@pytest.fixture
+def catalog_dir(tmp_path):
+    (tmp_path / 'en.json').write_text(json.dumps(
+        {'nav': {'home': 'Home', 'videos': 'Videos'}, 'footer': {'contact': 'Contact'}}), encoding='utf-8')
+    (tmp_path / 'fr.json').write_text(json.dumps({'nav': {'home': 'Accueil'}}), encoding='utf-8')
+    return tmp_path
+
+
+def test_english_fallback_is_merged_in(catalog_dir):
+    fr = TranslationCatalogs(str(catalog_dir)).get('fr')
+
+    assert fr['nav']['home'] == 'Accueil'
+    assert fr['nav']['videos'] == 'Videos'
+    assert fr['footer']['contact'] == 'Contact'
+
+
+def test_unknown_language_gets_english(catalog_dir):
+    assert TranslationCatalogs(str(catalog_dir)).get('xx')['nav']['home'] == 'Home'
+
+
+def test_catalogs_are_read_only_and_shared(catalog_dir):
+    catalogs = TranslationCatalogs(str(catalog_dir))
+    fr = catalogs.get('fr')
+
+    with pytest.raises(TypeError):
+        fr['nav']['home'] = 'changed'
+    assert catalogs.get('fr') is fr
+
+
+def test_reloads_only_when_the_file_changes(catalog_dir, monkeypatch):
+    catalogs = TranslationCatalogs(str(catalog_dir), check_interval=0)
+    first = catalogs.get('fr')
+
+    reads = []
+    original_read = catalogs._read
+    monkeypatch.setattr(catalogs, '_read', lambda language: reads.append(language) or original_read(language))
+    assert catalogs.get('fr') is first
+    assert reads == []
+
+    path = catalog_dir / 'fr.json'
+    path.write_text(json.dumps({'nav': {'home': 'Maison'}}), encoding='utf-8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert catalogs.get('fr')['nav']['home'] == 'Maison'
+    assert reads == ['en', 'fr']
+
+
+def test_shipped_catalogs_compile():
+    catalogs = TranslationCatalogs()
+    assert catalogs.get('en')['nav']['home']
+    assert catalogs.get('fr')['nav']['home'] != catalogs.get('en')['nav']['home']
+
+
+def test_json_for_scripts_is_compiled_with_the_catalog(catalog_dir):
+    (catalog_dir / 'en.json').write_text(json.dumps({'nav': {'home': '</script>'}}), encoding='utf-8')
+    catalogs = TranslationCatalogs(str(catalog_dir))
+
+    text = catalogs.get_json('fr')
+    assert '</script>' not in text
+    assert json.loads(text) == {'nav': {'home': 'Accueil'}}
+    assert catalogs.get_json('fr') is text
@@ -0,0 +1,167 @@
+"""
+Tests for the write-behind buffer (write_buffer.py)
+Run with: python -m pytest test_write_buffer.py
+"""
+import sqlite3
+import time
+
+import pytest
+
+import database
+from repository import SQL_REFRESH_VIEW_COUNT
+from write_buffer import WriteBuffer
+
+INSERT_VIEW = 'INSERT OR IGNORE INTO video_views (user_id, video_id) VALUES (?, ?)'
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'test.db')
+    monkeypatch.setattr(database, 'DATABASE_PATH', path)
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE videos (id INTEGER PRIMARY KEY, view_count INTEGER DEFAULT 0);
+        CREATE TABLE video_views (user_id INTEGER, video_id INTEGER, UNIQUE(user_id, video_id));
+        CREATE TABLE admin_logs (action TEXT NOT NULL);
+        INSERT INTO videos (id) VALUES (1), (2);
+    ''')
+    conn.close()
+    yield path
+    database.close_pool()
+
+
+def _query(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_records_wait_for_flush_and_land_in_one_batch(db_path):
+    buffer = WriteBuffer()
+    for user_id in (1, 2, 2, 3):
+        buffer.enqueue(INSERT_VIEW, (user_id, 1), after=(SQL_REFRESH_VIEW_COUNT, (1, 1)))
+    buffer.enqueue(INSERT_VIEW, (1, 2), after=(SQL_REFRESH_VIEW_COUNT, (2, 2)))
+
+    assert buffer.pending() == 5
+    assert _query(db_path, 'SELECT COUNT(*) FROM video_views') == [(0,)]
+
+    assert buffer.flush() == 5
+    assert buffer.pending() == 0
+    assert _query(db_path, 'SELECT id, view_count FROM videos ORDER BY id') == [(1, 3), (2, 1)]
+
+
+def test_full_buffer_wakes_the_flush_thread(db_path):
+    buffer = WriteBuffer(flush_interval_ms=60000, max_records=3)
+    buffer.start()
+    try:
+        for user_id in range(3):
+            buffer.enqueue(INSERT_VIEW, (user_id, 1))
+        for _ in range(200):
+            if _query(db_path, 'SELECT COUNT(*) FROM video_views') == [(3,)]:
+                break
+            time.sleep(0.01)
+        assert _query(db_path, 'SELECT COUNT(*) FROM video_views') == [(3,)]
+    finally:
+        buffer.stop()
+
+
+def test_stop_flushes_whatever_is_queued(db_path):
+    buffer = WriteBuffer(flush_interval_ms=60000)
+    buffer.start()
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('login',))
+    buffer.stop()
+
+    assert _query(db_path, 'SELECT action FROM admin_logs') == [('login',)]
+
+
+def test_bad_record_is_dropped_without_losing_the_batch(db_path):
+    buffer = WriteBuffer()
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('kept',))
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', (None,))  # NOT NULL violation
+
+    assert buffer.flush() == 1
+    assert _query(db_path, 'SELECT action FROM admin_logs') == [('kept',)]
+
+
+def test_permanent_error_does_not_hold_up_later_flushes(db_path):
+    buffer = WriteBuffer()
+    buffer.enqueue('INSERT INTO missing_table (action) VALUES (?)', ('lost',))
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('kept',))
+
+    assert buffer.flush() == 1
+    assert buffer.pending() == 0
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('next',))
+    assert buffer.flush() == 1
+    assert _query(db_path, 'SELECT action FROM admin_logs ORDER BY action') == [('kept',), ('next',)]
+
+
+def test_locked_database_keeps_records_for_the_next_flush(db_path, monkeypatch):
+    monkeypatch.setattr(database.Config, 'SQLITE_WRITE_RETRIES', 0)
+    monkeypatch.setattr(database.Config, 'SQLITE_BUSY_TIMEOUT_MS', 0)
+    buffer = WriteBuffer()
+    buffer.enqueue(INSERT_VIEW, (1, 1))
+
+    other = sqlite3.connect(db_path, timeout=0)
+    other.execute('BEGIN IMMEDIATE')
+    assert buffer.flush() == 0
+    assert buffer.pending() == 1
+
+    other.rollback()
+    other.close()
+    assert buffer.flush() == 1
+
+
+def _crash(buffer):
+    """The process dies without flushing; its spool lock goes with it"""
+    buffer._spool_lock.close()
+
+
+def test_spool_policy_replays_after_a_crash(db_path, tmp_path):
+    spool = str(tmp_path / 'writes.spool')
+    crashed = WriteBuffer(crash_policy='spool', spool_path=spool)
+    crashed.enqueue(INSERT_VIEW, (7, 1), after=(SQL_REFRESH_VIEW_COUNT, (1, 1)))
+    _crash(crashed)
+
+    restarted = WriteBuffer(crash_policy='spool', spool_path=spool)
+    assert restarted.pending() == 1
+    restarted.stop()
+
+    assert _query(db_path, 'SELECT view_count FROM videos WHERE id = 1') == [(1,)]
+    assert WriteBuffer(crash_policy='spool', spool_path=spool).pending() == 0
+
+
+def test_workers_sharing_a_spool_directory_keep_their_own_records(db_path, tmp_path):
+    spool = str(tmp_path / 'writes.spool')
+    first = WriteBuffer(crash_policy='spool', spool_path=spool)
+    second = WriteBuffer(crash_policy='spool', spool_path=spool)
+    assert first.spool_path != second.spool_path
+    first.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('first',))
+    second.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('second',))
+
+    # A flush only rewrites the flushing worker's spool
+    assert first.flush() == 1
+    # A worker starting next to live ones replays none of their records
+    assert WriteBuffer(crash_policy='spool', spool_path=spool).pending() == 0
+
+    # Once the second worker dies, exactly one of the workers starting after it replays its spool
+    _crash(second)
+    restarted = [WriteBuffer(crash_policy='spool', spool_path=spool) for _ in range(2)]
+    assert sorted(buffer.pending() for buffer in restarted) == [0, 1]
+    for buffer in restarted:
+        buffer.flush()
+    assert _query(db_path, 'SELECT action FROM admin_logs ORDER BY action') == [('first',), ('second',)]
+
+
+def test_sync_policy_writes_immediately(db_path):
+    buffer = WriteBuffer(crash_policy='sync')
+    buffer.enqueue('INSERT INTO admin_logs (action) VALUES (?)', ('now',))
+
+    assert buffer.pending() == 0
+    assert _query(db_path, 'SELECT action FROM admin_logs') == [('now',)]
+
+
+def test_unknown_crash_policy_is_rejected():
+    with pytest.raises(ValueError):
+        WriteBuffer(crash_policy='hope')
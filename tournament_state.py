@@ -0,0 +1,73 @@
+"""
+Tournament State
+Per-process copy of the tournament_settings row, so the upgrade and payment
+paths can check whether the tournament is open without loading the row.
+
+Every worker keeps its own copy, tagged with the row's generation column
+(migration 12). Whatever changes the row bumps generation in the same
+transaction, and every worker compares it with a primary-key lookup at most
+once per check_interval, reloading the row when it moved. The generation
+lives in the database, so the invalidation reaches every worker whatever
+CACHE_URL is set to.
+
+Usage:
+    state = TournamentState(load=lambda: TournamentRepository(get_db()).settings(),
+                            load_generation=lambda: TournamentRepository(get_db()).generation())
+    state.is_open()
+    state.invalidate()   # after changing tournament_settings (and bumping generation)
+"""
+import threading
+import time
+
+
+class TournamentState:
+    """
+    Cached tournament settings with cross-process invalidation
+
+    Args:
+        load: Callable returning the TournamentSettings row, or None if missing
+        load_generation: Callable returning the row's generation, or None if missing
+        check_interval: Seconds between generation checks; within the interval
+            reads are served from memory alone
+        max_age: Seconds after which the row is reloaded even if the
+            generation did not change (e.g. after a hand-edited row)
+    """
+
+    def __init__(self, load, load_generation, check_interval=1.0, max_age=60.0):
+        self.load = load
+        self.load_generation = load_generation
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._state = None  # (generation, loaded_at, checked_at, settings)
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        The tournament settings row
+
+        Returns:
+            TournamentSettings: Cached row, or None if it does not exist
+        """
+        state = self._state
+        now = time.monotonic()
+        if state is not None and now - state[2] < self.check_interval and now - state[1] < self.max_age:
+            return state[3]
+
+        with self._lock:
+            state = self._state
+            if state is not None and now - state[1] < self.max_age and self.load_generation() == state[0]:
+                self._state = (state[0], state[1], now, state[3])
+            else:
+                settings = self.load()
+                self._state = (settings.generation if settings is not None else None, now, now, settings)
+            return self._state[3]
+
+    def is_open(self):
+        """Whether users may currently upgrade to participant (open when the row is missing)"""
+        settings = self.get()
+        return bool(settings.is_open) if settings is not None else True
+
+    def invalidate(self):
+        """Reload the row in this worker now (the others follow its bumped generation)"""
+        with self._lock:
+            self._state = None
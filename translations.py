@@ -0,0 +1,109 @@
+"""
+Translation Catalogs
+Loads static/translations/<lang>.json once per process into read-only nested
+mappings, with the English catalog already merged in as the fallback for any
+key a language is missing. Requests get the compiled catalog with no file I/O;
+a catalog is recompiled only when its JSON file (or en.json) changes on disk.
+The script-safe JSON that base.html hands to JavaScript is compiled with it.
+
+Usage:
+    catalogs = TranslationCatalogs()
+    g.translations = catalogs.get('fr')   # {{ translations.nav.home }} in templates
+    catalogs.get_json('fr')               # window.translations = {{ translations_json }};
+"""
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from jinja2.utils import htmlsafe_json_dumps
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'translations')
+FALLBACK_LANGUAGE = 'en'
+
+
+def merge_catalogs(fallback, overrides):
+    """Deep-merge two catalogs; values from overrides win"""
+    merged = dict(fallback)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge_catalogs(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def freeze(catalog):
+    """Turn nested dicts into read-only mappings shared safely by every request"""
+    return MappingProxyType({key: freeze(value) if isinstance(value, dict) else value
+                             for key, value in catalog.items()})
+
+
+class TranslationCatalogs:
+    """
+    Per-process cache of compiled catalogs
+
+    Args:
+        directory: Folder holding <lang>.json files
+        check_interval: Seconds between mtime checks for a language; within
+            the interval get() is a plain dict lookup
+    """
+
+    def __init__(self, directory=TRANSLATIONS_DIR, check_interval=2.0):
+        self.directory = directory
+        self.check_interval = check_interval
+        self._compiled = {}  # language -> (source mtimes, checked_at, catalog, catalog_json)
+        self._lock = threading.Lock()
+
+    def _path(self, language):
+        return os.path.join(self.directory, f'{language}.json')
+
+    def _mtime(self, language):
+        try:
+            return os.stat(self._path(language)).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self, language):
+        try:
+            with open(self._path(language), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            if language == FALLBACK_LANGUAGE or os.path.exists(self._path(language)):
+                print(f"⚠️  Could not load translations for '{language}': {e}")
+            return {}
+
+    def _compile(self, language):
+        catalog = self._read(FALLBACK_LANGUAGE)
+        if language != FALLBACK_LANGUAGE:
+            catalog = merge_catalogs(catalog, self._read(language))
+        return freeze(catalog), htmlsafe_json_dumps(catalog)
+
+    def _entry(self, language):
+        entry = self._compiled.get(language)
+        now = time.monotonic()
+        if entry is not None and now - entry[1] < self.check_interval:
+            return entry
+
+        with self._lock:
+            mtimes = (self._mtime(FALLBACK_LANGUAGE), self._mtime(language))
+            entry = self._compiled.get(language)
+            if entry is None or entry[0] != mtimes:
+                entry = (mtimes, now) + self._compile(language)
+            else:
+                entry = (mtimes, now) + entry[2:]
+            self._compiled[language] = entry
+            return entry
+
+    def get(self, language):
+        """
+        Compiled catalog for a language (English for unknown languages)
+
+        Returns:
+            MappingProxyType: Nested read-only mapping of translation keys
+        """
+        return self._entry(language)[2]
+
+    def get_json(self, language):
+        """The same catalog as script-safe JSON markup, serialized once per compile"""
+        return self._entry(language)[3]
@@ -0,0 +1,303 @@
+"""
+Write-Behind Buffer
+Collects high-frequency, low-value writes (video views, login statistics,
+admin audit rows) in memory and applies them in one transaction every
+Config.WRITE_BUFFER_FLUSH_INTERVAL_MS, or as soon as
+Config.WRITE_BUFFER_MAX_RECORDS are waiting.
+
+What happens to buffered writes if the process dies before a flush is set
+by Config.WRITE_BUFFER_CRASH_POLICY:
+    drop   -> records live only in memory; a crash loses at most one interval
+    spool  -> every record is also appended to a spool file of this process
+              and replayed by the next process (survives a crash, not power loss)
+    sync   -> no buffering; each write runs in its own transaction immediately
+
+Each buffer spools to its own file, Config.WRITE_BUFFER_SPOOL_PATH plus
+".<pid>.<token>", and holds an exclusive flock() on "<that file>.lock" for as
+long as it lives. A new buffer claims (replays once, then deletes) every spool
+whose lock it can take - the files of processes that died - while the spools of
+live workers are left alone. Without fcntl (Windows), only the buffer's own
+records are spooled and orphans wait for a platform that can lock them.
+
+A normal shutdown always flushes (atexit).
+
+Usage:
+    write_buffer.enqueue('UPDATE users SET login_count = login_count + 1 WHERE id = ?', (user_id,))
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from config import Config
+import database
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+CRASH_POLICIES = ('drop', 'spool', 'sync')
+
+
+def utc_timestamp():
+    """CURRENT_TIMESTAMP as SQLite writes it, taken when the write is queued rather than when it lands"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class WriteBuffer:
+    """
+    In-memory queue of (sql, params, after) records flushed in batches
+
+    "after" is an optional (sql, params) statement run once per flush after
+    all the records, however many records asked for it - e.g. refreshing a
+    video's view_count once for a batch of new views.
+    """
+
+    def __init__(self, flush_interval_ms=500, max_records=200, crash_policy='drop', spool_path=None):
+        if crash_policy not in CRASH_POLICIES:
+            raise ValueError(f'Unknown write buffer crash policy: {crash_policy}')
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_records = max_records
+        self.crash_policy = crash_policy
+        self.spool_path = None
+        self._spool_lock = None
+        self._records = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+        if crash_policy == 'spool':
+            self.spool_path = f'{spool_path}.{os.getpid()}.{uuid.uuid4().hex[:8]}'
+            self._spool_lock = _try_lock(self.spool_path)
+            self._records = self._claim_orphaned_spools(spool_path)
+
+    def enqueue(self, sql, params=(), after=None):
+        """Queue one write; it is applied by the next flush"""
+        record = (sql, tuple(params), tuple(after) if after else None)
+        if self.crash_policy == 'sync':
+            self._apply([record])
+            return
+
+        with self._lock:
+            self._records.append(record)
+            if self.crash_policy == 'spool':
+                self._append_spool(record)
+            full = len(self._records) >= self.max_records
+        if full:
+            self._wake.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._records)
+
+    def flush(self):
+        """
+        Apply every queued record in one transaction
+
+        Returns:
+            int: Number of records written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._records = self._records, []
+            if not batch:
+                return 0
+
+            try:
+                self._apply(batch)
+            except database.OperationalError as e:
+                if not database.is_lock_contention(e):
+                    # e.g. "no such table": retrying would block every later flush behind it
+                    print(f"⚠️  Write buffer batch failed ({e}), applying records one by one")
+                    written = self._apply_individually(batch)
+                else:
+                    # Another writer holds the lock: keep everything for the next flush
+                    print(f"⚠️  Write buffer flush failed, retrying later: {e}")
+                    with self._lock:
+                        self._records = batch + self._records
+                    return 0
+            except database.DatabaseError as e:
+                print(f"⚠️  Write buffer batch rejected ({e}), applying records one by one")
+                written = self._apply_individually(batch)
+            else:
+                written = len(batch)
+
+            if self.crash_policy == 'spool':
+                with self._lock:
+                    self._rewrite_spool(self._records)
+            return written
+
+    def _apply(self, batch):
+        # Consecutive records with the same statement go through one executemany()
+        after = {}
+        with database.write_transaction() as conn:
+            start = 0
+            while start < len(batch):
+                sql = batch[start][0]
+                end = start
+                while end < len(batch) and batch[end][0] == sql:
+                    if batch[end][2]:
+                        after.setdefault(batch[end][2], None)
+                    end += 1
+                conn.executemany(sql, [record[1] for record in batch[start:end]])
+                start = end
+            for statement, params in after:
+                conn.execute(statement, params)
+
+    def _apply_individually(self, batch):
+        written = 0
+        for record in batch:
+            try:
+                self._apply([record])
+                written += 1
+            except database.DatabaseError as e:
+                print(f"❌ Dropping buffered write ({' '.join(record[0].split()[:3])} ...): {e}")
+        return written
+
+    def _claim_orphaned_spools(self, base_path):
+        """
+        Take over the spools of dead processes: their records are copied into
+        this buffer's spool before the orphan is deleted, and the flock keeps
+        two starting workers from replaying the same file
+
+        Returns:
+            list: The claimed records
+        """
+        records = []
+        candidates = [base_path] + glob.glob(glob.escape(base_path) + '.*')
+        for path in sorted(candidates):
+            if path == self.spool_path or path.endswith(('.lock', '.tmp')) or not os.path.exists(path):
+                continue
+            lock = _try_lock(path)
+            if lock is None:
+                continue  # a live worker's spool (or no fcntl to tell)
+            try:
+                # Another worker may have claimed it between the listing and the lock
+                claimed = _read_spool(path) if os.path.exists(path) else []
+                if claimed:
+                    print(f"📼 Replaying {len(claimed)} buffered writes from {path}")
+                    records += claimed
+                    self._rewrite_spool(records)
+                for leftover in (path, path + '.tmp', path + '.lock'):
+                    if os.path.exists(leftover):
+                        os.remove(leftover)
+            finally:
+                lock.close()
+        return records
+
+    def _append_spool(self, record):
+        with open(self.spool_path, 'a', encoding='utf-8') as spool:
+            spool.write(json.dumps(record) + '\n')
+
+    def _rewrite_spool(self, records):
+        if not records:
+            if os.path.exists(self.spool_path):
+                os.remove(self.spool_path)
+            return
+        temp_path = self.spool_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as spool:
+            for record in records:
+                spool.write(json.dumps(record) + '\n')
+        os.replace(temp_path, self.spool_path)
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ Write buffer flush error: {e}")
+
+    def start(self):
+        """Start the background flush thread (no-op for the sync policy)"""
+        if self.crash_policy == 'sync' or self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='write-buffer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flush thread and write out whatever is still queued"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=max(self.flush_interval * 4, 5))
+            self._thread = None
+        self.flush()
+        if self._spool_lock is not None and not self.pending():
+            # Nothing left to replay; a spool still holding records keeps its
+            # lock file, and the lock itself goes with the process
+            os.remove(self._spool_lock.name)
+            self._spool_lock.close()
+            self._spool_lock = None
+
+
+def _read_spool(path):
+    records = []
+    with open(path, encoding='utf-8') as spool:
+        for line in spool:
+            try:
+                sql, params, after = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash mid-write
+            records.append((sql, tuple(params), (after[0], tuple(after[1])) if after else None))
+    return records
+
+
+def _try_lock(spool_path):
+    """
+    Take the exclusive flock of a spool without waiting
+
+    Returns:
+        The open lock file (closing it releases the lock), or None if another
+        process holds it or the platform has no fcntl
+    """
+    if fcntl is None:
+        return None
+    lock = open(spool_path + '.lock', 'a')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return None
+    return lock
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer():
+    """The process's write buffer, created and started on first use"""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                buffer = WriteBuffer(
+                    flush_interval_ms=Config.WRITE_BUFFER_FLUSH_INTERVAL_MS,
+                    max_records=Config.WRITE_BUFFER_MAX_RECORDS,
+                    crash_policy=Config.WRITE_BUFFER_CRASH_POLICY,
+                    spool_path=Config.WRITE_BUFFER_SPOOL_PATH
+                )
+                buffer.start()
+                atexit.register(buffer.stop)
+                _buffer = buffer
+    return _buffer
+
+
+def enqueue(sql, params=(), after=None):
+    """Queue a write on the process's buffer"""
+    get_buffer().enqueue(sql, params, after)
+
+
+def flush():
+    """Write out everything queued so far (e.g. before reading it back)"""
+    if _buffer is None:
+        return 0
+    return _buffer.flush()